@@ -0,0 +1,51 @@
+# rename_app/async_file_ops.py
+"""
+Awaitable wrappers around blocking filesystem calls.
+
+Live runs execute on the asyncio loop that also drives metadata requests, background cache
+refreshes and the progress display. AsyncFileOps runs exists/mkdir/move calls, and whole
+blocking units such as perform_file_actions (which also trashes files and restores mtimes),
+on a small thread pool so a slow disk or network share stalls only the batch waiting on it,
+not the loop.
+"""
+
+import asyncio
+import logging
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+log = logging.getLogger(__name__)
+
+
+class AsyncFileOps:
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, int(max_workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, cfg_helper) -> "AsyncFileOps":
+        # Sized for the batches a live run executes at once; sequential runs use one thread.
+        return cls(max_workers=int(cfg_helper('live_parallel_batches', 4) or 4))
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Runs func(*args, **kwargs) on the pool; exceptions propagate to the awaiting caller."""
+        if self._executor is None: # Created on first use: dry runs never start a thread
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rename-fileops")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def exists(self, path: Path) -> bool:
+        return await self.run(path.exists)
+
+    async def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
+        await self.run(path.mkdir, parents=parents, exist_ok=exist_ok)
+
+    async def move(self, src: Path, dst: Path) -> None:
+        await self.run(shutil.move, str(src), str(dst))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the pool once queued calls finish; the next call starts a new one."""
+        executor, self._executor = self._executor, None
+        if executor is not None: executor.shutdown(wait=wait)
@@ -0,0 +1,150 @@
+# rename_app/cache_warmer.py
+"""Prefetches metadata for a library into the cache without planning or touching any files."""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .config_manager import EffectiveSettings
+from .exceptions import MetadataError
+from .main_processor import DEFAULT_PROGRESS_COLUMNS, _guessed_episode_numbers, _guessed_title
+from .metadata_fetcher import MetadataFetcher
+from .models import MediaMetadata
+from .renamer_engine import RenamerEngine
+from .ui_utils import ConsoleClass, ProgressClass, TableClass, RICH_AVAILABLE_UI as RICH_AVAILABLE
+from .utils import scan_media_files
+
+log = logging.getLogger(__name__)
+
+# (title, year, season); season is None for movies.
+WarmKey = Tuple[str, Optional[int], Optional[int]]
+
+
+@dataclass
+class CacheWarmSummary:
+    files_scanned: int = 0
+    files_skipped: int = 0 # Unparseable, unknown type, or series without episode numbers
+    lookups: int = 0 # One per unique title/season; every episode set of a season is cached from that one lookup
+    resolved: Set[WarmKey] = field(default_factory=set)
+    unresolved: Dict[WarmKey, str] = field(default_factory=dict)
+
+    @property
+    def keys(self) -> int:
+        return len(self.resolved) + len(self.unresolved)
+
+
+def format_warm_key(key: WarmKey) -> str:
+    title, year, season = key
+    label = f"{title} ({year})" if year else title
+    return f"{label} S{season:02d}" if season is not None else label
+
+
+def collect_warm_lookups(
+    file_batches: Dict[str, Dict[str, Any]], renamer: RenamerEngine, summary: CacheWarmSummary
+) -> Dict[WarmKey, Set[Tuple[int, ...]]]:
+    """
+    Parses each batch's video the way a rename run does and dedupes the results by
+    (title, year, season). The episode tuples are kept per key because series cache
+    entries are keyed by the exact episode set a file asks for; the warmer fills all
+    of them from a single season lookup.
+    """
+    lookups: Dict[WarmKey, Set[Tuple[int, ...]]] = {}
+    for stem, batch_data in file_batches.items():
+        summary.files_scanned += 1
+        video_path = batch_data.get('video')
+        if not video_path:
+            summary.files_skipped += 1; continue
+        try:
+            guess_info = renamer.parse_filename(video_path)
+            file_type = renamer._determine_file_type(guess_info)
+        except Exception as e:
+            log.error(f"Error parsing '{stem}' for cache warm-up: {e}", exc_info=True)
+            summary.files_skipped += 1; continue
+
+        year = guess_info.get('year')
+        year = year if isinstance(year, int) else None
+        title = _guessed_title(guess_info, Path(video_path), stem)
+        if file_type == 'movie':
+            lookups.setdefault((title, year, None), set()).add(())
+        elif file_type == 'series':
+            episodes = tuple(_guessed_episode_numbers(guess_info, stem))
+            if not episodes:
+                log.debug(f"Cache warm-up: no episode numbers for '{stem}', skipping.")
+                summary.files_skipped += 1; continue
+            season = guess_info.get('season', 0)
+            lookups.setdefault((title, year, season if isinstance(season, int) else 0), set()).add(episodes)
+        else:
+            summary.files_skipped += 1
+    return lookups
+
+
+class CacheWarmer:
+    def __init__(self, cfg_helper: EffectiveSettings, console: Optional[ConsoleClass] = None, quiet: bool = False):
+        self.cfg = cfg_helper
+        self.quiet = quiet
+        self.console = console or ConsoleClass(quiet=quiet)
+        self.renamer = RenamerEngine(cfg_helper)
+        self.metadata_fetcher = MetadataFetcher(cfg_helper, console=self.console)
+
+    async def _lookup(self, key: WarmKey, episode_sets: Set[Tuple[int, ...]]) -> Tuple[WarmKey, Optional[str]]:
+        """Returns (key, None) on success or (key, reason) when the lookup found nothing usable."""
+        title, year, season = key
+        try:
+            if season is None:
+                metadata: MediaMetadata = await self.metadata_fetcher.fetch_movie_metadata(movie_title_guess=title, year_guess=year)
+            else:
+                # One search + season fetch for the union of episodes; each file's own episode set is cached from it.
+                all_episodes = tuple(sorted({ep for episodes in episode_sets for ep in episodes}))
+                metadata = await self.metadata_fetcher.fetch_series_metadata(
+                    show_title_guess=title, season_num=season, episode_num_list=all_episodes, year_guess=year,
+                    cache_episode_sets=sorted(episode_sets)
+                )
+        except MetadataError as e:
+            return key, str(e)
+        except Exception as e:
+            log.exception(f"Unexpected error warming cache for '{format_warm_key(key)}': {e}")
+            return key, f"Unexpected error: {e}"
+        if not metadata.source_api:
+            return key, "No usable API data."
+        return key, None
+
+    async def warm(self, target_dir: Path) -> CacheWarmSummary:
+        summary = CacheWarmSummary()
+        file_batches = {stem: data for stem, data in scan_media_files(target_dir, self.cfg)}
+        lookups = collect_warm_lookups(file_batches, self.renamer, summary)
+        summary.lookups = len(lookups)
+        log.info(f"Cache warm-up: {summary.files_scanned} files -> {len(lookups)} unique titles/seasons.")
+
+        # All lookups are queued at once; the fetcher's rate limiter decides how fast they actually go out.
+        failures: Dict[WarmKey, str] = {}
+        with ProgressClass(*DEFAULT_PROGRESS_COLUMNS, console=self.console, disable=self.quiet or not RICH_AVAILABLE) as progress:
+            warm_task = progress.add_task("Warming Metadata Cache", total=len(lookups), item_name="")
+            tasks = [asyncio.create_task(self._lookup(key, episode_sets), name=f"warm_{format_warm_key(key)}") for key, episode_sets in lookups.items()]
+            for completed in asyncio.as_completed(tasks):
+                key, error = await completed
+                if error: failures[key] = error
+                progress.update(warm_task, advance=1, item_name=format_warm_key(key)[:30])
+
+        await self.metadata_fetcher.wait_for_background_refreshes()
+        self.metadata_fetcher.log_cache_stats()
+        self.metadata_fetcher.log_retry_stats()
+        summary.unresolved = failures
+        summary.resolved = set(lookups) - set(failures)
+        return summary
+
+    def print_summary(self, summary: CacheWarmSummary) -> None:
+        self.console.print(
+            f"Cache warm-up: {summary.files_scanned} files scanned ({summary.files_skipped} skipped), "
+            f"{summary.keys} unique titles/seasons, {summary.lookups} lookups, "
+            f"{len(summary.resolved)} resolved, {len(summary.unresolved)} unresolved."
+        )
+        if not summary.unresolved:
+            return
+        table = TableClass(title="Unresolved Titles", show_header=True, header_style="bold magenta")
+        table.add_column("Title / Season", style="cyan")
+        table.add_column("Reason", style="yellow")
+        for key in sorted(summary.unresolved, key=format_warm_key):
+            table.add_row(format_warm_key(key), summary.unresolved[key])
+        self.console.print(table)
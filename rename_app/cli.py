@@ -3,6 +3,50 @@ import logging
 from pathlib import Path
 from . import __version__
 
+def _add_processing_arguments(parser_cmd):
+    """Options shared by the 'rename' and 'watch' subcommands."""
+    parser_cmd.add_argument("directory", type=Path, help="Directory to process.")
+    parser_cmd.add_argument("--live", action="store_true", default=False, help="Perform live run (Default: dry run).")
+    parser_cmd.add_argument("-r", "--recursive", action=argparse.BooleanOptionalAction, default=None, help="Process recursively (overrides config).")
+    parser_cmd.add_argument("--processing-mode", choices=['auto', 'series', 'movie'], default=None, help="Force processing mode (overrides config).")
+    parser_cmd.add_argument("--use-metadata", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable metadata fetching (overrides config).")
+    parser_cmd.add_argument("--use-stream-info", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable extracting technical stream info (overrides config).")
+    parser_cmd.add_argument("--preserve-mtime", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable preserving original file modification time (overrides config).")
+    parser_cmd.add_argument("--series-format", type=str, default=None, help="Series filename format string (overrides config).")
+    parser_cmd.add_argument("--movie-format", type=str, default=None, help="Movie filename format string (overrides config).")
+    parser_cmd.add_argument("--subtitle-format", type=str, default=None, help="Subtitle filename format string (overrides config).")
+    parser_cmd.add_argument("--extensions", type=str, default=None, help="Comma-separated video+associated extensions (overrides config).")
+    parser_cmd.add_argument("--on-conflict", choices=['skip', 'overwrite', 'suffix', 'fail'], default=None, help="Action on filename conflict (overrides config).")
+    parser_cmd.add_argument("--create-folders", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable folder creation (overrides config).")
+    parser_cmd.add_argument("--folder-format-series", type=str, default=None, help="Folder format string for series (overrides config).")
+    parser_cmd.add_argument("--folder-format-movie", type=str, default=None, help="Folder format string for movies (overrides config).")
+    parser_cmd.add_argument("--interactive", "-i", action="store_true", default=False, help="Confirm each batch before live action.")
+    parser_cmd.add_argument("--enable-undo", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable undo logging (overrides config).")
+    parser_cmd.add_argument("--undo-prune", dest="undo_prune_mode", choices=['background', 'startup', 'off'], default=None, help="When to prune expired undo records (overrides config).")
+    parser_cmd.add_argument("--undo-integrity-hash-full", action=argparse.BooleanOptionalAction, default=None, help="Calculate full file hash for undo log (SLOW, overrides config).")    
+    parser_cmd.add_argument("--log-file", type=str, default=None, help="Log file path (overrides config).")
+    parser_cmd.add_argument("--api-rate-limit-delay", type=float, default=None, help="Delay (sec) between API calls (overrides config).")
+    parser_cmd.add_argument("--scan-strategy", choices=['memory', 'low_memory'], default=None, help="Scanning strategy (overrides config).")
+    parser_cmd.add_argument("--scene-tags-in-filename", action=argparse.BooleanOptionalAction, default=None, help="Include scene tags in filename (overrides config).")
+    parser_cmd.add_argument("--scene-tags-to-preserve", type=str, default=None, help="Comma-separated scene tags to preserve (overrides config).")
+    parser_cmd.add_argument("--subtitle-encoding-detection", action=argparse.BooleanOptionalAction, default=None, help="Detect subtitle encoding (overrides config).")
+    parser_cmd.add_argument("--confirm-match-below", type=int, metavar="SCORE", default=None, choices=range(0, 101), help="Interactively confirm metadata match if fuzzy score is below SCORE (0-100).")
+    parser_cmd.add_argument("--series-source-pref", type=str, default=None, help="Preferred metadata source order for series (comma-separated, e.g., tmdb,tvdb or tvdb,tmdb).")    
+    parser_cmd.add_argument("--movie-yearless-match-confidence", choices=['high', 'medium', 'low', 'confirm'], default=None, help="Confidence requirement for yearless movie matches (overrides config).")
+    parser_cmd.add_argument("--unknown-file-handling", choices=['skip', 'guessit_only', 'move_to_unknown'], default=None, help="How to handle files where type cannot be determined (overrides config).")
+    parser_cmd.add_argument("--unknown-files-dir", type=str, default=None, help="Directory for 'move_to_unknown' handling (relative to target or absolute, overrides config).")
+
+    # --- Direct ID Matching Group ---
+    id_group = parser_cmd.add_mutually_exclusive_group()
+    id_group.add_argument("--tmdb-id", type=int, default=None, help="Force using this TMDB ID for metadata (applies to all files in the run).")
+    id_group.add_argument("--tvdb-id", type=int, default=None, help="Force using this TVDB ID for series metadata (applies to all series in the run).")
+
+    # --- Safety Options Group ---
+    safety_group = parser_cmd.add_mutually_exclusive_group()
+    safety_group.add_argument("--backup-dir", type=Path, default=None, help="Backup originals before action.")
+    safety_group.add_argument("--stage-dir", type=Path, default=None, help="Move files to staging dir.")
+    safety_group.add_argument("--trash", action="store_true", default=False, help="Move originals to trash.")
+
 def create_parser():
     parser = argparse.ArgumentParser(
         description=f"Advanced media renamer (v{__version__}).",
@@ -19,46 +63,16 @@ def create_parser():
 
     # --- Rename Subparser ---
     parser_rename = subparsers.add_parser('rename', help='Scan and rename files.', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-    parser_rename.add_argument("directory", type=Path, help="Directory to process.")
-    parser_rename.add_argument("--live", action="store_true", default=False, help="Perform live run (Default: dry run).")
-    parser_rename.add_argument("-r", "--recursive", action=argparse.BooleanOptionalAction, default=None, help="Process recursively (overrides config).")
-    parser_rename.add_argument("--processing-mode", choices=['auto', 'series', 'movie'], default=None, help="Force processing mode (overrides config).")
-    parser_rename.add_argument("--use-metadata", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable metadata fetching (overrides config).")
-    parser_rename.add_argument("--use-stream-info", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable extracting technical stream info (overrides config).")
-    parser_rename.add_argument("--preserve-mtime", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable preserving original file modification time (overrides config).")
-    parser_rename.add_argument("--series-format", type=str, default=None, help="Series filename format string (overrides config).")
-    parser_rename.add_argument("--movie-format", type=str, default=None, help="Movie filename format string (overrides config).")
-    parser_rename.add_argument("--subtitle-format", type=str, default=None, help="Subtitle filename format string (overrides config).")
-    parser_rename.add_argument("--extensions", type=str, default=None, help="Comma-separated video+associated extensions (overrides config).")
-    parser_rename.add_argument("--on-conflict", choices=['skip', 'overwrite', 'suffix', 'fail'], default=None, help="Action on filename conflict (overrides config).")
-    parser_rename.add_argument("--create-folders", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable folder creation (overrides config).")
-    parser_rename.add_argument("--folder-format-series", type=str, default=None, help="Folder format string for series (overrides config).")
-    parser_rename.add_argument("--folder-format-movie", type=str, default=None, help="Folder format string for movies (overrides config).")
-    parser_rename.add_argument("--interactive", "-i", action="store_true", default=False, help="Confirm each batch before live action.")
-    parser_rename.add_argument("--enable-undo", action=argparse.BooleanOptionalAction, default=None, help="Enable/disable undo logging (overrides config).")
-    parser_rename.add_argument("--undo-integrity-hash-full", action=argparse.BooleanOptionalAction, default=None, help="Calculate full file hash for undo log (SLOW, overrides config).")    
-    parser_rename.add_argument("--log-file", type=str, default=None, help="Log file path (overrides config).")
-    parser_rename.add_argument("--api-rate-limit-delay", type=float, default=None, help="Delay (sec) between API calls (overrides config).")
-    parser_rename.add_argument("--scan-strategy", choices=['memory', 'low_memory'], default=None, help="Scanning strategy (overrides config).")
-    parser_rename.add_argument("--scene-tags-in-filename", action=argparse.BooleanOptionalAction, default=None, help="Include scene tags in filename (overrides config).")
-    parser_rename.add_argument("--scene-tags-to-preserve", type=str, default=None, help="Comma-separated scene tags to preserve (overrides config).")
-    parser_rename.add_argument("--subtitle-encoding-detection", action=argparse.BooleanOptionalAction, default=None, help="Detect subtitle encoding (overrides config).")
-    parser_rename.add_argument("--confirm-match-below", type=int, metavar="SCORE", default=None, choices=range(0, 101), help="Interactively confirm metadata match if fuzzy score is below SCORE (0-100).")
-    parser_rename.add_argument("--series-source-pref", type=str, default=None, help="Preferred metadata source order for series (comma-separated, e.g., tmdb,tvdb or tvdb,tmdb).")    
-    parser_rename.add_argument("--movie-yearless-match-confidence", choices=['high', 'medium', 'low', 'confirm'], default=None, help="Confidence requirement for yearless movie matches (overrides config).")
-    parser_rename.add_argument("--unknown-file-handling", choices=['skip', 'guessit_only', 'move_to_unknown'], default=None, help="How to handle files where type cannot be determined (overrides config).")
-    parser_rename.add_argument("--unknown-files-dir", type=str, default=None, help="Directory for 'move_to_unknown' handling (relative to target or absolute, overrides config).")
+    _add_processing_arguments(parser_rename)
+    parser_rename.add_argument("--resume", metavar="RUN_ID", type=str, default=None, help="Resume an interrupted live run: finish its pending renames from the undo log and process only the batches it had not handled yet (requires --live).")
 
-    # --- Direct ID Matching Group ---
-    id_group = parser_rename.add_mutually_exclusive_group()
-    id_group.add_argument("--tmdb-id", type=int, default=None, help="Force using this TMDB ID for metadata (applies to all files in the run).")
-    id_group.add_argument("--tvdb-id", type=int, default=None, help="Force using this TVDB ID for series metadata (applies to all series in the run).")
-
-    # --- Safety Options Group ---
-    safety_group = parser_rename.add_mutually_exclusive_group()
-    safety_group.add_argument("--backup-dir", type=Path, default=None, help="Backup originals before action.")
-    safety_group.add_argument("--stage-dir", type=Path, default=None, help="Move files to staging dir.")
-    safety_group.add_argument("--trash", action="store_true", default=False, help="Move originals to trash.")
+    # --- Watch Subparser ---
+    parser_watch = subparsers.add_parser('watch', help='Watch a directory and rename new/changed files as they settle.', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    _add_processing_arguments(parser_watch)
+    parser_watch.add_argument("--settle-seconds", dest="watch_settle_seconds", type=float, default=None, help="Seconds a file must stay unchanged before processing (overrides config).")
+    parser_watch.add_argument("--poll-interval", dest="watch_poll_interval_seconds", type=float, default=None, help="Polling interval in seconds when inotify is unavailable (overrides config).")
+    parser_watch.add_argument("--polling", dest="watch_use_polling", action=argparse.BooleanOptionalAction, default=None, help="Force polling instead of inotify (overrides config).")
+    parser_watch.add_argument("--initial-scan", action=argparse.BooleanOptionalAction, default=True, help="Process files already present in the directory before starting to watch.")
 
     # --- Undo Subparser ---
     parser_undo = subparsers.add_parser('undo', help='Revert rename operations or list batches.')
@@ -67,6 +81,7 @@ def create_parser():
     parser_undo.add_argument("--dry-run", action="store_true", help="Show which files would be reverted for the given batch ID without taking action.")
     parser_undo.add_argument("--enable-undo", action=argparse.BooleanOptionalAction, default=None, help="Enable undo log for revert actions (rarely needed).")
     parser_undo.add_argument("--check-integrity", action=argparse.BooleanOptionalAction, default=None, help="Verify size/mtime before reverting.")
+    parser_undo.add_argument("--undo-prune", dest="undo_prune_mode", choices=['background', 'startup', 'off'], default=None, help="When to prune expired undo records (overrides config).")
     parser_undo.add_argument("--log-file", type=str, default=None, help="Log file path for undo operation.")
 
     # --- Config Subparser ---
@@ -83,6 +98,28 @@ def create_parser():
     parser_config_generate.add_argument('--output', type=Path, default=None, help='Optional path to save the generated config.toml. Defaults to the standard location (user config or CWD).')
     parser_config_generate.add_argument('--force', '-f', action='store_true', help='Overwrite the config file if it already exists at the target location.')
 
+    # --- Cache Subparser ---
+    parser_cache = subparsers.add_parser('cache', help='Manage the metadata cache.')
+    cache_subparsers = parser_cache.add_subparsers(dest='cache_command', required=True, help='Cache action to perform')
+
+    parser_cache_purge_neg = cache_subparsers.add_parser('purge-negative', help="Forget cached 'no match' results for a title so it is looked up again.")
+    parser_cache_purge_neg.add_argument('title', type=str, help='Title as parsed from the filename (case-insensitive; all years/seasons/sources).')
+
+    parser_cache_forget_alias = cache_subparsers.add_parser('forget-alias', help='Forget which provider ID a title resolved to, so it is searched again.')
+    parser_cache_forget_alias.add_argument('title', type=str, help='Title (any spelling that normalizes the same; all years/sources).')
+
+    parser_cache_unpin = cache_subparsers.add_parser('unpin', help='Remove the provider ID pinned to a directory or title by earlier confirmed matches.')
+    parser_cache_unpin.add_argument('target', type=str, help='Directory path or title (any spelling that normalizes the same; all years).')
+
+    parser_cache_warm = cache_subparsers.add_parser('warm', help='Prefetch metadata for every title/season in a directory (no files are touched).')
+    parser_cache_warm.add_argument("directory", type=Path, help="Library directory to scan.")
+    parser_cache_warm.add_argument("-r", "--recursive", action=argparse.BooleanOptionalAction, default=None, help="Scan recursively (overrides config).")
+    parser_cache_warm.add_argument("--processing-mode", choices=['auto', 'series', 'movie'], default=None, help="Force processing mode (overrides config).")
+    parser_cache_warm.add_argument("--extensions", type=str, default=None, help="Comma-separated video+associated extensions (overrides config).")
+    parser_cache_warm.add_argument("--scan-strategy", choices=['memory', 'low_memory'], default=None, help="Scanning strategy (overrides config).")
+    parser_cache_warm.add_argument("--api-rate-limit-delay", type=float, default=None, help="Delay (sec) between API calls (overrides config).")
+    parser_cache_warm.add_argument("--series-source-pref", type=str, default=None, help="Preferred metadata source order for series (comma-separated).")
+
     # --- Setup Subparser ---
     parser_setup = subparsers.add_parser('setup', help='Interactively set up API keys and other initial configurations.')
     parser_setup.add_argument("--dotenv-path", type=Path, default=None, help="Specify a custom path for the .env file (default: .env in CWD).")
@@ -3,12 +3,12 @@
 import os
 import sys # For sys.stderr in critical prints
 import builtins # For builtins.print
+import json
+import hashlib
 import pytomlpp
 import logging
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Set, Union
-
-from pydantic import BaseModel, Field, ValidationError, field_validator # model_validator not used here, but fine
+from typing import Optional, List, Dict, Any, Set, Union, TYPE_CHECKING
 
 try:
     import platformdirs
@@ -27,248 +27,47 @@ from rename_app.ui_utils import ( # Import from the new ui_utils module
 
 from dotenv import load_dotenv, find_dotenv, dotenv_values, set_key, unset_key
 from .exceptions import ConfigError
+from . import __version__
 import argparse # Keep for ConfigHelper type hint
 
+if TYPE_CHECKING:
+    from .config_schema import EffectiveSettings
+
 log = logging.getLogger(__name__)
 DEFAULT_CONFIG_FILENAME = "config.toml"
 DEFAULT_DOTENV_FILENAME = ".env"
+VALIDATED_CONFIG_CACHE_DIRNAME = "validated_config"
 
-class BaseProfileSettings(BaseModel):
-    # Core Settings
-    recursive: Optional[bool] = Field(default=False, description="Scan subdirectories.")
-    processing_mode: Optional[str] = Field(default='auto', description="Processing mode: 'auto', 'series', 'movie'.")
-    use_metadata: Optional[bool] = Field(default=True, description="Fetch metadata from APIs.")
-    extract_stream_info: Optional[bool] = Field(default=False, description="Extract technical stream info (resolution, codecs).")
-    preserve_mtime: Optional[bool] = Field(default=False, description="Preserve original file modification time.")
-    ignore_dirs: Optional[List[str]] = Field(default_factory=list, description="List of exact directory names to ignore.")
-    ignore_patterns: Optional[List[str]] = Field(
-        default_factory=lambda: ['.*', '*.partial', 'Thumbs.db', '*[sS]ample*'],
-        description="List of glob patterns (e.g., '*.tmp', '.*') to ignore."
-    )
-
-    # Format Strings
-    series_format: Optional[str] = Field(default="{show_title} ({show_year})/Season {season:02d}/S{season:02d}{ep_identifier} - {episode_title}", description="Filename format for series episodes.")
-    movie_format: Optional[str] = Field(default="{movie_title} ({movie_year})/{movie_title} ({movie_year})", description="Filename format for movies.")
-    subtitle_format: Optional[str] = Field(default="{stem}{lang_dot}{flags_dot}", description="Filename format for subtitles.")
-    series_format_specials: Optional[str] = Field(default="{show_title} ({show_year})/Season 00/S00{ep_identifier} - {episode_title}", description="Filename format for series specials (Season 00).")
-    folder_format_series: Optional[str] = Field(default="{show_title} ({show_year})/Season {season:02d}", description="Folder structure for series.")
-    folder_format_movie: Optional[str] = Field(default="{movie_title} ({movie_year})", description="Folder structure for movies.")
-    folder_format_specials: Optional[str] = Field(default="{show_title} ({show_year})/Season 00", description="Folder structure for series specials.")
-
-    # File Handling & Extensions
-    video_extensions: Optional[List[str]] = Field(default_factory=lambda: [".mkv", ".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm", ".mpg", ".mpeg", ".m4v", ".ts", ".m2ts"], description="List of video file extensions.")
-    associated_extensions: Optional[List[str]] = Field(default_factory=lambda: [".nfo", ".txt", ".jpg", ".png", ".sfv"], description="List of associated file extensions (excluding subtitles).")
-    subtitle_extensions: Optional[List[str]] = Field(default_factory=lambda: [".srt", ".sub", ".ass", ".ssa", ".vtt", ".idx"], description="List of subtitle file extensions.")
-    on_conflict: Optional[str] = Field(default='skip', description="Action on filename conflict: 'skip', 'overwrite', 'suffix', 'fail'.")
-    create_folders: Optional[bool] = Field(default=True, description="Create destination folders if they don't exist.")
-    unknown_file_handling: Optional[str] = Field(default='skip', description="How to handle unknown files: 'skip', 'guessit_only', 'move_to_unknown'.")
-    unknown_files_dir: Optional[str] = Field(default='_unknown_files_', description="Directory for 'move_to_unknown' files (relative to target or absolute).")
-    scan_strategy: Optional[str] = Field(default='memory', description="Scanning strategy: 'memory', 'low_memory'.")
-    temp_file_suffix_prefix: Optional[str] = Field(default=".renametmp_", description="Prefix for temporary filenames during transactional renames (e.g., '.tmp_', '_temp_'). Should include leading/trailing separators as desired.")
-
-
-    # Scene Tags
-    scene_tags_in_filename: Optional[bool] = Field(default=True, description="Include scene tags in the final filename.")
-    scene_tags_to_preserve: Optional[List[str]] = Field(default_factory=lambda: ["PROPER", "REPACK", "READ.NFO", "INTERNAL", "LIMITED", "UNCUT", "UNRATED", "DIRECTORS.CUT", "EXTENDED", "REMASTERED", "COMPLETE"], description="List of scene tags to preserve if found.")
-
-    # Subtitles
-    subtitle_encoding_detection: Optional[bool] = Field(default=True, description="Attempt to detect subtitle encoding (requires 'chardet').")
-
-    # API & Metadata Options
-    api_rate_limit_delay: Optional[float] = Field(default=0.5, ge=0.0, description="Delay (seconds) between API calls.")
-    api_retry_attempts: Optional[int] = Field(default=3, ge=0, description="Number of retry attempts for API calls.")
-    api_retry_wait_seconds: Optional[float] = Field(default=2.0, ge=0.0, description="Wait time (seconds) between API retry attempts.")
-    api_year_tolerance: Optional[int] = Field(default=1, ge=0, description="Year tolerance for matching API results.")
-    tmdb_match_strategy: Optional[str] = Field(default='first', description="TMDB matching strategy: 'first', 'fuzzy'.")
-    tmdb_match_fuzzy_cutoff: Optional[int] = Field(default=70, ge=0, le=100, description="Minimum score for 'fuzzy' TMDB match.")
-    tmdb_first_result_min_score: Optional[int] = Field(default=65, ge=0, le=100, description="Minimum fuzzy score for a 'first' strategy TMDB match to be considered valid (requires 'thefuzz').")
-    movie_yearless_match_confidence: Optional[str] = Field(default='medium', description="Confidence level for yearless movie matches: 'high' (>=90), 'medium' (>=80), 'low' (>=fuzzy_cutoff), 'confirm' (always confirm).")
-    confirm_match_below: Optional[int] = Field(default=None, ge=0, le=100, description="Interactively confirm metadata match if score is below this value (0-100).")
-    series_metadata_preference: Optional[List[str]] = Field(default=['tmdb', 'tvdb'], description="Preferred metadata source order for series.")
-
-    # Caching Options
-    cache_enabled: Optional[bool] = Field(default=True, description="Enable API response caching.")
-    cache_directory: Optional[str] = Field(default=None, description="Custom cache directory (default: user cache dir).")
-    cache_expire_seconds: Optional[int] = Field(default=604800, ge=0, description="Cache expiration time in seconds (default: 7 days).")
-
-    # Undo Options
-    enable_undo: Optional[bool] = Field(default=True, description="Enable undo logging.")
-    undo_db_path: Optional[str] = Field(default=None, description="Path to undo database file (default: in app dir).")
-    undo_expire_days: Optional[int] = Field(default=30, ge=-1, description="Days to keep undo logs (-1 for forever, 0 for session only).")
-    undo_check_integrity: Optional[bool] = Field(default=False, description="Verify file integrity before undoing (size, mtime).")
-    undo_integrity_hash_bytes: Optional[int] = Field(default=0, ge=0, description="Bytes to hash for integrity check (0 to disable partial hash).")
-    undo_integrity_hash_full: Optional[bool] = Field(default=False, description="Calculate full file hash for undo integrity check (SLOW, overrides hash_bytes).")
-
-    # Logging Options
-    log_file: Optional[str] = Field(default=None, description="Path to log file (e.g., rename_app.log).")
-    log_level: Optional[str] = Field(default='INFO', description="Logging level: DEBUG, INFO, WARNING, ERROR.")
-
-    @field_validator('on_conflict', mode='before')
-    @classmethod
-    def check_on_conflict(cls, v: Any) -> Optional[str]:
-        if v is not None and isinstance(v, str) and v.lower() not in ['skip', 'overwrite', 'suffix', 'fail']:
-            raise ValueError("on_conflict must be one of 'skip', 'overwrite', 'suffix', 'fail'")
-        return v.lower() if isinstance(v, str) else None
-
-    @field_validator('log_level', mode='before')
-    @classmethod
-    def check_log_level(cls, v: Any) -> Optional[str]:
-        if v is not None and isinstance(v, str) and v.upper() not in ['DEBUG', 'INFO', 'WARNING', 'ERROR']:
-            raise ValueError("log_level must be one of DEBUG, INFO, WARNING, ERROR")
-        return v.upper() if isinstance(v, str) else None
-
-    @field_validator('tmdb_match_strategy', mode='before')
-    @classmethod
-    def check_tmdb_strategy(cls, v: Any) -> Optional[str]:
-        if v is not None and isinstance(v, str) and v.lower() not in ['first', 'fuzzy']:
-            raise ValueError("tmdb_match_strategy must be 'first' or 'fuzzy'")
-        return v.lower() if isinstance(v, str) else 'first'
-
-    @field_validator('scan_strategy', mode='before')
-    @classmethod
-    def check_scan_strategy(cls, v: Any) -> Optional[str]:
-        if v is not None and isinstance(v, str) and v.lower() not in ['memory', 'low_memory']:
-            raise ValueError("scan_strategy must be 'memory' or 'low_memory'")
-        return v.lower() if isinstance(v, str) else 'memory'
-
-    @field_validator('extract_stream_info', mode='before')
-    @classmethod
-    def check_extract_stream_info(cls, v: Any) -> Optional[bool]:
-        if v is not None and not isinstance(v, bool):
-            raise ValueError("extract_stream_info must be a boolean (true/false)")
-        return v
-
-    @field_validator('unknown_file_handling', mode='before')
-    @classmethod
-    def check_unknown_file_handling(cls, v: Any) -> Optional[str]:
-        if v is not None and isinstance(v, str) and v.lower() not in ['skip', 'guessit_only', 'move_to_unknown']:
-            raise ValueError("unknown_file_handling must be one of 'skip', 'guessit_only', 'move_to_unknown'")
-        return v.lower() if isinstance(v, str) else 'skip'
-
-    @field_validator('series_metadata_preference', mode='before')
-    @classmethod
-    def check_series_metadata_preference(cls, v: Any) -> List[str]:
-        default_pref = ['tmdb', 'tvdb']
-        if v is None: return default_pref
-        
-        val_list: List[str]
-        if isinstance(v, str):
-            val_list = [item.strip().lower() for item in v.split(',') if item.strip()]
-        elif isinstance(v, list):
-            val_list = [str(item).strip().lower() for item in v if str(item).strip()]
-        else:
-            raise ValueError("series_metadata_preference must be a list or comma-separated string")
+# The pydantic schema lives in config_schema and is only imported when something needs it
+# (validation of a changed config, 'config validate/generate', building a settings snapshot).
+_SCHEMA_EXPORTS = ('BaseProfileSettings', 'DefaultSettings', 'RootConfigModel', 'generate_default_toml_content', 'EffectiveSettings')
 
-        if not val_list:
-            return default_pref
+def _schema():
+    from . import config_schema
+    return config_schema
 
-        if len(val_list) != 2:
-            raise ValueError("series_metadata_preference must contain exactly two sources (e.g., 'tmdb,tvdb')")
-        
-        sources = {s.lower() for s in val_list}
-        allowed = {'tmdb', 'tvdb'}
-        if sources != allowed:
-            raise ValueError(f"series_metadata_preference must be 'tmdb' and 'tvdb', got: {val_list}")
-        return [s.lower() for s in val_list]
-
-    @field_validator('preserve_mtime', mode='before')
-    @classmethod
-    def check_preserve_mtime(cls, v: Any) -> Optional[bool]:
-        if v is not None and not isinstance(v, bool): raise ValueError("preserve_mtime must be a boolean")
-        return v
-
-    @field_validator('undo_integrity_hash_full', mode='before')
-    @classmethod
-    def check_undo_integrity_hash_full(cls, v: Any) -> Optional[bool]:
-        if v is not None and not isinstance(v, bool): raise ValueError("undo_integrity_hash_full must be a boolean")
-        return v
-    
-    @field_validator('temp_file_suffix_prefix', mode='before')
-    @classmethod
-    def check_temp_file_suffix_prefix(cls, v: Any) -> Optional[str]:
-        if v is not None:
-            if not isinstance(v, str):
-                raise ValueError("temp_file_suffix_prefix must be a string.")
-            if not v: # cannot be empty
-                raise ValueError("temp_file_suffix_prefix cannot be empty.")
-        return v
-        
-    @field_validator('movie_yearless_match_confidence', mode='before')
-    @classmethod
-    def check_movie_yearless_match_confidence(cls, v: Any) -> Optional[str]:
-        if v is not None:
-            if not isinstance(v, str) or v.lower() not in ['high', 'medium', 'low', 'confirm']:
-                raise ValueError("movie_yearless_match_confidence must be one of 'high', 'medium', 'low', 'confirm'.")
-            return v.lower()
-        return 'medium' # Default if None
-
-
-class DefaultSettings(BaseProfileSettings):
-    pass
-
-class RootConfigModel(BaseModel):
-    default: DefaultSettings = Field(default_factory=DefaultSettings)
-    model_config = {'extra': 'allow'}
-
-
-def generate_default_toml_content() -> str:
-    default_settings = DefaultSettings()
-    content_lines = ["# Gemini-Renamer Default Configuration File"]
-    content_lines.append("# For more details on placeholders, see README.md or documentation.\n")
-    
-    sections: Dict[str, List[str]] = {
-        "Core Settings": ['recursive', 'processing_mode', 'use_metadata', 'extract_stream_info', 'preserve_mtime', 'ignore_dirs', 'ignore_patterns'],
-        "Format Strings": ['series_format', 'movie_format', 'subtitle_format', 'series_format_specials', 'folder_format_series', 'folder_format_movie', 'folder_format_specials'],
-        "File Handling & Extensions": ['video_extensions', 'associated_extensions', 'subtitle_extensions', 'on_conflict', 'create_folders', 'unknown_file_handling', 'unknown_files_dir', 'scan_strategy', 'temp_file_suffix_prefix'],
-        "Scene Tags": ['scene_tags_in_filename', 'scene_tags_to_preserve'],
-        "Subtitles": ['subtitle_encoding_detection'],
-        "API & Metadata Options": ['api_rate_limit_delay', 'api_retry_attempts', 'api_retry_wait_seconds', 'api_year_tolerance', 'tmdb_match_strategy', 'tmdb_match_fuzzy_cutoff', 'tmdb_first_result_min_score', 'movie_yearless_match_confidence', 'confirm_match_below', 'series_metadata_preference'],
-        "Caching Options": ['cache_enabled', 'cache_directory', 'cache_expire_seconds'],
-        "Undo Options": ['enable_undo', 'undo_db_path', 'undo_expire_days', 'undo_check_integrity', 'undo_integrity_hash_bytes', 'undo_integrity_hash_full'],
-        "Logging Options": ['log_file', 'log_level'],
-    }
-
-    content_lines.append("[default]")
-    for section_name, keys in sections.items():
-        content_lines.append(f"\n  # --- {section_name} ---")
-        for key in keys:
-            field_info = BaseProfileSettings.model_fields.get(key)
-            if field_info:
-                default_value = getattr(default_settings, key)
-                comment = field_info.description or ""
-                if comment:
-                    content_lines.append(f"  # {comment}")
-                
-                toml_value_str: str
-                if isinstance(default_value, str):
-                    # Escape backslashes and double quotes in string values for TOML
-                    escaped_default_value = default_value.replace('\\', '\\\\').replace('"', '\\"')
-                    toml_value_str = f'"{escaped_default_value}"'
-                elif isinstance(default_value, bool):
-                    toml_value_str = str(default_value).lower()
-                elif isinstance(default_value, list):
-                    list_items_str = []
-                    for item in default_value:
-                        if isinstance(item, str): list_items_str.append(f'"{str(item)}"')
-                        elif isinstance(item, bool): list_items_str.append(str(item).lower())
-                        else: list_items_str.append(str(item))
-                    toml_value_str = "[" + ", ".join(list_items_str) + "]"
-                elif default_value is None: 
-                    toml_value_str = "# (not set, uses internal default or None)"
-                    content_lines.append(f"  # {key} = {toml_value_str}")
-                    continue 
-                else: 
-                    toml_value_str = str(default_value)
-                
-                content_lines.append(f"  {key} = {toml_value_str}")
-    
-    content_lines.append("\n# You can create other profiles, e.g.:")
-    content_lines.append("# [movie_profile]")
-    content_lines.append("# movie_format = \"{movie_title} [{movie_year}] - {resolution}\"")
-    content_lines.append("# use_metadata = true")
-
-    return "\n".join(content_lines)
+def __getattr__(name: str) -> Any:
+    if name in _SCHEMA_EXPORTS:
+        return getattr(_schema(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+def _config_fingerprint(raw_toml: str) -> str:
+    schema_stamp = "unknown"
+    try:
+        schema_stamp = hashlib.sha256(Path(__file__).with_name("config_schema.py").read_bytes()).hexdigest()
+    except (OSError, NameError):
+        pass
+    return hashlib.sha256(f"{__version__}|{schema_stamp}|{raw_toml}".encode('utf-8')).hexdigest()
+
+def validated_config_cache_dir() -> Optional[Path]:
+    """Where validated config dumps are kept (one JSON file per config path); None disables the cache."""
+    if not (PLATFORMDIRS_AVAILABLE and platformdirs):
+        return None
+    try:
+        return Path(platformdirs.user_cache_dir("rename_app", "rename_app_author")) / VALIDATED_CONFIG_CACHE_DIRNAME
+    except Exception as e:
+        log.debug(f"Could not determine cache dir for validated config: {e}")
+        return None
 
 class ConfigManager:
     def __init__(self, config_path_override: Optional[Path] = None, interactive_fallback: bool = True, quiet_mode: bool = False):
@@ -277,6 +76,7 @@ class ConfigManager:
 
         self.config_path = self._resolve_config_path(config_path_override)
         self._raw_toml_content_str: Optional[str] = None
+        self._model_defaults: Optional[Dict[str, Any]] = None
         self._config = self._load_config(interactive_fallback=interactive_fallback)
         self._api_keys = self._load_env_keys()
         log.debug(f"Config path used: {self.config_path}")
@@ -337,7 +137,7 @@ class ConfigManager:
         try:
             if ConfirmClass.ask("Would you like to create a default configuration file now?", default=True):
                 try:
-                    default_content = generate_default_toml_content()
+                    default_content = _schema().generate_default_toml_content()
                     target_path.parent.mkdir(parents=True, exist_ok=True)
                     with open(target_path, "w", encoding="utf-8") as f:
                         f.write(default_content)
@@ -371,7 +171,7 @@ class ConfigManager:
             if not self._create_default_config_interactively(self.config_path):
                 log.warning(f"Proceeding without a config file. Using internal defaults.")
                 self._raw_toml_content_str = "# No configuration file present or created.\n"
-                return RootConfigModel().model_dump(exclude_unset=False, by_alias=False)
+                return self._default_config_dump()
 
         if self.config_path.is_file():
             try:
@@ -379,7 +179,11 @@ class ConfigManager:
                 if not self._raw_toml_content_str.strip():
                     log.warning(f"Config file '{self.config_path}' is empty. Using internal defaults.")
                     self._raw_toml_content_str = "# Config file was empty.\n"
-                    return RootConfigModel().model_dump(exclude_unset=False, by_alias=False)
+                    return self._default_config_dump()
+                cached_config = self._read_validated_cache(self._raw_toml_content_str)
+                if cached_config is not None:
+                    log.info(f"Loaded configuration from '{self.config_path}' (previously validated)")
+                    return cached_config
                 cfg_dict = pytomlpp.loads(self._raw_toml_content_str)
                 log.info(f"Loaded configuration from '{self.config_path}'")
             except pytomlpp.DecodeError as e_toml:
@@ -390,13 +194,16 @@ class ConfigManager:
         else:
             log.warning(f"Config file not found at '{self.config_path}' and not created (interactive_fallback={interactive_fallback}). Using internal defaults.")
             self._raw_toml_content_str = "# Config file not found or empty.\n"
-            return RootConfigModel().model_dump(exclude_unset=False, by_alias=False)
+            return self._default_config_dump()
 
+        schema = _schema()
         try:
-            validated_config = RootConfigModel.model_validate(cfg_dict)
+            validated_config = schema.RootConfigModel.model_validate(cfg_dict)
             log.debug("Config validation successful.")
-            return validated_config.model_dump(exclude_unset=False, by_alias=False)
-        except ValidationError as e_val:
+            dumped_config = validated_config.model_dump(exclude_unset=False, by_alias=False)
+            self._write_validated_cache(self._raw_toml_content_str, dumped_config)
+            return dumped_config
+        except schema.ValidationError as e_val:
             error_details = e_val.errors()
             error_msgs = [f"  - Field `{' -> '.join(map(str, err['loc']))}`: {err['msg']}" for err in error_details]
             error_summary = f"Config file '{self.config_path}' validation failed:\n" + "\n".join(error_msgs)
@@ -407,12 +214,72 @@ class ConfigManager:
                 log.critical(f"Newly created default config FAILED validation. This is an internal error. {error_summary}")
                 self.console.print(f"[bold red]INTERNAL ERROR: The generated default configuration is invalid. Please report this.[/bold red]", file=sys.stderr)
                 self.console.print(error_summary, file=sys.stderr)
-                return RootConfigModel().model_dump(exclude_unset=False, by_alias=False)
+                return schema.RootConfigModel().model_dump(exclude_unset=False, by_alias=False)
         except Exception as e_load_val:
             self._raw_toml_content_str = f"# Unexpected error loading config: {e_load_val}\n"
             log.exception(f"Unexpected error loading/validating config '{self.config_path}': {e_load_val}")
             raise ConfigError(f"Unexpected error loading/validating config '{self.config_path}': {e_load_val}")
 
+    def _default_config_dump(self) -> Dict[str, Any]:
+        cached_config = self._read_validated_cache("")
+        if cached_config is not None:
+            return cached_config
+        dumped_config = _schema().RootConfigModel().model_dump(exclude_unset=False, by_alias=False)
+        self._write_validated_cache("", dumped_config)
+        return dumped_config
+
+    def _validated_cache_path(self, raw_toml: str) -> Optional[Path]:
+        cache_dir = validated_config_cache_dir()
+        if cache_dir is None:
+            return None
+        # Keyed by config path so alternating between config files doesn't evict each other's entry.
+        source = str(self.config_path.resolve()) if raw_toml else "<defaults>"
+        return cache_dir / f"{hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]}.json"
+
+    def _read_validated_cache(self, raw_toml: str) -> Optional[Dict[str, Any]]:
+        """Returns the validated config dump for raw_toml if it was validated before with the same schema."""
+        cache_path = self._validated_cache_path(raw_toml)
+        if not cache_path or not cache_path.is_file():
+            return None
+        try:
+            entry = json.loads(cache_path.read_text(encoding='utf-8'))
+            if entry.get('fingerprint') != _config_fingerprint(raw_toml):
+                return None
+            config_dump, model_defaults = entry['config'], entry['model_defaults']
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            log.debug(f"Ignoring unreadable validated-config cache '{cache_path}': {e}")
+            return None
+        if not isinstance(config_dump, dict) or not isinstance(model_defaults, dict):
+            return None
+        self._model_defaults = model_defaults
+        log.debug(f"Using cached validation result from '{cache_path}'.")
+        return config_dump
+
+    def _write_validated_cache(self, raw_toml: str, config_dump: Dict[str, Any]) -> None:
+        cache_path = self._validated_cache_path(raw_toml)
+        if not cache_path:
+            return
+        try:
+            payload = json.dumps({
+                'fingerprint': _config_fingerprint(raw_toml),
+                'config': config_dump,
+                'model_defaults': self.model_defaults,
+            })
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(payload, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            # TypeError/ValueError: config holds values JSON can't represent (e.g. TOML dates); just revalidate next time
+            log.debug(f"Not caching validated config: {e}")
+
+    @property
+    def model_defaults(self) -> Dict[str, Any]:
+        """Defaults of every BaseProfileSettings field (from the validated-config cache when available)."""
+        if self._model_defaults is None:
+            self._model_defaults = _schema().model_defaults()
+        return self._model_defaults
+
     def get_raw_toml_content(self) -> Optional[str]:
         return self._raw_toml_content_str
 
@@ -446,14 +313,14 @@ class ConfigManager:
         if command_line_value is not None:
             if key == 'series_metadata_preference' and isinstance(command_line_value, str):
                 try:
-                    validated_list = BaseProfileSettings.model_fields['series_metadata_preference'].validate(command_line_value)
+                    validated_list = _schema().BaseProfileSettings.model_fields['series_metadata_preference'].validate(command_line_value)
                     return validated_list
                 except ValueError:
                     log.warning(f"Invalid command-line value for {key}: '{command_line_value}'. Ignoring.")
             # Add similar validation for movie_yearless_match_confidence if needed from CLI
             elif key == 'movie_yearless_match_confidence' and isinstance(command_line_value, str):
                 try:
-                    validated_value = BaseProfileSettings.model_fields['movie_yearless_match_confidence'].validate(command_line_value)
+                    validated_value = _schema().BaseProfileSettings.model_fields['movie_yearless_match_confidence'].validate(command_line_value)
                     return validated_value
                 except ValueError:
                     log.warning(f"Invalid command-line value for {key}: '{command_line_value}'. Ignoring.")
@@ -488,12 +355,10 @@ class ConfigManager:
                     return val_from_default_section
         
         # Fallback to Pydantic model's default if not found above
-        if default_value is None and hasattr(BaseProfileSettings, 'model_fields') and key in BaseProfileSettings.model_fields:
-            field_info = BaseProfileSettings.model_fields[key]
-            if field_info.default_factory is not None:
-                return field_info.default_factory()
-            return field_info.default # This could be None itself, which is fine.
-            
+        if default_value is None and key in self.model_defaults:
+            model_default = self.model_defaults[key]
+            return list(model_default) if isinstance(model_default, list) else model_default # May be None itself, which is fine.
+
         return default_value
 
     def get_api_key(self, service_name: str) -> Optional[str]:
@@ -501,7 +366,7 @@ class ConfigManager:
         return self._api_keys.get(key_name)
 
     def get_profile_settings(self, profile: str = 'default') -> Dict[str, Any]:
-        base_defaults = DefaultSettings().model_dump(exclude_unset=False, by_alias=False)
+        base_defaults = {k: (list(v) if isinstance(v, list) else v) for k, v in self.model_defaults.items()}
 
         default_section_settings = self._config.get('default', {})
         if isinstance(default_section_settings, dict):
@@ -551,16 +416,17 @@ class ConfigHelper:
             return [item.strip() for item in val.split(',') if item.strip()]
 
         # If no value from config or CLI, use Pydantic model's default for lists if available
-        if default_value is None and hasattr(BaseProfileSettings, 'model_fields') and key in BaseProfileSettings.model_fields:
-            field_info = BaseProfileSettings.model_fields[key]
-            if field_info.default_factory is not None:
-                model_default_list = field_info.default_factory()
-                if isinstance(model_default_list, list): return model_default_list
-            elif isinstance(field_info.default, list):
-                return field_info.default
+        if default_value is None and key in self.manager.model_defaults:
+            model_default_list = self.manager.model_defaults[key]
+            if isinstance(model_default_list, list): return list(model_default_list)
 
         return default_value if isinstance(default_value, list) else []
 
+    def snapshot(self) -> 'EffectiveSettings':
+        """Resolves every known setting once and returns an immutable EffectiveSettings."""
+        return _schema().EffectiveSettings.from_helper(self)
+
+
 def interactive_api_setup(dotenv_path_override: Optional[Path] = None, quiet_mode: bool = False) -> bool:
     # This function now uses ConsoleClass and ConfirmClass imported from ui_utils
     # which are already quiet-aware or have fallbacks.
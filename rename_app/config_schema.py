@@ -0,0 +1,412 @@
+# rename_app/config_schema.py
+# Pydantic schema for config.toml and the frozen per-run settings snapshot.
+# Kept separate from config_manager so commands that never validate (e.g. 'undo --list'
+# with an unchanged config) do not pay for importing pydantic.
+
+import argparse
+import logging
+from typing import Optional, List, Dict, Any, Set, TYPE_CHECKING
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+if TYPE_CHECKING:
+    from .config_manager import ConfigManager, ConfigHelper
+
+log = logging.getLogger(__name__)
+
+class BaseProfileSettings(BaseModel):
+    # Core Settings
+    recursive: Optional[bool] = Field(default=False, description="Scan subdirectories.")
+    processing_mode: Optional[str] = Field(default='auto', description="Processing mode: 'auto', 'series', 'movie'.")
+    use_metadata: Optional[bool] = Field(default=True, description="Fetch metadata from APIs.")
+    extract_stream_info: Optional[bool] = Field(default=False, description="Extract technical stream info (resolution, codecs).")
+    preserve_mtime: Optional[bool] = Field(default=False, description="Preserve original file modification time.")
+    ignore_dirs: Optional[List[str]] = Field(default_factory=list, description="List of exact directory names to ignore.")
+    ignore_patterns: Optional[List[str]] = Field(
+        default_factory=lambda: ['.*', '*.partial', 'Thumbs.db', '*[sS]ample*'],
+        description="List of glob patterns (e.g., '*.tmp', '.*') to ignore."
+    )
+
+    # Format Strings
+    series_format: Optional[str] = Field(default="{show_title} ({show_year})/Season {season:02d}/S{season:02d}{ep_identifier} - {episode_title}", description="Filename format for series episodes.")
+    movie_format: Optional[str] = Field(default="{movie_title} ({movie_year})/{movie_title} ({movie_year})", description="Filename format for movies.")
+    subtitle_format: Optional[str] = Field(default="{stem}{lang_dot}{flags_dot}", description="Filename format for subtitles.")
+    series_format_specials: Optional[str] = Field(default="{show_title} ({show_year})/Season 00/S00{ep_identifier} - {episode_title}", description="Filename format for series specials (Season 00).")
+    folder_format_series: Optional[str] = Field(default="{show_title} ({show_year})/Season {season:02d}", description="Folder structure for series.")
+    folder_format_movie: Optional[str] = Field(default="{movie_title} ({movie_year})", description="Folder structure for movies.")
+    folder_format_specials: Optional[str] = Field(default="{show_title} ({show_year})/Season 00", description="Folder structure for series specials.")
+
+    # File Handling & Extensions
+    video_extensions: Optional[List[str]] = Field(default_factory=lambda: [".mkv", ".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm", ".mpg", ".mpeg", ".m4v", ".ts", ".m2ts"], description="List of video file extensions.")
+    associated_extensions: Optional[List[str]] = Field(default_factory=lambda: [".nfo", ".txt", ".jpg", ".png", ".sfv"], description="List of associated file extensions (excluding subtitles).")
+    subtitle_extensions: Optional[List[str]] = Field(default_factory=lambda: [".srt", ".sub", ".ass", ".ssa", ".vtt", ".idx"], description="List of subtitle file extensions.")
+    on_conflict: Optional[str] = Field(default='skip', description="Action on filename conflict: 'skip', 'overwrite', 'suffix', 'fail'.")
+    create_folders: Optional[bool] = Field(default=True, description="Create destination folders if they don't exist.")
+    unknown_file_handling: Optional[str] = Field(default='skip', description="How to handle unknown files: 'skip', 'guessit_only', 'move_to_unknown'.")
+    unknown_files_dir: Optional[str] = Field(default='_unknown_files_', description="Directory for 'move_to_unknown' files (relative to target or absolute).")
+    scan_strategy: Optional[str] = Field(default='memory', description="Scanning strategy: 'memory', 'low_memory'.")
+    temp_file_suffix_prefix: Optional[str] = Field(default=".renametmp_", description="Prefix for temporary filenames during transactional renames (e.g., '.tmp_', '_temp_'). Should include leading/trailing separators as desired.")
+    backup_strategy: Optional[str] = Field(default='copy', description="How --backup-dir copies originals: 'copy', 'auto' (reflink where supported, else copy), 'reflink' (btrfs/XFS copy-on-write clone), 'hardlink' (same filesystem only; the backup shares the file's data, so in-place edits change it too). Unsupported strategies fall back to a copy.")
+    move_copy_chunk_mb: Optional[float] = Field(default=64, gt=0, description="Chunk size (MB) for copying files to another filesystem (staging or moves across mounts).")
+    move_parallel_transfers: Optional[int] = Field(default=2, ge=1, description="Number of files of one batch copied to another filesystem at the same time.")
+    trash_batch_size: Optional[int] = Field(default=100, ge=1, description="--trash: files handed to send2trash per call (grouped by filesystem); 1 trashes one file at a time.")
+    live_parallel_batches: Optional[int] = Field(default=4, ge=1, description="Live runs: number of batches whose file operations run at the same time (1 = one after another). Batches sharing a directory are always serialized; interactive runs and on_conflict='fail' stay sequential. Quiet and 'watch' live runs also look up metadata this many batches ahead while earlier batches are being moved.")
+
+
+    # Scene Tags
+    scene_tags_in_filename: Optional[bool] = Field(default=True, description="Include scene tags in the final filename.")
+    scene_tags_to_preserve: Optional[List[str]] = Field(default_factory=lambda: ["PROPER", "REPACK", "READ.NFO", "INTERNAL", "LIMITED", "UNCUT", "UNRATED", "DIRECTORS.CUT", "EXTENDED", "REMASTERED", "COMPLETE"], description="List of scene tags to preserve if found.")
+
+    # Subtitles
+    subtitle_encoding_detection: Optional[bool] = Field(default=True, description="Attempt to detect subtitle encoding (requires 'chardet').")
+
+    # API & Metadata Options
+    api_rate_limit_delay: Optional[float] = Field(default=0.5, ge=0.0, description="Delay (seconds) between API calls.")
+    api_retry_attempts: Optional[int] = Field(default=3, ge=0, description="Number of retry attempts for API calls.")
+    api_retry_wait_seconds: Optional[float] = Field(default=2.0, ge=0.0, description="Base wait (seconds) for API retries; each retry waits a random time up to base * 2^(attempt-1).")
+    api_retry_max_wait_seconds: Optional[float] = Field(default=60.0, ge=0.0, description="Upper bound (seconds) for a single API retry wait.")
+    api_retry_budget: Optional[int] = Field(default=200, ge=0, description="Maximum number of API retries per run across all requests; once spent, failed requests are not retried.")
+    api_provider_pause_after: Optional[int] = Field(default=5, ge=0, description="Pause all requests to a provider after this many consecutive 429/5xx responses (0 disables).")
+    api_provider_pause_seconds: Optional[float] = Field(default=30.0, ge=0.0, description="How long (seconds) a throttled provider is paused.")
+    api_breaker_failure_threshold: Optional[int] = Field(default=5, ge=0, description="Skip a provider after this many requests to it failed even after retries; series fall back to the next source in series_metadata_preference, other lookups to cached data (0 disables).")
+    api_breaker_cooldown_seconds: Optional[float] = Field(default=300.0, ge=0.0, description="How long (seconds) a provider is skipped once its circuit breaker opens.")
+    api_year_tolerance: Optional[int] = Field(default=1, ge=0, description="Year tolerance for matching API results.")
+    tmdb_match_strategy: Optional[str] = Field(default='first', description="TMDB matching strategy: 'first', 'fuzzy'.")
+    tmdb_match_fuzzy_cutoff: Optional[int] = Field(default=70, ge=0, le=100, description="Minimum score for 'fuzzy' TMDB match.")
+    tmdb_first_result_min_score: Optional[int] = Field(default=65, ge=0, le=100, description="Minimum fuzzy score for a 'first' strategy TMDB match to be considered valid (requires 'thefuzz').")
+    movie_yearless_match_confidence: Optional[str] = Field(default='medium', description="Confidence level for yearless movie matches: 'high' (>=90), 'medium' (>=80), 'low' (>=fuzzy_cutoff), 'confirm' (always confirm).")
+    confirm_match_below: Optional[int] = Field(default=None, ge=0, le=100, description="Interactively confirm metadata match if score is below this value (0-100).")
+    series_metadata_preference: Optional[List[str]] = Field(default=['tmdb', 'tvdb'], description="Preferred metadata source order for series.")
+    title_alias_index_enabled: Optional[bool] = Field(default=True, description="Remember which provider ID each normalized title resolved to and skip the search for later spellings of it.")
+    id_pinning_enabled: Optional[bool] = Field(default=True, description="Pin the provider ID of interactively confirmed matches to the file's directory and title; later runs fetch by that ID instead of searching.")
+    title_alias_min_score: Optional[int] = Field(default=90, ge=0, le=100, description="Only title searches matching at least this score are remembered as aliases.")
+    offline_index_path: Optional[str] = Field(default=None, description="Path to a local SQLite title index (movies/shows/episodes) used for lookups on hosts without internet access.")
+    offline_index_mode: Optional[str] = Field(default='only', description="With offline_index_path: 'only' (never call the APIs) or 'fallback' (query the index first, then the APIs).")
+
+    # Caching Options
+    cache_enabled: Optional[bool] = Field(default=True, description="Enable API response caching.")
+    cache_directory: Optional[str] = Field(default=None, description="Custom cache directory (default: user cache dir).")
+    cache_expire_seconds: Optional[int] = Field(default=604800, ge=0, description="Cache expiration time in seconds (default: 7 days).")
+    cache_negative_expire_seconds: Optional[int] = Field(default=86400, ge=0, description="How long (seconds) to remember that a title had no API match before asking again (0 disables negative caching).")
+    cache_stale_while_revalidate: Optional[bool] = Field(default=False, description="Serve expired cache entries immediately and refresh them in the background instead of blocking on the API.")
+    cache_max_stale_seconds: Optional[int] = Field(default=None, ge=0, description="With stale-while-revalidate: never serve entries older than cache_expire_seconds + this (unset = no limit).")
+    cache_memory_max_items: Optional[int] = Field(default=512, ge=0, description="Max entries in the in-memory (L1) metadata cache in front of the disk cache (0 disables it).")
+    cache_memory_max_mb: Optional[float] = Field(default=64.0, ge=0.0, description="Max approximate size (MB) of the in-memory (L1) metadata cache.")
+
+    # Undo Options
+    enable_undo: Optional[bool] = Field(default=True, description="Enable undo logging.")
+    undo_db_path: Optional[str] = Field(default=None, description="Path to undo database file (default: in app dir).")
+    undo_expire_days: Optional[int] = Field(default=30, ge=-1, description="Days to keep undo logs (-1 for forever, 0 for session only).")
+    undo_check_integrity: Optional[bool] = Field(default=False, description="Verify file integrity before undoing (size, mtime).")
+    undo_integrity_hash_bytes: Optional[int] = Field(default=0, ge=0, description="Bytes to hash for integrity check (0 to disable partial hash).")
+    undo_integrity_hash_full: Optional[bool] = Field(default=False, description="Calculate full file hash for undo integrity check (SLOW, overrides hash_bytes).")
+    undo_parallel_workers: Optional[int] = Field(default=8, ge=1, description="Threads used by 'undo' for integrity checks and for reverting independent directories concurrently (1 = one file at a time).")
+    undo_prune_mode: Optional[str] = Field(default='background', description="When expired undo records are pruned: 'background' (in a thread while the command runs), 'startup' (before the command starts) or 'off'.")
+    undo_prune_time_budget_seconds: Optional[float] = Field(default=2.0, ge=0, description="Maximum seconds one prune pass spends deleting and vacuuming (0 = no limit); what is left is pruned on a later run.")
+    undo_prune_chunk_rows: Optional[int] = Field(default=2000, ge=1, description="Undo records deleted per transaction while pruning, so other writers are never blocked for long.")
+
+    # Watch Mode Options
+    watch_settle_seconds: Optional[float] = Field(default=30.0, ge=0.0, description="'watch' mode: seconds a file's size/mtime must stay unchanged before it is processed (debounces incomplete downloads).")
+    watch_poll_interval_seconds: Optional[float] = Field(default=10.0, gt=0.0, description="'watch' mode: rescan interval (seconds) when inotify is unavailable or polling is forced.")
+    watch_use_polling: Optional[bool] = Field(default=False, description="'watch' mode: always poll the directory tree instead of using inotify.")
+
+    # Logging Options
+    log_file: Optional[str] = Field(default=None, description="Path to log file (e.g., rename_app.log).")
+    log_level: Optional[str] = Field(default='INFO', description="Logging level: DEBUG, INFO, WARNING, ERROR.")
+
+    @field_validator('on_conflict', mode='before')
+    @classmethod
+    def check_on_conflict(cls, v: Any) -> Optional[str]:
+        if v is not None and isinstance(v, str) and v.lower() not in ['skip', 'overwrite', 'suffix', 'fail']:
+            raise ValueError("on_conflict must be one of 'skip', 'overwrite', 'suffix', 'fail'")
+        return v.lower() if isinstance(v, str) else None
+
+    @field_validator('backup_strategy', mode='before')
+    @classmethod
+    def check_backup_strategy(cls, v: Any) -> Optional[str]:
+        if v is not None and isinstance(v, str) and v.lower() not in ['auto', 'reflink', 'hardlink', 'copy']:
+            raise ValueError("backup_strategy must be one of 'auto', 'reflink', 'hardlink', 'copy'")
+        return v.lower() if isinstance(v, str) else 'copy'
+
+    @field_validator('undo_prune_mode', mode='before')
+    @classmethod
+    def check_undo_prune_mode(cls, v: Any) -> Optional[str]:
+        if v is not None and isinstance(v, str) and v.lower() not in ['background', 'startup', 'off']:
+            raise ValueError("undo_prune_mode must be one of 'background', 'startup', 'off'")
+        return v.lower() if isinstance(v, str) else 'background'
+
+    @field_validator('log_level', mode='before')
+    @classmethod
+    def check_log_level(cls, v: Any) -> Optional[str]:
+        if v is not None and isinstance(v, str) and v.upper() not in ['DEBUG', 'INFO', 'WARNING', 'ERROR']:
+            raise ValueError("log_level must be one of DEBUG, INFO, WARNING, ERROR")
+        return v.upper() if isinstance(v, str) else None
+
+    @field_validator('tmdb_match_strategy', mode='before')
+    @classmethod
+    def check_tmdb_strategy(cls, v: Any) -> Optional[str]:
+        if v is not None and isinstance(v, str) and v.lower() not in ['first', 'fuzzy']:
+            raise ValueError("tmdb_match_strategy must be 'first' or 'fuzzy'")
+        return v.lower() if isinstance(v, str) else 'first'
+
+    @field_validator('offline_index_mode', mode='before')
+    @classmethod
+    def check_offline_index_mode(cls, v: Any) -> Optional[str]:
+        if v is not None and isinstance(v, str) and v.lower() not in ['only', 'fallback']:
+            raise ValueError("offline_index_mode must be 'only' or 'fallback'")
+        return v.lower() if isinstance(v, str) else 'only'
+
+    @field_validator('scan_strategy', mode='before')
+    @classmethod
+    def check_scan_strategy(cls, v: Any) -> Optional[str]:
+        if v is not None and isinstance(v, str) and v.lower() not in ['memory', 'low_memory']:
+            raise ValueError("scan_strategy must be 'memory' or 'low_memory'")
+        return v.lower() if isinstance(v, str) else 'memory'
+
+    @field_validator('extract_stream_info', mode='before')
+    @classmethod
+    def check_extract_stream_info(cls, v: Any) -> Optional[bool]:
+        if v is not None and not isinstance(v, bool):
+            raise ValueError("extract_stream_info must be a boolean (true/false)")
+        return v
+
+    @field_validator('unknown_file_handling', mode='before')
+    @classmethod
+    def check_unknown_file_handling(cls, v: Any) -> Optional[str]:
+        if v is not None and isinstance(v, str) and v.lower() not in ['skip', 'guessit_only', 'move_to_unknown']:
+            raise ValueError("unknown_file_handling must be one of 'skip', 'guessit_only', 'move_to_unknown'")
+        return v.lower() if isinstance(v, str) else 'skip'
+
+    @field_validator('series_metadata_preference', mode='before')
+    @classmethod
+    def check_series_metadata_preference(cls, v: Any) -> List[str]:
+        default_pref = ['tmdb', 'tvdb']
+        if v is None: return default_pref
+        
+        val_list: List[str]
+        if isinstance(v, str):
+            val_list = [item.strip().lower() for item in v.split(',') if item.strip()]
+        elif isinstance(v, list):
+            val_list = [str(item).strip().lower() for item in v if str(item).strip()]
+        else:
+            raise ValueError("series_metadata_preference must be a list or comma-separated string")
+
+        if not val_list:
+            return default_pref
+
+        if len(val_list) != 2:
+            raise ValueError("series_metadata_preference must contain exactly two sources (e.g., 'tmdb,tvdb')")
+        
+        sources = {s.lower() for s in val_list}
+        allowed = {'tmdb', 'tvdb'}
+        if sources != allowed:
+            raise ValueError(f"series_metadata_preference must be 'tmdb' and 'tvdb', got: {val_list}")
+        return [s.lower() for s in val_list]
+
+    @field_validator('preserve_mtime', mode='before')
+    @classmethod
+    def check_preserve_mtime(cls, v: Any) -> Optional[bool]:
+        if v is not None and not isinstance(v, bool): raise ValueError("preserve_mtime must be a boolean")
+        return v
+
+    @field_validator('undo_integrity_hash_full', mode='before')
+    @classmethod
+    def check_undo_integrity_hash_full(cls, v: Any) -> Optional[bool]:
+        if v is not None and not isinstance(v, bool): raise ValueError("undo_integrity_hash_full must be a boolean")
+        return v
+    
+    @field_validator('temp_file_suffix_prefix', mode='before')
+    @classmethod
+    def check_temp_file_suffix_prefix(cls, v: Any) -> Optional[str]:
+        if v is not None:
+            if not isinstance(v, str):
+                raise ValueError("temp_file_suffix_prefix must be a string.")
+            if not v: # cannot be empty
+                raise ValueError("temp_file_suffix_prefix cannot be empty.")
+        return v
+        
+    @field_validator('movie_yearless_match_confidence', mode='before')
+    @classmethod
+    def check_movie_yearless_match_confidence(cls, v: Any) -> Optional[str]:
+        if v is not None:
+            if not isinstance(v, str) or v.lower() not in ['high', 'medium', 'low', 'confirm']:
+                raise ValueError("movie_yearless_match_confidence must be one of 'high', 'medium', 'low', 'confirm'.")
+            return v.lower()
+        return 'medium' # Default if None
+
+
+class DefaultSettings(BaseProfileSettings):
+    pass
+
+class RootConfigModel(BaseModel):
+    default: DefaultSettings = Field(default_factory=DefaultSettings)
+    model_config = {'extra': 'allow'}
+
+
+def generate_default_toml_content() -> str:
+    default_settings = DefaultSettings()
+    content_lines = ["# Gemini-Renamer Default Configuration File"]
+    content_lines.append("# For more details on placeholders, see README.md or documentation.\n")
+    
+    sections: Dict[str, List[str]] = {
+        "Core Settings": ['recursive', 'processing_mode', 'use_metadata', 'extract_stream_info', 'preserve_mtime', 'ignore_dirs', 'ignore_patterns'],
+        "Format Strings": ['series_format', 'movie_format', 'subtitle_format', 'series_format_specials', 'folder_format_series', 'folder_format_movie', 'folder_format_specials'],
+        "File Handling & Extensions": ['video_extensions', 'associated_extensions', 'subtitle_extensions', 'on_conflict', 'create_folders', 'unknown_file_handling', 'unknown_files_dir', 'scan_strategy', 'temp_file_suffix_prefix', 'backup_strategy', 'move_copy_chunk_mb', 'move_parallel_transfers', 'trash_batch_size', 'live_parallel_batches'],
+        "Scene Tags": ['scene_tags_in_filename', 'scene_tags_to_preserve'],
+        "Subtitles": ['subtitle_encoding_detection'],
+        "API & Metadata Options": ['api_rate_limit_delay', 'api_retry_attempts', 'api_retry_wait_seconds', 'api_retry_max_wait_seconds', 'api_retry_budget', 'api_provider_pause_after', 'api_provider_pause_seconds', 'api_breaker_failure_threshold', 'api_breaker_cooldown_seconds', 'api_year_tolerance', 'tmdb_match_strategy', 'tmdb_match_fuzzy_cutoff', 'tmdb_first_result_min_score', 'movie_yearless_match_confidence', 'confirm_match_below', 'series_metadata_preference', 'title_alias_index_enabled', 'title_alias_min_score', 'id_pinning_enabled', 'offline_index_path', 'offline_index_mode'],
+        "Caching Options": ['cache_enabled', 'cache_directory', 'cache_expire_seconds', 'cache_negative_expire_seconds', 'cache_stale_while_revalidate', 'cache_max_stale_seconds', 'cache_memory_max_items', 'cache_memory_max_mb'],
+        "Undo Options": ['enable_undo', 'undo_db_path', 'undo_expire_days', 'undo_check_integrity', 'undo_integrity_hash_bytes', 'undo_integrity_hash_full', 'undo_parallel_workers', 'undo_prune_mode', 'undo_prune_time_budget_seconds', 'undo_prune_chunk_rows'],
+        "Watch Mode Options": ['watch_settle_seconds', 'watch_poll_interval_seconds', 'watch_use_polling'],
+        "Logging Options": ['log_file', 'log_level'],
+    }
+
+    content_lines.append("[default]")
+    for section_name, keys in sections.items():
+        content_lines.append(f"\n  # --- {section_name} ---")
+        for key in keys:
+            field_info = BaseProfileSettings.model_fields.get(key)
+            if field_info:
+                default_value = getattr(default_settings, key)
+                comment = field_info.description or ""
+                if comment:
+                    content_lines.append(f"  # {comment}")
+                
+                toml_value_str: str
+                if isinstance(default_value, str):
+                    # Escape backslashes and double quotes in string values for TOML
+                    escaped_default_value = default_value.replace('\\', '\\\\').replace('"', '\\"')
+                    toml_value_str = f'"{escaped_default_value}"'
+                elif isinstance(default_value, bool):
+                    toml_value_str = str(default_value).lower()
+                elif isinstance(default_value, list):
+                    list_items_str = []
+                    for item in default_value:
+                        if isinstance(item, str): list_items_str.append(f'"{str(item)}"')
+                        elif isinstance(item, bool): list_items_str.append(str(item).lower())
+                        else: list_items_str.append(str(item))
+                    toml_value_str = "[" + ", ".join(list_items_str) + "]"
+                elif default_value is None: 
+                    toml_value_str = "# (not set, uses internal default or None)"
+                    content_lines.append(f"  # {key} = {toml_value_str}")
+                    continue 
+                else: 
+                    toml_value_str = str(default_value)
+                
+                content_lines.append(f"  {key} = {toml_value_str}")
+    
+    content_lines.append("\n# You can create other profiles, e.g.:")
+    content_lines.append("# [movie_profile]")
+    content_lines.append("# movie_format = \"{movie_title} [{movie_year}] - {resolution}\"")
+    content_lines.append("# use_metadata = true")
+
+    return "\n".join(content_lines)
+
+
+_UNSET = object()
+# Settings that are not BaseProfileSettings fields but are still looked up via cfg(...)
+_EXTRA_SETTING_KEYS = ('tmdb_language',)
+
+
+def model_defaults() -> Dict[str, Any]:
+    """Plain dict of every BaseProfileSettings field default (default_factory values expanded)."""
+    defaults: Dict[str, Any] = {}
+    for key, field_info in BaseProfileSettings.model_fields.items():
+        defaults[key] = field_info.default_factory() if field_info.default_factory is not None else field_info.default
+    return defaults
+
+
+def _model_default(key: str) -> Any:
+    field_info = BaseProfileSettings.model_fields.get(key)
+    if field_info is None:
+        return None
+    if field_info.default_factory is not None:
+        return field_info.default_factory()
+    return field_info.default
+
+
+class EffectiveSettings:
+    """
+    Frozen snapshot of the effective settings (CLI > env > profile > default > model default)
+    for a single run. Values are resolved once via ConfigManager.get_value so hot paths
+    only pay for an attribute lookup. Call signature and get_list() mirror ConfigHelper, with
+    one difference: a list setting given on the command line as a comma-separated string is
+    split once here, so calling the snapshot returns the list where ConfigHelper returns the
+    raw CLI string (get_list() gives the same result on both).
+    """
+    __slots__ = ('args', 'profile', 'manager', '_explicit') + tuple(BaseProfileSettings.model_fields) + _EXTRA_SETTING_KEYS
+    _SETTING_KEYS = frozenset(BaseProfileSettings.model_fields) | frozenset(_EXTRA_SETTING_KEYS)
+
+    def __init__(self, values: Dict[str, Any], explicit_keys: Set[str], args_ns: Optional[argparse.Namespace] = None,
+                 profile: str = 'default', manager: Optional['ConfigManager'] = None):
+        setter = object.__setattr__
+        setter(self, 'args', args_ns)
+        setter(self, 'profile', profile)
+        setter(self, 'manager', manager)
+        setter(self, '_explicit', frozenset(explicit_keys))
+        for key in self._SETTING_KEYS:
+            value = values.get(key, _model_default(key))
+            # Lists are stored as tuples so the shared snapshot cannot be mutated through a returned value
+            setter(self, key, tuple(value) if isinstance(value, list) else value)
+
+    @classmethod
+    def from_helper(cls, cfg_helper: 'ConfigHelper') -> 'EffectiveSettings':
+        values: Dict[str, Any] = {}
+        explicit: Set[str] = set()
+        for key in cls._SETTING_KEYS:
+            cmd_line_val = getattr(cfg_helper.args, key, None)
+            if isinstance(cmd_line_val, str) and isinstance(_model_default(key), list):
+                cmd_line_val = [item.strip() for item in cmd_line_val.split(',') if item.strip()]
+            val = cfg_helper.manager.get_value(key, cfg_helper.profile, cmd_line_val, _UNSET)
+            if val is _UNSET:
+                continue
+            explicit.add(key)
+            values[key] = val
+        log.debug(f"Resolved effective settings snapshot for profile '{cfg_helper.profile}' ({len(explicit)} explicit keys).")
+        return cls(values, explicit, cfg_helper.args, cfg_helper.profile, cfg_helper.manager)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"EffectiveSettings is immutable (cannot set '{name}').")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"EffectiveSettings is immutable (cannot delete '{name}').")
+
+    def _value(self, key: str) -> Any:
+        value = getattr(self, key)
+        return list(value) if isinstance(value, tuple) else value
+
+    def __call__(self, key: str, default_value: Any = None, arg_value: Any = None) -> Any:
+        if arg_value is not None:
+            return arg_value
+        if key not in self._SETTING_KEYS:
+            return default_value
+        if key in self._explicit or default_value is None:
+            return self._value(key)
+        return default_value
+
+    def get_api_key(self, service_name: str) -> Optional[str]:
+        return self.manager.get_api_key(service_name) if self.manager else None
+
+    def get_list(self, key: str, default_value: Optional[List[Any]] = None) -> List[Any]:
+        val = self._value(key) if key in self._SETTING_KEYS else None
+        if isinstance(val, list):
+            return val
+        elif isinstance(val, str):
+            return [item.strip() for item in val.split(',') if item.strip()]
+        return list(default_value) if isinstance(default_value, list) else []
+
+    def with_overrides(self, **overrides: Any) -> 'EffectiveSettings':
+        """Returns a new snapshot with the given keys replaced (this one is left untouched)."""
+        unknown_keys = set(overrides) - self._SETTING_KEYS
+        if unknown_keys:
+            raise KeyError(f"Unknown setting(s): {', '.join(sorted(unknown_keys))}")
+        values = {key: self._value(key) for key in self._SETTING_KEYS}
+        values.update(overrides)
+        return EffectiveSettings(values, set(self._explicit) | set(overrides), self.args, self.profile, self.manager)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {key: self._value(key) for key in sorted(self._SETTING_KEYS)}
+
+    def __repr__(self) -> str:
+        return f"EffectiveSettings(profile={self.profile!r}, explicit={sorted(self._explicit)})"
+
@@ -10,6 +10,10 @@ class MetadataError(RenamerError):
     """Errors related to fetching or processing metadata."""
     pass
 
+class MetadataNotFoundError(MetadataError):
+    """The API answered, but definitively has no match (as opposed to network/server/auth errors)."""
+    pass
+
 class FileOperationError(RenamerError):
     """Errors during file system operations."""
     pass
@@ -1,4 +1,5 @@
 # rename_app/file_system_ops.py
+import errno
 import logging
 import shutil
 import uuid
@@ -20,7 +21,8 @@ from rename_app.ui_utils import (
 from .models import RenamePlan, RenameAction, MediaInfo, MediaMetadata
 from .exceptions import FileOperationError, RenamerError
 from .undo_manager import UndoManager
-from .config_manager import ConfigHelper
+from .move_engine import MoveEngine
+from .config_manager import EffectiveSettings
 
 try: import send2trash; SEND2TRASH_AVAILABLE = True
 except ImportError: SEND2TRASH_AVAILABLE = False
@@ -29,6 +31,64 @@ log = logging.getLogger(__name__)
 # TEMP_SUFFIX_PREFIX = ".renametmp_" # Removed hardcoded constant
 WINDOWS_PATH_LENGTH_WARNING_THRESHOLD = 240
 
+_RENAME_NOREPLACE = 1 # linux/fs.h
+_AT_FDCWD = -100
+# Errors meaning "can't rename this way here", not "the rename failed": fall back to the two-phase move.
+_NOREPLACE_UNSUPPORTED_ERRNOS = {errno.EEXIST, errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP}
+_renameat2_func: Any = None # None: not looked up yet, False: unavailable
+
+_FICLONE = 0x40049409 # linux/fs.h: _IOW(0x94, 9, int)
+# A hardlink shares its inode with the renamed file, so later in-place edits change the backup
+# too: only used when asked for explicitly, never by 'auto'.
+_BACKUP_METHODS: Dict[str, Tuple[str, ...]] = {
+    'auto': ('reflink', 'copy'),
+    'reflink': ('reflink', 'copy'),
+    'hardlink': ('hardlink', 'copy'),
+    'copy': ('copy',),
+}
+
+def _get_renameat2() -> Any:
+    global _renameat2_func
+    if _renameat2_func is None:
+        _renameat2_func = False
+        if sys.platform.startswith('linux'):
+            try:
+                import ctypes
+                func = ctypes.CDLL(None, use_errno=True).renameat2 # glibc >= 2.28
+                func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+                func.restype = ctypes.c_int
+                _renameat2_func = func
+            except (OSError, AttributeError) as e:
+                log.debug(f"renameat2 not available ({e}); using two-phase renames only.")
+    return _renameat2_func
+
+def _rename_noreplace(src: Path, dst: Path) -> bool:
+    """
+    Atomically renames src to dst unless dst exists, in a single syscall.
+    Returns False when that isn't possible here (dst exists, other filesystem, no kernel/libc
+    support) so the caller can fall back to the two-phase move; other OS errors are raised.
+    """
+    if sys.platform == 'win32':
+        try:
+            os.rename(src, dst) # Never replaces an existing target on Windows
+            return True
+        except FileExistsError:
+            return False
+        except OSError as e:
+            if e.errno == errno.EXDEV or getattr(e, 'winerror', None) == 17: return False # ERROR_NOT_SAME_DEVICE
+            raise
+    renameat2 = _get_renameat2()
+    if not renameat2:
+        return False
+    if renameat2(_AT_FDCWD, os.fsencode(src), _AT_FDCWD, os.fsencode(dst), _RENAME_NOREPLACE) == 0:
+        return True
+    import ctypes # Already loaded by _get_renameat2
+    err = ctypes.get_errno()
+    if err in _NOREPLACE_UNSUPPORTED_ERRNOS:
+        log.debug(f"  Direct rename of '{src.name}' not possible ({os.strerror(err)}); using temp-file move.")
+        return False
+    raise OSError(err, os.strerror(err), str(src), None, str(dst))
+
 def _compare_and_format(
     field_name: str,
     guess_value: Optional[Any],
@@ -97,7 +157,7 @@ def _handle_conflict(original_path: Path, target_path: Path, conflict_mode: str)
 
 def _display_dry_run_plan(
     plan: RenamePlan,
-    cfg_helper: ConfigHelper,
+    cfg_helper: EffectiveSettings,
     media_info: Optional[MediaInfo] = None,
     quiet_mode: bool = False
 ) -> Tuple[bool, str, int]:
@@ -285,7 +345,7 @@ def _display_dry_run_plan(
 
 def _prepare_live_actions(
     plan: RenamePlan,
-    cfg_helper: ConfigHelper,
+    cfg_helper: EffectiveSettings,
     action_messages: List[str]
 ) -> Tuple[Optional[Path], Dict[Path, Path], Dict[Path, float], bool]:
     conflict_mode = cfg_helper('on_conflict', 'skip')
@@ -366,17 +426,49 @@ def _prepare_live_actions(
         
     return created_dir_path, resolved_target_map, original_mtimes, preparation_success
 
+def _reflink_file(src: Path, dst: Path) -> None:
+    import fcntl # POSIX only; ImportError on Windows
+    with open(src, 'rb') as fsrc, open(dst, 'xb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            dst.unlink(missing_ok=True)
+            raise
+    shutil.copystat(src, dst)
+
+def _backup_file(src: Path, dst: Path, strategy: str, unsupported: Set[str]) -> str:
+    """
+    Creates dst from src with the first workable method for `strategy` and returns its name.
+    Methods that fail are added to `unsupported` so the rest of the batch skips them.
+    """
+    for method in _BACKUP_METHODS[strategy]:
+        if method in unsupported: continue
+        try:
+            if method == 'reflink': _reflink_file(src, dst)
+            elif method == 'hardlink': os.link(src, dst)
+            else: shutil.copy2(str(src), str(dst))
+            return method
+        except (OSError, ImportError) as e:
+            if method == 'copy' or isinstance(e, FileExistsError): raise
+            log.debug(f"{method.capitalize()} backup of '{src.name}' not possible ({e}); trying the next strategy.")
+            unsupported.add(method)
+    raise FileOperationError(f"No backup strategy left for '{src.name}'.") # Unreachable: every strategy ends with 'copy'
+
 def _perform_backup_action(
     plan: RenamePlan,
     backup_dir_path: Path,
-    action_messages: List[str]
-) -> None:
+    action_messages: List[str],
+    strategy: str = 'copy'
+) -> Dict[Path, Tuple[Path, str]]:
+    """Backs up every original; returns resolved original -> (backup path, strategy used)."""
     if not backup_dir_path:
         raise FileOperationError("Backup directory not specified or invalid.")
     
     backup_dir_path.mkdir(parents=True, exist_ok=True)
     backed_up_count = 0
-    log.info(f"Starting backup phase to {backup_dir_path}...")
+    backups: Dict[Path, Tuple[Path, str]] = {}
+    unsupported_methods: Set[str] = set()
+    log.info(f"Starting backup phase to {backup_dir_path} (strategy: {strategy})...")
 
     for action in plan.actions:
         original_p = action.original_path
@@ -400,53 +492,72 @@ def _perform_backup_action(
             log.warning(f"Potential long path issue on Windows for backup target: '{final_backup_target.resolve()}'.")
         
         try:
-            shutil.copy2(str(original_p), str(final_backup_target))
-            log.debug(f"Backed up '{original_p.name}' to '{final_backup_target.name}'")
+            method_used = _backup_file(original_p, final_backup_target, strategy, unsupported_methods)
+            log.debug(f"Backed up '{original_p.name}' to '{final_backup_target.name}' ({method_used})")
+            backups[original_p.resolve()] = (final_backup_target, method_used)
             backed_up_count += 1
         except Exception as e_backup:
             log.error(f"Failed to backup '{original_p.name}' to '{final_backup_target}': {e_backup}")
             action_messages.append(f"ERROR (Backup): Failed for '{original_p.name}': {e_backup}")
 
     if backed_up_count > 0:
-        action_messages.append(f"Backed up {backed_up_count} files to '{backup_dir_path}'.")
+        methods_used = sorted({method for _, method in backups.values()})
+        action_messages.append(f"Backed up {backed_up_count} files to '{backup_dir_path}' ({', '.join(methods_used)}).")
+    return backups
+
+
+def _trash_groups(paths: List[Path], batch_size: int) -> List[List[Path]]:
+    """Splits paths into send2trash calls of at most batch_size files, each on a single device."""
+    by_device: Dict[int, List[Path]] = {}
+    for path in paths:
+        try: device = os.stat(path).st_dev
+        except OSError: device = -1 # Reported by send2trash itself
+        by_device.setdefault(device, []).append(path)
+    return [group[i:i + batch_size] for group in by_device.values() for i in range(0, len(group), batch_size)]
 
 
 def _perform_trash_action(
     plan: RenamePlan,
     run_batch_id: str,
     undo_manager: UndoManager,
-    action_messages: List[str]
+    action_messages: List[str],
+    batch_size: int = 100
 ) -> int:
     if not SEND2TRASH_AVAILABLE:
         raise FileOperationError("'send2trash' library not installed or available. Cannot move files to trash.")
     
     log.info("Starting trash phase...")
-    trashed_count = 0
+    intended_names: Dict[Path, Path] = {}
     for action in plan.actions:
-        original_p = action.original_path
-        final_p_intended_for_log = action.new_path
-
-        if not original_p.exists():
-            log.warning(f"Cannot trash non-existent file: '{original_p.name}'. Skipping.")
+        if not action.original_path.exists():
+            log.warning(f"Cannot trash non-existent file: '{action.original_path.name}'. Skipping.")
             continue
-        
+        intended_names[action.original_path] = action.new_path
+    if not intended_names: return 0
+
+    if undo_manager.is_enabled and not undo_manager.log_actions(run_batch_id, list(intended_names.items()), 'file', 'trashed'):
+        for original_p, final_p_intended_for_log in intended_names.items(): # Keep every entry that can still be logged
+            undo_manager.log_action(batch_id=run_batch_id, original_path=original_p, new_path=final_p_intended_for_log, item_type='file', status='trashed')
+
+    trashed_count = 0
+    failed_paths: List[str] = []
+    for group in _trash_groups(list(intended_names), max(1, batch_size)):
         try:
-            if undo_manager.is_enabled:
-                undo_manager.log_action(
-                    batch_id=run_batch_id,
-                    original_path=original_p,
-                    new_path=final_p_intended_for_log,
-                    item_type='file',
-                    status='trashed'
-                )
-            send2trash.send2trash(str(original_p))
-            action_messages.append(f"TRASHED: '{original_p.name}' (intended new name: '{final_p_intended_for_log.name}')")
-            trashed_count += 1
+            send2trash.send2trash([str(path) for path in group])
+            trashed = group
         except Exception as e_trash:
-            log.error(f"Failed to move '{original_p.name}' to trash: {e_trash}")
-            action_messages.append(f"ERROR (Trash): Failed for '{original_p.name}': {e_trash}")
-            if undo_manager.is_enabled:
-                undo_manager.update_action_status(run_batch_id, str(original_p), 'failed_pending')
+            # send2trash stops at the first file it can't trash; the ones before it are gone.
+            trashed = [path for path in group if not path.exists()]
+            for path in group:
+                if path in trashed: continue
+                log.error(f"Failed to move '{path.name}' to trash: {e_trash}")
+                action_messages.append(f"ERROR (Trash): Failed for '{path.name}': {e_trash}")
+                failed_paths.append(str(path))
+        for path in trashed:
+            action_messages.append(f"TRASHED: '{path.name}' (intended new name: '{intended_names[path].name}')")
+        trashed_count += len(trashed)
+    if failed_paths and undo_manager.is_enabled:
+        undo_manager.update_action_statuses(run_batch_id, failed_paths, 'failed_pending')
     return trashed_count
 
 
@@ -458,7 +569,8 @@ def _perform_stage_action(
     resolved_target_map: Dict[Path, Path],
     original_mtimes: Dict[Path, float],
     should_preserve_mtime: bool,
-    action_messages: List[str]
+    action_messages: List[str],
+    move_engine: Optional[MoveEngine] = None
 ) -> int:
     if not stage_dir_path:
         raise FileOperationError("Staging directory not specified or invalid.")
@@ -466,6 +578,8 @@ def _perform_stage_action(
     stage_dir_path.mkdir(parents=True, exist_ok=True)
     log.info(f"Starting staging phase to {stage_dir_path}...")
     staged_count = 0
+    pending_moves: List[Tuple[Path, Path]] = []
+    resolved_originals: List[Path] = []
 
     for action in plan.actions:
         original_p = action.original_path
@@ -485,37 +599,72 @@ def _perform_stage_action(
         if sys.platform == 'win32' and len(str(final_staged_path.resolve())) > WINDOWS_PATH_LENGTH_WARNING_THRESHOLD:
             log.warning(f"Potential long path issue on Windows for staged target: '{final_staged_path.resolve()}'.")
         
-        try:
-            if undo_manager.is_enabled:
-                undo_manager.log_action(
-                    batch_id=run_batch_id,
-                    original_path=original_p,
-                    new_path=final_staged_path,
-                    item_type='file',
-                    status='moved'
-                )
-            shutil.move(str(original_p), str(final_staged_path))
-            action_messages.append(f"MOVED to stage: '{original_p.name}' -> '{final_staged_path}'")
-            staged_count += 1
+        if undo_manager.is_enabled:
+            undo_manager.log_action(
+                batch_id=run_batch_id,
+                original_path=original_p,
+                new_path=final_staged_path,
+                item_type='file',
+                status='moved'
+            )
+        pending_moves.append((original_p, final_staged_path))
+        resolved_originals.append(original_p_resolved)
 
-            if should_preserve_mtime:
-                original_mtime_val = original_mtimes.get(original_p_resolved)
-                if original_mtime_val is not None:
-                    try:
-                        log.debug(f"  -> Preserving mtime ({original_mtime_val:.2f}) for staged file '{final_staged_path.name}'")
-                        os.utime(str(final_staged_path), (original_mtime_val, original_mtime_val))
-                    except OSError as utime_err:
-                        log.warning(f"  -> Failed to preserve mtime for staged file '{final_staged_path.name}': {utime_err}")
-                else:
-                    log.debug(f"  -> Could not preserve mtime for staged file '{final_staged_path.name}': Original mtime not found.")
-        except Exception as e_stage:
+    # The stage dir is often another mount: the engine copies those files several at a time.
+    move_errors = (move_engine or MoveEngine()).move_many(pending_moves)
+
+    for (original_p, final_staged_path), original_p_resolved, e_stage in zip(pending_moves, resolved_originals, move_errors):
+        if e_stage is not None:
             log.error(f"Failed to stage '{original_p.name}' to '{final_staged_path}': {e_stage}")
             action_messages.append(f"ERROR (Stage): Failed for '{original_p.name}': {e_stage}")
             if undo_manager.is_enabled:
                 undo_manager.update_action_status(run_batch_id, str(original_p), 'failed_pending')
+            continue
+        action_messages.append(f"MOVED to stage: '{original_p.name}' -> '{final_staged_path}'")
+        staged_count += 1
+
+        if should_preserve_mtime:
+            original_mtime_val = original_mtimes.get(original_p_resolved)
+            if original_mtime_val is not None:
+                try:
+                    log.debug(f"  -> Preserving mtime ({original_mtime_val:.2f}) for staged file '{final_staged_path.name}'")
+                    os.utime(str(final_staged_path), (original_mtime_val, original_mtime_val))
+                except OSError as utime_err:
+                    log.warning(f"  -> Failed to preserve mtime for staged file '{final_staged_path.name}': {utime_err}")
+            else:
+                log.debug(f"  -> Could not preserve mtime for staged file '{final_staged_path.name}': Original mtime not found.")
     return staged_count
 
 
+def _finish_moved_file(
+    original_path: Path,
+    final_path: Path,
+    run_batch_id: str,
+    undo_manager: UndoManager,
+    original_mtimes: Dict[Path, float],
+    should_preserve_mtime: bool,
+    action_messages: List[str]
+) -> None:
+    """Restores the original mtime if requested and marks the file's undo entry renamed/moved."""
+    if should_preserve_mtime:
+        original_mtime_val = original_mtimes.get(original_path)
+        if original_mtime_val is not None:
+            try:
+                log.debug(f"    Preserving mtime ({original_mtime_val:.2f}) for '{final_path.name}'")
+                os.utime(str(final_path), (original_mtime_val, original_mtime_val))
+            except OSError as utime_err:
+                log.warning(f"    Failed to preserve mtime for '{final_path.name}': {utime_err}")
+        else:
+            log.debug(f"    Could not preserve mtime for '{final_path.name}': Original mtime not found for key {original_path}.")
+
+    if undo_manager.is_enabled:
+        final_op_status = 'moved' if final_path.parent.resolve() != original_path.parent.resolve() else 'renamed'
+        if not undo_manager.update_action_status(run_batch_id, str(original_path), final_op_status):
+            log.error(f"  Move succeeded, but FAILED to update undo log status for '{original_path}' to '{final_op_status}'")
+            action_messages.append(f"ACTION LOG UPDATE FAILED? '{original_path.name}' -> '{final_path}'")
+        else:
+            action_messages.append(f"{final_op_status.upper()}D: '{original_path.name}' -> '{final_path}'")
+
 def _perform_transactional_rename_move(
     plan: RenamePlan,
     run_batch_id: str,
@@ -525,12 +674,19 @@ def _perform_transactional_rename_move(
     should_preserve_mtime: bool,
     conflict_mode_for_phase2: str, # This parameter is passed from perform_file_actions
     temp_suffix_prefix: str, # New parameter
-    action_messages: List[str]
+    action_messages: List[str],
+    move_engine: Optional[MoveEngine] = None,
+    backups: Optional[Dict[Path, Tuple[Path, str]]] = None
 ) -> Tuple[int, bool]:
+    move_engine = move_engine or MoveEngine()
     original_to_temp_map: Dict[Path, Path] = {}
     temp_to_final_map: Dict[Path, Path] = {}
+    direct_renames: Dict[Path, Path] = {}
     phase1_ok = True
     actions_taken_count = 0
+    # Swaps and chains (a target that is also a source in this plan) need the temp paths; any
+    # other file goes straight to its final name with one no-clobber rename where supported.
+    direct_rename_allowed = not set(resolved_target_map).intersection(resolved_target_map.values())
 
     log.debug(f"Starting Phase 1: Move to temporary paths for run {run_batch_id} (using prefix: '{temp_suffix_prefix}')")
     for action in plan.actions:
@@ -545,6 +701,23 @@ def _perform_transactional_rename_move(
             continue
 
         try:
+            if undo_manager.is_enabled:
+                backup_path, backup_strategy = (backups or {}).get(orig_p_resolved, (None, None))
+                undo_manager.log_action(
+                    batch_id=run_batch_id,
+                    original_path=action.original_path,
+                    new_path=final_p_intended,
+                    item_type='file',
+                    status='pending_final',
+                    backup_path=backup_path,
+                    backup_strategy=backup_strategy
+                )
+
+            if direct_rename_allowed and _rename_noreplace(action.original_path, final_p_intended):
+                direct_renames[orig_p_resolved] = final_p_intended
+                log.debug(f"  P1 Renamed '{action.original_path.name}' directly to '{final_p_intended}'.")
+                continue
+
             temp_file_uuid = uuid.uuid4().hex[:8]
             # Use the new temp_suffix_prefix parameter here
             temp_path = final_p_intended.parent / f"{final_p_intended.stem}{temp_suffix_prefix}{temp_file_uuid}{final_p_intended.suffix}"
@@ -554,17 +727,8 @@ def _perform_transactional_rename_move(
                 # And here
                 temp_path = final_p_intended.parent / f"{final_p_intended.stem}{temp_suffix_prefix}{temp_file_uuid}{final_p_intended.suffix}"
 
-            if undo_manager.is_enabled:
-                undo_manager.log_action(
-                    batch_id=run_batch_id,
-                    original_path=action.original_path,
-                    new_path=final_p_intended,
-                    item_type='file',
-                    status='pending_final'
-                )
-
             log.debug(f"  P1 Moving '{action.original_path}' -> Temp '{temp_path}' (Final Target Dir: {final_p_intended.parent})")
-            shutil.move(str(action.original_path), str(temp_path))
+            move_engine.move(action.original_path, temp_path) # Copies across filesystems into the target dir
 
             original_to_temp_map[orig_p_resolved] = temp_path
             temp_to_final_map[temp_path] = final_p_intended
@@ -583,13 +747,14 @@ def _perform_transactional_rename_move(
         log.warning(f"Rolling back Phase 1 for run {run_batch_id} due to error...")
         rollback_success_count = 0; rollback_fail_count = 0
         
-        for orig_p_res_rb, temp_p_rb in original_to_temp_map.items():
+        # Directly renamed files are rolled back from their final path like temp files.
+        for orig_p_res_rb, temp_p_rb in [*original_to_temp_map.items(), *direct_renames.items()]:
             original_path_for_rollback = Path(orig_p_res_rb)
             log.debug(f"  Attempting P1 rollback: Temp '{temp_p_rb}' -> Original '{original_path_for_rollback}'")
             try:
                 if temp_p_rb.exists():
                     original_path_for_rollback.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(temp_p_rb), str(original_path_for_rollback))
+                    move_engine.move(temp_p_rb, original_path_for_rollback)
                     log.info(f"  P1 Rollback successful: '{temp_p_rb.name}' -> '{original_path_for_rollback.name}'")
                     if undo_manager.is_enabled:
                         undo_manager.update_action_status(run_batch_id, str(original_path_for_rollback), 'failed_pending')
@@ -621,6 +786,11 @@ def _perform_transactional_rename_move(
         action_messages.append(f"Phase 1 Rollback Summary: {rollback_success_count} files restored, {rollback_fail_count} file restore failures.")
         return 0, True
 
+    for orig_p_resolved, final_p in direct_renames.items():
+        actions_taken_count += 1
+        log.info(f"  P1 Successfully renamed/moved '{orig_p_resolved.name}' directly to '{final_p}'")
+        _finish_moved_file(orig_p_resolved, final_p, run_batch_id, undo_manager, original_mtimes, should_preserve_mtime, action_messages)
+
     log.debug(f"Starting Phase 2: Rename temporary paths to final for run {run_batch_id}")
     phase2_errors_occurred = False
     for temp_path, final_path_target in temp_to_final_map.items():
@@ -681,25 +851,8 @@ def _perform_transactional_rename_move(
             if rename_move_successful_p2:
                 actions_taken_count += 1
                 log.info(f"  P2 Successfully renamed/moved original '{Path(original_path_for_log_str).name}' (from temp) to '{final_path_target}'")
-
-                if should_preserve_mtime and original_path_resolved_for_mtime:
-                    original_mtime_val = original_mtimes.get(original_path_resolved_for_mtime)
-                    if original_mtime_val is not None:
-                        try:
-                            log.debug(f"    P2 Preserving mtime ({original_mtime_val:.2f}) for '{final_path_target.name}'")
-                            os.utime(str(final_path_target), (original_mtime_val, original_mtime_val))
-                        except OSError as utime_err_p2:
-                            log.warning(f"    P2 Failed to preserve mtime for '{final_path_target.name}': {utime_err_p2}")
-                    else:
-                        log.debug(f"    P2 Could not preserve mtime for '{final_path_target.name}': Original mtime not found for key {original_path_resolved_for_mtime}.")
-                
-                if undo_manager.is_enabled:
-                    final_op_status = 'moved' if final_path_target.parent.resolve() != Path(original_path_for_log_str).parent.resolve() else 'renamed'
-                    if not undo_manager.update_action_status(run_batch_id, original_path_for_log_str, final_op_status):
-                        log.error(f"  P2 Success, but FAILED to update undo log status for '{original_path_for_log_str}' to '{final_op_status}'")
-                        action_messages.append(f"ACTION LOG UPDATE FAILED? '{Path(original_path_for_log_str).name}' -> '{final_path_target}'")
-                    else:
-                        action_messages.append(f"{final_op_status.upper()}D: '{Path(original_path_for_log_str).name}' -> '{final_path_target}'")
+                _finish_moved_file(original_path_resolved_for_mtime or Path(original_path_for_log_str), final_path_target, run_batch_id, undo_manager,
+                                   original_mtimes, should_preserve_mtime, action_messages)
             else:
                 msg_p2_fail = f"P2 All rename/move attempts FAILED for original '{Path(original_path_for_log_str).name}' (from temp '{temp_path.name}') to '{final_path_target.name}'."
                 log.error(msg_p2_fail)
@@ -727,7 +880,7 @@ def _perform_transactional_rename_move(
 def perform_file_actions(
     plan: RenamePlan,
     args_ns: argparse.Namespace,
-    cfg_helper: ConfigHelper,
+    cfg_helper: EffectiveSettings,
     undo_manager: UndoManager,
     run_batch_id: str,
     media_info: Optional[MediaInfo] = None,
@@ -762,6 +915,7 @@ def perform_file_actions(
 
     # Fetch the temp file suffix prefix from config
     temp_suffix_prefix_val = cfg_helper('temp_file_suffix_prefix', ".renametmp_") # Default if not in config for some reason
+    move_engine = MoveEngine.from_config(cfg_helper)
 
     created_dir_this_plan: Optional[Path] = None
     try:
@@ -787,26 +941,27 @@ def perform_file_actions(
 
         actions_performed_count = 0
         if primary_action_type == 'backup' and backup_dir_path:
-            _perform_backup_action(plan, backup_dir_path, action_messages)
+            backups = _perform_backup_action(plan, backup_dir_path, action_messages, cfg_helper('backup_strategy', 'copy'))
             actions_performed_count, phase2_errors_rename = _perform_transactional_rename_move(
                 plan, run_batch_id, undo_manager, resolved_target_map, original_mtimes,
                 cfg_helper('preserve_mtime', False), cfg_helper('on_conflict', 'skip'),
-                temp_suffix_prefix_val, action_messages
+                temp_suffix_prefix_val, action_messages, move_engine, backups
             )
             if phase2_errors_rename: results['success'] = False
         elif primary_action_type == 'trash':
-            actions_performed_count = _perform_trash_action(plan, run_batch_id, undo_manager, action_messages)
+            actions_performed_count = _perform_trash_action(plan, run_batch_id, undo_manager, action_messages,
+                                                            batch_size=int(cfg_helper('trash_batch_size', 100)))
         elif primary_action_type == 'stage' and stage_dir_path:
             actions_performed_count = _perform_stage_action(
                 plan, stage_dir_path, run_batch_id, undo_manager,
                 resolved_target_map, original_mtimes,
-                cfg_helper('preserve_mtime', False), action_messages
+                cfg_helper('preserve_mtime', False), action_messages, move_engine
             )
         elif primary_action_type == 'rename':
             actions_performed_count, phase2_errors_std_rename = _perform_transactional_rename_move(
                 plan, run_batch_id, undo_manager, resolved_target_map, original_mtimes,
                 cfg_helper('preserve_mtime', False), cfg_helper('on_conflict', 'skip'),
-                temp_suffix_prefix_val, action_messages
+                temp_suffix_prefix_val, action_messages, move_engine
             )
             if phase2_errors_std_rename: results['success'] = False
         else:
@@ -0,0 +1,82 @@
+# rename_app/fuzzy_matcher.py
+"""
+Batched fuzzy title scoring. Candidate strings are preprocessed once, and each query is
+scored against all of them in one rapidfuzz call (a C loop) rather than a Python loop of
+thefuzz scorer calls. Falls back to thefuzz when rapidfuzz is missing.
+"""
+
+import logging
+import re
+from typing import Callable, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+    from rapidfuzz.utils import default_process as rf_default_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    rf_fuzz = None
+    rf_process = None
+    rf_default_process = None
+
+try:
+    from thefuzz import fuzz as tf_fuzz
+    THEFUZZ_AVAILABLE = True
+except ImportError:
+    THEFUZZ_AVAILABLE = False
+    tf_fuzz = None
+
+FUZZY_AVAILABLE = RAPIDFUZZ_AVAILABLE or THEFUZZ_AVAILABLE
+
+Match = Tuple[int, float] # (candidate index, score 0-100)
+
+_NON_ALNUM = re.compile(r'[\W_]+')
+
+
+def preprocess_for_scoring(text: str) -> str:
+    """Lowercase, non-alphanumerics to spaces, trimmed (what thefuzz's full_process does)."""
+    if rf_default_process is not None:
+        return rf_default_process(str(text))
+    return _NON_ALNUM.sub(' ', str(text)).lower().strip()
+
+
+def _scorer(name: str) -> Callable[..., float]:
+    module = rf_fuzz if RAPIDFUZZ_AVAILABLE else tf_fuzz
+    if module is None:
+        raise RuntimeError("No fuzzy matching library installed ('rapidfuzz' or 'thefuzz').")
+    return {'wratio': module.WRatio, 'ratio': module.ratio, 'token_sort_ratio': module.token_sort_ratio}[name]
+
+
+def fuzzy_ratio(a: str, b: str) -> float:
+    """Plain (case-insensitive) Levenshtein ratio between two titles."""
+    return float(_scorer('ratio')(str(a).lower(), str(b).lower()))
+
+
+class TitleMatcher:
+    """Scores queries against a fixed candidate list; build once, query many times."""
+
+    def __init__(self, candidates: Sequence[str], scorer: str = 'wratio'):
+        self.candidates = [str(c) for c in candidates]
+        self._processed = [preprocess_for_scoring(c) for c in self.candidates]
+        self._scorer = _scorer(scorer)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def extract(self, query: str, limit: Optional[int] = 5, score_cutoff: float = 0) -> List[Match]:
+        """Best candidates for query, highest score first (ties keep candidate order)."""
+        processed_query = preprocess_for_scoring(query)
+        if not processed_query or not self._processed:
+            return []
+        if RAPIDFUZZ_AVAILABLE:
+            results = rf_process.extract(processed_query, self._processed, scorer=self._scorer, processor=None, limit=limit, score_cutoff=score_cutoff)
+            return [(index, float(score)) for _choice, score, index in results]
+        scored = [(i, float(self._scorer(processed_query, c))) for i, c in enumerate(self._processed)]
+        scored = sorted((m for m in scored if m[1] >= score_cutoff), key=lambda m: -m[1])
+        return scored[:limit] if limit is not None else scored
+
+    def best(self, query: str, score_cutoff: float = 0) -> Optional[Match]:
+        matches = self.extract(query, limit=1, score_cutoff=score_cutoff)
+        return matches[0] if matches else None
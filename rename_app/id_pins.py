@@ -0,0 +1,120 @@
+# rename_app/id_pins.py
+"""
+Persistent provider-ID pins.
+
+A pin says "files in this directory" or "this normalized title" belong to a given
+TMDB/TVDB ID. Pins are written when the user confirms a match interactively (or picks
+one by ID) and are consulted before any search, so later runs over the same show
+folder resolve every file through one direct-ID fetch instead of per-file searches.
+
+Directory pins are only kept while a directory maps to a single ID: confirming a
+different ID for the same directory marks it ambiguous (flat "TV" folders holding
+several shows), after which only the title pins apply there.
+"""
+
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .title_aliases import normalize_title
+
+log = logging.getLogger(__name__)
+
+PIN_DB_FILENAME = "id_pins.sqlite3"
+
+
+@dataclass(frozen=True)
+class IdPin:
+    source: str # 'tmdb' or 'tvdb'
+    provider_id: int
+
+
+_PinKey = Tuple[str, str, str] # (kind, scope 'dir'/'title', key)
+
+
+def _title_key(kind: str, title: str, year: Optional[int]) -> Optional[str]:
+    norm = normalize_title(title)
+    if not norm: return None
+    # Movies share titles across remakes, so their pins include the year; a show's title is enough.
+    return f"{norm}|{int(year)}" if kind == 'movie' and year else norm
+
+
+class IdPinStore:
+    """SQLite-backed, fully cached in memory; only written when a pin changes."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS id_pins (
+                kind TEXT NOT NULL, scope TEXT NOT NULL, pin_key TEXT NOT NULL,
+                source TEXT, provider_id INTEGER, title TEXT, updated_at REAL NOT NULL,
+                PRIMARY KEY (kind, scope, pin_key)
+            )""") # source/provider_id NULL: ambiguous directory
+        self._conn.commit()
+        self._pins: Dict[_PinKey, Optional[IdPin]] = {
+            (kind, scope, key): IdPin(source, provider_id) if provider_id is not None else None
+            for kind, scope, key, source, provider_id in self._conn.execute(
+                "SELECT kind, scope, pin_key, source, provider_id FROM id_pins")
+        }
+        log.debug(f"ID pin store loaded from {self.db_path}: {len(self._pins)} pins.")
+
+    def __len__(self) -> int:
+        return sum(1 for pin in self._pins.values() if pin is not None)
+
+    def lookup(self, kind: str, directory: Optional[Path], title: Optional[str], year: Optional[int] = None) -> Optional[IdPin]:
+        """The title pin if there is one, else the directory pin (series only)."""
+        title_key = _title_key(kind, title, year) if title else None
+        if title_key and self._pins.get((kind, 'title', title_key)):
+            return self._pins[(kind, 'title', title_key)]
+        if kind == 'series' and directory is not None:
+            return self._pins.get((kind, 'dir', str(directory)))
+        return None
+
+    def pin(self, kind: str, directory: Optional[Path], title: Optional[str], year: Optional[int], source: str, provider_id: int) -> None:
+        new_pin = IdPin(source, int(provider_id))
+        rows = []
+        title_key = _title_key(kind, title, year) if title else None
+        if title_key and self._pins.get((kind, 'title', title_key)) != new_pin:
+            rows.append((kind, 'title', title_key, new_pin))
+        # A movie directory usually holds many movies; only season/show folders are pinned as a whole.
+        if kind == 'series' and directory is not None:
+            dir_key: _PinKey = (kind, 'dir', str(directory))
+            if dir_key not in self._pins:
+                rows.append((*dir_key, new_pin))
+            elif self._pins[dir_key] is not None and self._pins[dir_key] != new_pin:
+                log.info(f"Directory '{directory}' now holds more than one pinned show; only title pins apply there.")
+                rows.append((*dir_key, None))
+        if not rows: return
+        for kind_, scope, key, pin in rows:
+            self._pins[(kind_, scope, key)] = pin
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO id_pins (kind, scope, pin_key, source, provider_id, title, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(k, s, key, p.source if p else None, p.provider_id if p else None, title, time.time()) for k, s, key, p in rows])
+            log.debug(f"Pinned {kind} '{title}' ({directory}) -> {source.upper()} ID {provider_id}")
+        except sqlite3.Error as e:
+            log.warning(f"Could not persist ID pin for '{title}': {e}")
+
+    def unpin(self, target: str) -> int:
+        """Drops the pins for a directory path or a title (any kind/year). Returns the number removed."""
+        norm = normalize_title(target)
+        dir_key = str(Path(target).expanduser().resolve())
+        doomed = [k for k in self._pins
+                  if (k[1] == 'dir' and k[2] == dir_key) or (k[1] == 'title' and norm and k[2].split('|')[0] == norm)]
+        for k in doomed:
+            del self._pins[k]
+        try:
+            with self._conn:
+                self._conn.executemany("DELETE FROM id_pins WHERE kind = ? AND scope = ? AND pin_key = ?", doomed)
+        except sqlite3.Error as e:
+            log.warning(f"Could not delete ID pins for '{target}': {e}")
+        return len(doomed)
+
+    def close(self) -> None:
+        self._conn.close()
@@ -1,27 +1,34 @@
 # rename_app/main_processor.py
 import logging
+import sqlite3
 import uuid
 import builtins
 import sys
 # import time
 import asyncio
-import shutil
+import dataclasses
+from contextlib import AsyncExitStack
+from functools import partial
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Tuple, Optional, Dict, Any, cast, List, Deque, TYPE_CHECKING, Union
+from typing import Tuple, Optional, Dict, Any, cast, List, Deque, Sequence, TYPE_CHECKING, Union, Iterator, Callable, Awaitable
 
 from collections import deque
 
-from .metadata_fetcher import MetadataFetcher, DIRECT_ID_MATCH_SCORE
+from .metadata_fetcher import MetadataFetcher, DIRECT_ID_MATCH_SCORE, resolve_cache_directory
+from .id_pins import PIN_DB_FILENAME, IdPinStore
+from .offline_index import offline_index_configured
 from .renamer_engine import RenamerEngine
 from .file_system_ops import perform_file_actions, _handle_conflict, FileOperationError
+from .async_file_ops import AsyncFileOps
 from .utils import scan_media_files
 from .exceptions import UserAbortError, RenamerError, MetadataError
 from .models import MediaInfo, RenamePlan, MediaMetadata
 from .api_clients import get_tmdb_client, get_tvdb_client
 from .enums import ProcessingStatus
 from .undo_manager import UndoManager
-from .config_manager import ConfigHelper
+from .config_manager import ConfigHelper, EffectiveSettings
+from .title_aliases import normalize_title
 from .ui_utils import (
     ConsoleClass, TextClass, PanelClass, TableClass, ProgressClass,
     GroupClass,
@@ -78,13 +85,49 @@ def _print_stderr_message_processor(console_obj: ConsoleClass, message: Any, is_
         console_obj.print(message, file=sys.stderr)
         
 
+def _batch_file_paths(batch_data: Dict[str, Any]) -> List[Path]:
+    """The video and associated files of a scanned batch."""
+    return [Path(p) for p in [batch_data.get('video'), *batch_data.get('associated', [])] if p]
+
+
+def _guessed_title(guess_info: Dict[str, Any], original_path: Path, batch_stem: str) -> str:
+    """Title to search the APIs with: guessit's (first) title, else the file stem."""
+    guessed_title_raw = guess_info.get('title')
+    guessed_title = str(guessed_title_raw[0] if isinstance(guessed_title_raw, list) and guessed_title_raw else guessed_title_raw if isinstance(guessed_title_raw, str) and guessed_title_raw else original_path.stem)
+    if not guessed_title_raw or (isinstance(guessed_title_raw, list) and not guessed_title_raw[0]): log.debug(f"Guessed title empty for '{batch_stem}', using stem: '{guessed_title}'")
+    return guessed_title
+
+
+def _guessed_episode_numbers(guess_info: Dict[str, Any], batch_stem: str) -> List[int]:
+    """Sorted, de-duplicated positive episode numbers from guessit data."""
+    raw_episode_data: Any = None; valid_ep_list: List[int] = []
+    if isinstance(guess_info.get('episode_list'), list): raw_episode_data = guess_info['episode_list']
+    elif 'episode' in guess_info: raw_episode_data = guess_info['episode']
+    elif 'episode_number' in guess_info: raw_episode_data = guess_info['episode_number']
+    if raw_episode_data is not None:
+        ep_data_list = raw_episode_data if isinstance(raw_episode_data, list) else [raw_episode_data]
+        for ep in ep_data_list:
+            try:
+                ep_int = int(str(ep)) # Attempt conversion
+                if ep_int > 0:        # Check and append ONLY if conversion succeeded
+                    valid_ep_list.append(ep_int)
+            except (ValueError, TypeError): # Catch errors from int(str(ep))
+                log.warning(f"Could not parse episode number '{ep}' from guessit data for '{batch_stem}'.")
+    return sorted(list(set(valid_ep_list)))
+
+
 async def _fetch_metadata_for_batch(
     processor: "MainProcessor", 
     batch_stem: str,
     batch_data: Dict[str, Any],
     progress: Optional[ProgressClass] = None,
-    task_id: Optional[TaskIDClass] = None
+    task_id: Optional[TaskIDClass] = None,
+    episode_sets: Sequence[Tuple[int, ...]] = ()
 ) -> Tuple[str, MediaInfo]: 
+    """
+    episode_sets (series groups): the episode lists of every file in the batch's show/season group.
+    Their union is fetched in one lookup and each set is cached individually.
+    """
     video_path_for_media_info = batch_data.get('video')
     if not video_path_for_media_info:
         log.error(f"CRITICAL in _fetch_metadata_for_batch: video_path is None for stem '{batch_stem}'. Using dummy.")
@@ -129,6 +172,13 @@ async def _fetch_metadata_for_batch(
             
             year_guess = media_info.guess_info.get('year')
             fetched_api_metadata: Optional[MediaMetadata] = None
+            if not (forced_tmdb_id or forced_tvdb_id) and processor.id_pins is not None and media_info.file_type in ('series', 'movie'):
+                pin = processor.id_pins.lookup(media_info.file_type, media_info.original_path.parent,
+                                               _guessed_title(media_info.guess_info, media_info.original_path, batch_stem), year_guess)
+                if pin and (pin.source == 'tmdb' or media_info.file_type == 'series'):
+                    log.info(f"Using pinned {pin.source.upper()} ID {pin.provider_id} for '{batch_stem}'; skipping search.")
+                    if pin.source == 'tvdb': forced_tvdb_id = pin.provider_id
+                    else: forced_tmdb_id = pin.provider_id
             try:
                 effective_file_type = media_info.file_type
                 if effective_file_type == 'unknown':
@@ -136,38 +186,22 @@ async def _fetch_metadata_for_batch(
                     elif forced_tmdb_id: effective_file_type = 'movie' 
 
                 if effective_file_type == 'series':
-                    raw_episode_data: Any = None; valid_ep_list: List[int] = []
-                    if isinstance(media_info.guess_info.get('episode_list'), list): raw_episode_data = media_info.guess_info['episode_list']
-                    elif 'episode' in media_info.guess_info: raw_episode_data = media_info.guess_info['episode']
-                    elif 'episode_number' in media_info.guess_info: raw_episode_data = media_info.guess_info['episode_number']
-                    if raw_episode_data is not None:
-                        ep_data_list = raw_episode_data if isinstance(raw_episode_data, list) else [raw_episode_data]
-                        for ep in ep_data_list:
-                            try: 
-                                ep_int = int(str(ep)) # Attempt conversion
-                                if ep_int > 0:        # Check and append ONLY if conversion succeeded
-                                    valid_ep_list.append(ep_int)
-                            except (ValueError, TypeError): # Catch errors from int(str(ep))
-                                log.warning(f"Could not parse episode number '{ep}' from guessit data for '{batch_stem}'.")
-                    valid_ep_list = sorted(list(set(valid_ep_list)))
+                    valid_ep_list = _guessed_episode_numbers(media_info.guess_info, batch_stem)
+                    if episode_sets: valid_ep_list = sorted(set(valid_ep_list).union(*episode_sets))
                     log.debug(f"Final valid episode list for API call for '{batch_stem}': {valid_ep_list}")
-                    guessed_title_raw = media_info.guess_info.get('title')
-                    guessed_title = str(guessed_title_raw[0] if isinstance(guessed_title_raw, list) and guessed_title_raw else guessed_title_raw if isinstance(guessed_title_raw, str) and guessed_title_raw else media_info.original_path.stem)
-                    if not guessed_title_raw or (isinstance(guessed_title_raw, list) and not guessed_title_raw[0]): log.debug(f"Guessed title empty for series '{batch_stem}', using stem: '{guessed_title}'")
+                    guessed_title = _guessed_title(media_info.guess_info, media_info.original_path, batch_stem)
 
                     if valid_ep_list or forced_tmdb_id or forced_tvdb_id: 
                         fetched_api_metadata = await processor.metadata_fetcher.fetch_series_metadata(
                             show_title_guess=guessed_title, season_num=media_info.guess_info.get('season', 0),
                             episode_num_list=tuple(valid_ep_list), year_guess=year_guess,
-                            force_tmdb_id=forced_tmdb_id, force_tvdb_id=forced_tvdb_id
+                            force_tmdb_id=forced_tmdb_id, force_tvdb_id=forced_tvdb_id, cache_episode_sets=episode_sets
                         )
                     else: log.warning(f"No valid episode numbers and no forced ID for series '{batch_stem}'. Skipping series metadata fetch.")
                 
                 elif effective_file_type == 'movie':
-                    guessed_title_raw = media_info.guess_info.get('title')
-                    guessed_title = str(guessed_title_raw[0] if isinstance(guessed_title_raw, list) and guessed_title_raw else guessed_title_raw if isinstance(guessed_title_raw, str) and guessed_title_raw else media_info.original_path.stem)
-                    if not guessed_title_raw or (isinstance(guessed_title_raw, list) and not guessed_title_raw[0]): log.debug(f"Guessed title empty for movie '{batch_stem}', using stem: '{guessed_title}'")
-                    
+                    guessed_title = _guessed_title(media_info.guess_info, media_info.original_path, batch_stem)
+
                     fetched_api_metadata = await processor.metadata_fetcher.fetch_movie_metadata(
                         movie_title_guess=guessed_title, year_guess=year_guess, force_tmdb_id=forced_tmdb_id
                     )
@@ -207,9 +241,52 @@ async def _fetch_metadata_for_batch(
                 try: progress.update(task_id, advance=1, item_name="")
                 except Exception as e_prog_final: log.error(f"Error finalizing progress bar item name in fetch: {e_prog_final}")
 
+def _episode_subset(metadata: Optional[MediaMetadata], episodes: Sequence[int]) -> Optional[MediaMetadata]:
+    """A copy of a season-group's series metadata narrowed to one file's episodes."""
+    if metadata is None: return None
+    return dataclasses.replace(
+        metadata, ids=dict(metadata.ids), episode_list=list(episodes),
+        episode_titles={ep: t for ep, t in metadata.episode_titles.items() if ep in episodes},
+        air_dates={ep: d for ep, d in metadata.air_dates.items() if ep in episodes}
+    )
+
+
+async def _fetch_metadata_for_series_group(
+    processor: "MainProcessor",
+    stems: List[str],
+    file_batches: Dict[str, Dict[str, Any]],
+    parsed_infos: Dict[str, Optional[MediaInfo]],
+    episode_sets: Dict[str, Tuple[int, ...]],
+    progress: Optional[ProgressClass] = None,
+    task_id: Optional[TaskIDClass] = None
+) -> List[Tuple[str, MediaInfo]]:
+    """One metadata resolution for every file of a (title, year, season) group, fanned out per file."""
+    leader_stem = stems[0]
+    _, leader_info = await _fetch_metadata_for_batch(
+        processor, leader_stem, file_batches[leader_stem], progress, task_id,
+        episode_sets=[episode_sets[stem] for stem in stems]
+    )
+    results: List[Tuple[str, MediaInfo]] = []
+    for stem in stems:
+        member_info = MediaInfo(original_path=file_batches[stem]['video'])
+        parsed_info = parsed_infos.get(stem) # Phase 1 already parsed every member
+        member_info.guess_info = leader_info.guess_info if stem == leader_stem or not parsed_info else parsed_info.guess_info
+        member_info.file_type = leader_info.file_type
+        member_info.metadata = _episode_subset(leader_info.metadata, episode_sets[stem])
+        member_info.metadata_error_message = leader_info.metadata_error_message
+        results.append((stem, member_info))
+    if progress and task_id is not None and len(stems) > 1:
+        try: progress.update(task_id, advance=len(stems) - 1)
+        except Exception as e_prog_group: log.error(f"Error advancing progress bar for series group: {e_prog_group}")
+    return results
+
+
 class MainProcessor:
-    def __init__(self, args, cfg_helper: ConfigHelper, undo_manager: UndoManager):
+    def __init__(self, args, cfg_helper: Union[EffectiveSettings, ConfigHelper], undo_manager: UndoManager):
         self.args = args
+        if isinstance(cfg_helper, ConfigHelper):
+            # Per-file lookups go through the frozen snapshot, never the dynamic resolver
+            cfg_helper = cfg_helper.snapshot()
         self.cfg = cfg_helper
         self.undo_manager = undo_manager
         self.renamer = RenamerEngine(cfg_helper)
@@ -225,7 +302,7 @@ class MainProcessor:
 
         if use_metadata_effective:
              log.info("Metadata fetching will be attempted (enabled by config/args or CLI ID).")
-             if get_tmdb_client() or get_tvdb_client():
+             if get_tmdb_client() or get_tvdb_client() or offline_index_configured(cfg_helper):
                  self.metadata_fetcher = MetadataFetcher(cfg_helper, console=self.console)
                  if cli_forced_id and (cli_use_metadata_arg is None or not cli_use_metadata_arg):
                      self.args.use_metadata = True
@@ -242,6 +319,27 @@ class MainProcessor:
             log.info("Metadata fetching disabled (not enabled in config/args and no CLI ID provided).")
             self.args.use_metadata = False 
 
+        self.file_ops = AsyncFileOps.from_config(self.cfg) # Blocking file operations run here, off the event loop
+        self._dir_locks: Dict[str, asyncio.Lock] = {}
+        self.id_pins: Optional[IdPinStore] = None
+        if self.metadata_fetcher and self.cfg('id_pinning_enabled', True):
+            pin_dir = resolve_cache_directory(self.cfg)
+            try:
+                if pin_dir: self.id_pins = IdPinStore(pin_dir / PIN_DB_FILENAME)
+            except (OSError, sqlite3.Error) as e:
+                log.warning(f"Could not open ID pin store in '{pin_dir}': {e}. Confirmed matches will not be pinned.")
+
+    def _pin_confirmed_match(self, media_info: MediaInfo, source: Optional[str] = None, provider_id: Optional[int] = None) -> None:
+        """Remembers a user-confirmed match for the file's directory and title, so later runs skip the search."""
+        if self.id_pins is None or media_info.file_type not in ('series', 'movie'): return
+        if source is None and media_info.metadata and media_info.metadata.source_api:
+            source = media_info.metadata.source_api
+            provider_id = media_info.metadata.ids.get(f"{source}_id")
+        if not source or not provider_id or (source == 'tvdb' and media_info.file_type != 'series'): return
+        guess_info = media_info.guess_info or {}
+        title = _guessed_title(guess_info, media_info.original_path, media_info.original_path.stem)
+        self.id_pins.pin(media_info.file_type, media_info.original_path.parent, title, guess_info.get('year'), source, int(provider_id))
+
     def _display_plan_for_confirmation(self, plan: RenamePlan, media_info: MediaInfo):
         if not plan:
             self.console.print(f"[yellow]No valid rename plan generated for {media_info.original_path.name} to display for confirmation.[/yellow]")
@@ -443,7 +541,7 @@ class MainProcessor:
             self.console.print(f"\n[bold red]ERROR: Could not get confirmation: {e}[/bold red]", file=sys.stderr)
             return False
 
-    def _handle_move_to_unknown(self, batch_stem: str, batch_data: Dict[str, Any], run_batch_id: str) -> Dict[str, Any]:
+    async def _handle_move_to_unknown(self, batch_stem: str, batch_data: Dict[str, Any], run_batch_id: str) -> Dict[str, Any]:
         results: Dict[str, Any] = {'move_success': False, 'message': "", 'actions_taken': 0, 'fs_errors': 0}
         action_messages: List[str] = []
         unknown_dir_str_from_args = getattr(self.args, 'unknown_files_dir', None)
@@ -468,21 +566,22 @@ class MainProcessor:
 
         if not is_live_run:
             dry_run_actions_count = 0
-            if not unknown_target_dir.exists():
+            unknown_dir_exists = await self.file_ops.exists(unknown_target_dir)
+            if not unknown_dir_exists:
                 action_messages.append(f"DRY RUN: [{ProcessingStatus.SUCCESS}] Would create directory '{unknown_target_dir}'")
                 dry_run_actions_count += 1
             
             all_files_in_batch: List[Optional[Path]] = [batch_data.get('video')] + batch_data.get('associated', [])
-            files_to_log_dry_run = [f for f in all_files_in_batch if f and isinstance(f, Path) and f.exists()]
+            files_to_log_dry_run = [f for f in all_files_in_batch if f and isinstance(f, Path) and await self.file_ops.exists(f)]
 
-            if not files_to_log_dry_run and unknown_target_dir.exists():
+            if not files_to_log_dry_run and unknown_dir_exists:
                 action_messages.append(f"DRY RUN: [{ProcessingStatus.SKIPPED}] No files to move for '{batch_stem}' to existing '{unknown_target_dir}'.")
             
             for file_path in files_to_log_dry_run:
                 sim_dest_path = unknown_target_dir / file_path.name
                 try:
                     # Simplified dry run conflict check for _handle_move_to_unknown
-                    if sim_dest_path.exists():
+                    if await self.file_ops.exists(sim_dest_path):
                         if self.cfg('on_conflict', 'skip') == 'skip':
                             raise FileOperationError(f"Target '{sim_dest_path.name}' exists (mode: skip)")
                         elif self.cfg('on_conflict', 'skip') == 'fail':
@@ -500,80 +599,82 @@ class MainProcessor:
             return results
 
         # Live run part of _handle_move_to_unknown
-        try:
-            if not unknown_target_dir.exists():
-                log.info(f"Creating unknown files directory: {unknown_target_dir}")
-                unknown_target_dir.mkdir(parents=True, exist_ok=True)
-                if self.undo_manager.is_enabled:
-                    self.undo_manager.log_action(batch_id=run_batch_id, original_path=unknown_target_dir, new_path=unknown_target_dir, item_type='dir', status='created_dir')
-                action_messages.append(f"[{ProcessingStatus.SUCCESS}] CREATED DIR (unknowns): '{unknown_target_dir}'")
-                results['actions_taken'] +=1 
-        except OSError as e:
-            msg = f"[{ProcessingStatus.FILE_OPERATION_ERROR}] {base_message_prefix}Could not create directory '{unknown_target_dir}': {e}"
-            log.error(msg, exc_info=True); results['message'] = msg; results['fs_errors'] += 1
-            return results
-
-        conflict_mode = self.cfg('on_conflict', 'skip')
-        files_to_move_live: List[Optional[Path]] = [batch_data.get('video')] + batch_data.get('associated', [])
-        files_moved_successfully = 0; files_to_move_count = 0
-
-        for original_file_path_live in files_to_move_live:
-            if not original_file_path_live or not isinstance(original_file_path_live, Path): continue
-            if not original_file_path_live.exists():
-                log.warning(f"Skipping move of non-existent file: {original_file_path_live}"); continue
+        # Concurrent batches share this directory: existence checks and suffix probing must not interleave.
+        async with self._dir_locks.setdefault(str(unknown_target_dir), asyncio.Lock()):
+            try:
+                if not await self.file_ops.exists(unknown_target_dir):
+                    log.info(f"Creating unknown files directory: {unknown_target_dir}")
+                    await self.file_ops.mkdir(unknown_target_dir, parents=True, exist_ok=True)
+                    if self.undo_manager.is_enabled:
+                        await self.file_ops.run(self.undo_manager.log_action, batch_id=run_batch_id, original_path=unknown_target_dir, new_path=unknown_target_dir, item_type='dir', status='created_dir')
+                    action_messages.append(f"[{ProcessingStatus.SUCCESS}] CREATED DIR (unknowns): '{unknown_target_dir}'")
+                    results['actions_taken'] +=1 
+            except OSError as e:
+                msg = f"[{ProcessingStatus.FILE_OPERATION_ERROR}] {base_message_prefix}Could not create directory '{unknown_target_dir}': {e}"
+                log.error(msg, exc_info=True); results['message'] = msg; results['fs_errors'] += 1
+                return results
+
+            conflict_mode = self.cfg('on_conflict', 'skip')
+            files_to_move_live: List[Optional[Path]] = [batch_data.get('video')] + batch_data.get('associated', [])
+            files_moved_successfully = 0; files_to_move_count = 0
+
+            for original_file_path_live in files_to_move_live:
+                if not original_file_path_live or not isinstance(original_file_path_live, Path): continue
+                if not await self.file_ops.exists(original_file_path_live):
+                    log.warning(f"Skipping move of non-existent file: {original_file_path_live}"); continue
             
-            files_to_move_count += 1
-            target_file_path_in_unknown_dir = unknown_target_dir / original_file_path_live.name
-            final_target_path_for_move = target_file_path_in_unknown_dir # Default unless conflict is handled
+                files_to_move_count += 1
+                target_file_path_in_unknown_dir = unknown_target_dir / original_file_path_live.name
+                final_target_path_for_move = target_file_path_in_unknown_dir # Default unless conflict is handled
 
-            try:
-                # Simplified conflict handling for move_to_unknown for now.
-                # For full robustness, this would use the shared _handle_conflict from file_system_ops if it were easily accessible.
-                if target_file_path_in_unknown_dir.exists():
-                    if conflict_mode == 'skip':
-                        raise FileOperationError(f"Target '{target_file_path_in_unknown_dir.name}' exists in unknown_dir (mode: skip).")
-                    elif conflict_mode == 'fail':
-                        # This should stop processing of this batch if conflict_mode is 'fail'
-                        raise FileExistsError(f"Target '{target_file_path_in_unknown_dir.name}' exists in unknown_dir (mode: fail). Stopping.")
-                    elif conflict_mode == 'suffix':
-                        counter = 1
-                        original_stem_unknown = target_file_path_in_unknown_dir.stem
-                        original_ext_unknown = target_file_path_in_unknown_dir.suffix
-                        suffixed_path = target_file_path_in_unknown_dir
-                        while suffixed_path.exists():
-                            suffixed_path = unknown_target_dir / f"{original_stem_unknown}_{counter}{original_ext_unknown}"
-                            counter += 1
-                            if counter > 100: raise FileOperationError("Too many suffixes for unknown file, stopping.")
-                        final_target_path_for_move = suffixed_path
-                        log.info(f"Conflict in unknown_dir: Using suffixed name '{final_target_path_for_move.name}' for original '{original_file_path_live.name}'.")
-                    # 'overwrite' is handled by shutil.move implicitly if target exists
+                try:
+                    # Simplified conflict handling for move_to_unknown for now.
+                    # For full robustness, this would use the shared _handle_conflict from file_system_ops if it were easily accessible.
+                    if await self.file_ops.exists(target_file_path_in_unknown_dir):
+                        if conflict_mode == 'skip':
+                            raise FileOperationError(f"Target '{target_file_path_in_unknown_dir.name}' exists in unknown_dir (mode: skip).")
+                        elif conflict_mode == 'fail':
+                            # This should stop processing of this batch if conflict_mode is 'fail'
+                            raise FileExistsError(f"Target '{target_file_path_in_unknown_dir.name}' exists in unknown_dir (mode: fail). Stopping.")
+                        elif conflict_mode == 'suffix':
+                            counter = 1
+                            original_stem_unknown = target_file_path_in_unknown_dir.stem
+                            original_ext_unknown = target_file_path_in_unknown_dir.suffix
+                            suffixed_path = target_file_path_in_unknown_dir
+                            while await self.file_ops.exists(suffixed_path):
+                                suffixed_path = unknown_target_dir / f"{original_stem_unknown}_{counter}{original_ext_unknown}"
+                                counter += 1
+                                if counter > 100: raise FileOperationError("Too many suffixes for unknown file, stopping.")
+                            final_target_path_for_move = suffixed_path
+                            log.info(f"Conflict in unknown_dir: Using suffixed name '{final_target_path_for_move.name}' for original '{original_file_path_live.name}'.")
+                        # 'overwrite' is handled by shutil.move implicitly if target exists
                 
-                if self.undo_manager.is_enabled:
-                    self.undo_manager.log_action(batch_id=run_batch_id, original_path=original_file_path_live, new_path=final_target_path_for_move, item_type='file', status='moved')
+                    if self.undo_manager.is_enabled:
+                        await self.file_ops.run(self.undo_manager.log_action, batch_id=run_batch_id, original_path=original_file_path_live, new_path=final_target_path_for_move, item_type='file', status='moved')
                 
-                log.debug(f"Moving '{original_file_path_live.name}' to '{final_target_path_for_move}' for unknown handling.")
-                shutil.move(str(original_file_path_live), str(final_target_path_for_move))
-                action_messages.append(f"[{ProcessingStatus.SUCCESS}] MOVED (unknown): '{original_file_path_live.name}' to '{final_target_path_for_move}'")
-                results['actions_taken'] += 1; files_moved_successfully += 1
-            except FileExistsError as e_fe: # Specifically for 'fail' mode
-                msg = f"[{ProcessingStatus.PLAN_TARGET_EXISTS_FAIL_MODE}] ERROR (move unknown): {e_fe} - File '{original_file_path_live.name}' not moved."
-                log.error(msg); action_messages.append(msg); results['fs_errors'] += 1
-                raise # Re-raise to stop further processing of this batch if 'fail' mode
-            except FileOperationError as e_foe: # For 'skip' mode or suffixing errors
-                msg = f"[{ProcessingStatus.PLAN_TARGET_EXISTS_SKIP_MODE}] SKIPPED (move unknown): {e_foe} - File '{original_file_path_live.name}' not moved."
-                log.warning(msg); action_messages.append(msg)
-                # Do not increment fs_errors for explicit skip
-            except OSError as e_os:
-                msg = f"[{ProcessingStatus.FILE_OPERATION_ERROR}] ERROR (move unknown): Failed to move '{original_file_path_live.name}': {e_os}"
-                log.error(msg, exc_info=True); action_messages.append(msg); results['fs_errors'] += 1
-            except Exception as e_generic:
-                msg = f"[{ProcessingStatus.INTERNAL_ERROR}] ERROR (move unknown): Unexpected error for '{original_file_path_live.name}': {e_generic}"
-                log.exception(msg); action_messages.append(msg); results['fs_errors'] += 1
+                    log.debug(f"Moving '{original_file_path_live.name}' to '{final_target_path_for_move}' for unknown handling.")
+                    await self.file_ops.move(original_file_path_live, final_target_path_for_move)
+                    action_messages.append(f"[{ProcessingStatus.SUCCESS}] MOVED (unknown): '{original_file_path_live.name}' to '{final_target_path_for_move}'")
+                    results['actions_taken'] += 1; files_moved_successfully += 1
+                except FileExistsError as e_fe: # Specifically for 'fail' mode
+                    msg = f"[{ProcessingStatus.PLAN_TARGET_EXISTS_FAIL_MODE}] ERROR (move unknown): {e_fe} - File '{original_file_path_live.name}' not moved."
+                    log.error(msg); action_messages.append(msg); results['fs_errors'] += 1
+                    raise # Re-raise to stop further processing of this batch if 'fail' mode
+                except FileOperationError as e_foe: # For 'skip' mode or suffixing errors
+                    msg = f"[{ProcessingStatus.PLAN_TARGET_EXISTS_SKIP_MODE}] SKIPPED (move unknown): {e_foe} - File '{original_file_path_live.name}' not moved."
+                    log.warning(msg); action_messages.append(msg)
+                    # Do not increment fs_errors for explicit skip
+                except OSError as e_os:
+                    msg = f"[{ProcessingStatus.FILE_OPERATION_ERROR}] ERROR (move unknown): Failed to move '{original_file_path_live.name}': {e_os}"
+                    log.error(msg, exc_info=True); action_messages.append(msg); results['fs_errors'] += 1
+                except Exception as e_generic:
+                    msg = f"[{ProcessingStatus.INTERNAL_ERROR}] ERROR (move unknown): Unexpected error for '{original_file_path_live.name}': {e_generic}"
+                    log.exception(msg); action_messages.append(msg); results['fs_errors'] += 1
         
-        results['move_success'] = (files_to_move_count > 0 and files_moved_successfully == files_to_move_count) and (results['fs_errors'] == 0)
-        if not action_messages: action_messages.append(f"[{ProcessingStatus.SKIPPED}] {base_message_prefix}No files moved to unknown.")
-        results['message'] = "\n".join(action_messages)
-        return results
+            results['move_success'] = (files_to_move_count > 0 and files_moved_successfully == files_to_move_count) and (results['fs_errors'] == 0)
+            if not action_messages: action_messages.append(f"[{ProcessingStatus.SKIPPED}] {base_message_prefix}No files moved to unknown.")
+            results['message'] = "\n".join(action_messages)
+            return results
     
     def _perform_prescan(self, file_batches: Dict[str, Dict[str, Any]], batch_count: int, initial_media_infos_for_prescan: Dict[str, Optional[MediaInfo]]) -> int:
         log.info("Performing synchronous pre-scan for live run confirmation...")
@@ -653,6 +754,25 @@ class MainProcessor:
                     initial_media_infos[stem] = None 
         return initial_media_infos
 
+    def _group_series_stems(self, stems: List[str], media_infos: Dict[str, Optional[MediaInfo]]) -> Tuple[List[List[str]], Dict[str, Tuple[int, ...]]]:
+        """
+        Groups parsed episode files by (normalized title, year, season). Returns the groups with more
+        than one member and each grouped stem's episode numbers; everything else is fetched per file.
+        """
+        groups: Dict[Tuple[str, Any, Any], List[str]] = {}
+        episode_sets: Dict[str, Tuple[int, ...]] = {}
+        for stem in stems:
+            info = media_infos.get(stem)
+            if not info or info.file_type != 'series' or not info.guess_info: continue
+            episodes = tuple(_guessed_episode_numbers(info.guess_info, stem))
+            norm_title = normalize_title(_guessed_title(info.guess_info, info.original_path, stem))
+            if not episodes or not norm_title: continue
+            episode_sets[stem] = episodes
+            groups.setdefault((norm_title, info.guess_info.get('year'), info.guess_info.get('season', 0)), []).append(stem)
+        multi_member_groups = [group for group in groups.values() if len(group) > 1]
+        grouped = {stem for group in multi_member_groups for stem in group}
+        return multi_member_groups, {stem: eps for stem, eps in episode_sets.items() if stem in grouped}
+
     async def _fetch_all_metadata( self, file_batches: Dict[str, Dict[str, Any]], initial_media_infos: Dict[str, Optional[MediaInfo]] ) -> Dict[str, Optional[MediaInfo]]:
         use_metadata_effective = getattr(self.args, 'use_metadata', False)
 
@@ -664,33 +784,26 @@ class MainProcessor:
                  self.console.print("[yellow]Metadata fetching is disabled. Proceeding with filename parsing data only.[/yellow]")
             return initial_media_infos
        
-        stems_to_fetch = [ stem for stem, info in initial_media_infos.items() 
-                           if info and (info.file_type != 'unknown' or \
-                                        getattr(self.args, 'tmdb_id', None) is not None or \
-                                        getattr(self.args, 'tvdb_id', None) is not None) ]
-        
+        stems_to_fetch = self._stems_to_fetch(initial_media_infos)
         log.info(f"Phase 2: Creating {len(stems_to_fetch)} tasks for concurrent metadata fetching...")
         if not stems_to_fetch:
             log.info("No batches required metadata fetching.")
             return initial_media_infos
 
-        fetch_tasks: List[asyncio.Task[Tuple[str, MediaInfo]]] = []
+        fetch_tasks: List[asyncio.Task[Any]] = []
         disable_rich_progress = getattr(self.args, 'quiet', False) or getattr(self.args, 'interactive', False) or not RICH_AVAILABLE
         
         with ProgressClass(*DEFAULT_PROGRESS_COLUMNS, console=self.console, disable=disable_rich_progress) as progress_bar:
             metadata_overall_task: TaskIDClass = progress_bar.add_task("Fetching Metadata", total=len(stems_to_fetch), item_name="")
-            for stem in stems_to_fetch:
-                batch_data = file_batches[stem]
-                task = asyncio.create_task(
-                    _fetch_metadata_for_batch(self, stem, batch_data, progress_bar, metadata_overall_task), 
-                    name=f"fetch_{stem}"
-                )
-                fetch_tasks.append(task)
+            for fetch_stems, fetch in self._iter_metadata_fetches(stems_to_fetch, file_batches, initial_media_infos, progress_bar, metadata_overall_task):
+                fetch_tasks.append(asyncio.create_task(fetch(), name=f"fetch_{fetch_stems[0]}"))
             
             completed_fetch_results_tuples: List[Tuple[str, MediaInfo]] = []
             try:
                 for f_task_completed in asyncio.as_completed(fetch_tasks):
-                    completed_fetch_results_tuples.append(await f_task_completed)
+                    task_result = await f_task_completed
+                    if isinstance(task_result, list): completed_fetch_results_tuples.extend(task_result)
+                    else: completed_fetch_results_tuples.append(task_result)
             except Exception as e_async_task_collection:
                 log.error(f"Error collecting results from async metadata tasks: {e_async_task_collection}")
 
@@ -708,16 +821,51 @@ class MainProcessor:
         for result_item in completed_fetch_results_tuples:
             if isinstance(result_item, tuple) and len(result_item) == 2:
                 stem_from_task, updated_media_info_obj = result_item
-                if updated_media_info_obj:
-                    initial_media_infos[stem_from_task] = updated_media_info_obj
-                else: 
-                    log.error(f"Async task for {stem_from_task} returned None for MediaInfo object")
-                    original_path_fallback = file_batches.get(stem_from_task, {}).get('video', Path(f"error_dummy_{stem_from_task}.file"))
-                    mi_fallback = MediaInfo(original_path=cast(Path, original_path_fallback))
-                    mi_fallback.metadata_error_message = f"[{ProcessingStatus.INTERNAL_ERROR}] Async task returned invalid data"
-                    mi_fallback.file_type = 'unknown'
-                    initial_media_infos[stem_from_task] = mi_fallback
+                initial_media_infos[stem_from_task] = self._fetched_media_info(stem_from_task, updated_media_info_obj, file_batches)
+        self.metadata_fetcher.log_cache_stats()
+        self.metadata_fetcher.log_retry_stats()
         return initial_media_infos
+
+    def _stems_to_fetch(self, media_infos: Dict[str, Optional[MediaInfo]]) -> List[str]:
+        return [ stem for stem, info in media_infos.items() 
+                 if info and (info.file_type != 'unknown' or \
+                              getattr(self.args, 'tmdb_id', None) is not None or \
+                              getattr(self.args, 'tvdb_id', None) is not None) ]
+
+    def _iter_metadata_fetches(
+        self,
+        stems_to_fetch: List[str],
+        file_batches: Dict[str, Dict[str, Any]],
+        media_infos: Dict[str, Optional[MediaInfo]],
+        progress: Optional[ProgressClass] = None,
+        task_id: Optional[TaskIDClass] = None
+    ) -> Iterator[Tuple[List[str], Callable[[], Awaitable[Any]]]]:
+        """
+        Yields (stems, fetch) in scan order: one lookup per show/season group, placed at its first
+        member and fanned out to every member, and one per remaining file. Calling fetch() starts it.
+        """
+        series_groups, episode_sets = self._group_series_stems(stems_to_fetch, media_infos)
+        group_by_leader = {group[0]: group for group in series_groups}
+        grouped_stems = {stem for group in series_groups for stem in group}
+        if series_groups:
+            log.info(f"Phase 2: {len(grouped_stems)} episode files share {len(series_groups)} show/season lookups.")
+        for stem in stems_to_fetch:
+            if stem in group_by_leader:
+                group = group_by_leader[stem]
+                yield group, partial(_fetch_metadata_for_series_group, self, group, file_batches, media_infos, episode_sets, progress, task_id)
+            elif stem not in grouped_stems:
+                yield [stem], partial(_fetch_metadata_for_batch, self, stem, file_batches[stem], progress, task_id)
+
+    def _fetched_media_info(self, stem: str, media_info: Optional[MediaInfo], file_batches: Dict[str, Dict[str, Any]],
+                            reason: str = "Async task returned invalid data") -> MediaInfo:
+        """The fetched MediaInfo, or an 'unknown' one carrying an internal error if the fetch produced none."""
+        if media_info: return media_info
+        log.error(f"Async task for {stem} returned None for MediaInfo object")
+        original_path_fallback = file_batches.get(stem, {}).get('video', Path(f"error_dummy_{stem}.file"))
+        mi_fallback = MediaInfo(original_path=cast(Path, original_path_fallback))
+        mi_fallback.metadata_error_message = f"[{ProcessingStatus.INTERNAL_ERROR}] {reason}"
+        mi_fallback.file_type = 'unknown'
+        return mi_fallback
     
     async def _get_user_confirmation_in_executor(
         self,
@@ -906,6 +1054,7 @@ class MainProcessor:
                         self.console.print("[green]✓ Yearless match confirmed by user.[/green]")
                         log.info(f"User confirmed yearless match for '{media_info.original_path.name}'.")
                         if media_info.metadata: media_info.metadata.match_confidence = None
+                        self._pin_confirmed_match(media_info)
                     else:
                         self.console.print("[yellow]✗ Yearless match rejected by user (or default 'No' taken).[/yellow]")
                         log.info(f"User REJECTED yearless match for '{media_info.original_path.name}' (or default 'No' taken).")
@@ -961,6 +1110,7 @@ class MainProcessor:
                     if user_confirmed:
                         self.console.print("[green]✓ Low-confidence match accepted by user.[/green]")
                         log.info(f"User accepted low-confidence match for '{media_info.original_path.name}'.")
+                        self._pin_confirmed_match(media_info)
                     else:
                         self.console.print("[yellow]✗ Low-confidence match rejected by user.[/yellow]")
                         log.info(f"User REJECTED low-confidence match for '{media_info.original_path.name}'.")
@@ -984,6 +1134,146 @@ class MainProcessor:
                 
         return user_quit_flag, metadata_rejected_flag
 
+    def _live_parallel_width(self, is_live_run: bool, batch_count: int) -> int:
+        """Thread pool width for Phase 4, or 1 when batches must run one after another."""
+        width = int(self.cfg('live_parallel_batches', 4))
+        if not is_live_run or batch_count < 2 or width < 2: return 1
+        if getattr(self.args, 'interactive', False): return 1 # Prompts need one batch at a time
+        if self.cfg('on_conflict', 'skip') == 'fail': return 1 # The first conflict must stop the run before later batches start
+        return width
+
+    def _action_lock_keys(self, plan: RenamePlan) -> List[str]:
+        """Directories a plan reads from or writes to; plans sharing one are never executed at the same time."""
+        dirs = {path.parent for action in plan.actions for path in (action.original_path, action.new_path)}
+        if plan.created_dir_path: dirs.add(plan.created_dir_path)
+        # Backups and staging go to one shared directory with unique-name probing.
+        for shared_dir in (getattr(self.args, 'backup_dir', None), getattr(self.args, 'stage_dir', None)):
+            if shared_dir: dirs.add(Path(shared_dir))
+        return sorted(str(d) for d in dirs)
+
+    async def _run_file_actions(self, plan: RenamePlan, media_info: MediaInfo, run_batch_id: str) -> Dict[str, Any]:
+        run_actions = partial(
+            perform_file_actions, plan=plan, args_ns=self.args, cfg_helper=self.cfg, undo_manager=self.undo_manager,
+            run_batch_id=run_batch_id, media_info=media_info, quiet_mode=getattr(self.args, 'quiet', False)
+        )
+        async with AsyncExitStack() as held_locks:
+            for key in self._action_lock_keys(plan): # Sorted, so two plans never wait on each other's locks
+                await held_locks.enter_async_context(self._dir_locks.setdefault(key, asyncio.Lock()))
+            return await self.file_ops.run(run_actions)
+
+    async def _execute_batches_concurrently(
+        self,
+        file_batches: Dict[str, Dict[str, Any]],
+        media_infos: Dict[str, Optional[MediaInfo]],
+        run_batch_id: str,
+        width: int,
+        progress: ProgressClass,
+        task_id: TaskIDClass
+    ) -> Dict[str, Tuple[Dict[str, Any], bool, bool]]:
+        """
+        Phase 4 for non-interactive live runs: batches are planned on the event loop and their file
+        actions run on the file-ops thread pool, `width` at a time. Undo logging and per-batch results are the
+        same as in a sequential run; results are reported afterwards in scan order.
+        """
+        async def run_batch(stem: str, batch_data: Dict[str, Any], media_info: MediaInfo) -> Tuple[str, Tuple[Dict[str, Any], bool, bool]]:
+            outcome = await self._process_single_batch(stem, batch_data, media_info, run_batch_id, True)
+            progress.update(task_id, advance=1, item_name=f"Done: {Path(batch_data.get('video', stem)).name[:30]}...") # type: ignore
+            return stem, outcome
+
+        log.info(f"Phase 4: Executing live batches on {width} workers (plans sharing a directory run one at a time).")
+        self._dir_locks = {}
+        outcomes = await asyncio.gather(*(
+            run_batch(stem, batch_data, media_info)
+            for stem, batch_data in file_batches.items()
+            if (media_info := media_infos.get(stem)) is not None
+        ))
+        return dict(outcomes)
+
+    def _pipelines_metadata(self, is_live_run: bool, unattended: bool) -> bool:
+        """True when Phase 2 can feed Phase 4 batch by batch instead of finishing every lookup first."""
+        if not (is_live_run and getattr(self.args, 'use_metadata', False) and self.metadata_fetcher): return False
+        if getattr(self.args, 'interactive', False): return False
+        # The metadata confirmation phase and the live-run pre-scan need every batch's metadata before any
+        # file moves; neither runs unattended or in quiet mode.
+        return unattended or getattr(self.args, 'quiet', False)
+
+    async def _fetch_and_execute_pipelined(
+        self,
+        file_batches: Dict[str, Dict[str, Any]],
+        media_infos: Dict[str, Optional[MediaInfo]],
+        run_batch_id: str,
+        width: int,
+        progress: ProgressClass,
+        task_id: TaskIDClass
+    ) -> Dict[str, Tuple[Dict[str, Any], bool, bool]]:
+        """
+        Phases 2 and 4 together for live runs without prompts: metadata is looked up a few batches
+        ahead (live_parallel_batches) and every fetched batch goes through a bounded queue to `width`
+        executors, so the next batches are fetched while earlier ones are being moved. media_infos is
+        updated in place. A batch that stops the run (on_conflict=fail) keeps later batches from
+        starting; their stems are missing from the result. Results are reported afterwards in scan order.
+        """
+        prefetch = max(1, int(self.cfg('live_parallel_batches', 4) or 1))
+        ready: asyncio.Queue[Optional[Tuple[str, MediaInfo]]] = asyncio.Queue(maxsize=prefetch)
+        fetch_slots = asyncio.Semaphore(prefetch)
+        stop_run = asyncio.Event()
+        outcomes: Dict[str, Tuple[Dict[str, Any], bool, bool]] = {}
+
+        async def fetch_into_queue(stems: List[str], fetch: Callable[[], Awaitable[Any]]) -> None:
+            try:
+                fetched: Dict[str, MediaInfo] = {}
+                failure_reason = "Async task returned invalid data"
+                try:
+                    result = await fetch()
+                    fetched = dict(result if isinstance(result, list) else [result])
+                except Exception as e_fetch:
+                    log.error(f"Error fetching metadata for {stems[0]}: {e_fetch}")
+                    failure_reason = f"Metadata lookup failed: {e_fetch}"
+                for stem in stems: # Still holding the slot: a full queue also pauses further lookups
+                    await ready.put((stem, self._fetched_media_info(stem, fetched.get(stem), file_batches, failure_reason)))
+            finally:
+                fetch_slots.release()
+
+        async def produce() -> None:
+            fetches: List[asyncio.Task[None]] = []
+            try:
+                stems_to_fetch = self._stems_to_fetch(media_infos)
+                fetched_stems = set(stems_to_fetch)
+                for stem, media_info in media_infos.items(): # Nothing to look up; ready right away
+                    if stem not in fetched_stems and media_info is not None: await ready.put((stem, media_info))
+                for stems, fetch in self._iter_metadata_fetches(stems_to_fetch, file_batches, media_infos):
+                    await fetch_slots.acquire()
+                    fetches.append(asyncio.create_task(fetch_into_queue(stems, fetch), name=f"fetch_{stems[0]}"))
+                await asyncio.gather(*fetches)
+            except Exception as e_produce:
+                log.error(f"Error scheduling metadata lookups: {e_produce}")
+            finally:
+                for fetch_task in fetches: fetch_task.cancel() # Only still running if this task was cancelled
+            for _ in range(width): await ready.put(None)
+
+        async def execute() -> None:
+            while not stop_run.is_set() and (item := await ready.get()) is not None:
+                stem, media_info = item
+                media_infos[stem] = media_info
+                outcome = await self._process_single_batch(stem, file_batches[stem], media_info, run_batch_id, True)
+                outcomes[stem] = outcome
+                progress.update(task_id, advance=1, item_name=f"Done: {Path(file_batches[stem].get('video', stem)).name[:30]}...") # type: ignore
+                if outcome[2]: stop_run.set()
+
+        log.info(f"Phase 2/4: Fetching metadata up to {prefetch} batches ahead of {width} live executors.")
+        self._dir_locks = {}
+        producer = asyncio.create_task(produce(), name="metadata_pipeline")
+        executors = [asyncio.create_task(execute()) for _ in range(width)]
+        try:
+            await asyncio.gather(*executors)
+        finally:
+            producer.cancel()
+            for executor in executors: executor.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+        self.metadata_fetcher.log_cache_stats()
+        self.metadata_fetcher.log_retry_stats()
+        return outcomes
+
     async def _process_single_batch(
         self,
         stem: str,
@@ -1054,7 +1344,7 @@ class MainProcessor:
                 action_result['success'] = True; final_batch_processing_error_occurred = False
                 proceed_with_normal_planning = False
             elif unknown_handling_mode == 'move_to_unknown':
-                move_result = self._handle_move_to_unknown(stem, batch_data, run_batch_id)
+                move_result = await self._handle_move_to_unknown(stem, batch_data, run_batch_id)
                 action_result['message'] = f"{message_for_this_outcome}. {move_result.get('message', 'Move to unknown attempted.')}"
                 action_result['actions_taken'] = move_result.get('actions_taken',0)
                 action_result['success'] = move_result.get('move_success', False)
@@ -1138,6 +1428,7 @@ class MainProcessor:
                         if choice == 'y':
                             if current_plan_for_interaction and current_plan_for_interaction.status in ['success', 'skipped', 'conflict_unresolved']:
                                 user_choice_for_action = 'y'
+                                self._pin_confirmed_match(media_info)
                                 break
                             elif current_plan_for_interaction and current_plan_for_interaction.status == 'failed':
                                 self.console.print(f"[red]The current plan for '{stem}' has failed ({current_plan_for_interaction.message}). Cannot apply. Choose another option or re-plan.[/red]")
@@ -1227,6 +1518,8 @@ class MainProcessor:
                                     if quit_after_refetch_confirm: user_quit_flag = True; break
                                     if rejected_after_refetch_confirm:
                                         self.console.print("[yellow]Metadata from manual selection was subsequently rejected or failed confirmation rules.[/yellow]")
+                                    else:
+                                        self._pin_confirmed_match(media_info, api_source_to_search, selected_id)
                                     current_plan_for_interaction = self.renamer.plan_rename(media_info.original_path, batch_data.get('associated', []), media_info)
                                 else:
                                     self.console.print(f"[red]Manual ID selection ({api_source_to_search.upper()} ID {selected_id}) failed to fetch details. Current metadata/plan retained.[/red]")
@@ -1254,7 +1547,7 @@ class MainProcessor:
                 log.info(action_result['message']); final_batch_processing_error_occurred = False
                 is_skip_or_correct_batch_plan = True
             elif final_plan_to_execute and final_plan_to_execute.status == 'success':
-                action_result = perform_file_actions( plan=final_plan_to_execute, args_ns=self.args, cfg_helper=self.cfg, undo_manager=self.undo_manager, run_batch_id=run_batch_id, media_info=media_info, quiet_mode=getattr(self.args, 'quiet', False) )
+                action_result = await self._run_file_actions(final_plan_to_execute, media_info, run_batch_id)
                 if current_metadata_outcome_message and action_result.get('success') and unknown_handling_mode == 'guessit_only' and metadata_failed_or_rejected:
                     action_result['message'] = f"(Original issue: '{current_metadata_outcome_message}') -> {action_result.get('message', 'Actions performed via Guessit.')}"
                 final_batch_processing_error_occurred = not action_result.get('success', False)
@@ -1294,7 +1587,7 @@ class MainProcessor:
 
         return action_result, final_batch_processing_error_occurred, user_quit_flag
     
-    async def run_processing(self):
+    async def run_processing(self, unattended: bool = False):
         target_dir = self.args.directory.resolve()
         if not target_dir.is_dir():
             msg = f"[{ProcessingStatus.INTERNAL_ERROR}] Target directory not found or is not a directory: {target_dir}"
@@ -1311,24 +1604,71 @@ class MainProcessor:
             _print_stderr_message_processor(self.console, TextClass(f"\n[bold red]CRITICAL ERROR: {msg}[/]", style="bold red"), getattr(self.args, 'quiet', False))
             return
         
+        resume_run_id = getattr(self.args, 'resume', None)
+        if resume_run_id and not getattr(self.args, 'live', False):
+            msg = f"[{ProcessingStatus.INTERNAL_ERROR}] --resume only applies to live runs; add --live to resume run '{resume_run_id}'."
+            log.critical(msg)
+            _print_stderr_message_processor(self.console, TextClass(f"[bold red]Error: {msg}[/]", style="bold red"), getattr(self.args, 'quiet', False))
+            return
+
         log.info("Phase 1: Collecting and Parsing Batches...")
         file_batches = {stem: data for stem, data in scan_media_files(target_dir, self.cfg)}
         batch_count = len(file_batches)
         log.info(f"Collected {batch_count} batches.")
+        if resume_run_id:
+            file_batches = self._batches_left_to_resume(file_batches, resume_run_id)
+            batch_count = len(file_batches)
 
         if batch_count == 0:
+             if resume_run_id:
+                 self.console.print(f"Run '{resume_run_id}' has no batches left to process.")
+                 return
              log.warning(f"[{ProcessingStatus.SKIPPED}] No valid video files/batches found matching criteria.")
              self.console.print(TextClass(f"[yellow][{ProcessingStatus.SKIPPED}] No valid video files/batches found.[/yellow]", style="yellow"))
              return
 
+        return await self.process_file_batches(file_batches, unattended=unattended, run_batch_id=resume_run_id)
+
+    def _batches_left_to_resume(self, file_batches: Dict[str, Dict[str, Any]], run_id: str) -> Dict[str, Dict[str, Any]]:
+        """Repairs the interrupted run's journal, then drops every batch with a file the run already handled."""
+        recovery = self.undo_manager.recover_run(run_id)
+        done_paths = recovery['done_paths']
+        remaining = {stem: data for stem, data in file_batches.items()
+                     if not any(str(path.resolve()) in done_paths for path in _batch_file_paths(data))}
+        log.info(f"Resuming run {run_id}: finished {recovery['finished']} interrupted renames, re-planning {recovery['discarded']} "
+                 f"that never took effect, {recovery['unresolved']} left for manual review; "
+                 f"{len(file_batches) - len(remaining)} of {len(file_batches)} batches already done.")
+        self.console.print(f"Resuming run [bold cyan]{run_id}[/bold cyan]: {recovery['finished']} interrupted renames finished, "
+                           f"{len(file_batches) - len(remaining)} batches already done, {len(remaining)} left.")
+        if recovery['unresolved']:
+            _print_stderr_message_processor(self.console, TextClass(
+                f"Warning: {recovery['unresolved']} journal entries of run '{run_id}' could not be matched to a file; see the log.", style="yellow"),
+                getattr(self.args, 'quiet', False))
+        return remaining
+
+    async def process_file_batches(self, file_batches: Dict[str, Dict[str, Any]], unattended: bool = False,
+                                   run_batch_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Runs phases 2-4 (parse, fetch, confirm, plan/execute, summary) for already collected batches.
+        unattended=True (used by 'watch') skips the metadata confirmation phase and the live-run prompt.
+        run_batch_id continues the undo log of an earlier run (--resume) instead of starting a new one.
+        Returns the results summary ('failed_paths' lists the original files of batches that failed or
+        were left untouched after a metadata error), or None if the user aborted.
+        """
+        batch_count = len(file_batches)
+        use_metadata_globally = getattr(self.args, 'use_metadata', False)
+
+        is_live_run = getattr(self.args, 'live', False)
+        pipelined = self._pipelines_metadata(is_live_run, unattended)
         initial_media_infos = self._perform_initial_parsing(file_batches, batch_count)
-        initial_media_infos = await self._fetch_all_metadata(file_batches, initial_media_infos)
+        if not pipelined: # Otherwise Phase 2 runs alongside Phase 4
+            initial_media_infos = await self._fetch_all_metadata(file_batches, initial_media_infos)
 
         log.info("Phase 2.5: Handling Metadata Confirmations...")
         user_quit_during_meta_confirm = False
         items_for_meta_confirmation_phase: Deque[Tuple[str, MediaInfo]] = deque()
 
-        if use_metadata_globally and not getattr(self.args, 'quiet', False) :
+        if use_metadata_globally and not getattr(self.args, 'quiet', False) and not unattended:
             for stem, mi in initial_media_infos.items():
                 if mi and mi.metadata: # Only consider if metadata object exists
                     is_yearless_confirm_needed = (
@@ -1358,20 +1698,19 @@ class MainProcessor:
             self.console.print("[yellow]Operation aborted by user during metadata confirmation.[/yellow]")
             return
 
-        is_live_run = getattr(self.args, 'live', False)
-        if is_live_run:
+        if is_live_run and not unattended and not pipelined:
             log.info("Phase 3: Performing pre-scan for live run final confirmation...")
             potential_actions_count = self._perform_prescan(file_batches, batch_count, initial_media_infos)
             if not self._confirm_live_run(potential_actions_count):
                 return
         
-        run_batch_id = f"run-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        run_batch_id = run_batch_id or f"run-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
         log.info(f"Phase 4: Starting planning and execution run ID: {run_batch_id}")
 
         results_summary = {
             'success_renames_moves': 0, 'skipped_correct_or_conflict': 0, 'error_batches': 0,
             'actions_taken': 0, 'moved_unknown_files': 0,
-            'user_skipped_batches': 0, 'config_skipped_batches': 0
+            'user_skipped_batches': 0, 'config_skipped_batches': 0, 'failed_paths': []
         }
         self.console.print("-" * 30)
         total_planned_actions_accumulator_for_dry_run = 0
@@ -1379,15 +1718,29 @@ class MainProcessor:
         disable_final_progress = getattr(self.args, 'quiet', False) or getattr(self.args, 'interactive', False) or not RICH_AVAILABLE
         with ProgressClass(*DEFAULT_PROGRESS_COLUMNS, console=self.console, disable=disable_final_progress) as final_progress_bar:
             main_processing_task: TaskIDClass = final_progress_bar.add_task("Planning/Executing", total=batch_count, item_name="") # type: ignore
+            concurrent_outcomes: Dict[str, Tuple[Dict[str, Any], bool, bool]] = {}
+            live_width = self._live_parallel_width(is_live_run, batch_count)
+            if pipelined:
+                concurrent_outcomes = await self._fetch_and_execute_pipelined(
+                    file_batches, initial_media_infos, run_batch_id, live_width, final_progress_bar, main_processing_task
+                )
+            elif live_width > 1:
+                concurrent_outcomes = await self._execute_batches_concurrently(
+                    file_batches, initial_media_infos, run_batch_id, live_width, final_progress_bar, main_processing_task
+                )
 
             for stem, batch_data in file_batches.items():
+                if pipelined and stem not in concurrent_outcomes and initial_media_infos.get(stem) is not None:
+                    continue # Never started: an earlier batch stopped the run
                 item_name_short = Path(batch_data.get('video', stem)).name[:30] + "..."
-                final_progress_bar.update(main_processing_task, advance=1, item_name=f"Processing: {item_name_short}") # type: ignore
+                if stem not in concurrent_outcomes:
+                    final_progress_bar.update(main_processing_task, advance=1, item_name=f"Processing: {item_name_short}") # type: ignore
 
                 media_info = initial_media_infos.get(stem)
                 if not media_info:
                     log.error(f"[{ProcessingStatus.INTERNAL_ERROR}] CRITICAL: Skipping batch '{stem}' due to missing MediaInfo object before final processing.")
                     results_summary['error_batches'] += 1
+                    results_summary['failed_paths'].extend(_batch_file_paths(batch_data))
                     continue
                 
                 log_base_info = f"Final Processing Batch '{stem}': Type='{media_info.file_type}', API='{getattr(media_info.metadata, 'source_api', 'N/A')}', Score='{getattr(media_info.metadata, 'match_confidence', 'N/A')}'"
@@ -1395,9 +1748,12 @@ class MainProcessor:
                     log_base_info += f", MetaError='{media_info.metadata_error_message}'"
                 log.debug(log_base_info)
 
-                action_result, final_batch_had_error_flag, user_quit_processing = await self._process_single_batch(
-                    stem, batch_data, media_info, run_batch_id, is_live_run
-                )
+                if stem in concurrent_outcomes:
+                    action_result, final_batch_had_error_flag, user_quit_processing = concurrent_outcomes[stem]
+                else:
+                    action_result, final_batch_had_error_flag, user_quit_processing = await self._process_single_batch(
+                        stem, batch_data, media_info, run_batch_id, is_live_run
+                    )
 
                 batch_msg_from_action = action_result.get('message', f"[{ProcessingStatus.INTERNAL_ERROR}] No message from batch processing for '{stem}'.")
                 primary_reason_for_log_and_console = batch_msg_from_action
@@ -1441,6 +1797,13 @@ class MainProcessor:
                         log.info(f"  Detail/Action Outcome for Failed Batch '{stem}': {batch_msg_from_action}")
                     results_summary['error_batches'] += 1
                 
+                batch_succeeded = action_result.get('success', False) and not final_batch_had_error_flag
+                metadata_failed = bool(media_info.metadata_error_message) and not (
+                    ProcessingStatus.USER_INTERACTIVE_SKIP.name in media_info.metadata_error_message or
+                    ProcessingStatus.USER_ABORTED_OPERATION.name in media_info.metadata_error_message)
+                if not batch_succeeded or (metadata_failed and not action_result.get('actions_taken', 0)):
+                    results_summary['failed_paths'].extend(_batch_file_paths(batch_data))
+
                 if is_live_run:
                     results_summary['actions_taken'] += action_result.get('actions_taken', 0)
                 else:
@@ -1477,8 +1840,9 @@ class MainProcessor:
                         self.console.print(message_renderable)
                     if use_rule: self.console.print("-" * 70)
 
-                if user_quit_processing: break
+                if user_quit_processing and not pipelined: break # Pipelined batches finish out of scan order; the rest never started
 
+        self.file_ops.shutdown()
         self.console.print("-" * 30)
         log.info("Processing complete.")
         self.console.print("Processing Summary:")
@@ -1504,6 +1868,9 @@ class MainProcessor:
                                          ProcessingStatus.USER_ABORTED_OPERATION.name in mi.metadata_error_message))
         if initial_meta_errors_count > 0:
             self.console.print(f"  Initial Metadata Fetch Issues (Batches): {initial_meta_errors_count}")
+        if self.metadata_fetcher and self.metadata_fetcher.circuit_breaker.trips:
+            trips = ", ".join(f"{provider.upper()} x{count}" for provider, count in self.metadata_fetcher.circuit_breaker.trips.items())
+            self.console.print(f"  Providers Skipped After Repeated Failures (circuit breaker trips): {trips}")
 
         if results_summary['error_batches'] > 0 :
             error_summary_msg_content = f"Batches with Processing Errors: {results_summary['error_batches']}"
@@ -1525,6 +1892,9 @@ class MainProcessor:
              else:
                  self.console.print("DRY RUN COMPLETE. No actions were planned.")
 
+        if self.metadata_fetcher:
+            await self.metadata_fetcher.wait_for_background_refreshes()
+
         undo_enabled_final_check = self.cfg('enable_undo', False, arg_value=getattr(self.args, 'enable_undo', None))
         if is_live_run and undo_enabled_final_check and results_summary['actions_taken'] > 0:
             script_name = Path(sys.argv[0]).name
@@ -1545,4 +1915,6 @@ class MainProcessor:
              if total_skipped > 0:
                  self.console.print(f"[yellow] ({total_skipped} batches were skipped for various reasons).[/yellow]")
         elif batch_count > 0: # If no successes, no errors, and not all skipped, it's an odd state
-             self.console.print("Operation finished. (No explicit success, errors, or all skips recorded - check logs for details).")
\ No newline at end of file
+             self.console.print("Operation finished. (No explicit success, errors, or all skips recorded - check logs for details).")
+
+        return results_summary
\ No newline at end of file
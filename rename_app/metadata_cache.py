@@ -0,0 +1,194 @@
+# rename_app/metadata_cache.py
+
+import json
+import logging
+import pickle
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Bump whenever the record layout below changes; entries with another version are refetched.
+CACHE_SCHEMA_VERSION = 1
+
+MovieResult = Tuple[Dict[str, Any], Dict[str, Any], Optional[float]]  # (data, ids, score)
+SeriesResult = Tuple[Dict[str, Any], Dict[int, Dict[str, Any]], Dict[str, Any], Optional[float]]  # (show, episodes, ids, score)
+
+
+def _field(obj: Any, *names: str) -> Optional[str]:
+    """First non-empty attribute/key out of names, as str (works for tmdbv3api AsObj and TVDB dicts)."""
+    if obj is None:
+        return None
+    for name in names:
+        value = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+        if value:
+            return str(value)
+    return None
+
+
+def compact_movie_result(data: Any, ids: Optional[Dict[str, Any]], score: Optional[float]) -> MovieResult:
+    """Reduces a TMDB movie response to the fields MediaMetadata is built from."""
+    record = {'title': _field(data, 'title'), 'release_date': _field(data, 'release_date')}
+    return record, dict(ids or {}), score
+
+
+def compact_series_result(data: Any, ep_map: Optional[Dict[int, Any]], ids: Optional[Dict[str, Any]], score: Optional[float]) -> SeriesResult:
+    """Reduces a TMDB/TVDB show + episode map to the fields MediaMetadata is built from."""
+    show = {'name': _field(data, 'name'), 'first_air_date': _field(data, 'first_air_date', 'firstAired')}
+    episodes = {
+        int(ep_num): {'name': _field(ep_obj, 'name', 'episodeName'), 'air_date': _field(ep_obj, 'air_date', 'aired', 'airDate')}
+        for ep_num, ep_obj in (ep_map or {}).items() if ep_obj
+    }
+    return show, episodes, dict(ids or {}), score
+
+
+def encode_cache_record(value: Tuple[Any, ...], fetched_at: Optional[float] = None) -> str:
+    """Serializes a compact movie (3-tuple) or series (4-tuple) result to versioned JSON."""
+    fetched_at = time.time() if fetched_at is None else fetched_at
+    if len(value) == 3:
+        data, ids, score = value
+        payload: Dict[str, Any] = {'v': CACHE_SCHEMA_VERSION, 'kind': 'movie', 'ts': fetched_at, 'data': data, 'ids': ids, 'score': score}
+    elif len(value) == 4:
+        data, episodes, ids, score = value
+        payload = {'v': CACHE_SCHEMA_VERSION, 'kind': 'series', 'ts': fetched_at, 'data': data,
+                   'episodes': {str(k): v for k, v in episodes.items()}, 'ids': ids, 'score': score}
+    else:
+        raise ValueError(f"Unexpected cache value with {len(value)} items.")
+    if not isinstance(data, dict) or not isinstance(ids, dict):
+        raise ValueError("Cache value must be a compact record (dict data and ids).")
+    return json.dumps(payload, separators=(',', ':'))
+
+
+def decode_cache_entry(raw: Any) -> Optional[Tuple[Tuple[Any, ...], Optional[float]]]:
+    """Like decode_cache_record(), plus the time the record was fetched (None if unknown)."""
+    if not isinstance(raw, (str, bytes)):
+        return None
+    try:
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or payload.get('v') != CACHE_SCHEMA_VERSION:
+            return None
+        fetched_at = payload.get('ts')
+        if payload['kind'] == 'movie':
+            return (payload['data'], payload['ids'], payload['score']), fetched_at
+        if payload['kind'] == 'series':
+            episodes = {int(k): v for k, v in payload['episodes'].items()}
+            return (payload['data'], episodes, payload['ids'], payload['score']), fetched_at
+    except (ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def decode_cache_record(raw: Any) -> Optional[Tuple[Any, ...]]:
+    """Inverse of encode_cache_record(). Returns None for other schema versions or legacy pickled tuples."""
+    entry = decode_cache_entry(raw)
+    return entry[0] if entry else None
+
+
+def encode_negative_record(reason: str) -> str:
+    """A 'no match' result, cached separately (and for less time) than real metadata."""
+    return json.dumps({'v': CACHE_SCHEMA_VERSION, 'kind': 'negative', 'reason': reason}, separators=(',', ':'))
+
+
+def decode_negative_record(raw: Any) -> Optional[str]:
+    """Returns the cached 'not found' reason, or None if raw isn't a current negative record."""
+    if not isinstance(raw, (str, bytes)):
+        return None
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        return None
+    if isinstance(payload, dict) and payload.get('v') == CACHE_SCHEMA_VERSION and payload.get('kind') == 'negative':
+        return str(payload.get('reason') or 'No match found (cached).')
+    return None
+
+
+def negative_cache_key(key: str) -> str:
+    return f"neg::{key}"
+
+
+def negative_cache_tag(title: str) -> str:
+    """diskcache tag shared by every negative entry for a title (any year/season/source/language)."""
+    return f"neg::{' '.join(str(title).split()).casefold()}"
+
+
+def purge_negative_cache(cache: Any, title: str) -> int:
+    """Deletes all negative entries for title from a diskcache.Cache. Returns the number removed."""
+    return int(cache.evict(negative_cache_tag(title)))
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate in-memory cost of a cache value (its pickled size)."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class MemoryLRUCache:
+    """
+    Small in-process LRU used as L1 in front of the diskcache (L2) metadata cache.
+    Bounded by entry count and by total (estimated) bytes; 0 for either disables the tier.
+    Values are kept as live objects, so hits cost a dict lookup instead of an executor
+    round trip plus unpickling. Only accessed from the event loop thread.
+    """
+
+    def __init__(self, max_items: int, max_bytes: int):
+        self.max_items = max(0, int(max_items))
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()  # key -> (value, size, expires_at)
+        self.total_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_items > 0 and self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, _size, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self.delete(key)
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None, size: Optional[int] = None) -> bool:
+        """Stores value (expire in seconds, None = no expiry). Returns False if it doesn't fit."""
+        if not self.enabled:
+            return False
+        size = _estimate_size(value) if size is None else size
+        self.delete(key)
+        if size > self.max_bytes:
+            log.debug(f"L1 cache: value for '{key}' ({size} bytes) exceeds the memory budget; disk tier only.")
+            return False
+        expires_at = time.monotonic() + expire if expire is not None else None
+        self._entries[key] = (value, size, expires_at)
+        self.total_bytes += size
+        while len(self._entries) > self.max_items or self.total_bytes > self.max_bytes:
+            _old_key, (_v, old_size, _e) = self._entries.popitem(last=False)
+            self.total_bytes -= old_size
+        return True
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {'items': len(self._entries), 'bytes': self.total_bytes}
+
+
+_MISSING = object()
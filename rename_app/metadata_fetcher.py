@@ -1,22 +1,31 @@
 # rename_app/metadata_fetcher.py
 
 import logging
+import sqlite3
 import time
 import asyncio
 import builtins 
 import sys
 from functools import wraps, partial 
 from pathlib import Path
-from typing import Optional, Tuple, TYPE_CHECKING, Any, Iterable, Sequence, Dict, cast, List, Deque, Union, TypeAlias
+from typing import Optional, Tuple, TYPE_CHECKING, Any, Awaitable, Callable, Iterable, Sequence, Dict, cast, List, Deque, Union, TypeAlias
 
-from collections import deque 
+from collections import deque, Counter
 
-from tenacity import AsyncRetrying, RetryError, stop_after_attempt, wait_fixed, retry_if_exception
+from tenacity import RetryError
 
 from .api_clients import get_tmdb_client, get_tvdb_client
-from .exceptions import MetadataError
+from .exceptions import MetadataError, MetadataNotFoundError
 from .models import MediaMetadata
-from .config_manager import ConfigHelper 
+from .config_manager import EffectiveSettings
+from .offline_index import open_offline_index
+from .fuzzy_matcher import FUZZY_AVAILABLE, TitleMatcher, fuzzy_ratio
+from .title_aliases import ALIAS_DB_FILENAME, TitleAlias, TitleAliasIndex
+from .retry_policy import CircuitBreaker, RetryPolicy
+from .metadata_cache import (
+    MemoryLRUCache, compact_movie_result, compact_series_result, encode_cache_record, decode_cache_entry,
+    encode_negative_record, decode_negative_record, negative_cache_key, negative_cache_tag, purge_negative_cache
+)
 
 from rename_app.ui_utils import (
     ConsoleClass, ConfirmClass, 
@@ -51,15 +60,6 @@ except ImportError:
     PLATFORMDIRS_AVAILABLE = False
     platformdirs = None
 
-try:
-    from thefuzz import process as fuzz_process
-    from thefuzz import fuzz
-    THEFUZZ_AVAILABLE = True
-except ImportError:
-    THEFUZZ_AVAILABLE = False
-    fuzz = None
-    fuzz_process = None 
-
 try:
     import dateutil.parser
     DATEUTIL_AVAILABLE = True
@@ -90,6 +90,8 @@ except ImportError:
     TMDBV3API_AVAILABLE = False
 
 DIRECT_ID_MATCH_SCORE = 101.0 
+# _sync_tmdb_series_fetch signals meaning "TMDB answered, nothing matches" (vs. client/data problems).
+TMDB_NOT_FOUND_SIGNALS = frozenset({"SEARCH_NO_RESULTS", "SEARCH_NOT_FOUND", "NO_FINAL_MATCH"})
 
 class AsyncRateLimiter:
     def __init__(self, delay: float):
@@ -163,51 +165,35 @@ def find_best_match(title_to_find: str, api_results_tuple: Tuple[Dict, ...], res
     if not api_results_tuple: return None
     first_result_dict = next(iter(api_results_tuple), None)
 
-    if not THEFUZZ_AVAILABLE or not fuzz_process or not fuzz:
-        log.debug("Fuzzy matching unavailable ('thefuzz' not installed). Returning first result.")
+    if not FUZZY_AVAILABLE:
+        log.debug("Fuzzy matching unavailable ('rapidfuzz'/'thefuzz' not installed). Returning first result.")
         return first_result_dict, None
 
-    choices: Dict[Any, str] = {}
-    log.debug(f"Attempting to build choices for fuzzy match '{title_to_find}'.")
-    try:
-        for r_dict in api_results_tuple:
-            if not isinstance(r_dict, dict):
-                log.warning(f"Skipping non-dict item in fuzzy match choices: {type(r_dict)}")
-                continue
-            current_id = r_dict.get(id_key)
-            current_result_val = r_dict.get(result_key)
-            if current_id is not None and current_result_val is not None:
-                choices[current_id] = str(current_result_val)
-            else:
-                log.debug(f"Skipping item due to missing id ('{id_key}') or result ('{result_key}'): {r_dict}")
-    except Exception as e_choices:
-        log.error(f"Error creating choices dict for fuzzy matching: {e_choices}", exc_info=True)
-        return first_result_dict, None
+    candidates: List[Dict] = []
+    for r_dict in api_results_tuple:
+        if not isinstance(r_dict, dict):
+            log.warning(f"Skipping non-dict item in fuzzy match choices: {type(r_dict)}")
+        elif r_dict.get(id_key) is not None and r_dict.get(result_key) is not None:
+            candidates.append(r_dict)
+        else:
+            log.debug(f"Skipping item due to missing id ('{id_key}') or result ('{result_key}'): {r_dict}")
 
-    if not choices:
+    if not candidates:
         log.debug("No valid choices built for fuzzy matching. Returning first result.")
         return first_result_dict, None
 
-    best_match_dict: Optional[Dict] = None; best_score: Optional[float] = None
     try:
-        if not isinstance(title_to_find, str): title_to_find = str(title_to_find)
-        str_choices = {k: str(v) for k,v in choices.items()}
-        best_result_list = fuzz_process.extractBests(title_to_find, str_choices, score_cutoff=score_cutoff, limit=1)
-
-        if best_result_list:
-             matched_value, score_val, best_id = best_result_list[0]
-             best_score = float(score_val)
-             log.debug(f"Fuzzy match '{title_to_find}': Found '{matched_value}' (ID:{best_id}) score {best_score:.1f}")
-             best_match_dict = next((r_dict for r_dict in api_results_tuple if isinstance(r_dict, dict) and str(r_dict.get(id_key)) == str(best_id)), None)
-             if not best_match_dict:
-                 log.error(f"Fuzzy match found ID {best_id} but couldn't find corresponding dict in original results.")
-                 best_match_dict = first_result_dict; best_score = None
-        else:
-            log.warning(f"Fuzzy match failed for '{title_to_find}' (cutoff {score_cutoff}). Falling back to first result.")
-            best_match_dict = first_result_dict; best_score = None
+        # All candidates are scored in one batched call.
+        match = TitleMatcher([str(r_dict[result_key]) for r_dict in candidates]).best(str(title_to_find), score_cutoff=score_cutoff)
     except Exception as e_fuzz:
         log.error(f"Error during fuzzy matching process: {e_fuzz}", exc_info=True)
-        best_match_dict = first_result_dict; best_score = None
+        return first_result_dict, None
+    if not match:
+        log.warning(f"Fuzzy match failed for '{title_to_find}' (cutoff {score_cutoff}). Falling back to first result.")
+        return first_result_dict, None
+    best_index, best_score = match
+    best_match_dict = candidates[best_index]
+    log.debug(f"Fuzzy match '{title_to_find}': Found '{best_match_dict[result_key]}' (ID:{best_match_dict[id_key]}) score {best_score:.1f}")
     return best_match_dict, best_score
 
 def get_external_ids(tmdb_obj: Optional[Any] = None, tvdb_obj: Optional[Any] = None) -> Dict[str, Any]:
@@ -306,10 +292,20 @@ def _tmdb_results_to_dicts(results_iterable: Optional[Iterable[Any]], result_typ
     log.debug(f"Converted {len(dict_list)} TMDB {result_type} results to dicts for matching.")
     return tuple(dict_list)
 
-class MetadataFetcher:
-    from rename_app.config_manager import ConfigHelper 
+def resolve_cache_directory(cfg_helper) -> Optional[Path]:
+    """Metadata cache location: 'cache_directory' setting, else the platform user cache dir, else a local fallback."""
+    cache_dir_config = cfg_helper('cache_directory', None)
+    cache_dir_path: Optional[Path] = None
+    if cache_dir_config: cache_dir_path = Path(str(cache_dir_config)).resolve()
+    elif PLATFORMDIRS_AVAILABLE and platformdirs is not None:
+        try: cache_dir_path = Path(platformdirs.user_cache_dir("rename_app", "rename_app_author"))
+        except Exception as e_pdirs: log.warning(f"Platformdirs failed to get cache dir: {e_pdirs}. Falling back.")
+    if not cache_dir_path:
+        cache_dir_path = Path(__file__).parent.parent / ".rename_cache"; log.warning(f"Could not determine platform cache directory. Using fallback: {cache_dir_path}")
+    return cache_dir_path
 
-    def __init__(self, cfg_helper: ConfigHelper, console: Optional[ConsoleClass] = None):
+class MetadataFetcher:
+    def __init__(self, cfg_helper: EffectiveSettings, console: Optional[ConsoleClass] = None):
         self.cfg = cfg_helper 
         self.tmdb = get_tmdb_client()
         self.tvdb = get_tvdb_client()
@@ -321,6 +317,8 @@ class MetadataFetcher:
             self.console = ConsoleClass(quiet=quiet_mode_fetcher)
 
         self.rate_limiter = AsyncRateLimiter(float(self.cfg('api_rate_limit_delay', 0.5)))
+        self.circuit_breaker = CircuitBreaker.from_config(self.cfg)
+        self.retry_policy = RetryPolicy.from_config(self.cfg, should_retry_api_error, breaker=self.circuit_breaker)
         self.year_tolerance = int(self.cfg('api_year_tolerance', 1))
         self.tmdb_strategy = str(self.cfg('tmdb_match_strategy', 'first'))
         self.tmdb_fuzzy_cutoff = int(self.cfg('tmdb_match_fuzzy_cutoff', 70))
@@ -328,20 +326,31 @@ class MetadataFetcher:
         self.movie_yearless_match_confidence = str(self.cfg('movie_yearless_match_confidence', 'medium'))
         log.debug(f"Fetcher Config: Year Tolerance={self.year_tolerance}, TMDB Strategy='{self.tmdb_strategy}', TMDB Fuzzy Cutoff={self.tmdb_fuzzy_cutoff}, TMDB First Result Min Score={self.tmdb_first_result_min_score}, Movie Yearless Confidence='{self.movie_yearless_match_confidence}'")
 
+        self.offline_index = open_offline_index(self.cfg)
+        self.offline_only = self.offline_index is not None and str(self.cfg('offline_index_mode', 'only')) == 'only'
+
         self.cache: Optional[DiskCacheType] = None
         self.cache_enabled = bool(self.cfg('cache_enabled', True)) 
+        if self.offline_only and self.cache_enabled:
+            # The synced index is the source of truth; caching its answers would only hide index updates.
+            log.info("Offline metadata index in 'only' mode: API response cache not used.")
+            self.cache_enabled = False
         self.cache_expire = int(self.cfg('cache_expire_seconds', 60 * 60 * 24 * 7))
+        self.memory_cache = MemoryLRUCache(
+            max_items=int(self.cfg('cache_memory_max_items', 512)),
+            max_bytes=int(float(self.cfg('cache_memory_max_mb', 64.0)) * 1024 * 1024)
+        )
+        self.negative_cache_expire = int(self.cfg('cache_negative_expire_seconds', 60 * 60 * 24))
+        self.stale_while_revalidate = bool(self.cfg('cache_stale_while_revalidate', False))
+        max_stale_cfg = self.cfg('cache_max_stale_seconds', None)
+        self.cache_max_stale: Optional[int] = int(max_stale_cfg) if max_stale_cfg is not None else None
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        self.cache_stats: Counter = Counter(memory_hits=0, disk_hits=0, misses=0, negative_hits=0, stale_hits=0, refreshed=0, alias_hits=0)
+        self.alias_index: Optional[TitleAliasIndex] = None
+        self.alias_min_score = float(self.cfg('title_alias_min_score', 90))
         if self.cache_enabled:
             if DISKCACHE_AVAILABLE and actual_diskcache_module is not None: 
-                cache_dir_config = self.cfg('cache_directory', None)
-                cache_dir_path: Optional[Path] = None
-                if cache_dir_config: cache_dir_path = Path(str(cache_dir_config)).resolve()
-                elif PLATFORMDIRS_AVAILABLE and platformdirs is not None:
-                    try: cache_dir_path = Path(platformdirs.user_cache_dir("rename_app", "rename_app_author"))
-                    except Exception as e_pdirs: log.warning(f"Platformdirs failed to get cache dir: {e_pdirs}. Falling back.")
-                if not cache_dir_path:
-                    cache_dir_path = Path(__file__).parent.parent / ".rename_cache"; log.warning(f"Could not determine platform cache directory. Using fallback: {cache_dir_path}")
-                 
+                cache_dir_path = resolve_cache_directory(self.cfg)
                 if cache_dir_path:
                     status_context: Any = None
                     is_quiet_for_status = getattr(self.cfg.args, 'quiet', False) if hasattr(self.cfg, 'args') and self.cfg.args else False
@@ -366,6 +375,42 @@ class MetadataFetcher:
                 log.warning("Persistent caching enabled, but 'diskcache' library not found. Caching disabled."); self.cache_enabled = False
         else:
             log.info("Persistent caching disabled by configuration.")
+        # Aliases live next to the disk cache and are only kept when it is in use.
+        if self.cache_enabled and self.cache is not None and self.cfg('title_alias_index_enabled', True):
+            alias_dir = resolve_cache_directory(self.cfg)
+            try:
+                if alias_dir: self.alias_index = TitleAliasIndex(alias_dir / ALIAS_DB_FILENAME)
+            except (sqlite3.Error, OSError) as e:
+                log.warning(f"Could not open title alias index in '{alias_dir}': {e}. Title searches will not be skipped.")
+
+    def _lookup_alias(self, kind: str, title: str, year: Optional[int], source: str) -> Optional[TitleAlias]:
+        if self.alias_index is None: return None
+        alias = self.alias_index.lookup(kind, title, year, source)
+        if alias:
+            self.cache_stats['alias_hits'] += 1
+            log.debug(f"Title alias hit: {kind} '{title}' ({year}) -> {source.upper()} ID {alias.provider_id}; skipping search.")
+        return alias
+
+    def _record_alias(self, kind: str, title: str, year: Optional[int], source: str, ids: Optional[Dict[str, Any]], score: Optional[float]) -> None:
+        """Remembers a confident title-search resolution (forced/direct-ID matches carry no title evidence)."""
+        if self.alias_index is None or score is None or score < self.alias_min_score or score >= DIRECT_ID_MATCH_SCORE: return
+        provider_id = (ids or {}).get(f"{source}_id")
+        if provider_id: self.alias_index.record(kind, title, year, source, int(provider_id), score)
+
+    def _forget_alias(self, kind: str, title: str, year: Optional[int], source: str) -> None:
+        if self.alias_index is None: return
+        log.warning(f"{source.upper()} ID from the title alias for '{title}' no longer resolves; dropping the alias.")
+        self.alias_index.forget(title, kind=kind, year=year, source=source)
+
+    def _source_available(self, source: str) -> bool:
+        """Whether lookups for 'tmdb'/'tvdb' can be answered (API client configured and its breaker closed, or the offline index)."""
+        if self.offline_index is not None: return True
+        return bool(self.tmdb if source == 'tmdb' else self.tvdb) and self.circuit_breaker.allow(source)
+
+    def _unavailable_reason(self, source: str) -> str:
+        if (self.tmdb if source == 'tmdb' else self.tvdb) and not self.circuit_breaker.allow(source):
+            return f"{source.upper()} is temporarily skipped after repeated failures (circuit breaker open); only cached data is used."
+        return f"{source.upper()} client not available."
 
     def _get_year_from_date(self, date_str: Optional[str]) -> Optional[int]:
         if not date_str or not DATEUTIL_AVAILABLE or dateutil is None: return None
@@ -376,45 +421,152 @@ class MetadataFetcher:
 
     async def _run_sync(self, func, *args, **kwargs):
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, func, *args, **kwargs)
+        # run_in_executor() takes no keyword arguments; bind them first (e.g. cache.get(default=...), cache.set(expire=...)).
+        return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+    def _disk_expire(self) -> Optional[int]:
+        """diskcache TTL: the freshness window, extended by the allowed staleness in stale-while-revalidate mode."""
+        if not self.stale_while_revalidate: return self.cache_expire
+        if self.cache_max_stale is None: return None # Kept until refreshed or evicted
+        return self.cache_expire + self.cache_max_stale
 
     async def _get_cache(self, key: str) -> Optional[Any]:
-        if not self.cache_enabled or not self.cache: return None
+        """Returns a compact movie (data, ids, score) or series (show, episodes, ids, score) tuple, or None."""
+        value, _is_stale = await self._get_cache_entry(key)
+        return value
+
+    async def _get_cache_entry(self, key: str) -> Tuple[Optional[Any], bool]:
+        """Like _get_cache(), plus whether the value is past cache_expire_seconds (stale-while-revalidate only)."""
+        if not self.cache_enabled or self.cache is None: return None, False
         _cache_miss = object()
+        # L1: decoded records from earlier in this run, no executor hop or deserialization.
+        memory_value = self.memory_cache.get(key, _cache_miss)
+        if memory_value is not _cache_miss:
+            self.cache_stats['memory_hits'] += 1
+            log.debug(f"Cache HIT (memory) for key: {key}")
+            return memory_value, False
         try:
-            if self.cache is None: return None # Should not happen if cache_enabled is true
-            cached_value = await self._run_sync(self.cache.get, key, default=_cache_miss)
-            if cached_value is not _cache_miss:
-                log.debug(f"Cache HIT for key: {key}")
-                # Check structure based on expected return type (movie vs series)
-                if isinstance(cached_value, tuple) and \
-                   ( (len(cached_value) == 4 and isinstance(cached_value[1], dict)) or # Movie: data, ids, score, error_signal
-                     (len(cached_value) == 5 and isinstance(cached_value[1], dict) and isinstance(cached_value[2], dict)) ): # Series: data, ep_map, ids, score, error_signal
-                    return cached_value
-                else:
-                    log.warning(f"Cache data for {key} has unexpected structure. Ignoring cache. Data: {cached_value}")
-                    await self._run_sync(self.cache.delete, key)
-                    return None
-            else:
-                log.debug(f"Cache MISS for key: {key}"); return None
+            raw_value = await self._run_sync(self.cache.get, key, default=_cache_miss)
+            if raw_value is _cache_miss:
+                self.cache_stats['misses'] += 1
+                log.debug(f"Cache MISS for key: {key}"); return None, False
+            entry = decode_cache_entry(raw_value)
+            if entry is None:
+                # Legacy pickled API objects or another schema version: drop it and refetch.
+                self.cache_stats['misses'] += 1
+                log.info(f"Cache entry for {key} has an outdated format. Refetching.")
+                await self._run_sync(self.cache.delete, key)
+                return None, False
+            decoded, fetched_at = entry
+            age = time.time() - fetched_at if fetched_at is not None else 0.0
+            if self.stale_while_revalidate and age > self.cache_expire:
+                if self.cache_max_stale is not None and age > self.cache_expire + self.cache_max_stale:
+                    self.cache_stats['misses'] += 1
+                    log.debug(f"Cache entry for {key} is older than the staleness limit. Refetching.")
+                    return None, False
+                # Not promoted to L1, so later lookups keep seeing it as stale until the refresh lands.
+                self.cache_stats['stale_hits'] += 1
+                log.debug(f"Cache HIT (stale, {age:.0f}s old) for key: {key}")
+                return decoded, True
+            log.debug(f"Cache HIT (disk) for key: {key}")
+            self.cache_stats['disk_hits'] += 1
+            self.memory_cache.set(key, decoded, expire=self.cache_expire, size=len(raw_value))
+            return decoded, False
         except Exception as e:
-            log.warning(f"Error getting from cache key '{key}': {e}", exc_info=True); return None
-
-    async def _set_cache(self, key: str, value: Any):
-        if not self.cache_enabled or not self.cache: return
-        # Validate structure before caching
-        if not isinstance(value, tuple) or not \
-           ( (len(value) == 4 and isinstance(value[1], dict)) or \
-             (len(value) == 5 and isinstance(value[1], dict) and isinstance(value[2], dict)) ):
-             log.error(f"Attempted to cache value with incorrect structure for key {key}. Aborting cache set. Value: {value}")
-             return
+            log.warning(f"Error getting from cache key '{key}': {e}", exc_info=True); return None, False
+
+    async def _get_first_cache_entry(self, keys: List[str]) -> Tuple[Optional[Any], bool, str]:
+        """_get_cache_entry() over keys in order; returns the first hit and its key (the last key on a miss)."""
+        for key in keys:
+            value, is_stale = await self._get_cache_entry(key)
+            if value: return value, is_stale, key
+        return None, False, keys[-1]
+
+    async def _set_cache(self, key: str, value: Tuple[Any, ...]):
+        if not self.cache_enabled or self.cache is None: return
         try:
-            if self.cache is None: return
-            await self._run_sync(self.cache.set, key, value, expire=self.cache_expire)
-            log.debug(f"Cache SET for key: {key}")
+            raw_value = encode_cache_record(value)
+        except (ValueError, TypeError) as e:
+            log.error(f"Attempted to cache value with incorrect structure for key {key}: {e}. Aborting cache set.")
+            return
+        # Write-through: L1 first so lookups later in this run hit memory, then the disk tier.
+        self.memory_cache.set(key, value, expire=self.cache_expire, size=len(raw_value))
+        try:
+            await self._run_sync(self.cache.set, key, raw_value, expire=self._disk_expire())
+            log.debug(f"Cache SET for key: {key} ({len(raw_value)} bytes)")
         except Exception as e:
             log.warning(f"Error setting cache key '{key}': {e}", exc_info=True)
 
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Tuple[Any, ...]]], compact: Callable[..., Tuple[Any, ...]]) -> None:
+        """Refetches a stale entry in the background; the stale value has already been returned to the caller."""
+        if key in self._refresh_tasks: return
+
+        async def _refresh() -> None:
+            try:
+                await self.rate_limiter.wait()
+                result = await fetch()
+                await self._set_cache(key, compact(*result))
+                self.cache_stats['refreshed'] += 1
+                log.debug(f"Background refresh updated cache key: {key}")
+            except MetadataError as e:
+                # Keep serving the stale entry; a transient failure is retried on the next stale hit.
+                log.info(f"Background refresh for '{key}' failed, keeping cached data: {e}")
+            except Exception as e:
+                log.warning(f"Unexpected error refreshing cache key '{key}': {type(e).__name__}: {e}")
+            finally:
+                self._refresh_tasks.pop(key, None)
+
+        self._refresh_tasks[key] = asyncio.create_task(_refresh(), name=f"refresh_{key}")
+
+    async def wait_for_background_refreshes(self) -> None:
+        """Awaits pending stale-while-revalidate refreshes (call before the event loop shuts down)."""
+        while self._refresh_tasks:
+            log.info(f"Waiting for {len(self._refresh_tasks)} background metadata cache refresh(es)...")
+            await asyncio.gather(*list(self._refresh_tasks.values()), return_exceptions=True)
+
+    async def _get_negative_cache(self, key: str) -> Optional[str]:
+        """Returns the reason if key was recently a definitive 'no match', else None."""
+        if not self.cache_enabled or self.cache is None or self.negative_cache_expire <= 0: return None
+        try:
+            reason = decode_negative_record(await self._run_sync(self.cache.get, negative_cache_key(key)))
+        except Exception as e:
+            log.warning(f"Error reading negative cache for key '{key}': {e}"); return None
+        if reason is not None:
+            self.cache_stats['negative_hits'] += 1
+            log.debug(f"Negative cache HIT for key: {key}")
+        return reason
+
+    async def _set_negative_cache(self, key: str, title: str, reason: str):
+        if not self.cache_enabled or self.cache is None or self.negative_cache_expire <= 0: return
+        try:
+            await self._run_sync(self.cache.set, negative_cache_key(key), encode_negative_record(reason),
+                                 expire=self.negative_cache_expire, tag=negative_cache_tag(title))
+            log.debug(f"Negative cache SET for key: {key} (expires in {self.negative_cache_expire}s)")
+        except Exception as e:
+            log.warning(f"Error setting negative cache key '{key}': {e}", exc_info=True)
+
+    def purge_negative_cache(self, title: str) -> int:
+        """Forgets cached 'no match' results for title so the next run asks the APIs again."""
+        if self.cache is None: return 0
+        removed = purge_negative_cache(self.cache, title)
+        log.info(f"Purged {removed} negative cache entries for '{title}'.")
+        return removed
+
+    def log_cache_stats(self) -> None:
+        if not self.cache_enabled: return
+        mem = self.memory_cache.stats()
+        log.info(f"Metadata cache: {self.cache_stats['memory_hits']} memory hits, {self.cache_stats['disk_hits']} disk hits, "
+                 f"{self.cache_stats['stale_hits']} stale hits, {self.cache_stats['negative_hits']} negative hits, {self.cache_stats['alias_hits']} alias hits, "
+                 f"{self.cache_stats['misses']} misses, {self.cache_stats['refreshed']} refreshed "
+                 f"(L1: {mem['items']} entries, {mem['bytes'] / 1024:.0f} KiB).")
+
+    def log_retry_stats(self) -> None:
+        if not (self.retry_policy.retries_used or self.retry_policy.pauses or self.circuit_breaker.trips): return
+        pauses = ", ".join(f"{provider.upper()} x{count}" for provider, count in self.retry_policy.pauses.items()) or "none"
+        trips = ", ".join(f"{provider.upper()} x{count}" for provider, count in self.circuit_breaker.trips.items()) or "none"
+        budget_left = "unlimited" if self.retry_policy.retries_left is None else self.retry_policy.retries_left
+        log.info(f"API retries: {self.retry_policy.retries_used} used ({budget_left} left in budget); provider pauses: {pauses}; circuit breaker trips: {trips}.")
+
     def _sync_tmdb_movie_fetch(self, sync_title: str, sync_year_guess: Optional[int], sync_lang: str, forced_tmdb_id: Optional[int] = None) -> Tuple[Optional[Any], Optional[Dict[str, Any]], Optional[float]]:
         log.debug(f"Executing TMDB Movie Fetch [sync thread] for: '{sync_title}' (year: {sync_year_guess}, lang: {sync_lang}, forced_id: {forced_tmdb_id})")
 
@@ -506,7 +658,7 @@ class MetadataFetcher:
                         elif self.movie_yearless_match_confidence == 'low': effective_fuzzy_cutoff = self.tmdb_fuzzy_cutoff
                         log.debug(f"Yearless movie match: using effective fuzzy cutoff of {effective_fuzzy_cutoff} (strategy: {self.movie_yearless_match_confidence})")
 
-                    if self.tmdb_strategy == 'fuzzy' and THEFUZZ_AVAILABLE and fuzz:
+                    if self.tmdb_strategy == 'fuzzy' and FUZZY_AVAILABLE:
                         log.debug(f"Attempting TMDB movie fuzzy match (cutoff: {effective_fuzzy_cutoff}).")
                         match_tuple_res = find_best_match(sync_title, results_as_dicts_tuple, result_key='title', id_key='id', score_cutoff=effective_fuzzy_cutoff)
                         if match_tuple_res: best_match_from_fuzzy_dict, temp_score = match_tuple_res
@@ -515,9 +667,9 @@ class MetadataFetcher:
                         log.debug("Using 'first' result strategy for TMDB movie (or fuzzy failed).")
                         first_raw_match_dict = next(iter(results_as_dicts_tuple), None)
                         if first_raw_match_dict:
-                            if THEFUZZ_AVAILABLE and fuzz:
+                            if FUZZY_AVAILABLE:
                                 api_title_str = str(first_raw_match_dict.get('title', ''))
-                                first_score_val = float(fuzz.ratio(str(sync_title).lower(), api_title_str.lower()))
+                                first_score_val = fuzzy_ratio(sync_title, api_title_str)
                                 effective_first_min_score = self.tmdb_first_result_min_score
                                 if is_yearless_match_attempt:
                                     if self.movie_yearless_match_confidence == 'high': effective_first_min_score = 90
@@ -624,7 +776,7 @@ class MetadataFetcher:
                 results_as_dicts_tuple = _tmdb_results_to_dicts(processed_results_list, result_type='series')
                 if results_as_dicts_tuple:
                     best_match_from_fuzzy_dict: Optional[Dict] = None; temp_score: Optional[float] = None
-                    if self.tmdb_strategy == 'fuzzy' and THEFUZZ_AVAILABLE and fuzz:
+                    if self.tmdb_strategy == 'fuzzy' and FUZZY_AVAILABLE:
                         log.debug(f"Attempting TMDB series fuzzy match (cutoff: {self.tmdb_fuzzy_cutoff}).")
                         match_tuple_res = find_best_match(sync_title, results_as_dicts_tuple, result_key='name', id_key='id', score_cutoff=self.tmdb_fuzzy_cutoff)
                         if match_tuple_res: best_match_from_fuzzy_dict, temp_score = match_tuple_res
@@ -632,9 +784,9 @@ class MetadataFetcher:
                         log.debug("Using 'first' result strategy for TMDB series.")
                         first_raw_match_dict = next(iter(results_as_dicts_tuple), None)
                         if first_raw_match_dict:
-                            if THEFUZZ_AVAILABLE and fuzz:
+                            if FUZZY_AVAILABLE:
                                 api_name_str = str(first_raw_match_dict.get('name', ''))
-                                first_score_val = float(fuzz.ratio(str(sync_title).lower(), api_name_str.lower()))
+                                first_score_val = fuzzy_ratio(sync_title, api_name_str)
                                 log.debug(f"  'first' strategy: Series Name='{api_name_str}', Score vs '{sync_title}' = {first_score_val:.1f} (Min required: {self.tmdb_first_result_min_score})")
                                 if first_score_val >= self.tmdb_first_result_min_score:
                                     best_match_from_fuzzy_dict = first_raw_match_dict; temp_score = first_score_val
@@ -872,21 +1024,25 @@ class MetadataFetcher:
         return show_data_dict, ep_data_map_tvdb, ids_dict_tvdb, match_score_val
 
     async def _do_fetch_tmdb_movie(self, title_arg: str, year_arg: Optional[int], lang: str ='en', force_tmdb_id_arg: Optional[int] = None) -> Tuple[Optional[Any], Optional[Dict[str, Any]], Optional[float]]:
-        max_attempts = max(1, int(self.cfg('api_retry_attempts', 3)))
-        wait_seconds = float(self.cfg('api_retry_wait_seconds', 2.0))
-        async_retryer = AsyncRetrying( stop=stop_after_attempt(max_attempts), wait=wait_fixed(wait_seconds), retry=retry_if_exception(should_retry_api_error), reraise=True )
+        if self.offline_index is not None:
+            offline_hit = self.offline_index.find_movie(title_arg, year_arg, tmdb_id=force_tmdb_id_arg)
+            if offline_hit: return offline_hit
+            if self.offline_only or not self.tmdb:
+                # Plain MetadataError, not MetadataNotFoundError: the next index sync may add it, so don't negative-cache.
+                raise MetadataError(f"No match for movie '{title_arg}' (ID: {force_tmdb_id_arg or 'N/A'}) in the offline index.")
+        max_attempts = self.retry_policy.max_attempts
         
         data_obj, ids_dict, score = None, None, None
         try:
-            log.debug(f"Attempting TMDB movie fetch for '{title_arg}' ({year_arg}, id:{force_tmdb_id_arg}) with tenacity.")
+            log.debug(f"Attempting TMDB movie fetch for '{title_arg}' ({year_arg}, id:{force_tmdb_id_arg}) with retries.")
             # _sync_tmdb_movie_fetch now returns 3 items
-            data_obj, ids_dict, score = await async_retryer( 
-                self._run_sync, self._sync_tmdb_movie_fetch, str(title_arg), year_arg, str(lang), force_tmdb_id_arg 
+            data_obj, ids_dict, score = await self.retry_policy.call(
+                'tmdb', self._run_sync, self._sync_tmdb_movie_fetch, str(title_arg), year_arg, str(lang), force_tmdb_id_arg 
             )
             
             if data_obj is None and ids_dict is None and score is None : 
                 log.info(f"TMDB movie '{title_arg}' ({year_arg}, id:{force_tmdb_id_arg}) no match found after search/filtering.")
-                raise MetadataError(f"No TMDB match found for movie '{title_arg}' (ID: {force_tmdb_id_arg if force_tmdb_id_arg else 'N/A - search failed'}).")
+                raise MetadataNotFoundError(f"No TMDB match found for movie '{title_arg}' (ID: {force_tmdb_id_arg if force_tmdb_id_arg else 'N/A - search failed'}).")
             
             return data_obj, ids_dict, score
         except MetadataError as me: # This catches "FORCED_TMDB_ID_NOT_FOUND" OR "No TMDB match found..."
@@ -895,7 +1051,7 @@ class MetadataFetcher:
                 try:
                     forced_id = str(me).split("::")[1]
                     log.warning(f"TMDB movie: Forced ID {forced_id} not found.")
-                    raise MetadataError(f"Provided TMDB ID '{forced_id}' was not found.") from me
+                    raise MetadataNotFoundError(f"Provided TMDB ID '{forced_id}' was not found.") from me
                 except IndexError: # Fallback if parsing signal fails
                     log.error(f"Error parsing FORCED_ID signal: {me}")
                     raise # Re-raise original MetadataError
@@ -941,24 +1097,29 @@ class MetadataFetcher:
             raise MetadataError(final_error_msg) from e
 
     async def _do_fetch_tmdb_series(self, title_arg: str, season_arg: int, episodes_arg: Tuple[int, ...], year_guess_arg: Optional[int] = None, lang: str ='en', force_tmdb_id_arg: Optional[int] = None) -> Tuple[Optional[Any], Optional[Dict[int, Any]], Optional[Dict[str, Any]], Optional[float]]:
-        max_attempts = max(1, int(self.cfg('api_retry_attempts', 3)))
-        wait_seconds = float(self.cfg('api_retry_wait_seconds', 2.0))
-        async_retryer = AsyncRetrying(stop=stop_after_attempt(max_attempts), wait=wait_fixed(wait_seconds), retry=retry_if_exception(should_retry_api_error), reraise=True)
+        if self.offline_index is not None:
+            offline_hit = self.offline_index.find_series(title_arg, int(season_arg), tuple(episodes_arg), year_guess_arg, tmdb_id=force_tmdb_id_arg)
+            if offline_hit: return offline_hit
+            if self.offline_only or not self.tmdb:
+                raise MetadataError(f"No match for series '{title_arg}' S{season_arg} (ID: {force_tmdb_id_arg or 'N/A'}) in the offline index.")
+        max_attempts = self.retry_policy.max_attempts
         data_obj, ep_map, ids_dict, score, specific_error = None, None, None, None, None
         try:
-            log.debug(f"Attempting TMDB series fetch for '{title_arg}' S{season_arg} (id:{force_tmdb_id_arg}) with tenacity.")
-            data_obj, ep_map, ids_dict, score, specific_error = await async_retryer(
-                self._run_sync, self._sync_tmdb_series_fetch, str(title_arg), int(season_arg), tuple(episodes_arg), year_guess_arg, str(lang), force_tmdb_id_arg
+            log.debug(f"Attempting TMDB series fetch for '{title_arg}' S{season_arg} (id:{force_tmdb_id_arg}) with retries.")
+            data_obj, ep_map, ids_dict, score, specific_error = await self.retry_policy.call(
+                'tmdb', self._run_sync, self._sync_tmdb_series_fetch, str(title_arg), int(season_arg), tuple(episodes_arg), year_guess_arg, str(lang), force_tmdb_id_arg
             )
             if specific_error:
                 if "FORCED_TMDB_ID_NOT_FOUND" in specific_error:
                     forced_id = specific_error.split("::")[1]
-                    raise MetadataError(f"Provided TMDB Series ID '{forced_id}' was not found.")
+                    raise MetadataNotFoundError(f"Provided TMDB Series ID '{forced_id}' was not found.")
+                elif specific_error in TMDB_NOT_FOUND_SIGNALS:
+                    raise MetadataNotFoundError(f"No TMDB match found for series '{title_arg}' S{season_arg} ({specific_error}).")
                 else: raise MetadataError(f"A specific error occurred during TMDB series fetch: {specific_error}")
 
             if data_obj is None:
                 log.info(f"TMDB series '{title_arg}' S{season_arg} (id:{force_tmdb_id_arg}) not found or no match.")
-                raise MetadataError(f"No TMDB match found for series '{title_arg}' S{season_arg} (ID: {force_tmdb_id_arg}).")
+                raise MetadataNotFoundError(f"No TMDB match found for series '{title_arg}' S{season_arg} (ID: {force_tmdb_id_arg}).")
             return data_obj, ep_map, ids_dict, score
         except MetadataError as me: log.error(f"MetadataError during TMDB series fetch for '{title_arg}' S{season_arg}: {me}"); raise
         except RetryError as e: 
@@ -980,21 +1141,24 @@ class MetadataFetcher:
             raise MetadataError(final_error_msg) from e
 
     async def _do_fetch_tvdb_series(self, title_arg: str, season_num_arg: int, episodes_arg: Tuple[int, ...], tvdb_id_arg: Optional[int] = None, year_guess_arg: Optional[int] = None, lang: str = 'en', force_tvdb_id_arg: Optional[int] = None) -> Tuple[Optional[Dict], Optional[Dict[int, Any]], Optional[Dict[str, Any]], Optional[float]]:
-        max_attempts = max(1, int(self.cfg('api_retry_attempts', 3)))
-        wait_seconds = float(self.cfg('api_retry_wait_seconds', 2.0))
-        async_retryer = AsyncRetrying(stop=stop_after_attempt(max_attempts), wait=wait_fixed(wait_seconds), retry=retry_if_exception(should_retry_api_error), reraise=True)
+        if self.offline_index is not None:
+            offline_hit = self.offline_index.find_series(title_arg, int(season_num_arg), tuple(episodes_arg), year_guess_arg, tvdb_id=force_tvdb_id_arg or tvdb_id_arg)
+            if offline_hit: return offline_hit
+            if self.offline_only or not self.tvdb:
+                raise MetadataError(f"No match for series '{title_arg}' S{season_num_arg} (ID: {force_tvdb_id_arg or tvdb_id_arg or 'N/A'}) in the offline index.")
+        max_attempts = self.retry_policy.max_attempts
         
         data_obj, ep_map, ids_dict, score = None, None, None, None
         try:
-            log.debug(f"Attempting TVDB series fetch for '{title_arg}' S{season_num_arg} (id_arg:{tvdb_id_arg}, force_id:{force_tvdb_id_arg}) with tenacity.")
+            log.debug(f"Attempting TVDB series fetch for '{title_arg}' S{season_num_arg} (id_arg:{tvdb_id_arg}, force_id:{force_tvdb_id_arg}) with retries.")
             # _sync_tvdb_series_fetch now returns 4 items. It raises MetadataError for FORCED_ID_NOT_FOUND.
-            data_obj, ep_map, ids_dict, score = await async_retryer(
-                self._run_sync, self._sync_tvdb_series_fetch, str(title_arg), int(season_num_arg), tuple(episodes_arg), tvdb_id_arg, year_guess_arg, str(lang), force_tvdb_id_arg 
+            data_obj, ep_map, ids_dict, score = await self.retry_policy.call(
+                'tvdb', self._run_sync, self._sync_tvdb_series_fetch, str(title_arg), int(season_num_arg), tuple(episodes_arg), tvdb_id_arg, year_guess_arg, str(lang), force_tvdb_id_arg 
             )
 
             if data_obj is None: # This means search found nothing or an unexpected issue not caught as specific error
                 log.info(f"TVDB series '{title_arg}' S{season_num_arg} (id_arg:{tvdb_id_arg}, force_id:{force_tvdb_id_arg}) no match found.")
-                raise MetadataError(f"No TVDB match found for series '{title_arg}' S{season_num_arg} (ID: {force_tvdb_id_arg or tvdb_id_arg}).")
+                raise MetadataNotFoundError(f"No TVDB match found for series '{title_arg}' S{season_num_arg} (ID: {force_tvdb_id_arg or tvdb_id_arg}).")
             return data_obj, ep_map, ids_dict, score
         except MetadataError as me: # This will catch "FORCED_TVDB_ID_NOT_FOUND" or "No TVDB match found..."
             # Refine message if it's the internal signal
@@ -1002,7 +1166,7 @@ class MetadataFetcher:
                 try:
                     forced_id = str(me).split("::")[1]
                     log.warning(f"TVDB series: Forced ID {forced_id} not found.")
-                    raise MetadataError(f"Provided TVDB ID '{forced_id}' was not found.") from me
+                    raise MetadataNotFoundError(f"Provided TVDB ID '{forced_id}' was not found.") from me
                 except IndexError: pass # Fall through to re-raise original 'me'
             log.error(f"MetadataError during TVDB series fetch for '{title_arg}' S{season_num_arg}: {me}"); 
             raise # Re-raise the (potentially refined) MetadataError
@@ -1038,29 +1202,46 @@ class MetadataFetcher:
         tmdb_movie_data: Optional[Any] = None; tmdb_ids: Optional[Dict[str, Any]] = None; tmdb_score: Optional[float] = None
         lang = str(self.cfg('tmdb_language', 'en')) 
         
+        alias = None if force_tmdb_id else self._lookup_alias('movie', movie_title_guess, year_guess, 'tmdb')
+        lookup_tmdb_id = force_tmdb_id or (alias.provider_id if alias else None)
+
         cache_key_base = f"movie::{lang}"
-        if force_tmdb_id: cache_key = f"{cache_key_base}::id_{force_tmdb_id}"
-        else: cache_key = f"{cache_key_base}::{movie_title_guess}_{year_guess}"
+        title_cache_key = f"{cache_key_base}::{movie_title_guess}_{year_guess}"
+        cache_key = f"{cache_key_base}::id_{lookup_tmdb_id}" if lookup_tmdb_id else title_cache_key
 
         fetch_error_message: Optional[str] = None
         
-        cached_data = await self._get_cache(cache_key) # Cache now stores 3 items for movie (data, ids, score)
+        cached_data, cache_is_stale, hit_key = await self._get_first_cache_entry([title_cache_key, cache_key] if alias else [cache_key]) # Compact record: (data, ids, score)
         if cached_data and len(cached_data) == 3:
             tmdb_movie_data, tmdb_ids, tmdb_score_cached = cached_data
-            tmdb_score = tmdb_score_cached if tmdb_score_cached is not None else (DIRECT_ID_MATCH_SCORE if force_tmdb_id else None)
-            log.debug(f"Using cached data for movie: '{movie_title_guess}' (ID: {force_tmdb_id}, Score: {tmdb_score})")
+            refresh_tmdb_id = None if hit_key == title_cache_key else lookup_tmdb_id
+            tmdb_score = tmdb_score_cached if tmdb_score_cached is not None else (DIRECT_ID_MATCH_SCORE if refresh_tmdb_id else None)
+            log.debug(f"Using cached data for movie: '{movie_title_guess}' (ID: {lookup_tmdb_id}, Score: {tmdb_score})")
+            if cache_is_stale and self._source_available('tmdb'):
+                self._schedule_refresh(hit_key, partial(self._do_fetch_tmdb_movie, movie_title_guess, year_guess, lang, force_tmdb_id_arg=refresh_tmdb_id), compact_movie_result)
         else:
             if cached_data: log.warning(f"Invalid movie cache structure for {cache_key}, re-fetching.")
-            if not self.tmdb:
-                fetch_error_message = "TMDB client not available."
+            negative_reason = None if lookup_tmdb_id else await self._get_negative_cache(cache_key)
+            if negative_reason:
+                fetch_error_message = f"{negative_reason} (cached)"
+            elif not self._source_available('tmdb'):
+                fetch_error_message = self._unavailable_reason('tmdb')
             else:
                 try:
                     await self.rate_limiter.wait()
                     tmdb_movie_data, tmdb_ids, tmdb_score = await self._do_fetch_tmdb_movie(
-                        movie_title_guess, year_guess, lang, force_tmdb_id_arg=force_tmdb_id
+                        movie_title_guess, year_guess, lang, force_tmdb_id_arg=lookup_tmdb_id
                     )
                     if tmdb_movie_data is not None: 
-                         await self._set_cache(cache_key, (tmdb_movie_data, tmdb_ids, tmdb_score)) # Cache 3 items
+                         tmdb_movie_data, tmdb_ids, tmdb_score = compact_movie_result(tmdb_movie_data, tmdb_ids, tmdb_score)
+                         await self._set_cache(cache_key, (tmdb_movie_data, tmdb_ids, tmdb_score))
+                         if not lookup_tmdb_id: self._record_alias('movie', movie_title_guess, year_guess, 'tmdb', tmdb_ids, tmdb_score)
+                except MetadataNotFoundError as me_nf:
+                    log.info(f"TMDB has no match for movie '{movie_title_guess}' (ID: {force_tmdb_id}): {me_nf}")
+                    fetch_error_message = str(me_nf)
+                    tmdb_movie_data, tmdb_ids, tmdb_score = None, None, None
+                    if alias: self._forget_alias('movie', movie_title_guess, year_guess, 'tmdb')
+                    elif not force_tmdb_id: await self._set_negative_cache(cache_key, movie_title_guess, fetch_error_message)
                 except MetadataError as me: 
                     log.error(f"TMDB movie fetch failed for '{movie_title_guess}' (ID: {force_tmdb_id}): {me}")
                     fetch_error_message = str(me) 
@@ -1071,13 +1252,15 @@ class MetadataFetcher:
 
             if tmdb_movie_data is None and not fetch_error_message: 
                  fetch_error_message = f"No TMDB match for movie '{movie_title_guess}' (ID: {force_tmdb_id})."
+
+        if tmdb_movie_data and alias: tmdb_score = alias.score # The resolution's original match score, not the direct-ID score
         
         if tmdb_movie_data: 
             try:
                 final_meta.source_api = "tmdb"
                 final_meta.match_confidence = tmdb_score 
-                title_val = getattr(tmdb_movie_data, 'title', None) if isinstance(tmdb_movie_data, AsObj) else tmdb_movie_data.get('title')
-                release_date_val = getattr(tmdb_movie_data, 'release_date', None) if isinstance(tmdb_movie_data, AsObj) else tmdb_movie_data.get('release_date')
+                title_val = tmdb_movie_data.get('title')
+                release_date_val = tmdb_movie_data.get('release_date')
                 final_meta.movie_title = str(title_val) if title_val else None
                 final_meta.release_date = str(release_date_val) if release_date_val else None
                 final_meta.movie_year = self._get_year_from_date(final_meta.release_date) 
@@ -1102,8 +1285,27 @@ class MetadataFetcher:
         log.debug(f"fetch_movie_metadata returning for '{movie_title_guess}': Source='{final_meta.source_api}', Title='{final_meta.movie_title}', Year={final_meta.movie_year}, Score={final_meta.match_confidence}")
         return final_meta
 
-    async def fetch_series_metadata(self, show_title_guess: str, season_num: int, episode_num_list: Tuple[int, ...], year_guess: Optional[int] = None, force_tmdb_id: Optional[int] = None, force_tvdb_id: Optional[int] = None) -> MediaMetadata:
-        # ... (This method needs similar robust handling of the specific MetadataErrors from its _do_fetch... calls)
+    @staticmethod
+    def _series_cache_key(lang: str, season_num: int, episodes: Tuple[int, ...], title: str, year: Optional[int], source: str, lookup_id: Optional[int] = None) -> str:
+        cache_key_base = f"series::{lang}::S{season_num}E{episodes}"
+        if lookup_id: return f"{cache_key_base}::{source}_id_{lookup_id}"
+        return f"{cache_key_base}::{title}_{year}::{source}"
+
+    async def _cache_episode_subsets(self, lang: str, season_num: int, episode_sets: Sequence[Tuple[int, ...]], title: str, year: Optional[int],
+                                     source: str, lookup_id: Optional[int], record: Tuple[Any, ...]) -> None:
+        """Writes the entry each episode set would have been cached under, sliced from one season response."""
+        show, episodes, ids, score = record
+        for episode_set in episode_sets:
+            subset = tuple(sorted(set(episode_set)))
+            await self._set_cache(self._series_cache_key(lang, season_num, subset, title, year, source, lookup_id),
+                                  (show, {ep: episodes[ep] for ep in subset if ep in episodes}, ids, score))
+
+    async def fetch_series_metadata(self, show_title_guess: str, season_num: int, episode_num_list: Tuple[int, ...], year_guess: Optional[int] = None, force_tmdb_id: Optional[int] = None, force_tvdb_id: Optional[int] = None,
+                                    cache_episode_sets: Sequence[Tuple[int, ...]] = ()) -> MediaMetadata:
+        """
+        cache_episode_sets (cache warm-up): episode subsets of episode_num_list whose cache entries are
+        filled from this lookup's season data, so each one doesn't need its own search and season fetch.
+        """
         log.debug(f"Fetching series metadata (async) for: '{show_title_guess}' S{season_num}E{episode_num_list} (Year: {year_guess}, Force TMDB ID: {force_tmdb_id}, Force TVDB ID: {force_tvdb_id})")
         final_meta = MediaMetadata(is_series=True)
         lang = str(self.cfg('tmdb_language', 'en'))
@@ -1130,41 +1332,74 @@ class MetadataFetcher:
             if source == 'tmdb' and force_tmdb_id: current_force_id_val = force_tmdb_id
             elif source == 'tvdb' and force_tvdb_id: current_force_id_val = force_tvdb_id
 
-            cache_key_base = f"series::{lang}::S{season_num}E{episode_num_tuple}"
-            if current_force_id_val: cache_key = f"{cache_key_base}::{source}_id_{current_force_id_val}"
-            else: cache_key = f"{cache_key_base}::{show_title_guess}_{year_guess}::{source}"
+            alias = None if current_force_id_val else self._lookup_alias('series', show_title_guess, year_guess, source)
+            lookup_id = current_force_id_val or (alias.provider_id if alias else None)
+            tvdb_id_from_tmdb_source = (results_by_source['tmdb'].get('ids') or {}).get('tvdb_id') if source == 'tvdb' and not lookup_id else None
+            # Negative entries and aliases only describe title searches; explicit or cross-referenced IDs always go to the API.
+            searched_by_title = not lookup_id and not tvdb_id_from_tmdb_source
+
+            title_cache_key = self._series_cache_key(lang, season_num, episode_num_tuple, show_title_guess, year_guess, source)
+            cache_key = self._series_cache_key(lang, season_num, episode_num_tuple, show_title_guess, year_guess, source, lookup_id)
             
             source_data, source_ep_map, source_ids, source_score = None, None, None, None
             source_error: Optional[str] = None
 
-            cached_data = await self._get_cache(cache_key) # Expects 4 items (data, ep_map, ids, score) from _sync_... via _do_fetch...
-            if cached_data and len(cached_data) == 4: # Simplified cache structure check for series
+            cached_data, cache_is_stale, hit_key = await self._get_first_cache_entry([title_cache_key, cache_key] if alias else [cache_key]) # Compact record: (show, episodes, ids, score)
+            if cached_data and len(cached_data) == 4:
                 source_data, source_ep_map, source_ids, source_score = cached_data
                 if current_force_id_val and source_score != DIRECT_ID_MATCH_SCORE: source_score = DIRECT_ID_MATCH_SCORE
                 log.debug(f"Using cached {source.upper()} data for series: '{show_title_guess}' (ID: {current_force_id_val}, Score: {source_score})")
+                if cache_episode_sets and not cache_is_stale:
+                    await self._cache_episode_subsets(lang, season_num, cache_episode_sets, show_title_guess, year_guess, source, lookup_id, cached_data)
+                if cache_is_stale:
+                    refresh_id = None if hit_key == title_cache_key else lookup_id
+                    if source == 'tmdb' and self._source_available('tmdb'):
+                        self._schedule_refresh(hit_key, partial(self._do_fetch_tmdb_series, show_title_guess, season_num, episode_num_tuple, year_guess, lang, force_tmdb_id_arg=refresh_id), compact_series_result)
+                    elif source == 'tvdb' and self._source_available('tvdb'):
+                        self._schedule_refresh(hit_key, partial(
+                            self._do_fetch_tvdb_series, title_arg=show_title_guess, season_num_arg=season_num, episodes_arg=episode_num_tuple,
+                            tvdb_id_arg=refresh_id or (source_ids or {}).get('tvdb_id'), year_guess_arg=year_guess, lang=lang,
+                            force_tvdb_id_arg=refresh_id
+                        ), compact_series_result)
             else:
                 if cached_data: log.warning(f"Invalid series cache structure for {cache_key}, re-fetching.")
+                negative_reason = await self._get_negative_cache(cache_key) if searched_by_title else None
                 try:
+                    if negative_reason:
+                        raise MetadataNotFoundError(f"{negative_reason} (cached)")
                     await self.rate_limiter.wait()
-                    if source == 'tmdb' and self.tmdb:
+                    if source == 'tmdb' and self._source_available('tmdb'):
                         source_data, source_ep_map, source_ids, source_score = await self._do_fetch_tmdb_series(
-                            show_title_guess, season_num, episode_num_tuple, year_guess, lang, force_tmdb_id_arg=current_force_id_val
+                            show_title_guess, season_num, episode_num_tuple, year_guess, lang, force_tmdb_id_arg=lookup_id
                         )
-                    elif source == 'tvdb' and self.tvdb:
-                         tvdb_id_from_tmdb_source = results_by_source.get('tmdb', {}).get('ids', {}).get('tvdb_id') if not current_force_id_val else None
-                         effective_tvdb_id_arg = current_force_id_val if current_force_id_val else tvdb_id_from_tmdb_source
+                    elif source == 'tvdb' and self._source_available('tvdb'):
+                         effective_tvdb_id_arg = lookup_id if lookup_id else tvdb_id_from_tmdb_source
                          source_data, source_ep_map, source_ids, source_score = await self._do_fetch_tvdb_series(
                              title_arg=show_title_guess, season_num_arg=season_num, episodes_arg=episode_num_tuple,
                              tvdb_id_arg=effective_tvdb_id_arg, 
                              year_guess_arg=year_guess, lang=lang,
-                             force_tvdb_id_arg=current_force_id_val
+                             force_tvdb_id_arg=lookup_id
                          )
-                    else: source_error = f"{source.upper()} client not available."
+                    else: source_error = self._unavailable_reason(source)
                     
                     if source_data is not None: # Cache only if data was fetched
-                        await self._set_cache(cache_key, (source_data, source_ep_map or {}, source_ids or {}, source_score)) # Cache 4 items
+                        source_data, source_ep_map, source_ids, source_score = compact_series_result(source_data, source_ep_map, source_ids, source_score)
+                        await self._set_cache(cache_key, (source_data, source_ep_map, source_ids, source_score))
+                        if cache_episode_sets:
+                            await self._cache_episode_subsets(lang, season_num, cache_episode_sets, show_title_guess, year_guess, source, lookup_id, (source_data, source_ep_map, source_ids, source_score))
+                        if searched_by_title: self._record_alias('series', show_title_guess, year_guess, source, source_ids, source_score)
+                except MetadataNotFoundError as me_not_found:
+                    source_error = str(me_not_found)
+                    if alias: self._forget_alias('series', show_title_guess, year_guess, source)
+                    elif searched_by_title and not negative_reason:
+                        await self._set_negative_cache(cache_key, show_title_guess, source_error)
+                        for episode_set in cache_episode_sets:
+                            subset_key = self._series_cache_key(lang, season_num, tuple(sorted(set(episode_set))), show_title_guess, year_guess, source)
+                            await self._set_negative_cache(subset_key, show_title_guess, source_error)
                 except MetadataError as me_fetch: source_error = str(me_fetch)
                 except Exception as e_fetch_unexp: source_error = f"Unexpected {source.upper()} error: {type(e_fetch_unexp).__name__}"
+
+            if source_data is not None and alias: source_score = alias.score
             
             results_by_source[source]['data'] = source_data; results_by_source[source]['ep_map'] = source_ep_map or {}
             results_by_source[source]['ids'] = source_ids or {}; results_by_source[source]['score'] = source_score
@@ -1198,12 +1433,10 @@ class MetadataFetcher:
             final_meta.match_confidence = results_by_source[primary_source]['score']
             final_meta.ids = merged_ids
             try:
-                show_title_api_val = getattr(primary_show_data_obj, 'name', None) if isinstance(primary_show_data_obj, AsObj) else primary_show_data_obj.get('name')
+                show_title_api_val = primary_show_data_obj.get('name')
                 final_meta.show_title = str(show_title_api_val) if show_title_api_val else None
-                show_air_date_val: Optional[str] = None
-                if isinstance(primary_show_data_obj, AsObj): show_air_date_val = getattr(primary_show_data_obj, 'first_air_date', None)
-                elif isinstance(primary_show_data_obj, dict): show_air_date_val = primary_show_data_obj.get('firstAired') or primary_show_data_obj.get('first_air_date')
-                
+                show_air_date_val: Optional[str] = primary_show_data_obj.get('first_air_date')
+
                 final_meta.show_year = self._get_year_from_date(show_air_date_val)
                 final_meta.season = season_num; final_meta.episode_list = list(episode_num_tuple)
 
@@ -1211,11 +1444,7 @@ class MetadataFetcher:
                     for ep_num_val in episode_num_tuple:
                         ep_details_obj = primary_ep_map_dict.get(ep_num_val)
                         if ep_details_obj:
-                            ep_title_val: Optional[str] = None; air_date_val: Optional[str] = None
-                            if isinstance(ep_details_obj, AsObj): 
-                                ep_title_val = getattr(ep_details_obj, 'name', None); air_date_val = getattr(ep_details_obj, 'air_date', None)
-                            elif isinstance(ep_details_obj, dict): 
-                                ep_title_val = ep_details_obj.get('name') or ep_details_obj.get('episodeName'); air_date_val = ep_details_obj.get('aired') or ep_details_obj.get('airDate') 
+                            ep_title_val: Optional[str] = ep_details_obj.get('name'); air_date_val: Optional[str] = ep_details_obj.get('air_date')
                             if ep_title_val: final_meta.episode_titles[ep_num_val] = str(ep_title_val)
                             if air_date_val: final_meta.air_dates[ep_num_val] = str(air_date_val)
                         else: log.debug(f"Episode S{season_num}E{ep_num_val} not found in primary source map ({primary_source}).")
@@ -0,0 +1,179 @@
+# rename_app/move_engine.py
+"""
+Moves files between filesystems without Python-level buffering.
+
+A move within one filesystem (same st_dev) is a plain rename. Across filesystems the
+data is copied in large chunks with os.copy_file_range (in-kernel, server-side or
+reflinked where the filesystem supports it), falling back to os.sendfile and then to a
+read/write loop. The copy is synced and its size checked against the source before the
+source is unlinked, so an interrupted or short copy never loses the original.
+
+Long transfers report progress in bytes through the log; MoveEngine.move_many runs
+several transfers at once.
+"""
+
+import errno
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .exceptions import FileOperationError
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+_READ_CHUNK_BYTES = 8 * 1024 * 1024 # Plain read/write fallback
+# copy_file_range/sendfile can't handle this pair of files: try the next method.
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+
+def _format_bytes(num_bytes: float) -> str:
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if abs(num_bytes) < 1024: return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} TiB"
+
+
+def _device_of(path: Path) -> int:
+    """st_dev of path, or of its nearest existing parent if it doesn't exist yet."""
+    for candidate in (path, *path.parents):
+        try: return os.stat(candidate).st_dev
+        except FileNotFoundError: continue
+    raise FileOperationError(f"No existing parent directory for '{path}'.")
+
+
+def is_cross_device(src: Path, dst: Path) -> bool:
+    return os.stat(src).st_dev != _device_of(dst.parent)
+
+
+class TransferProgress:
+    """Thread-safe byte counter shared by the transfers of one move; logs at most every `interval` seconds."""
+
+    def __init__(self, total_bytes: int, label: str, interval: float = 5.0):
+        self.total_bytes = total_bytes
+        self.label = label
+        self.interval = interval
+        self.done_bytes = 0
+        self._lock = threading.Lock()
+        self._started = self._last_report = time.monotonic()
+
+    def advance(self, num_bytes: int) -> None:
+        with self._lock:
+            self.done_bytes += num_bytes
+            now = time.monotonic()
+            if now - self._last_report < self.interval: return
+            self._last_report = now
+            done, elapsed = self.done_bytes, now - self._started
+        percent = f" ({done / self.total_bytes:.0%})" if self.total_bytes else ""
+        log.info(f"{self.label}: {_format_bytes(done)} of {_format_bytes(self.total_bytes)}{percent}, {_format_bytes(done / elapsed)}/s")
+
+
+def copy_file_data(src: Path, dst: Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                   on_bytes: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Copies src to dst, which must not exist, plus its permissions and timestamps.
+    The copy is fsync'ed and size-checked; a partial dst is removed on any failure.
+    """
+    src_fd = os.open(src, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    created_dst = False
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+        created_dst = True
+        try:
+            copied = 0
+            method = 'copy_file_range' if hasattr(os, 'copy_file_range') else 'sendfile' if hasattr(os, 'sendfile') else 'read'
+            while copied < size:
+                want = min(chunk_bytes, size - copied)
+                try:
+                    if method == 'copy_file_range':
+                        sent = os.copy_file_range(src_fd, dst_fd, want, copied)
+                    elif method == 'sendfile':
+                        sent = os.sendfile(dst_fd, src_fd, copied, want)
+                    else:
+                        os.lseek(src_fd, copied, os.SEEK_SET)
+                        data = os.read(src_fd, min(want, _READ_CHUNK_BYTES))
+                        sent = 0
+                        while sent < len(data): sent += os.write(dst_fd, data[sent:])
+                except OSError as e:
+                    if method == 'read' or e.errno not in _FALLBACK_ERRNOS: raise
+                    method = 'sendfile' if method == 'copy_file_range' and hasattr(os, 'sendfile') else 'read'
+                    log.debug(f"Falling back to {method} for '{src.name}': {e}")
+                    continue
+                if not sent: break # Source shrank while copying; caught by the size check
+                copied += sent
+                if on_bytes: on_bytes(sent)
+            os.fsync(dst_fd)
+            copied_size = os.fstat(dst_fd).st_size
+        finally:
+            os.close(dst_fd)
+        if copied_size != size or os.stat(src).st_size != size:
+            raise FileOperationError(f"Copy of '{src}' to '{dst}' is incomplete ({copied_size} of {size} bytes).")
+        shutil.copystat(src, dst)
+    except BaseException:
+        if created_dst: dst.unlink(missing_ok=True)
+        raise
+    finally:
+        os.close(src_fd)
+    return copied_size
+
+
+class MoveEngine:
+    def __init__(self, chunk_bytes: int = DEFAULT_CHUNK_BYTES, parallel_transfers: int = 2):
+        self.chunk_bytes = max(1024 * 1024, int(chunk_bytes))
+        self.parallel_transfers = max(1, int(parallel_transfers))
+
+    @classmethod
+    def from_config(cls, cfg_helper) -> "MoveEngine":
+        return cls(chunk_bytes=int(float(cfg_helper('move_copy_chunk_mb', 64)) * 1024 * 1024),
+                   parallel_transfers=int(cfg_helper('move_parallel_transfers', 2)))
+
+    def move(self, src: Path, dst: Path, progress: Optional[TransferProgress] = None) -> bool:
+        """Moves src to dst. Returns True if the data was copied to another filesystem."""
+        if src.is_symlink() or not src.is_file() or not is_cross_device(src, dst):
+            shutil.move(str(src), str(dst))
+            return False
+        if progress is None:
+            progress = TransferProgress(src.stat().st_size, f"Copying '{src.name}' to {dst.parent}")
+        # Copy under a hidden name so a partial file never shows up at dst; the final rename
+        # replaces an existing dst, as shutil.move would.
+        partial = dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.partial")
+        copy_file_data(src, partial, self.chunk_bytes, progress.advance)
+        try:
+            os.replace(partial, dst)
+        except OSError:
+            partial.unlink(missing_ok=True)
+            raise
+        src.unlink()
+        log.debug(f"Moved '{src}' across filesystems to '{dst}'.")
+        return True
+
+    def move_many(self, pairs: Sequence[Tuple[Path, Path]]) -> List[Optional[BaseException]]:
+        """
+        Moves each (src, dst) pair, running up to `parallel_transfers` at once.
+        Returns the exception raised for each pair, or None where the move succeeded.
+        """
+        total_bytes = 0
+        for src, dst in pairs:
+            try:
+                if src.is_file() and is_cross_device(src, dst): total_bytes += src.stat().st_size
+            except OSError: pass # Reported by the move itself
+        progress = TransferProgress(total_bytes, f"Copying {len(pairs)} files across filesystems") if total_bytes else None
+
+        def move_one(pair: Tuple[Path, Path]) -> Optional[BaseException]:
+            try:
+                self.move(pair[0], pair[1], progress)
+                return None
+            except Exception as e:
+                return e
+
+        if self.parallel_transfers == 1 or len(pairs) < 2:
+            return [move_one(pair) for pair in pairs]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(self.parallel_transfers, len(pairs)), thread_name_prefix="rename-move") as pool:
+            return list(pool.map(move_one, pairs))
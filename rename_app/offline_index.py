@@ -0,0 +1,154 @@
+# rename_app/offline_index.py
+"""
+Read-only local title index used instead of (or before) the TMDB/TVDB APIs on hosts
+without internet access. The index is an SQLite file exported/synced elsewhere:
+
+    CREATE TABLE movies   (tmdb_id INTEGER PRIMARY KEY, title TEXT NOT NULL, release_date TEXT,
+                           imdb_id TEXT, collection_id INTEGER, collection_name TEXT);
+    CREATE TABLE shows    (id INTEGER PRIMARY KEY, tmdb_id INTEGER, tvdb_id INTEGER, imdb_id TEXT,
+                           name TEXT NOT NULL, first_air_date TEXT);
+    CREATE TABLE episodes (show_id INTEGER NOT NULL REFERENCES shows(id), season INTEGER NOT NULL,
+                           episode INTEGER NOT NULL, name TEXT, air_date TEXT,
+                           PRIMARY KEY (show_id, season, episode));
+
+Movie and show rows are loaded into dicts keyed by normalized title on open, so
+lookups are dictionary hits; episodes are read per (show, season) from the primary
+key and memoized. Results use the same compact shapes as the metadata cache.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import ConfigError
+from .fuzzy_matcher import FUZZY_AVAILABLE, TitleMatcher
+from .metadata_cache import MovieResult, SeriesResult
+from .title_aliases import normalize_title
+
+log = logging.getLogger(__name__)
+
+EXACT_TITLE_SCORE = 100.0
+DIRECT_ID_SCORE = 101.0 # Same value as metadata_fetcher.DIRECT_ID_MATCH_SCORE
+
+_MovieRow = Tuple[int, str, Optional[str], Optional[str], Optional[int], Optional[str]]
+_ShowRow = Tuple[int, Optional[int], Optional[int], Optional[str], str, Optional[str]]
+
+
+def _year(date_str: Optional[str]) -> Optional[int]:
+    if date_str and len(date_str) >= 4 and date_str[:4].isdigit():
+        return int(date_str[:4])
+    return None
+
+
+def offline_index_configured(cfg_helper) -> bool:
+    return bool(cfg_helper('offline_index_path', None))
+
+
+def offline_index_only(cfg_helper) -> bool:
+    """True when the index replaces the APIs entirely (no network access is attempted)."""
+    return offline_index_configured(cfg_helper) and str(cfg_helper('offline_index_mode', 'only')) == 'only'
+
+
+class OfflineMetadataIndex:
+    def __init__(self, path: Path, year_tolerance: int = 1, fuzzy_cutoff: int = 70):
+        self.path = Path(path).expanduser()
+        self.year_tolerance = year_tolerance
+        self.fuzzy_cutoff = fuzzy_cutoff
+        if not self.path.is_file():
+            raise ConfigError(f"Offline metadata index not found: {self.path}")
+        try:
+            # Read-only: the index is replaced wholesale by the sync job, never written here.
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._movies_by_title: Dict[str, List[_MovieRow]] = {}
+            self._movies_by_id: Dict[int, _MovieRow] = {}
+            for row in self._conn.execute("SELECT tmdb_id, title, release_date, imdb_id, collection_id, collection_name FROM movies"):
+                self._movies_by_title.setdefault(normalize_title(row[1]), []).append(row)
+                self._movies_by_id[row[0]] = row
+            self._shows_by_title: Dict[str, List[_ShowRow]] = {}
+            self._shows_by_tmdb: Dict[int, _ShowRow] = {}
+            self._shows_by_tvdb: Dict[int, _ShowRow] = {}
+            self._show_count = 0
+            for row in self._conn.execute("SELECT id, tmdb_id, tvdb_id, imdb_id, name, first_air_date FROM shows"):
+                self._show_count += 1
+                self._shows_by_title.setdefault(normalize_title(row[4]), []).append(row)
+                if row[1] is not None: self._shows_by_tmdb[row[1]] = row
+                if row[2] is not None: self._shows_by_tvdb[row[2]] = row
+        except sqlite3.Error as e:
+            raise ConfigError(f"Offline metadata index '{self.path}' could not be read: {e}") from e
+        self._season_cache: Dict[Tuple[int, int], Dict[int, Dict[str, Any]]] = {}
+        self._title_matchers: Dict[str, TitleMatcher] = {} # 'movie'/'show' -> matcher over all index titles, built on first fuzzy lookup
+        log.info(f"Offline metadata index loaded from {self.path}: {len(self._movies_by_id)} movies, {self._show_count} shows.")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _pick(self, kind: str, by_title: Dict[str, List[Any]], title: str, year: Optional[int], date_index: int) -> Optional[Tuple[Any, float]]:
+        """Exact normalized title (closest year within tolerance), else the best fuzzy title above the cutoff."""
+        norm = normalize_title(title)
+        candidates: List[Tuple[Any, float]] = [(row, EXACT_TITLE_SCORE) for row in by_title.get(norm, [])]
+        if not candidates and FUZZY_AVAILABLE and norm:
+            matcher = self._title_matchers.get(kind)
+            if matcher is None:
+                matcher = self._title_matchers[kind] = TitleMatcher(list(by_title), scorer='token_sort_ratio')
+            candidates = [
+                (row, score)
+                for index, score in matcher.extract(norm, limit=10, score_cutoff=self.fuzzy_cutoff)
+                for row in by_title[matcher.candidates[index]]
+            ]
+        best: Optional[Tuple[Any, float]] = None; best_rank: Optional[Tuple[float, int]] = None
+        for row, score in candidates:
+            row_year = _year(row[date_index])
+            year_diff = abs(row_year - year) if year is not None and row_year is not None else 0
+            if year is not None and row_year is not None and year_diff > self.year_tolerance:
+                continue
+            rank = (-score, year_diff)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = (row, score), rank
+        return best
+
+    def find_movie(self, title: str, year: Optional[int] = None, tmdb_id: Optional[int] = None) -> Optional[MovieResult]:
+        if tmdb_id:
+            row = self._movies_by_id.get(int(tmdb_id)); score = DIRECT_ID_SCORE
+        else:
+            picked = self._pick('movie', self._movies_by_title, title, year, date_index=2)
+            row, score = picked if picked else (None, 0.0)
+        if row is None:
+            return None
+        tmdb_id_val, title_val, release_date, imdb_id, collection_id, collection_name = row
+        ids = {'tmdb_id': tmdb_id_val, 'imdb_id': imdb_id, 'collection_id': collection_id, 'collection_name': collection_name}
+        return {'title': title_val, 'release_date': release_date}, {k: v for k, v in ids.items() if v is not None}, score
+
+    def _season(self, show_rowid: int, season: int) -> Dict[int, Dict[str, Any]]:
+        key = (show_rowid, season)
+        if key not in self._season_cache:
+            rows = self._conn.execute("SELECT episode, name, air_date FROM episodes WHERE show_id = ? AND season = ?", (show_rowid, season))
+            self._season_cache[key] = {ep: {'name': name, 'air_date': air_date} for ep, name, air_date in rows}
+        return self._season_cache[key]
+
+    def find_series(self, title: str, season: int, episodes: Tuple[int, ...], year: Optional[int] = None,
+                    tmdb_id: Optional[int] = None, tvdb_id: Optional[int] = None) -> Optional[SeriesResult]:
+        if tmdb_id or tvdb_id:
+            row = self._shows_by_tmdb.get(int(tmdb_id)) if tmdb_id else self._shows_by_tvdb.get(int(tvdb_id)) # type: ignore[arg-type]
+            score = DIRECT_ID_SCORE
+        else:
+            picked = self._pick('show', self._shows_by_title, title, year, date_index=5)
+            row, score = picked if picked else (None, 0.0)
+        if row is None:
+            return None
+        show_rowid, tmdb_id_val, tvdb_id_val, imdb_id, name, first_air_date = row
+        season_map = self._season(show_rowid, int(season))
+        ep_map = {ep: season_map[ep] for ep in episodes if ep in season_map}
+        ids = {'tmdb_id': tmdb_id_val, 'tvdb_id': tvdb_id_val, 'imdb_id': imdb_id}
+        return {'name': name, 'first_air_date': first_air_date}, ep_map, {k: v for k, v in ids.items() if v is not None}, score
+
+
+def open_offline_index(cfg_helper) -> Optional[OfflineMetadataIndex]:
+    index_path = cfg_helper('offline_index_path', None)
+    if not index_path:
+        return None
+    return OfflineMetadataIndex(
+        Path(index_path),
+        year_tolerance=int(cfg_helper('api_year_tolerance', 1)),
+        fuzzy_cutoff=int(cfg_helper('tmdb_match_fuzzy_cutoff', 70))
+    )
@@ -0,0 +1,164 @@
+# rename_app/retry_policy.py
+"""
+Retry policy shared by every metadata request of a run.
+
+- Waits between attempts use exponential backoff with full jitter
+  (uniform(0, min(max_wait, base * 2**(attempt-1)))), so concurrent workers that were
+  throttled together don't retry in lockstep and re-trigger the limit.
+- After `pause_after` consecutive 429/5xx responses from one provider, every worker
+  talking to that provider waits out a provider-wide pause before its next request.
+- `budget` caps the total number of retries per run; once spent, failures are final.
+
+CircuitBreaker sits above the retries: after `threshold` requests to a provider have
+failed for good with transient errors, the provider is skipped for `cooldown` seconds
+(callers fall back to another source or to cached data). After the cool-down one
+request is let through; a failure re-opens the breaker, a success closes it.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception
+
+log = logging.getLogger(__name__)
+
+
+def is_throttle_or_server_error(exception: BaseException) -> bool:
+    """HTTP 429 or 5xx, whether raised as a requests HTTPError or only visible in a client library's message."""
+    status_code = getattr(getattr(exception, 'response', None), 'status_code', None)
+    if isinstance(status_code, int):
+        return status_code == 429 or 500 <= status_code <= 599
+    msg = str(exception).lower()
+    return '429' in msg or 'too many requests' in msg or any(code in msg for code in ('500', '502', '503', '504'))
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 5, cooldown: float = 300.0):
+        self.threshold = max(0, int(threshold)) # 0: never trips
+        self.cooldown = max(0.0, float(cooldown))
+        self.trips: Dict[str, int] = {}
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls, cfg_helper) -> "CircuitBreaker":
+        return cls(threshold=int(cfg_helper('api_breaker_failure_threshold', 5)),
+                   cooldown=float(cfg_helper('api_breaker_cooldown_seconds', 300.0)))
+
+    def allow(self, provider: str, now: Optional[float] = None) -> bool:
+        return (time.monotonic() if now is None else now) >= self._open_until.get(provider, 0.0)
+
+    def record_success(self, provider: str) -> None:
+        self._failures[provider] = 0
+
+    def record_failure(self, provider: str) -> None:
+        if not self.threshold:
+            return
+        count = self._failures.get(provider, 0) + 1
+        if count >= self.threshold:
+            self._open_until[provider] = time.monotonic() + self.cooldown
+            self.trips[provider] = self.trips.get(provider, 0) + 1
+            count = self.threshold - 1 # Half-open after the cool-down: the next failure trips it again
+            log.warning(f"{provider.upper()} keeps failing; skipping it for {self.cooldown:.0f}s (circuit breaker open).")
+        self._failures[provider] = count
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 3, base_wait: float = 2.0, max_wait: float = 60.0,
+                 pause_after: int = 5, pause_seconds: float = 30.0, budget: Optional[int] = None,
+                 should_retry: Callable[[BaseException], bool] = lambda e: True,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_wait = max(0.0, float(base_wait))
+        self.max_wait = max(self.base_wait, float(max_wait))
+        self.pause_after = max(0, int(pause_after)) # 0: never pause
+        self.pause_seconds = max(0.0, float(pause_seconds))
+        self.retries_left = budget if budget is None else max(0, int(budget))
+        self.should_retry = should_retry
+        self.breaker = breaker
+        self.retries_used = 0
+        self.pauses: Dict[str, int] = {}
+        self._consecutive_errors: Dict[str, int] = {}
+        self._paused_until: Dict[str, float] = {}
+        self._budget_exhausted_logged = False
+
+    @classmethod
+    def from_config(cls, cfg_helper, should_retry: Callable[[BaseException], bool], breaker: Optional[CircuitBreaker] = None) -> "RetryPolicy":
+        budget = cfg_helper('api_retry_budget', 200)
+        return cls(
+            max_attempts=int(cfg_helper('api_retry_attempts', 3)),
+            base_wait=float(cfg_helper('api_retry_wait_seconds', 2.0)),
+            max_wait=float(cfg_helper('api_retry_max_wait_seconds', 60.0)),
+            pause_after=int(cfg_helper('api_provider_pause_after', 5)),
+            pause_seconds=float(cfg_helper('api_provider_pause_seconds', 30.0)),
+            budget=int(budget) if budget is not None else None,
+            should_retry=should_retry,
+            breaker=breaker
+        )
+
+    def pause_remaining(self, provider: str, now: Optional[float] = None) -> float:
+        return max(0.0, self._paused_until.get(provider, 0.0) - (time.monotonic() if now is None else now))
+
+    def record_success(self, provider: str) -> None:
+        self._consecutive_errors[provider] = 0
+
+    def record_failure(self, provider: str, exception: BaseException) -> None:
+        if not is_throttle_or_server_error(exception):
+            return
+        count = self._consecutive_errors.get(provider, 0) + 1
+        self._consecutive_errors[provider] = count
+        if self.pause_after and count >= self.pause_after and not self.pause_remaining(provider):
+            self._paused_until[provider] = time.monotonic() + self.pause_seconds
+            self._consecutive_errors[provider] = 0
+            self.pauses[provider] = self.pauses.get(provider, 0) + 1
+            log.warning(f"{provider.upper()} returned {count} throttling/server errors in a row; pausing all requests to it for {self.pause_seconds:.0f}s.")
+
+    def backoff(self, attempt_number: int) -> float:
+        """Full jitter: a uniform wait up to the capped exponential delay for this attempt."""
+        return random.uniform(0.0, min(self.max_wait, self.base_wait * (2 ** max(0, attempt_number - 1))))
+
+    def _stop(self, retry_state: RetryCallState) -> bool:
+        # Only consulted when the last attempt failed with a retryable error.
+        if retry_state.attempt_number >= self.max_attempts:
+            return True
+        if self.retries_left is not None:
+            if self.retries_left == 0:
+                if not self._budget_exhausted_logged:
+                    log.warning("API retry budget for this run is exhausted; further failures are not retried.")
+                    self._budget_exhausted_logged = True
+                return True
+            self.retries_left -= 1
+        self.retries_used += 1
+        return False
+
+    def retrying(self, provider: str) -> AsyncRetrying:
+        def retry_predicate(exception: BaseException) -> bool:
+            self.record_failure(provider, exception)
+            return self.should_retry(exception)
+
+        def wait(retry_state: RetryCallState) -> float:
+            return max(self.backoff(retry_state.attempt_number), self.pause_remaining(provider))
+
+        return AsyncRetrying(stop=self._stop, wait=wait, retry=retry_if_exception(retry_predicate), reraise=True)
+
+    async def call(self, provider: str, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        Runs func(*args) with retries; every attempt first waits out a pause on the provider.
+        A call that still fails with a transient error counts against the provider's circuit breaker.
+        """
+        async def attempt() -> Any:
+            pause = self.pause_remaining(provider)
+            if pause: await asyncio.sleep(pause)
+            result = await func(*args)
+            self.record_success(provider)
+            return result
+        try:
+            result = await self.retrying(provider)(attempt)
+        except Exception as e:
+            if self.breaker is not None and self.should_retry(e): self.breaker.record_failure(provider)
+            raise
+        if self.breaker is not None: self.breaker.record_success(provider)
+        return result
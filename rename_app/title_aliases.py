@@ -0,0 +1,126 @@
+# rename_app/title_aliases.py
+"""
+Title normalization and the persistent alias index.
+
+normalize_title() folds the spellings release groups and databases use for the same
+title ("Marvels.Agents.of.S.H.I.E.L.D", "Marvel's Agents of S.H.I.E.L.D.") to one key.
+TitleAliasIndex remembers which provider ID each normalized (title, year) resolved to,
+so later lookups go straight to the ID and skip the search and fuzzy-scoring step.
+"""
+
+import logging
+import re
+import sqlite3
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+ALIAS_DB_FILENAME = "title_aliases.sqlite3"
+
+_APOSTROPHES = re.compile(r"[’'`´]")
+_TRAILING_ARTICLE = re.compile(r"^(.+),\s*(the|a|an)$")
+_LEADING_ARTICLE = re.compile(r"^(the|a|an)\s+(?=\S)")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# Dotted or spaced acronyms: "s.h.i.e.l.d" / "s h i e l d" -> "shield" (three or more single letters).
+_SPACED_ACRONYM = re.compile(r"\b(?:[a-z] ){2,}[a-z]\b")
+# II..XXXIX only: single letters ('i', 'x', 'v') and larger numerals collide with real words too often.
+_ROMAN_NUMERAL = re.compile(r"^(?=[ivx]{2,}$)x{0,3}(ix|iv|v?i{0,3})$")
+_ROMAN_VALUES = {'i': 1, 'v': 5, 'x': 10}
+
+
+def _roman_to_int(numeral: str) -> int:
+    total = 0
+    for i, char in enumerate(numeral):
+        value = _ROMAN_VALUES[char]
+        total += -value if i + 1 < len(numeral) and _ROMAN_VALUES[numeral[i + 1]] > value else value
+    return total
+
+
+def normalize_title(title: str) -> str:
+    """Case, diacritics, punctuation, acronyms, a leading article and roman numerals folded away."""
+    text = unicodedata.normalize('NFKD', str(title))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = _APOSTROPHES.sub('', text).replace('&', ' and ')
+    text = _TRAILING_ARTICLE.sub(r'\2 \1', text.strip())
+    text = _NON_ALNUM.sub(' ', text).strip()
+    text = _SPACED_ACRONYM.sub(lambda m: m.group(0).replace(' ', ''), text)
+    text = _LEADING_ARTICLE.sub('', text)
+    return ' '.join(str(_roman_to_int(word)) if _ROMAN_NUMERAL.match(word) else word for word in text.split())
+
+
+@dataclass(frozen=True)
+class TitleAlias:
+    provider_id: int
+    score: Optional[float] # Match score of the search that created the alias
+
+
+_AliasKey = Tuple[str, str, int, str] # (kind, normalized title, year or 0, source)
+
+
+class TitleAliasIndex:
+    """SQLite-backed, fully cached in memory; only written when a new resolution is recorded."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS title_aliases (
+                kind TEXT NOT NULL, normalized_title TEXT NOT NULL, year INTEGER NOT NULL DEFAULT 0,
+                source TEXT NOT NULL, provider_id INTEGER NOT NULL, score REAL, original_title TEXT,
+                updated_at REAL NOT NULL, PRIMARY KEY (kind, normalized_title, year, source)
+            )""")
+        self._conn.commit()
+        self._aliases: Dict[_AliasKey, TitleAlias] = {
+            (kind, norm, year, source): TitleAlias(provider_id, score)
+            for kind, norm, year, source, provider_id, score in self._conn.execute(
+                "SELECT kind, normalized_title, year, source, provider_id, score FROM title_aliases")
+        }
+        log.debug(f"Title alias index loaded from {self.db_path}: {len(self._aliases)} aliases.")
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    @staticmethod
+    def _key(kind: str, title: str, year: Optional[int], source: str) -> Optional[_AliasKey]:
+        norm = normalize_title(title)
+        return (kind, norm, int(year or 0), source) if norm else None
+
+    def lookup(self, kind: str, title: str, year: Optional[int], source: str) -> Optional[TitleAlias]:
+        key = self._key(kind, title, year, source)
+        return self._aliases.get(key) if key else None
+
+    def record(self, kind: str, title: str, year: Optional[int], source: str, provider_id: int, score: Optional[float]) -> None:
+        key = self._key(kind, title, year, source)
+        if key is None or self._aliases.get(key) == TitleAlias(int(provider_id), score):
+            return
+        self._aliases[key] = TitleAlias(int(provider_id), score)
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO title_aliases (kind, normalized_title, year, source, provider_id, score, original_title, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, int(provider_id), score, str(title), time.time()))
+            log.debug(f"Recorded title alias {key} -> {source.upper()} ID {provider_id}")
+        except sqlite3.Error as e:
+            log.warning(f"Could not persist title alias for '{title}': {e}")
+
+    def forget(self, title: str, kind: Optional[str] = None, year: Optional[int] = None, source: Optional[str] = None) -> int:
+        """Drops aliases for title (all kinds/years/sources unless narrowed). Returns the number removed."""
+        norm = normalize_title(title)
+        doomed = [k for k in self._aliases
+                  if k[1] == norm and (kind is None or k[0] == kind) and (year is None or k[2] == int(year or 0)) and (source is None or k[3] == source)]
+        for k in doomed:
+            del self._aliases[k]
+        try:
+            with self._conn:
+                self._conn.executemany("DELETE FROM title_aliases WHERE kind = ? AND normalized_title = ? AND year = ? AND source = ?", doomed)
+        except sqlite3.Error as e:
+            log.warning(f"Could not delete title aliases for '{title}': {e}")
+        return len(doomed)
+
+    def close(self) -> None:
+        self._conn.close()
@@ -10,7 +10,8 @@ import os # os.rename, os.utime
 import fnmatch # Not used, but was in original. Can be removed if truly unused.
 import hashlib
 import shutil
-from typing import Optional, Tuple, List, Dict, Any
+import threading
+from typing import Optional, Tuple, List, Dict, Any, Callable, Iterable, Sequence
 
 # --- MODIFIED RICH IMPORTS ---
 from rename_app.ui_utils import (
@@ -26,6 +27,129 @@ log = logging.getLogger(__name__)
 # TEMP_SUFFIX_PREFIX = ".renametmp_" # Removed hardcoded constant
 MTIME_TOLERANCE = 1.0
 HASH_CHUNK_SIZE = 65536
+UNDO_SCHEMA_VERSION = 3 # Stored in PRAGMA user_version
+# Outcome of reverting one logged action
+REVERT_DONE, REVERT_SKIPPED, REVERT_ERROR = 'reverted', 'skipped', 'error'
+_VACUUM_PAGES_PER_STEP = 256
+# Databases created before auto_vacuum=INCREMENTAL need one full VACUUM to switch; only done while it is quick.
+_VACUUM_CONVERT_MAX_BYTES = 32 * 1024 * 1024
+
+def _migrate_to_v2(conn: sqlite3.Connection) -> None:
+    # Indexed pruning by age and per-batch status lookups, and a per-batch summary kept
+    # current by triggers so 'undo --list' reads one row per batch instead of every action.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rename_log_timestamp ON rename_log(timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rename_log_batch_status ON rename_log(batch_id, status)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS batches (
+            batch_id TEXT PRIMARY KEY, first_timestamp TEXT NOT NULL, last_timestamp TEXT NOT NULL, action_count INTEGER NOT NULL
+        )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_batches_last_timestamp ON batches(last_timestamp)")
+    conn.execute("""
+        INSERT OR REPLACE INTO batches (batch_id, first_timestamp, last_timestamp, action_count)
+        SELECT batch_id, MIN(timestamp), MAX(timestamp), COUNT(*) FROM rename_log GROUP BY batch_id""")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rename_log_insert AFTER INSERT ON rename_log BEGIN
+            INSERT INTO batches (batch_id, first_timestamp, last_timestamp, action_count)
+            VALUES (NEW.batch_id, NEW.timestamp, NEW.timestamp, 1)
+            ON CONFLICT(batch_id) DO UPDATE SET
+                first_timestamp = MIN(first_timestamp, excluded.first_timestamp),
+                last_timestamp = MAX(last_timestamp, excluded.last_timestamp),
+                action_count = action_count + 1;
+        END""")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rename_log_delete AFTER DELETE ON rename_log BEGIN
+            UPDATE batches SET action_count = action_count - 1 WHERE batch_id = OLD.batch_id;
+            DELETE FROM batches WHERE batch_id = OLD.batch_id AND action_count <= 0;
+        END""")
+
+def _sql_dir_part(column: str) -> str:
+    # Everything up to and including the last '/' or '\' ('' for a bare name); see _split_path.
+    return f"rtrim({column}, replace(replace({column}, '/', ''), '\\', ''))"
+
+def _split_path(path: Any) -> Tuple[str, str]:
+    """Splits a logged path into (directory with trailing separator, name), as the schema stores it."""
+    text = str(path)
+    cut = max(text.rfind('/'), text.rfind('\\')) + 1
+    return text[:cut], text[cut:]
+
+def _migrate_to_v3(conn: sqlite3.Connection) -> None:
+    # A run logs thousands of files from a handful of directories, so each directory is stored
+    # once in 'dirs' and entries keep a dir id plus the name. 'rename_log' becomes a view with
+    # the old columns; inserting into it interns the directories. Writers that rely on rowcount
+    # update rename_entries directly (rowcount is 0 through INSTEAD OF triggers).
+    original_dir, new_dir = _sql_dir_part("original_path"), _sql_dir_part("new_path")
+    conn.execute("CREATE TABLE dirs (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE)")
+    conn.execute("""
+        CREATE TABLE rename_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT NOT NULL, timestamp TEXT NOT NULL,
+            original_dir_id INTEGER NOT NULL REFERENCES dirs(id), original_name TEXT NOT NULL,
+            new_dir_id INTEGER NOT NULL REFERENCES dirs(id), new_name TEXT NOT NULL,
+            type TEXT CHECK(type IN ('file', 'dir')) NOT NULL,
+            status TEXT CHECK(status IN ('renamed', 'moved', 'trashed', 'reverted', 'created_dir', 'pending_final', 'failed_pending')) NOT NULL,
+            original_size INTEGER, original_mtime REAL, original_hash TEXT NULL,
+            backup_path TEXT NULL, backup_strategy TEXT NULL, UNIQUE(batch_id, original_dir_id, original_name)
+        )""")
+    conn.execute(f"INSERT OR IGNORE INTO dirs (path) SELECT {original_dir} FROM rename_log UNION SELECT {new_dir} FROM rename_log")
+    conn.execute(f"""
+        INSERT INTO rename_entries (id, batch_id, timestamp, original_dir_id, original_name, new_dir_id, new_name, type, status,
+                                    original_size, original_mtime, original_hash, backup_path, backup_strategy)
+        SELECT id, batch_id, timestamp,
+               (SELECT id FROM dirs WHERE path = {original_dir}), substr(original_path, length({original_dir}) + 1),
+               (SELECT id FROM dirs WHERE path = {new_dir}), substr(new_path, length({new_dir}) + 1),
+               type, status, original_size, original_mtime, original_hash, backup_path, backup_strategy
+        FROM rename_log ORDER BY id""")
+    conn.execute("DROP TABLE rename_log") # Takes its indexes and the batch summary triggers with it
+    conn.execute("CREATE INDEX idx_rename_entries_timestamp ON rename_entries(timestamp)")
+    conn.execute("CREATE INDEX idx_rename_entries_batch_status ON rename_entries(batch_id, status)")
+    conn.execute("""
+        CREATE TRIGGER trg_rename_entries_insert AFTER INSERT ON rename_entries BEGIN
+            INSERT INTO batches (batch_id, first_timestamp, last_timestamp, action_count)
+            VALUES (NEW.batch_id, NEW.timestamp, NEW.timestamp, 1)
+            ON CONFLICT(batch_id) DO UPDATE SET
+                first_timestamp = MIN(first_timestamp, excluded.first_timestamp),
+                last_timestamp = MAX(last_timestamp, excluded.last_timestamp),
+                action_count = action_count + 1;
+        END""")
+    conn.execute("""
+        CREATE TRIGGER trg_rename_entries_delete AFTER DELETE ON rename_entries BEGIN
+            UPDATE batches SET action_count = action_count - 1 WHERE batch_id = OLD.batch_id;
+            DELETE FROM batches WHERE batch_id = OLD.batch_id AND action_count <= 0;
+        END""")
+    conn.execute("""
+        CREATE VIEW rename_log AS
+        SELECT e.id, e.batch_id, e.timestamp, od.path || e.original_name AS original_path, nd.path || e.new_name AS new_path,
+               e.type, e.status, e.original_size, e.original_mtime, e.original_hash, e.backup_path, e.backup_strategy
+        FROM rename_entries e JOIN dirs od ON od.id = e.original_dir_id JOIN dirs nd ON nd.id = e.new_dir_id""")
+    new_original_dir, new_new_dir = _sql_dir_part("NEW.original_path"), _sql_dir_part("NEW.new_path")
+    conn.execute(f"""
+        CREATE TRIGGER trg_rename_log_insert INSTEAD OF INSERT ON rename_log BEGIN
+            INSERT OR IGNORE INTO dirs (path) VALUES ({new_original_dir}), ({new_new_dir});
+            INSERT INTO rename_entries (id, batch_id, timestamp, original_dir_id, original_name, new_dir_id, new_name, type, status,
+                                        original_size, original_mtime, original_hash, backup_path, backup_strategy)
+            VALUES (NEW.id, NEW.batch_id, NEW.timestamp,
+                    (SELECT id FROM dirs WHERE path = {new_original_dir}), substr(NEW.original_path, length({new_original_dir}) + 1),
+                    (SELECT id FROM dirs WHERE path = {new_new_dir}), substr(NEW.new_path, length({new_new_dir}) + 1),
+                    NEW.type, NEW.status, NEW.original_size, NEW.original_mtime, NEW.original_hash, NEW.backup_path, NEW.backup_strategy);
+        END""")
+    conn.execute("""
+        CREATE TRIGGER trg_rename_log_update_status INSTEAD OF UPDATE OF status ON rename_log BEGIN
+            UPDATE rename_entries SET status = NEW.status WHERE id = OLD.id;
+        END""")
+    conn.execute("""
+        CREATE TRIGGER trg_rename_log_delete INSTEAD OF DELETE ON rename_log BEGIN
+            DELETE FROM rename_entries WHERE id = OLD.id;
+        END""")
+
+# Schema version -> migration; version 1 is the original rename_log table created in _init_db.
+_SCHEMA_MIGRATIONS: Dict[int, Callable[[sqlite3.Connection], None]] = {
+    2: _migrate_to_v2,
+    3: _migrate_to_v3,
+}
+
+# Status updates by (batch, original path) on the interned schema, for writers that need rowcount.
+_UPDATE_STATUS_BY_ORIGINAL_PATH = (
+    "UPDATE rename_entries SET status = ? WHERE batch_id = ? AND original_dir_id = (SELECT id FROM dirs WHERE path = ?) "
+    "AND original_name = ? AND status != 'reverted'")
 
 # Helper to print to stderr, adapted for use within this module
 def _print_stderr_message_undo(console_obj: ConsoleClass, message: Any, is_quiet: bool, is_rich_available: bool):
@@ -52,6 +176,7 @@ class UndoManager:
         self.check_integrity: bool = False
         self.hash_check_bytes: int = 0
         self.use_full_hash: bool = False
+        self.parallel_workers: int = 1
         
         self.quiet_mode = quiet_mode
         if console_instance:
@@ -72,6 +197,7 @@ class UndoManager:
                 if self.is_enabled:
                     self.check_integrity = self.cfg('undo_check_integrity', False)
                     self.use_full_hash = self.cfg('undo_integrity_hash_full', False)
+                    self.parallel_workers = max(1, int(self.cfg('undo_parallel_workers', 8) or 1))
                     try:
                         hash_bytes_cfg = self.cfg('undo_integrity_hash_bytes', 0)
                         self.hash_check_bytes = int(hash_bytes_cfg) if hash_bytes_cfg is not None else 0
@@ -139,23 +265,14 @@ class UndoManager:
                 log.error("UndoManager: Database connection failed during init. Disabling undo.")
                 return
 
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS rename_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT NOT NULL, timestamp TEXT NOT NULL,
-                    original_path TEXT NOT NULL, new_path TEXT NOT NULL, type TEXT CHECK(type IN ('file', 'dir')) NOT NULL,
-                    status TEXT CHECK(status IN ('renamed', 'moved', 'trashed', 'reverted', 'created_dir', 'pending_final', 'failed_pending')) NOT NULL,
-                    original_size INTEGER, original_mtime REAL, original_hash TEXT NULL, UNIQUE(batch_id, original_path)
-                )""")
-            try:
-                cursor = conn.execute("PRAGMA table_info(rename_log)")
-                columns = [row['name'] for row in cursor.fetchall()]
-                if 'original_hash' not in columns:
-                    conn.execute("ALTER TABLE rename_log ADD COLUMN original_hash TEXT NULL;")
-                    log.info("Added 'original_hash' column to undo log table.")
-            except sqlite3.Error as e_alter:
-                log.error(f"Error altering table to add original_hash: {e_alter}")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_batch_id ON rename_log(batch_id)")
+            if not conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone():
+                # New database: pick incremental auto-vacuum before the first table exists (VACUUM applies it under WAL).
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < 3: # From version 3 on rename_log is a view
+                self._init_legacy_table(conn)
             conn.commit()
+            self._migrate_schema(conn)
         except sqlite3.Error as e:
             log.error(f"Failed to initialize undo database schema: {e}")
             self.is_enabled = False
@@ -166,6 +283,47 @@ class UndoManager:
             if conn:
                 conn.close()
 
+    def _init_legacy_table(self, conn: sqlite3.Connection) -> None:
+        """Creates or completes the version 1 rename_log table that the migrations start from."""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rename_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT NOT NULL, timestamp TEXT NOT NULL,
+                original_path TEXT NOT NULL, new_path TEXT NOT NULL, type TEXT CHECK(type IN ('file', 'dir')) NOT NULL,
+                status TEXT CHECK(status IN ('renamed', 'moved', 'trashed', 'reverted', 'created_dir', 'pending_final', 'failed_pending')) NOT NULL,
+                original_size INTEGER, original_mtime REAL, original_hash TEXT NULL,
+                backup_path TEXT NULL, backup_strategy TEXT NULL, UNIQUE(batch_id, original_path)
+            )""")
+        try:
+            cursor = conn.execute("PRAGMA table_info(rename_log)")
+            columns = [row['name'] for row in cursor.fetchall()]
+            if 'original_hash' not in columns:
+                conn.execute("ALTER TABLE rename_log ADD COLUMN original_hash TEXT NULL;")
+                log.info("Added 'original_hash' column to undo log table.")
+            for backup_column in ('backup_path', 'backup_strategy'):
+                if backup_column not in columns:
+                    conn.execute(f"ALTER TABLE rename_log ADD COLUMN {backup_column} TEXT NULL;")
+                    log.info(f"Added '{backup_column}' column to undo log table.")
+        except sqlite3.Error as e_alter:
+            log.error(f"Error altering undo log table: {e_alter}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_batch_id ON rename_log(batch_id)")
+
+    def _migrate_schema(self, conn: sqlite3.Connection) -> None:
+        """Applies the migrations above the database's user_version in one transaction."""
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= UNDO_SCHEMA_VERSION: return
+        conn.execute("BEGIN IMMEDIATE") # Another process may be migrating the same file
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for target_version in range(version + 1, UNDO_SCHEMA_VERSION + 1):
+                migration = _SCHEMA_MIGRATIONS.get(target_version)
+                if migration:
+                    log.info(f"Upgrading undo database schema to version {target_version}...")
+                    migration(conn)
+            conn.execute(f"PRAGMA user_version = {max(version, UNDO_SCHEMA_VERSION)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
     def _calculate_file_hash(self, file_path: Path, full_hash: bool) -> Optional[str]:
         hasher = hashlib.sha256()
         try:
@@ -194,28 +352,29 @@ class UndoManager:
             log.exception(f"Unexpected error calculating hash for '{file_path}': {e}")
             return None
 
-    def log_action(self, batch_id: str, original_path: Path, new_path: Path, item_type: str, status: str) -> bool:
-        if not self.is_enabled: return False
-        
+    def _original_file_facts(self, original_path: Path, item_type: str, status: str) -> Tuple[Optional[int], Optional[float], Optional[str]]:
+        """Size, mtime and (if configured) hash of a file about to be acted on, for later integrity checks."""
+        if item_type != 'file' or status not in {'pending_final', 'renamed', 'moved', 'trashed'}:
+            return None, None, None
         orig_p = Path(original_path)
-        original_size: Optional[int] = None
-        original_mtime: Optional[float] = None
-        original_hash: Optional[str] = None
-        
-        can_stat = item_type == 'file' and status in {'pending_final', 'renamed', 'moved', 'trashed'}
+        try:
+            if orig_p.is_file():
+                stat_info = orig_p.stat()
+                original_hash = None
+                if self.use_full_hash or self.hash_check_bytes > 0:
+                    original_hash = self._calculate_file_hash(orig_p, full_hash=self.use_full_hash)
+                return stat_info.st_size, stat_info.st_mtime, original_hash
+        except OSError as e:
+            log.warning(f"Could not stat original file for log_action '{original_path}': {e}")
+        except Exception as e:
+            log.exception(f"Unexpected error getting stats/hash for '{original_path}': {e}")
+        return None, None, None
 
-        if can_stat:
-            try:
-                if orig_p.is_file():
-                    stat_info = orig_p.stat()
-                    original_size = stat_info.st_size
-                    original_mtime = stat_info.st_mtime
-                    if self.use_full_hash or self.hash_check_bytes > 0:
-                        original_hash = self._calculate_file_hash(orig_p, full_hash=self.use_full_hash)
-            except OSError as e:
-                log.warning(f"Could not stat original file for log_action '{original_path}': {e}")
-            except Exception as e:
-                log.exception(f"Unexpected error getting stats/hash for '{original_path}': {e}")
+    def log_action(self, batch_id: str, original_path: Path, new_path: Path, item_type: str, status: str,
+                   backup_path: Optional[Path] = None, backup_strategy: Optional[str] = None) -> bool:
+        if not self.is_enabled: return False
+        
+        original_size, original_mtime, original_hash = self._original_file_facts(original_path, item_type, status)
         
         conn = None
         try:
@@ -223,8 +382,9 @@ class UndoManager:
             if not conn: return False
 
             conn.execute(
-                "INSERT INTO rename_log (batch_id, timestamp, original_path, new_path, type, status, original_size, original_mtime, original_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (batch_id, datetime.now(timezone.utc).isoformat(), str(original_path), str(new_path), item_type, status, original_size, original_mtime, original_hash)
+                "INSERT INTO rename_log (batch_id, timestamp, original_path, new_path, type, status, original_size, original_mtime, original_hash, backup_path, backup_strategy) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (batch_id, datetime.now(timezone.utc).isoformat(), str(original_path), str(new_path), item_type, status, original_size, original_mtime, original_hash,
+                 str(backup_path) if backup_path else None, backup_strategy)
             )
             conn.commit()
             log.debug(f"Logged action for '{original_path}' (batch '{batch_id}') status '{status}'.")
@@ -242,6 +402,49 @@ class UndoManager:
             if conn:
                 conn.close()
 
+    def log_actions(self, batch_id: str, path_pairs: Sequence[Tuple[Path, Path]], item_type: str, status: str) -> bool:
+        """Logs one (original, new) entry per pair in a single transaction; nothing is logged if any insert fails."""
+        if not self.is_enabled or not path_pairs: return False
+        timestamp = datetime.now(timezone.utc).isoformat()
+        rows = [(batch_id, timestamp, str(original_path), str(new_path), item_type, status,
+                 *self._original_file_facts(original_path, item_type, status))
+                for original_path, new_path in path_pairs]
+        conn = None
+        try:
+            conn = self._connect()
+            if not conn: return False
+            conn.executemany(
+                "INSERT INTO rename_log (batch_id, timestamp, original_path, new_path, type, status, original_size, original_mtime, original_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            conn.commit()
+            log.debug(f"Logged {len(rows)} actions (batch '{batch_id}') status '{status}'.")
+            return True
+        except sqlite3.Error as e:
+            conn.rollback()
+            log.error(f"DB error logging {len(rows)} actions ('{batch_id}'): {e}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+
+    def update_action_statuses(self, batch_id: str, original_paths: Sequence[str], new_status: str) -> int:
+        """update_action_status for many files in one transaction. Returns the rows updated."""
+        if not self.is_enabled or not original_paths: return 0
+        conn = None
+        try:
+            conn = self._connect()
+            if not conn: return 0
+            cursor = conn.executemany(
+                _UPDATE_STATUS_BY_ORIGINAL_PATH, [(new_status, batch_id, *_split_path(path)) for path in original_paths])
+            conn.commit()
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            log.error(f"Failed updating undo status of {len(original_paths)} files ('{batch_id}') to '{new_status}': {e}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
     def update_action_status(self, batch_id: str, original_path: str, new_status: str, conn: Optional[sqlite3.Connection] = None) -> bool:
         if not self.is_enabled: return False
         log.debug(f"Updating status to '{new_status}' for '{original_path}' in batch '{batch_id}'")
@@ -253,7 +456,7 @@ class UndoManager:
             if not _conn: return False
 
             cursor = _conn.cursor()
-            cursor.execute("UPDATE rename_log SET status = ? WHERE batch_id = ? AND original_path = ? AND status != 'reverted'", (new_status, batch_id, str(original_path)))
+            cursor.execute(_UPDATE_STATUS_BY_ORIGINAL_PATH, (new_status, batch_id, *_split_path(original_path)))
             updated_count = cursor.rowcount
             if manage_connection:
                 _conn.commit()
@@ -274,7 +477,76 @@ class UndoManager:
             if manage_connection and _conn:
                 _conn.close()
 
-    def prune_old_batches(self):
+    def recover_run(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Brings the journal of an interrupted live run back in line with the filesystem so the
+        run can be resumed under the same ID:
+        - a 'pending_final' file whose temp copy is still next to its target is renamed to the
+          target (Phase 2 was cut short), and one already at its target is marked done;
+        - a 'pending_final'/'failed_pending' entry whose original is still in place never took
+          effect and is dropped, so the file is planned again.
+        Returns counts ('finished', 'discarded', 'unresolved') and 'done_paths': the original and
+        new paths (resolved, as strings) of every file the run has already handled.
+        """
+        if not self.is_enabled:
+            raise RenamerError("Resuming a run needs the undo log (enable_undo).")
+        conn = self._connect()
+        if not conn:
+            raise RenamerError(f"Cannot open the undo log to resume run '{batch_id}'.")
+        result: Dict[str, Any] = {'finished': 0, 'discarded': 0, 'unresolved': 0, 'done_paths': set()}
+        try:
+            rows = conn.execute("SELECT id, original_path, new_path, type, status FROM rename_log WHERE batch_id = ? ORDER BY id", (batch_id,)).fetchall()
+            if not rows:
+                raise RenamerError(f"No undo log entries found for run '{batch_id}'; nothing to resume.")
+            stale_ids: List[int] = []
+            for row in rows:
+                if row['type'] != 'file' or row['status'] == 'reverted': continue
+                original_path, new_path = Path(row['original_path']), Path(row['new_path'])
+                status = row['status']
+                if status in ('pending_final', 'failed_pending'):
+                    if original_path.exists():
+                        stale_ids.append(row['id'])
+                        result['discarded'] += 1
+                        continue
+                    if status == 'failed_pending':
+                        log.warning(f"Resume: '{original_path}' failed in the interrupted run and is no longer in place; leaving it alone.")
+                        result['unresolved'] += 1
+                        continue
+                    temp_path = self._find_temp_file(new_path) if not new_path.exists() else None
+                    if temp_path:
+                        try:
+                            os.rename(temp_path, new_path)
+                            log.info(f"Resume: finished interrupted rename '{temp_path.name}' -> '{new_path}'.")
+                        except OSError as e:
+                            log.error(f"Resume: could not finish rename of '{temp_path}' to '{new_path}': {e}")
+                            result['unresolved'] += 1
+                            continue
+                    elif not new_path.exists():
+                        log.warning(f"Resume: '{original_path}' is neither in place nor at '{new_path}' (or its temp file); leaving its entry pending.")
+                        result['unresolved'] += 1
+                        continue
+                    status = 'moved' if new_path.parent.resolve() != original_path.parent.resolve() else 'renamed'
+                    conn.execute("UPDATE rename_entries SET status = ? WHERE id = ?", (status, row['id']))
+                    result['finished'] += 1
+                if status in ('renamed', 'moved', 'trashed'):
+                    result['done_paths'].update((str(original_path.resolve()), str(new_path.resolve())))
+            if stale_ids:
+                conn.executemany("DELETE FROM rename_entries WHERE id = ?", [(row_id,) for row_id in stale_ids])
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise RenamerError(f"Could not read the undo log to resume run '{batch_id}': {e}") from e
+        finally:
+            conn.close()
+        return result
+
+    def prune_old_batches(self, time_budget: Optional[float] = None):
+        """
+        Deletes undo records older than undo_expire_days, undo_prune_chunk_rows at a time with a
+        commit after each chunk, then releases the freed pages with an incremental vacuum.
+        Stops once time_budget seconds (default undo_prune_time_budget_seconds, 0 = no limit)
+        are spent; whatever is left is pruned by a later run.
+        """
         if not self.is_enabled: return
         
         expire_days_cfg = self.cfg('undo_expire_days', 30)
@@ -290,6 +562,11 @@ class UndoManager:
             log.warning(f"Invalid 'undo_expire_days' ('{expire_days_cfg}'). Defaulting to 30.")
             expire_days = 30
 
+        if time_budget is None:
+            time_budget = float(self.cfg('undo_prune_time_budget_seconds', 2.0) or 0)
+        chunk_rows = max(1, int(self.cfg('undo_prune_chunk_rows', 2000) or 2000))
+        deadline = time.monotonic() + time_budget if time_budget > 0 else None
+
         cutoff = datetime.now(timezone.utc) - timedelta(days=expire_days)
         cutoff_iso = cutoff.isoformat()
         log.debug(f"Pruning undo records older than {cutoff_iso} ({expire_days} days)")
@@ -300,11 +577,24 @@ class UndoManager:
             conn = self._connect()
             if not conn: return
 
-            cur = conn.execute("DELETE FROM rename_log WHERE timestamp < ?", (cutoff_iso,))
-            deleted_rows = cur.rowcount if cur else 0
-            conn.commit()
+            while True:
+                cur = conn.execute(
+                    "DELETE FROM rename_entries WHERE id IN (SELECT id FROM rename_entries WHERE timestamp < ? LIMIT ?)",
+                    (cutoff_iso, chunk_rows))
+                conn.commit()
+                deleted_chunk = cur.rowcount if cur else 0
+                deleted_rows += deleted_chunk
+                if deleted_chunk < chunk_rows: break
+                if deadline is not None and time.monotonic() >= deadline:
+                    log.info(f"Undo log pruning stopped after {time_budget:.1f}s; the remaining expired records are pruned on a later run.")
+                    break
             if deleted_rows > 0:
                 log.info(f"Pruned {deleted_rows} old undo log records.")
+                conn.execute("""
+                    DELETE FROM dirs WHERE id NOT IN (
+                        SELECT original_dir_id FROM rename_entries UNION SELECT new_dir_id FROM rename_entries)""")
+                conn.commit()
+                self._vacuum_incrementally(conn, deadline)
             else:
                 log.debug("No expired entries found to prune.")
         except sqlite3.Error as e:
@@ -315,6 +605,32 @@ class UndoManager:
             if conn:
                 conn.close()
 
+    def _vacuum_incrementally(self, conn: sqlite3.Connection, deadline: Optional[float]) -> None:
+        """Returns free pages to the filesystem a few at a time until none are left or the deadline passes."""
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if auto_vacuum == 0: # NONE: a database from before incremental vacuuming
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            if page_count * page_size > _VACUUM_CONVERT_MAX_BYTES:
+                log.debug("Undo database is too large to switch to incremental vacuum in the background; freed pages are reused instead.")
+                return
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM") # One-off: rebuilds the file, which also drops every free page
+            log.info("Switched the undo database to incremental vacuuming.")
+            return
+        if auto_vacuum != 2: return # FULL: SQLite already truncates on every commit
+        while conn.execute("PRAGMA freelist_count").fetchone()[0]:
+            if deadline is not None and time.monotonic() >= deadline: break
+            # executescript steps the pragma to completion; execute() would free a single page.
+            conn.executescript(f"PRAGMA incremental_vacuum({_VACUUM_PAGES_PER_STEP});")
+
+    def start_background_prune(self) -> Optional[threading.Thread]:
+        """Runs prune_old_batches in a daemon thread; an unfinished pass is simply resumed by the next run."""
+        if not self.is_enabled: return None
+        thread = threading.Thread(target=self.prune_old_batches, name="undo-prune", daemon=True)
+        thread.start()
+        return thread
+
     def _find_temp_file(self, final_dest_path: Path) -> Optional[Path]:
         # Fetch temp_suffix_prefix from config
         temp_suffix_prefix_val = self.cfg('temp_file_suffix_prefix', ".renametmp_")
@@ -386,12 +702,7 @@ class UndoManager:
             log.error("Cannot list batches: Undo disabled or DB not found.")
             return []
         
-        query = """
-            SELECT batch_id, MIN(timestamp) as first_timestamp, MAX(timestamp) as last_timestamp, COUNT(*) as action_count
-            FROM rename_log
-            GROUP BY batch_id
-            ORDER BY last_timestamp DESC
-        """
+        query = "SELECT batch_id, first_timestamp, last_timestamp, action_count FROM batches ORDER BY last_timestamp DESC"
         batches: List[Dict[str, Any]] = []
         conn = None
         try:
@@ -419,7 +730,7 @@ class UndoManager:
             log.error(f"Error fetching undo actions for batch '{batch_id}': {e}")
             raise
 
-    def _display_undo_preview_table(self, actions: List[sqlite3.Row], batch_id: str):
+    def _display_undo_preview_table(self, actions: List[sqlite3.Row], batch_id: str, integrity: Optional[Dict[int, Tuple[bool, str]]] = None):
         # self.console is already quiet-aware from __init__
         self.console.print("Operations to be reverted (new -> original):")
         preview_table = TableClass(title=f"Undo Plan for Batch: {batch_id}", show_header=True, header_style="bold magenta")
@@ -445,7 +756,8 @@ class UndoManager:
                 current_path_str = str(new_p)
                 target_path_str = str(orig_p)
                 if self.check_integrity and item_type == 'file':
-                    _, integrity_msg = self._check_file_integrity(new_p, action['original_size'], action['original_mtime'], action['original_hash'])
+                    if integrity is not None and action_id in integrity: _, integrity_msg = integrity[action_id]
+                    else: _, integrity_msg = self._check_file_integrity(new_p, action['original_size'], action['original_mtime'], action['original_hash'])
             elif status == 'pending_final':
                 temp_p = self._find_temp_file(new_p)
                 current_path_str = str(temp_p) if temp_p else f"[red]TEMP NOT FOUND for {new_p.name}[/red]"
@@ -482,7 +794,51 @@ class UndoManager:
             _print_stderr_message_undo(self.console, TextClass("[bold red]Undo operation cancelled (Error reading input).[/bold red]", style="bold red"), self.quiet_mode, RICH_AVAILABLE)
             return False
 
-    def _revert_single_file_undo_action(self, action_log: sqlite3.Row, batch_id: str, conn: sqlite3.Connection) -> Tuple[bool, bool, str]:
+    def _map_parallel(self, func: Callable[[Any], Any], items: List[Any]) -> Iterable[Any]:
+        """func over items on up to `parallel_workers` threads, results in input order."""
+        if self.parallel_workers == 1 or len(items) < 2:
+            return map(func, items)
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(self.parallel_workers, len(items)), thread_name_prefix="undo") as pool:
+            return list(pool.map(func, items))
+
+    def _run_integrity_checks(self, actions: List[sqlite3.Row]) -> Dict[int, Tuple[bool, str]]:
+        """Integrity results for every renamed/moved file, keyed by action ID; used by the preview and the revert."""
+        if not self.check_integrity: return {}
+        to_check = [a for a in actions if a['type'] == 'file' and a['status'] in ('renamed', 'moved')]
+        def check(action: sqlite3.Row) -> Tuple[int, Tuple[bool, str]]:
+            return action['id'], self._check_file_integrity(Path(action['new_path']), action['original_size'], action['original_mtime'], action['original_hash'])
+        return dict(self._map_parallel(check, to_check))
+
+    @staticmethod
+    def _group_file_reverts(actions: List[sqlite3.Row]) -> List[List[sqlite3.Row]]:
+        """
+        Splits file reverts into groups that can run concurrently. Reverts into the same directory,
+        or touching a path another revert touches (chains, swaps), share a group in log order.
+        """
+        parents: Dict[str, str] = {}
+        def find(key: str) -> str:
+            parents.setdefault(key, key)
+            while parents[key] != key:
+                parents[key] = parents[parents[key]]
+                key = parents[key]
+            return key
+        def union(key_a: str, key_b: str) -> None:
+            parents[find(key_a)] = find(key_b)
+        for action in actions:
+            dir_key = f"dir:{Path(action['original_path']).parent}"
+            union(f"path:{action['original_path']}", dir_key)
+            union(f"path:{action['new_path']}", dir_key)
+        groups: Dict[str, List[sqlite3.Row]] = {}
+        for action in actions:
+            groups.setdefault(find(f"path:{action['original_path']}"), []).append(action)
+        return list(groups.values())
+
+    def _revert_single_file_undo_action(self, action_log: sqlite3.Row, integrity: Optional[Tuple[bool, str]] = None) -> Tuple[str, List[str]]:
+        """
+        Moves one file back; the caller records it as reverted. Runs on worker threads, so it only
+        returns its outcome (REVERT_DONE, REVERT_SKIPPED or REVERT_ERROR) and its console lines.
+        """
         orig_p = Path(action_log['original_path'])
         new_p = Path(action_log['new_path'])
         status = action_log['status']
@@ -491,6 +847,7 @@ class UndoManager:
         
         log_prefix = f"[Undo ID {action_id}] "
         console_prefix = f"  {log_prefix}"
+        lines: List[str] = []
         
         current_src: Optional[Path] = None
         if status in ('renamed', 'moved'):
@@ -504,34 +861,35 @@ class UndoManager:
             if status == 'pending_final':
                 msg = f"Skipped revert: Cannot find temp file for '{new_p.name}'"
                 log.warning(f"{log_prefix}{msg}")
-                return False, False, f"{console_prefix}[yellow]{msg}[/yellow]"
+                return REVERT_SKIPPED, [f"{console_prefix}[yellow]{msg}[/yellow]"]
             else:
                 msg = f"Internal error: Could not determine source for status '{status}' for '{new_p.name}'."
                 log.error(f"{log_prefix}{msg}")
-                return False, False, f"{console_prefix}[red]{msg}[/red]"
+                return REVERT_ERROR, [f"{console_prefix}[red]{msg}[/red]"]
 
         action_desc = f"Reverting '{current_src.name}' to '{target_dest.name}'"
         log.debug(f"{log_prefix}Processing revert: {action_desc}")
 
         if self.check_integrity and item_type == 'file' and status != 'pending_final':
-            integrity_passed, integrity_msg_raw = self._check_file_integrity(current_src, action_log['original_size'], action_log['original_mtime'], action_log['original_hash'])
-            if not self.quiet_mode: # Only print integrity to console if not quiet
-                self.console.print(f"{console_prefix}Integrity check for '[cyan]{current_src.name}[/]': {integrity_msg_raw}")
+            if integrity is None:
+                integrity = self._check_file_integrity(current_src, action_log['original_size'], action_log['original_mtime'], action_log['original_hash'])
+            integrity_passed, integrity_msg_raw = integrity
+            lines.append(f"{console_prefix}Integrity check for '[cyan]{current_src.name}[/]': {integrity_msg_raw}")
             log.info(f"{log_prefix}Integrity check for '{current_src}': {integrity_msg_raw}")
             if not integrity_passed:
                 msg = f"Skipping revert for '{current_src.name}' due to integrity failure."
                 log.warning(f"{log_prefix}{msg}")
-                return False, False, f"{console_prefix}[yellow]{msg}[/yellow]"
+                return REVERT_SKIPPED, lines + [f"{console_prefix}[yellow]{msg}[/yellow]"]
 
         if not current_src.exists():
             msg = f"Skipped revert: Source file '{current_src}' does not exist."
             log.warning(f"{log_prefix}{msg}")
-            return False, False, f"{console_prefix}[yellow]{msg}[/yellow]"
+            return REVERT_SKIPPED, lines + [f"{console_prefix}[yellow]{msg}[/yellow]"]
         
         if target_dest.exists():
             msg = f"Skipped revert: Target '{target_dest}' already exists."
             log.warning(f"{log_prefix}{msg}")
-            return False, False, f"{console_prefix}[yellow]{msg}[/yellow]"
+            return REVERT_SKIPPED, lines + [f"{console_prefix}[yellow]{msg}[/yellow]"]
 
         try:
             log.info(f"{log_prefix}Attempting rename/move: '{current_src}' -> '{target_dest}'")
@@ -543,22 +901,31 @@ class UndoManager:
                 log.debug(f"{log_prefix}os.rename failed, trying shutil.move for '{current_src.name}'.")
                 shutil.move(str(current_src), str(target_dest))
             
-            db_updated = self.update_action_status(batch_id, str(orig_p), 'reverted', conn=conn)
-            if not db_updated:
-                log.error(f"{log_prefix}FS op OK, but FAILED DB update to 'reverted' for '{orig_p.name}'")
             msg = f"Success: '{current_src.name}' reverted to '{target_dest.name}'"
             log.info(f"{log_prefix}{msg}")
-            return True, db_updated, f"{console_prefix}[green]{msg}[/green]"
+            return REVERT_DONE, lines + [f"{console_prefix}[green]{msg}[/green]"]
         except OSError as e:
             msg = f"Error reverting '{current_src.name}': {e}"
             log.error(f"{log_prefix}{msg}")
-            return False, False, f"{console_prefix}[bold red]{msg}[/bold red]"
+            return REVERT_ERROR, lines + [f"{console_prefix}[bold red]{msg}[/bold red]"]
         except Exception as e:
             msg = f"Unexpected error reverting '{current_src.name}': {e}"
             log.exception(f"{log_prefix}{msg}")
-            return False, False, f"{console_prefix}[bold red]{msg}[/bold red]"
+            return REVERT_ERROR, lines + [f"{console_prefix}[bold red]{msg}[/bold red]"]
 
-    def _revert_created_dir_undo_action(self, action_log: sqlite3.Row, batch_id: str, conn: sqlite3.Connection, removed_dirs_list: List[Path]) -> Tuple[bool, bool, str]:
+    def _mark_reverted(self, batch_id: str, original_paths: List[str], conn: sqlite3.Connection) -> int:
+        """One statement for all reverted files, inside the undo transaction. Returns the rows updated."""
+        if not original_paths: return 0
+        try:
+            cursor = conn.executemany(
+                _UPDATE_STATUS_BY_ORIGINAL_PATH, [('reverted', batch_id, *_split_path(path)) for path in original_paths])
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            log.error(f"Failed marking {len(original_paths)} files reverted in batch '{batch_id}': {e}")
+            return 0
+
+    def _revert_created_dir_undo_action(self, action_log: sqlite3.Row, batch_id: str, conn: sqlite3.Connection, removed_dirs_list: List[Path]) -> Tuple[str, bool, str]:
+        """Removes a directory the run created if it is empty. Returns (outcome, DB updated, console line)."""
         dir_to_remove = Path(action_log['original_path'])
         action_id = action_log['id']
         
@@ -570,22 +937,22 @@ class UndoManager:
             msg = f"Skipped removal: Dir '{dir_to_remove}' not found."
             log.debug(f"{log_prefix}{msg}")
             db_updated = self.update_action_status(batch_id, str(dir_to_remove), 'reverted', conn=conn)
-            return True, db_updated, f"{console_prefix}[dim]{msg}[/dim]"
+            return REVERT_DONE, db_updated, f"{console_prefix}[dim]{msg}[/dim]"
         
         if not dir_to_remove.is_dir():
             msg = f"Skipped removal: '{dir_to_remove}' is not a directory."
             log.warning(f"{log_prefix}{msg}")
-            return False, False, f"{console_prefix}[yellow]{msg}[/yellow]"
+            return REVERT_SKIPPED, False, f"{console_prefix}[yellow]{msg}[/yellow]"
         
         try:
             if any(dir_to_remove.iterdir()):
                 msg = f"Skipped removal: Dir '{dir_to_remove}' not empty."
                 log.warning(f"{log_prefix}{msg}")
-                return False, False, f"{console_prefix}[yellow]{msg}[/yellow]"
+                return REVERT_SKIPPED, False, f"{console_prefix}[yellow]{msg}[/yellow]"
         except OSError as e:
             msg = f"Error checking dir '{dir_to_remove}' emptiness: {e}"
             log.error(f"{log_prefix}{msg}")
-            return False, False, f"{console_prefix}[bold red]{msg}[/bold red]"
+            return REVERT_ERROR, False, f"{console_prefix}[bold red]{msg}[/bold red]"
 
         try:
             log.info(f"{log_prefix}Attempting rmdir: '{dir_to_remove}'")
@@ -597,15 +964,15 @@ class UndoManager:
                 log.error(f"{log_prefix}Dir removal OK, but FAILED DB update for '{dir_to_remove}'")
             msg = f"Success: Dir '{dir_to_remove}' removed."
             log.info(f"{log_prefix}{msg}")
-            return True, db_updated, f"{console_prefix}[green]{msg}[/green]"
+            return REVERT_DONE, db_updated, f"{console_prefix}[green]{msg}[/green]"
         except OSError as e:
             msg = f"Error removing dir '{dir_to_remove}': {e}"
             log.error(f"{log_prefix}{msg}")
-            return False, False, f"{console_prefix}[bold red]{msg}[/bold red]"
+            return REVERT_ERROR, False, f"{console_prefix}[bold red]{msg}[/bold red]"
         except Exception as e:
             msg = f"Unexpected error removing dir '{dir_to_remove}': {e}"
             log.exception(f"{log_prefix}{msg}")
-            return False, False, f"{console_prefix}[bold red]{msg}[/bold red]"
+            return REVERT_ERROR, False, f"{console_prefix}[bold red]{msg}[/bold red]"
 
     def _cleanup_empty_parent_dirs_after_undo(self, removed_dirs: List[Path]):
         if not removed_dirs: return
@@ -669,7 +1036,8 @@ class UndoManager:
             if conn: conn.close()
             return False
 
-        self._display_undo_preview_table(actions_to_revert, batch_id)
+        integrity_results = self._run_integrity_checks(actions_to_revert)
+        self._display_undo_preview_table(actions_to_revert, batch_id, integrity_results)
         if dry_run:
             self.console.print(f"\n--- {action_word} Preview Complete. No changes made. ---")
             if conn: conn.close()
@@ -685,31 +1053,47 @@ class UndoManager:
         removed_dirs: List[Path] = []
 
         try:
+            file_actions = [a for a in actions_to_revert if a['status'] in ('renamed', 'moved', 'pending_final')]
+            dir_actions = [a for a in actions_to_revert if a['status'] == 'created_dir']
             for item in actions_to_revert:
-                fs_ok, db_ok, msg = False, False, ""
-                status = item['status']
-                
-                if status in ('renamed', 'moved', 'pending_final'):
-                    fs_ok, db_ok, msg = self._revert_single_file_undo_action(item, batch_id, conn)
-                elif status == 'created_dir':
-                    fs_ok, db_ok, msg = self._revert_created_dir_undo_action(item, batch_id, conn, removed_dirs)
-                else:
+                if item['status'] not in ('renamed', 'moved', 'pending_final', 'created_dir'):
                     action_id_for_msg = item['id']
-                    console_prefix_unknown = f"  [Undo ID {action_id_for_msg}] "
-                    msg = f"{console_prefix_unknown}[yellow]Skipping action ID {action_id_for_msg} with unexpected status '{status}'[/yellow]"
-                    log.warning(f"[Undo ID {action_id_for_msg}] Skipping unknown status '{status}'")
+                    self.console.print(f"  [Undo ID {action_id_for_msg}] [yellow]Skipping action ID {action_id_for_msg} with unexpected status '{item['status']}'[/yellow]")
+                    log.warning(f"[Undo ID {action_id_for_msg}] Skipping unknown status '{item['status']}'")
                     sk_count += 1
-                
-                self.console.print(msg)
-                
-                if fs_ok and db_ok: s_count += 1
-                elif fs_ok and not db_ok: db_err += 1
-                elif not fs_ok:
-                    if "error" in msg.lower() or "fail" in msg.lower() or "[red]" in msg.lower():
+
+            def revert_group(group: List[sqlite3.Row]) -> List[Tuple[sqlite3.Row, str, List[str]]]:
+                return [(item, *self._revert_single_file_undo_action(item, integrity_results.get(item['id']))) for item in group]
+
+            # Independent groups run concurrently; their status updates are written in one statement.
+            reverted_paths: List[str] = []
+            for group_results in self._map_parallel(revert_group, self._group_file_reverts(file_actions)):
+                for item, outcome, lines in group_results:
+                    for line in lines: self.console.print(line)
+                    if outcome == REVERT_DONE:
+                        reverted_paths.append(item['original_path'])
+                    elif outcome == REVERT_ERROR:
                         fs_err += 1
                         crit_fs_err_flag = True
                     else:
-                        sk_count +=1
+                        sk_count += 1
+            file_db_err = len(reverted_paths) - self._mark_reverted(batch_id, reverted_paths, conn)
+            db_err += file_db_err
+            s_count += len(reverted_paths) - file_db_err
+
+            # Directories last: they can only be removed once the files have moved out.
+            for item in dir_actions:
+                outcome, db_ok, msg = self._revert_created_dir_undo_action(item, batch_id, conn, removed_dirs)
+                self.console.print(msg)
+                
+                if outcome == REVERT_DONE:
+                    if db_ok: s_count += 1
+                    else: db_err += 1
+                elif outcome == REVERT_ERROR:
+                    fs_err += 1
+                    crit_fs_err_flag = True
+                else:
+                    sk_count += 1
             
             if not crit_fs_err_flag and db_err == 0:
                 if conn: conn.commit()
@@ -12,24 +12,21 @@ from functools import lru_cache
 from collections import defaultdict
 from typing import List, Tuple, Optional, Set, Dict, Any, Iterator # <-- Make sure Set is imported
 from itertools import groupby
+from importlib.util import find_spec
 
 # TQDM Import (unchanged)
 try: from tqdm import tqdm; TQDM_AVAILABLE = True
 except ImportError: TQDM_AVAILABLE = False;
 def tqdm(iterable, *args, **kwargs): yield from iterable
 
-# Other Imports (unchanged)
-try: import langcodes; LANGCODES_AVAILABLE = True
-except ImportError: LANGCODES_AVAILABLE = False
-try: import chardet; CHARDET_AVAILABLE = True
-except ImportError: CHARDET_AVAILABLE = False
+# Other Imports
+# langcodes, chardet and pymediainfo are only needed for subtitles / stream info, so they are
+# located here (cheap) and imported on first use instead of on every CLI start.
+LANGCODES_AVAILABLE = find_spec("langcodes") is not None
+CHARDET_AVAILABLE = find_spec("chardet") is not None
+PYMEDIAINFO_AVAILABLE = find_spec("pymediainfo") is not None
 try: from guessit import guessit; GUESSIT_AVAILABLE = True
 except ImportError: GUESSIT_AVAILABLE = False
-try:
-    from pymediainfo import MediaInfo as MediaInfoParser
-    PYMEDIAINFO_AVAILABLE = True
-except ImportError:
-    PYMEDIAINFO_AVAILABLE = False
 
 log = logging.getLogger(__name__)
 
@@ -84,6 +81,7 @@ def detect_encoding(file_path: Path) -> Optional[str]:
         sample_size = 8192
         with open(file_path, 'rb') as f: sample = f.read(sample_size);
         if not sample: return 'empty'
+        import chardet
         result = chardet.detect(sample);
         if not result: return None
         encoding = result.get('encoding'); confidence = result.get('confidence')
@@ -95,6 +93,7 @@ def detect_encoding(file_path: Path) -> Optional[str]:
 @lru_cache(maxsize=128)
 def parse_subtitle_language(filename: str, detect_enc: bool = False, file_path: Optional[Path] = None) -> Tuple[Optional[str], List[str], Optional[str]]:
     if not LANGCODES_AVAILABLE: return None, [], None
+    import langcodes
     lang_code_3b, flags, encoding = None, set(), None; log.debug(f"Parsing subtitle language for: {filename}")
     base, _ = os.path.splitext(filename); guess = {}
     if GUESSIT_AVAILABLE:
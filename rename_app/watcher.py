@@ -0,0 +1,496 @@
+# rename_app/watcher.py
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import signal
+import struct
+import sys
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .utils import scan_media_files, _is_ignored
+
+log = logging.getLogger(__name__)
+
+# Files still being written by common download clients / browsers.
+INCOMPLETE_DOWNLOAD_SUFFIXES = ('.part', '.partial', '.!qb', '.!ut', '.crdownload', '.download', '.tmp')
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+# How many handled file identities to remember so our own renames don't re-trigger processing.
+_HANDLED_CACHE_SIZE = 10000
+# Files whose run failed are retried after settle_seconds * 2**failures, capped here.
+_MAX_RETRY_DELAY_SECONDS = 3600.0
+
+FileSignature = Tuple[int, int]  # (size, mtime_ns)
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int, int]]:
+    """Returns (st_dev, st_ino, size, mtime_ns) for a regular file, or None."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not path.is_file():
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _walk_files(root: Path, recursive: bool, ignore_dirs: Set[str], ignore_patterns: List[str]) -> List[Path]:
+    """Lists files below root, pruning ignored directories (same rules as the scanner)."""
+    found: List[Path] = []
+    if recursive:
+        for dirpath, dirnames, filenames in os.walk(root, topdown=True, onerror=lambda e: log.debug(f"watch walk error: {e}")):
+            current = Path(dirpath)
+            dirnames[:] = [d for d in dirnames if not _is_ignored(current / d, ignore_dirs, ignore_patterns)]
+            found.extend(current / f for f in filenames)
+    else:
+        try:
+            with os.scandir(root) as it:
+                found.extend(Path(entry.path) for entry in it if entry.is_file(follow_symlinks=False))
+        except OSError as e:
+            log.debug(f"watch scandir error for {root}: {e}")
+    return found
+
+
+class PollingWatcher:
+    """Portable watcher: periodically walks the tree and diffs (size, mtime_ns) snapshots."""
+
+    def __init__(self, root: Path, recursive: bool, ignore_dirs: Set[str], ignore_patterns: List[str], interval: float):
+        self.root = root
+        self.recursive = recursive
+        self.ignore_dirs = ignore_dirs
+        self.ignore_patterns = ignore_patterns
+        self.interval = interval
+        self._snapshot: Dict[Path, FileSignature] = {}
+
+    def _take_snapshot(self) -> Dict[Path, FileSignature]:
+        snapshot: Dict[Path, FileSignature] = {}
+        for path in _walk_files(self.root, self.recursive, self.ignore_dirs, self.ignore_patterns):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._snapshot = await loop.run_in_executor(None, self._take_snapshot)
+        log.info(f"Watching {self.root} by polling every {self.interval:.1f}s ({len(self._snapshot)} existing files).")
+
+    async def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Sleeps up to the poll interval (or timeout) and returns files added/changed since the last poll."""
+        delay = self.interval if timeout is None else max(0.0, min(timeout, self.interval))
+        await asyncio.sleep(delay)
+        loop = asyncio.get_running_loop()
+        new_snapshot = await loop.run_in_executor(None, self._take_snapshot)
+        changed = {p for p, sig in new_snapshot.items() if self._snapshot.get(p) != sig}
+        self._snapshot = new_snapshot
+        return changed
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+
+class InotifyWatcher:
+    """Linux inotify watcher (via libc/ctypes, no extra dependency). One watch per directory."""
+
+    def __init__(self, root: Path, recursive: bool, ignore_dirs: Set[str], ignore_patterns: List[str]):
+        self.root = root
+        self.recursive = recursive
+        self.ignore_dirs = ignore_dirs
+        self.ignore_patterns = ignore_patterns
+        self._fd: Optional[int] = None
+        self._libc: Any = None
+        self._wd_to_dir: Dict[int, Path] = {}
+        self._changed: Set[Path] = set()
+        self._event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+            return hasattr(libc, 'inotify_init1')
+        except OSError:
+            return False
+
+    async def start(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._libc.inotify_add_watch.restype = ctypes.c_int
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._fd = fd
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._add_watch_tree(self.root, collect_files=False)
+        self._loop.add_reader(fd, self._on_readable)
+        log.info(f"Watching {self.root} with inotify ({len(self._wd_to_dir)} directories).")
+
+    def _add_watch(self, directory: Path) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            log.warning(f"Could not watch directory '{directory}': {os.strerror(err)}")
+            return False
+        self._wd_to_dir[wd] = directory
+        return True
+
+    def _add_watch_tree(self, directory: Path, collect_files: bool) -> None:
+        """Watches directory (and, if recursive, its non-ignored subdirectories)."""
+        if not self._add_watch(directory):
+            return
+        if not self.recursive:
+            if collect_files:
+                self._changed.update(_walk_files(directory, False, self.ignore_dirs, self.ignore_patterns))
+            return
+        for dirpath, dirnames, filenames in os.walk(directory, topdown=True, onerror=lambda e: log.debug(f"watch walk error: {e}")):
+            current = Path(dirpath)
+            dirnames[:] = [d for d in dirnames if not _is_ignored(current / d, self.ignore_dirs, self.ignore_patterns)]
+            if current != directory:
+                self._add_watch(current)
+            if collect_files:
+                # A directory moved/created into the tree may already be full of files.
+                self._changed.update(current / f for f in filenames)
+
+    def _on_readable(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)  # type: ignore[arg-type]
+        except BlockingIOError:
+            return
+        except OSError as e:
+            log.error(f"Error reading inotify events: {e}")
+            return
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            self._handle_event(wd, mask, os.fsdecode(raw_name) if raw_name else '')
+        if self._changed and self._event:
+            self._event.set()
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            log.warning("inotify event queue overflowed; rescanning the watched tree.")
+            self._changed.update(_walk_files(self.root, self.recursive, self.ignore_dirs, self.ignore_patterns))
+            return
+        if mask & IN_IGNORED:
+            self._wd_to_dir.pop(wd, None)
+            return
+        directory = self._wd_to_dir.get(wd)
+        if directory is None or not name:
+            return
+        path = directory / name
+        if mask & IN_ISDIR:
+            if self.recursive and mask & (IN_CREATE | IN_MOVED_TO) and not _is_ignored(path, self.ignore_dirs, self.ignore_patterns):
+                self._add_watch_tree(path, collect_files=True)
+            return
+        self._changed.add(path)
+
+    async def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Waits for events (up to timeout seconds, forever if None) and returns the touched file paths."""
+        assert self._event is not None
+        if not self._changed:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._event.clear()
+        changed, self._changed = self._changed, set()
+        return changed
+
+    def close(self) -> None:
+        if self._fd is not None:
+            if self._loop is not None:
+                try:
+                    self._loop.remove_reader(self._fd)
+                except Exception:
+                    pass
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+        self._wd_to_dir.clear()
+
+
+class _PendingFile:
+    __slots__ = ('signature', 'stable_since')
+
+    def __init__(self, signature: Tuple[int, int, int, int], stable_since: float):
+        self.signature = signature
+        self.stable_since = stable_since
+
+
+class WatchService:
+    """
+    Watches a directory and feeds files to MainProcessor once they have settled
+    (size/mtime unchanged for watch_settle_seconds). Each settled group of files is
+    processed as its own unattended run with its own undo batch ID.
+    """
+
+    def __init__(self, processor, settings, target_dir: Path,
+                 settle_seconds: Optional[float] = None, poll_interval: Optional[float] = None,
+                 use_polling: Optional[bool] = None):
+        self.processor = processor
+        self.settings = settings
+        self.target_dir = target_dir.resolve()
+        self.settle_seconds = float(settings('watch_settle_seconds', 30.0, arg_value=settle_seconds))
+        self.poll_interval = float(settings('watch_poll_interval_seconds', 10.0, arg_value=poll_interval))
+        self.use_polling = bool(settings('watch_use_polling', False, arg_value=use_polling))
+        self.recursive = bool(settings('recursive', False))
+
+        self.ignore_dirs: Set[str] = set(d for d in settings.get_list('ignore_dirs', default_value=[]) if d)
+        self.ignore_patterns: List[str] = list(settings.get_list('ignore_patterns', default_value=[]))
+        if '.*' not in self.ignore_patterns and not any(p.startswith('.') for p in self.ignore_dirs):
+            self.ignore_patterns.append('.*')
+        self.allowed_ext: Set[str] = set(settings.get_list('video_extensions', default_value=[])) | set(settings.get_list('associated_extensions', default_value=[]))
+        self.temp_prefix: str = settings('temp_file_suffix_prefix', '.renametmp_') or ''
+        self.excluded_dirs: List[Path] = self._resolve_excluded_dirs()
+
+        self._pending: Dict[Path, _PendingFile] = {}
+        self._handled: "OrderedDict[Tuple[int, int, int, int], None]" = OrderedDict()
+        self._failures: Dict[Path, int] = {}
+        self._stop_event: Optional[asyncio.Event] = None
+        self.runs_completed = 0
+
+    def _resolve_excluded_dirs(self) -> List[Path]:
+        """Output directories of the renamer itself must never be treated as new input."""
+        excluded: List[Path] = []
+        args = getattr(self.processor, 'args', None)
+        unknown_dir = self.settings('unknown_files_dir', '_unknown_files_', arg_value=getattr(args, 'unknown_files_dir', None))
+        if unknown_dir:
+            p = Path(unknown_dir)
+            excluded.append(p if p.is_absolute() else self.target_dir / p)
+        for attr in ('stage_dir', 'backup_dir'):
+            value = getattr(args, attr, None)
+            if value:
+                excluded.append(Path(value).resolve())
+        return excluded
+
+    def is_candidate(self, path: Path) -> bool:
+        name = path.name
+        if path.suffix.lower() not in self.allowed_ext:
+            return False
+        if name.lower().endswith(INCOMPLETE_DOWNLOAD_SUFFIXES):
+            return False
+        if self.temp_prefix and self.temp_prefix in name:
+            return False
+        try:
+            rel_parent = path.parent.relative_to(self.target_dir)
+        except ValueError:
+            return False
+        if not self.recursive and rel_parent.parts:
+            return False
+        if any(path.is_relative_to(d) for d in self.excluded_dirs):
+            return False
+        if _is_ignored(path, self.ignore_dirs, self.ignore_patterns):
+            return False
+        return not any(_is_ignored(self.target_dir.joinpath(*rel_parent.parts[:i + 1]), self.ignore_dirs, self.ignore_patterns)
+                       for i in range(len(rel_parent.parts)))
+
+    def note_changed(self, paths: Set[Path], now: Optional[float] = None) -> None:
+        """Registers touched paths; any change restarts the file's settle timer."""
+        now = time.monotonic() if now is None else now
+        for path in paths:
+            if not self.is_candidate(path):
+                continue
+            signature = _file_signature(path)
+            if signature is None:
+                self._pending.pop(path, None)
+                continue
+            if signature in self._handled:
+                log.debug(f"Watch: ignoring '{path.name}' (result of an earlier run).")
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending.signature != signature:
+                self._pending[path] = _PendingFile(signature, now)
+
+    def collect_ready(self, now: Optional[float] = None) -> List[Path]:
+        """Returns pending paths whose size/mtime have been stable for settle_seconds."""
+        now = time.monotonic() if now is None else now
+        ready: List[Path] = []
+        for path, pending in list(self._pending.items()):
+            signature = _file_signature(path)
+            if signature is None:
+                del self._pending[path]
+                self._failures.pop(path, None)
+            elif signature != pending.signature:
+                pending.signature, pending.stable_since = signature, now
+            elif now - pending.stable_since >= self.settle_seconds:
+                ready.append(path)
+                del self._pending[path]
+        return ready
+
+    def next_timeout(self, now: Optional[float] = None) -> Optional[float]:
+        if not self._pending:
+            return None
+        now = time.monotonic() if now is None else now
+        soonest = min(p.stable_since for p in self._pending.values()) + self.settle_seconds
+        return max(0.5, soonest - now)
+
+    def _remember_handled(self, signatures: List[Tuple[int, int, int, int]]) -> None:
+        for signature in signatures:
+            self._handled[signature] = None
+            self._handled.move_to_end(signature)
+        while len(self._handled) > _HANDLED_CACHE_SIZE:
+            self._handled.popitem(last=False)
+
+    def _schedule_retry(self, path: Path, signature: Tuple[int, int, int, int], now: float) -> None:
+        failures = self._failures.get(path, 0) + 1
+        self._failures[path] = failures
+        delay = min(self.settle_seconds * 2 ** failures, _MAX_RETRY_DELAY_SECONDS)
+        log.info(f"Watch: '{path.name}' was not processed successfully; retrying in {delay:.0f}s (attempt {failures + 1}).")
+        # Backdated so collect_ready() fires after `delay` rather than after settle_seconds.
+        self._pending[path] = _PendingFile(signature, now + delay - self.settle_seconds)
+
+    def _settle_results(self, signatures_before: Dict[Path, Optional[Tuple[int, int, int, int]]], failed: Set[Path]) -> None:
+        """
+        Remembers files the run dealt with (moved away, or left in place on purpose) so their
+        events are ignored, and re-queues failed files that are still where they were.
+        A rename keeps the inode/size/mtime, so the pre-run signature also matches the new path.
+        """
+        now = time.monotonic()
+        handled: List[Tuple[int, int, int, int]] = []
+        for path, signature in signatures_before.items():
+            if signature is None:
+                continue
+            if path in failed and _file_signature(path) == signature:
+                self._schedule_retry(path, signature, now)
+            else:
+                self._failures.pop(path, None)
+                handled.append(signature)
+        self._remember_handled(handled)
+
+    @staticmethod
+    def _signatures(paths: List[Path]) -> Dict[Path, Optional[Tuple[int, int, int, int]]]:
+        return {path: _file_signature(path) for path in paths}
+
+    def _scan_batches(self, ready: List[Path]) -> Dict[Path, Dict[str, Dict[str, Any]]]:
+        """Scans the parent directory of each ready file and keeps the batches that contain one (blocking)."""
+        by_dir: Dict[Path, Set[Path]] = defaultdict(set)
+        for path in ready:
+            by_dir[path.parent].add(path)
+        dir_settings = self.settings.with_overrides(recursive=False)
+        batches_by_dir: Dict[Path, Dict[str, Dict[str, Any]]] = {}
+        for directory, ready_paths in by_dir.items():
+            selected: Dict[str, Dict[str, Any]] = {}
+            for stem, data in scan_media_files(directory, dir_settings):
+                members = {data.get('video')} | set(data.get('associated', []))
+                if members & ready_paths:
+                    selected[stem] = data
+            if selected:
+                batches_by_dir[directory] = selected
+        return batches_by_dir
+
+    async def build_batches(self, ready: List[Path]) -> Dict[Path, Dict[str, Dict[str, Any]]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._scan_batches, ready)
+
+    async def process_ready(self, ready: List[Path]) -> None:
+        loop = asyncio.get_running_loop()
+        batches_by_dir = await self.build_batches(ready)
+        run_paths = sorted(set(ready) | {Path(p) for batches in batches_by_dir.values() for data in batches.values()
+                                         for p in [data.get('video'), *data.get('associated', [])] if p})
+        signatures_before = await loop.run_in_executor(None, self._signatures, run_paths)
+        failed: Set[Path] = set()
+        for directory, batches in batches_by_dir.items():
+            log.info(f"Watch: processing {len(batches)} settled batch(es) in '{directory}'.")
+            try:
+                summary = await self.processor.process_file_batches(batches, unattended=True)
+                self.runs_completed += 1
+                if isinstance(summary, dict):
+                    failed.update(Path(p) for p in summary.get('failed_paths', []))
+            except Exception as e:
+                # A failed run must not stop the watcher; the error is already user-facing in the log.
+                log.exception(f"Watch: error while processing '{directory}': {e}")
+                failed.update(p for p in run_paths if p.parent == directory)
+        self._settle_results(signatures_before, failed)
+
+    def _create_watcher(self):
+        if not self.use_polling and InotifyWatcher.is_supported():
+            return InotifyWatcher(self.target_dir, self.recursive, self.ignore_dirs, self.ignore_patterns)
+        if not self.use_polling:
+            log.info("inotify is not available on this platform; falling back to polling.")
+        return PollingWatcher(self.target_dir, self.recursive, self.ignore_dirs, self.ignore_patterns, self.poll_interval)
+
+    def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run(self, initial_scan: bool = False) -> None:
+        """Watches until SIGINT/SIGTERM (or stop()). initial_scan first processes files already present."""
+        self._stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+
+        watcher = self._create_watcher()
+        try:
+            try:
+                await watcher.start()
+            except OSError as e:
+                log.warning(f"Could not start inotify watcher ({e}); falling back to polling.")
+                watcher = PollingWatcher(self.target_dir, self.recursive, self.ignore_dirs, self.ignore_patterns, self.poll_interval)
+                await watcher.start()
+
+            if initial_scan:
+                # Started after the watcher so nothing arriving during the scan is missed;
+                # files handled here are remembered and their later events ignored.
+                existing = await loop.run_in_executor(None, _walk_files, self.target_dir, self.recursive, self.ignore_dirs, self.ignore_patterns)
+                signatures_before = await loop.run_in_executor(None, self._signatures, existing)
+                summary = await self.processor.run_processing(unattended=True)
+                self.runs_completed += 1
+                failed = {Path(p) for p in summary.get('failed_paths', [])} if isinstance(summary, dict) else set()
+                self._settle_results(signatures_before, failed)
+
+            while not self._stop_event.is_set():
+                timeout = self.next_timeout()
+                wait_task = asyncio.ensure_future(watcher.wait(timeout))
+                stop_task = asyncio.ensure_future(self._stop_event.wait())
+                done, _ = await asyncio.wait({wait_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+                if stop_task not in done:
+                    stop_task.cancel()
+                if wait_task not in done:
+                    wait_task.cancel()
+                    break
+                self.note_changed(wait_task.result())
+                ready = self.collect_ready()
+                if ready:
+                    await self.process_ready(ready)
+        finally:
+            watcher.close()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.remove_signal_handler(sig)
+                except (NotImplementedError, RuntimeError, ValueError):
+                    pass
+            log.info(f"Watch stopped after {self.runs_completed} run(s).")
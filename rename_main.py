@@ -1,13 +1,10 @@
 #!/usr/bin/env python3
 import sys
 import logging
-import asyncio
 # time is now implicitly handled by ui_utils if its Console fallback uses it
 from pathlib import Path
 from datetime import datetime
 from typing import Any, Optional, TYPE_CHECKING, Dict, List # Added List
-import json
-import pytomlpp
 import builtins
 
 # --- MODIFIED RICH IMPORT ---
@@ -20,17 +17,16 @@ from rename_app.ui_utils import (
 from rename_app.cli import parse_arguments
 from rename_app.config_manager import (
     ConfigManager, ConfigHelper, interactive_api_setup,
-    RootConfigModel, BaseProfileSettings, generate_default_toml_content,
     DEFAULT_CONFIG_FILENAME, PLATFORMDIRS_AVAILABLE, platformdirs
 )
 from rename_app.log_setup import setup_logging
-from rename_app.main_processor import MainProcessor
-from rename_app.undo_manager import UndoManager
-from rename_app.api_clients import initialize_api_clients
 from rename_app.exceptions import RenamerError, UserAbortError, ConfigError as AppConfigError
 
+# Subcommand-specific modules (main_processor -> guessit/tmdbv3api/tvdb/diskcache/thefuzz/tenacity,
+# undo_manager, pydantic schema, pytomlpp) are imported inside the branch that uses them so
+# 'undo --list' and 'config show' don't pay for the whole rename pipeline at startup.
 if TYPE_CHECKING:
-    from pydantic import ValidationError
+    from rename_app.undo_manager import UndoManager
 
 log = logging.getLogger("rename_app")
 
@@ -57,7 +53,23 @@ def print_stderr_message(console_obj: ConsoleClass, message: Any, is_quiet: bool
         console_obj.print(message, file=sys.stderr)
 
 
-async def main_async(argv=None):
+def prune_undo_log(undo_manager_instance: Any, cfg: Any, deferred: bool = False) -> None:
+    """
+    Prunes expired undo records as configured by undo_prune_mode. 'background' runs the
+    time-boxed prune in a thread so startup never waits on it; a deferred call (after the
+    command's own work is done) prunes inline instead, as the process is about to exit.
+    """
+    if not undo_manager_instance.is_enabled: return
+    mode = cfg('undo_prune_mode', 'background')
+    if mode == 'off':
+        log.debug("Undo log pruning is turned off (undo_prune_mode='off').")
+    elif mode == 'startup' or deferred:
+        undo_manager_instance.prune_old_batches()
+    else:
+        undo_manager_instance.start_background_prune()
+
+
+def main(argv=None):
     args = parse_arguments(argv)
     is_quiet = getattr(args, 'quiet', False)
     console = ConsoleClass(quiet=is_quiet)
@@ -94,6 +106,7 @@ async def main_async(argv=None):
             if not log.handlers:
                  setup_logging(log_level_console=logging.INFO)
             log.info("Executing 'config generate' command.")
+            from rename_app.config_schema import generate_default_toml_content
             default_config_content = generate_default_toml_content()
 
             target_path: Path
@@ -159,10 +172,11 @@ async def main_async(argv=None):
         log.debug(f"Using profile: {args.profile}")
         log.info(f"Effective TMDB/TVDB Language: {cfg('tmdb_language', 'en')}")
 
-        if args.command in ['rename', 'undo']:
+        if args.command in ['rename', 'watch', 'undo']:
+            from rename_app.undo_manager import UndoManager
             undo_manager_instance = UndoManager(cfg, quiet_mode=is_quiet, console_instance=console)
-            if undo_manager_instance.is_enabled:
-                undo_manager_instance.prune_old_batches()
+            # 'undo' prunes after it has run, so a pass never races the revert of a batch.
+            if args.command != 'undo': prune_undo_log(undo_manager_instance, cfg)
 
         if args.command == 'config':
             if args.config_command == 'show':
@@ -178,7 +192,8 @@ async def main_async(argv=None):
                     if raw_content: console.print(raw_content)
                     else: console.print("# No config file loaded or content was empty.")
                 else:
-                    all_possible_keys = list(BaseProfileSettings.model_fields.keys())
+                    import json
+                    all_possible_keys = list(config_manager_instance.model_defaults.keys())
                     effective_settings: Dict[str, Any] = {}
                     for key in all_possible_keys:
                         effective_settings[key] = cfg(key, default_value=None)
@@ -196,6 +211,9 @@ async def main_async(argv=None):
                         print_stderr_message(console, "Could not display effective settings due to serialization error. Check logs.", is_quiet, RICH_AVAILABLE_MAIN)
                         print_stderr_message(console, f"Raw effective settings: {effective_settings}", is_quiet, RICH_AVAILABLE_MAIN) # type: ignore
             elif args.config_command == 'validate':
+                import pytomlpp
+                from pydantic import ValidationError
+                from rename_app.config_schema import RootConfigModel
                 console.print(f"--- Validating Configuration File: {config_manager_instance.config_path} ---")
                 if config_manager_instance.config_path.is_file():
                     try:
@@ -227,16 +245,20 @@ async def main_async(argv=None):
                 else:
                     console.print(f"Config file '[yellow]{config_manager_instance.config_path}[/yellow]' not found. Nothing to validate.")
 
-        elif args.command == 'rename':
-            if cfg is None: raise RenamerError("ConfigHelper not initialized for rename command.")
+        elif args.command in ('rename', 'watch'):
+            from rename_app.main_processor import MainProcessor
+            from rename_app.api_clients import initialize_api_clients
+            if cfg is None: raise RenamerError(f"ConfigHelper not initialized for {args.command} command.")
             if undo_manager_instance is None:
                 undo_manager_instance = UndoManager(cfg, quiet_mode=is_quiet, console_instance=console)
-                if undo_manager_instance.is_enabled:
-                    undo_manager_instance.prune_old_batches()
+                prune_undo_log(undo_manager_instance, cfg)
 
+            from rename_app.offline_index import offline_index_configured, offline_index_only
             use_metadata_effective = cfg('use_metadata', False, arg_value=getattr(args, 'use_metadata', None))
-            if use_metadata_effective:
-                 if not initialize_api_clients(cfg):
+            if use_metadata_effective and offline_index_only(cfg):
+                log.info(f"Using offline metadata index '{cfg('offline_index_path', None)}'; API clients not initialized.")
+            elif use_metadata_effective:
+                 if not initialize_api_clients(cfg) and not offline_index_configured(cfg):
                     warning_msg = TextClass("[yellow]Warning: Metadata processing enabled, but failed to initialize API clients (check API keys). Proceeding without metadata.[/yellow]", style="yellow")
                     print_stderr_message(console, warning_msg, is_quiet, RICH_AVAILABLE_MAIN)
                     log.warning("Metadata fetching will be disabled due to API client initialization failure.")
@@ -253,15 +275,74 @@ async def main_async(argv=None):
             args.unknown_file_handling = cfg('unknown_file_handling', 'skip', arg_value=getattr(args, 'unknown_file_handling', None))
             args.unknown_files_dir = cfg('unknown_files_dir', '_unknown_files_', arg_value=getattr(args, 'unknown_files_dir', None))
 
-            processor = MainProcessor(args, cfg, undo_manager_instance)
-            await processor.run_processing()
+            if args.command == 'watch' and getattr(args, 'interactive', False):
+                log.warning("Interactive mode is not supported by 'watch'; files are processed unattended.")
+                args.interactive = False
+
+            settings = cfg.snapshot()
+            processor = MainProcessor(args, settings, undo_manager_instance)
+            import asyncio # Only the rename pipeline is async
+            if args.command == 'rename':
+                asyncio.run(processor.run_processing())
+            else:
+                from rename_app.watcher import WatchService
+                watch_service = WatchService(
+                    processor, settings, args.directory,
+                    settle_seconds=args.watch_settle_seconds,
+                    poll_interval=args.watch_poll_interval_seconds,
+                    use_polling=args.watch_use_polling
+                )
+                asyncio.run(watch_service.run(initial_scan=args.initial_scan))
+
+        elif args.command == 'cache':
+            from rename_app.metadata_fetcher import DISKCACHE_AVAILABLE, resolve_cache_directory
+            from rename_app.metadata_cache import purge_negative_cache
+            if not DISKCACHE_AVAILABLE:
+                raise RenamerError("The 'diskcache' library is not installed; there is no metadata cache to manage.")
+            import diskcache
+            cache_dir = resolve_cache_directory(cfg)
+            if args.cache_command == 'purge-negative':
+                with diskcache.Cache(str(cache_dir)) as metadata_cache:
+                    removed = purge_negative_cache(metadata_cache, args.title)
+                log.info(f"Purged {removed} negative cache entries for '{args.title}' from {cache_dir}.")
+                console.print(f"Removed {removed} cached 'no match' result(s) for '{args.title}'.")
+            elif args.cache_command == 'forget-alias':
+                from rename_app.title_aliases import ALIAS_DB_FILENAME, TitleAliasIndex
+                alias_index = TitleAliasIndex(cache_dir / ALIAS_DB_FILENAME)
+                try:
+                    removed = alias_index.forget(args.title)
+                finally:
+                    alias_index.close()
+                log.info(f"Removed {removed} title alias(es) for '{args.title}' from {cache_dir}.")
+                console.print(f"Removed {removed} title alias(es) for '{args.title}'.")
+            elif args.cache_command == 'unpin':
+                from rename_app.id_pins import PIN_DB_FILENAME, IdPinStore
+                pin_store = IdPinStore(cache_dir / PIN_DB_FILENAME)
+                try:
+                    removed = pin_store.unpin(args.target)
+                finally:
+                    pin_store.close()
+                log.info(f"Removed {removed} ID pin(s) for '{args.target}' from {cache_dir}.")
+                console.print(f"Removed {removed} ID pin(s) for '{args.target}'.")
+            elif args.cache_command == 'warm':
+                from rename_app.api_clients import initialize_api_clients
+                from rename_app.cache_warmer import CacheWarmer
+                target_dir = args.directory.resolve()
+                if not target_dir.is_dir():
+                    raise RenamerError(f"Target directory not found or is not a directory: {target_dir}")
+                if not cfg('cache_enabled', True):
+                    raise RenamerError("The metadata cache is disabled (cache_enabled = false); there is nothing to warm.")
+                if not initialize_api_clients(cfg):
+                    raise RenamerError("Failed to initialize API clients (check API keys); cannot fetch metadata to warm the cache.")
+                import asyncio
+                warmer = CacheWarmer(cfg.snapshot(), console=console, quiet=is_quiet)
+                summary = asyncio.run(warmer.warm(target_dir))
+                warmer.print_summary(summary)
 
         elif args.command == 'undo':
             if cfg is None: raise RenamerError("ConfigHelper not initialized for undo command.")
             if undo_manager_instance is None:
                 undo_manager_instance = UndoManager(cfg, quiet_mode=is_quiet, console_instance=console)
-                if undo_manager_instance.is_enabled:
-                    undo_manager_instance.prune_old_batches()
 
             if args.list:
                 if not is_quiet:
@@ -299,6 +380,7 @@ async def main_async(argv=None):
             else:
                  log.info(f"Performing undo{' (dry run)' if args.dry_run else ''} for batch: {args.batch_id}")
                  undo_manager_instance.perform_undo(args.batch_id, dry_run=args.dry_run)
+            prune_undo_log(undo_manager_instance, cfg, deferred=True)
 
     except AppConfigError as e_app_cfg_fatal:
         builtins.print(f"FATAL CONFIGURATION ERROR: {e_app_cfg_fatal}", file=sys.stderr)
@@ -318,17 +400,17 @@ async def main_async(argv=None):
         builtins.print("\nCancelled by user.", file=sys.stderr)
         sys.exit(130)
     except Exception as e_fatal:
-        builtins.print(f"\nFATAL UNEXPECTED ERROR (main_async): {type(e_fatal).__name__}: {e_fatal}", file=sys.stderr)
+        builtins.print(f"\nFATAL UNEXPECTED ERROR (main): {type(e_fatal).__name__}: {e_fatal}", file=sys.stderr)
         builtins.print("Please check the log file for more details if logging was enabled.", file=sys.stderr)
         if log.handlers and logging.getLogger("rename_app").getEffectiveLevel() <= logging.DEBUG:
-             log.exception("FATAL UNHANDLED ERROR in main_async")
+             log.exception("FATAL UNHANDLED ERROR in main")
         elif log.handlers:
-             log.critical(f"FATAL UNHANDLED ERROR in main_async: {type(e_fatal).__name__}: {e_fatal}")
+             log.critical(f"FATAL UNHANDLED ERROR in main: {type(e_fatal).__name__}: {e_fatal}")
         sys.exit(1)
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main_async())
+        main()
     except KeyboardInterrupt:
         builtins.print("\nOperation cancelled by user (main entry).", file=sys.stderr)
         sys.exit(130)
@@ -9,6 +9,23 @@ import argparse
 project_root = Path(__file__).parent.parent.resolve()
 sys.path.insert(0, str(project_root))
 
+# --- Validated-Config Cache Isolation ---
+@pytest.fixture(autouse=True)
+def isolated_validated_config_cache(tmp_path, monkeypatch):
+    """Keeps ConfigManager's validated-config cache out of the developer's real cache dir."""
+    cache_dir = tmp_path / "validated_config_cache"
+    monkeypatch.setattr('rename_app.config_manager.validated_config_cache_dir', lambda: cache_dir)
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_id_pin_store(tmp_path, monkeypatch):
+    """MainProcessor opens its ID pin store in the cache dir; keep it out of the real one."""
+    pin_dir = tmp_path / "id_pins"
+    monkeypatch.setattr('rename_app.main_processor.resolve_cache_directory', lambda cfg: pin_dir)
+    return pin_dir
+
+
 # --- Mock Config Fixture ---
 # (Fixture as before)
 @pytest.fixture
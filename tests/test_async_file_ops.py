@@ -0,0 +1,45 @@
+# tests/test_async_file_ops.py
+import asyncio
+import threading
+
+import pytest
+
+from rename_app.async_file_ops import AsyncFileOps
+
+
+@pytest.mark.asyncio
+async def test_file_operations_run_on_the_pool_while_the_loop_keeps_going(tmp_path):
+    file_ops = AsyncFileOps(max_workers=2)
+    release = threading.Event()
+    ticks = []
+
+    async def ticker():
+        while not release.is_set():
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    blocked = asyncio.create_task(file_ops.run(release.wait, 5))
+    await asyncio.sleep(0.1)
+    assert len(ticks) > 3 # The loop was not blocked by the waiting call
+    release.set()
+    assert await blocked is True
+    await ticking
+
+    src, dst = tmp_path / "a.mkv", tmp_path / "sub" / "b.mkv"
+    src.write_text("data")
+    await file_ops.mkdir(dst.parent, parents=True, exist_ok=True)
+    await file_ops.move(src, dst)
+    assert not await file_ops.exists(src)
+    assert dst.read_text() == "data"
+    file_ops.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_the_caller_and_the_pool_restarts_after_shutdown(tmp_path):
+    file_ops = AsyncFileOps(max_workers=1)
+    with pytest.raises(FileNotFoundError):
+        await file_ops.move(tmp_path / "missing.mkv", tmp_path / "other.mkv")
+    file_ops.shutdown()
+    assert await file_ops.exists(tmp_path)
+    file_ops.shutdown()
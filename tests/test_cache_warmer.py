@@ -0,0 +1,98 @@
+# tests/test_cache_warmer.py
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from rename_app.cache_warmer import CacheWarmer, CacheWarmSummary, collect_warm_lookups, format_warm_key
+from rename_app.exceptions import MetadataNotFoundError
+from rename_app.models import MediaMetadata
+
+GUESSES = {
+    'Show.S01E01.mkv': {'title': 'Show', 'season': 1, 'episode': 1, 'type': 'episode'},
+    'Show.S01E02.mkv': {'title': 'Show', 'season': 1, 'episode': 2, 'type': 'episode'},
+    'Show.S01E02.PROPER.mkv': {'title': 'Show', 'season': 1, 'episode': 2, 'type': 'episode'},
+    'Show.S02E01.mkv': {'title': 'Show', 'season': 2, 'episode': 1, 'type': 'episode'},
+    'Heat.1995.mkv': {'title': 'Heat', 'year': 1995, 'type': 'movie'},
+    'Heat.1995.Directors.Cut.mkv': {'title': 'Heat', 'year': 1995, 'type': 'movie'},
+    'Show.Special.mkv': {'title': 'Show', 'season': 1, 'type': 'episode'},
+    'random.mkv': {'title': 'random'},
+}
+
+
+@pytest.fixture
+def renamer():
+    engine = MagicMock()
+    engine.parse_filename.side_effect = lambda path: GUESSES[Path(path).name]
+    engine._determine_file_type.side_effect = lambda guess: {'episode': 'series', 'movie': 'movie'}.get(guess.get('type'), 'unknown')
+    return engine
+
+
+@pytest.fixture
+def file_batches():
+    return {Path(name).stem: {'video': Path('/lib') / name, 'associated': []} for name in GUESSES}
+
+
+def test_collect_dedupes_by_title_year_season(renamer, file_batches):
+    summary = CacheWarmSummary()
+    lookups = collect_warm_lookups(file_batches, renamer, summary)
+    assert lookups == {
+        ('Show', None, 1): {(1,), (2,)},
+        ('Show', None, 2): {(1,)},
+        ('Heat', 1995, None): {()},
+    }
+    assert summary.files_scanned == 8
+    assert summary.files_skipped == 2  # no episode number; unknown type
+    assert format_warm_key(('Show', None, 1)) == 'Show S01'
+    assert format_warm_key(('Heat', 1995, None)) == 'Heat (1995)'
+
+
+@pytest.mark.asyncio
+async def test_warm_fetches_each_lookup_once_and_reports_unresolved(mocker, renamer, file_batches, mock_cfg_helper, tmp_path):
+    mocker.patch('rename_app.cache_warmer.scan_media_files', return_value=iter(file_batches.items()))
+    mock_cfg_helper.manager._mock_values.update({'cache_directory': str(tmp_path / 'cache')})
+    warmer = CacheWarmer(mock_cfg_helper, quiet=True)
+    warmer.renamer = renamer
+    found = MediaMetadata(is_series=True, source_api='tmdb')
+
+    async def fake_series(show_title_guess, season_num, episode_num_list, year_guess=None, cache_episode_sets=()):
+        if season_num == 2:
+            raise MetadataNotFoundError("No TMDB match for season 2.")
+        return found
+    series = mocker.patch.object(warmer.metadata_fetcher, 'fetch_series_metadata', side_effect=fake_series)
+    movie = mocker.patch.object(warmer.metadata_fetcher, 'fetch_movie_metadata', return_value=MediaMetadata(is_movie=True, source_api='tmdb'))
+
+    summary = await warmer.warm(Path('/lib'))
+
+    assert series.await_count == 2 and movie.await_count == 1
+    season_one = next(c.kwargs for c in series.await_args_list if c.kwargs['season_num'] == 1)
+    assert season_one['episode_num_list'] == (1, 2) and season_one['cache_episode_sets'] == [(1,), (2,)]
+    assert summary.lookups == 3 and summary.keys == 3
+    assert summary.resolved == {('Show', None, 1), ('Heat', 1995, None)}
+    assert summary.unresolved == {('Show', None, 2): "No TMDB match for season 2."}
+
+
+@pytest.mark.asyncio
+async def test_one_season_lookup_fills_every_episode_set(mocker, renamer, mock_cfg_helper, tmp_path):
+    mock_cfg_helper.manager._mock_values.update({'cache_directory': str(tmp_path / 'cache'), 'cache_enabled': True, 'api_rate_limit_delay': 0})
+    mock_cfg_helper.args.quiet = True
+    batches = {Path(name).stem: {'video': Path('/lib') / name, 'associated': []} for name in ('Show.S01E01.mkv', 'Show.S01E02.mkv')}
+    mocker.patch('rename_app.cache_warmer.scan_media_files', return_value=iter(batches.items()))
+    warmer = CacheWarmer(mock_cfg_helper, quiet=True)
+    warmer.renamer = renamer
+    fetcher = warmer.metadata_fetcher
+    fetcher.tmdb = object()
+    mock_cfg_helper.manager._mock_values['series_metadata_preference'] = ['tmdb']
+    season = {1: {'name': 'Pilot'}, 2: {'name': 'Second'}}
+    do_fetch = mocker.patch.object(fetcher, '_do_fetch_tmdb_series', return_value=({'name': 'Show'}, season, {'tmdb_id': 7}, 95.0))
+    try:
+        await warmer.warm(Path('/lib'))
+        assert do_fetch.await_count == 1
+        assert do_fetch.await_args.args[2] == (1, 2)
+
+        # A rename run asking for a single episode is answered from the warmed cache.
+        fetcher.memory_cache.clear()
+        meta = await fetcher.fetch_series_metadata('Show', 1, (2,))
+        assert do_fetch.await_count == 1
+        assert meta.episode_titles == {2: 'Second'}
+    finally:
+        fetcher.cache.close()
@@ -598,4 +598,79 @@ def test_helper_get_list_invalid_default(config_helper):
     # get_list call handles the string result and returns []
     assert config_helper.get_list('missing_list_bad_default', "not_a_list") == []
 
-# --- END OF FILE test_config_manager.py ---
\ No newline at end of file
+# --- EffectiveSettings Snapshot Tests ---
+
+@pytest.fixture
+def settings_snapshot(tmp_path, mocker):
+    config_path = tmp_path / DEFAULT_CONFIG_FILENAME
+    config_path.write_text(
+        '[default]\non_conflict = "suffix"\nsubtitle_extensions = [".srt"]\n'
+        '[web]\nmovie_format = "{movie_title}"\n',
+        encoding='utf-8'
+    )
+    mocker.patch('rename_app.config_manager.find_dotenv', return_value=None)
+    mocker.patch.dict(os.environ, {}, clear=True)
+    manager = config_manager.ConfigManager(config_path_override=config_path, interactive_fallback=False, quiet_mode=True)
+    args = argparse.Namespace(profile='web', preserve_mtime=True, scene_tags_to_preserve='PROPER, REPACK', recursive=None)
+    return config_manager.ConfigHelper(manager, args).snapshot()
+
+def test_snapshot_matches_precedence(settings_snapshot):
+    assert settings_snapshot('preserve_mtime', False) is True  # CLI
+    assert settings_snapshot('movie_format') == "{movie_title}"  # profile
+    assert settings_snapshot('on_conflict', 'skip') == 'suffix'  # default section
+    assert settings_snapshot('recursive') is False  # model default
+    assert settings_snapshot('not_a_setting', 'fallback') == 'fallback'
+    assert settings_snapshot('on_conflict', 'skip', arg_value='overwrite') == 'overwrite'
+
+def test_snapshot_agrees_with_dynamic_helper(settings_snapshot):
+    helper = config_manager.ConfigHelper(settings_snapshot.manager, settings_snapshot.args)
+    for key in config_manager.BaseProfileSettings.model_fields:
+        if key == 'scene_tags_to_preserve':
+            # Documented difference: the snapshot splits a comma-separated CLI list once.
+            assert helper(key) == 'PROPER, REPACK'
+            assert settings_snapshot(key) == helper.get_list(key) == ['PROPER', 'REPACK']
+            continue
+        assert settings_snapshot(key) == helper(key), key
+        assert settings_snapshot(key, 'fallback') == helper(key, 'fallback'), key
+
+def test_snapshot_get_list(settings_snapshot):
+    assert settings_snapshot.get_list('scene_tags_to_preserve') == ['PROPER', 'REPACK']
+    assert settings_snapshot.get_list('subtitle_extensions', ['.sub']) == ['.srt']
+    assert settings_snapshot.get_list('series_metadata_preference') == ['tmdb', 'tvdb']
+    assert settings_snapshot.get_list('not_a_setting', ['x']) == ['x']
+
+def test_snapshot_is_frozen(settings_snapshot):
+    with pytest.raises(AttributeError):
+        settings_snapshot.on_conflict = 'overwrite'
+    with pytest.raises(AttributeError):
+        settings_snapshot.brand_new_attribute = 1
+    assert not hasattr(settings_snapshot, '__dict__')
+    settings_snapshot.get_list('subtitle_extensions').append('.ass')
+    assert settings_snapshot.get_list('subtitle_extensions') == ['.srt']
+
+def test_snapshot_does_not_consult_manager_after_creation(settings_snapshot, mocker):
+    spy = mocker.patch.object(settings_snapshot.manager, 'get_value')
+    settings_snapshot('on_conflict', 'skip')
+    settings_snapshot.get_list('video_extensions')
+    spy.assert_not_called()
+
+
+# --- Validated-Config Cache Tests ---
+
+def test_validated_config_cache_is_keyed_by_config_path(tmp_path, mocker, isolated_validated_config_cache):
+    mocker.patch('rename_app.config_manager.find_dotenv', return_value=None)
+    config_a, config_b = tmp_path / "a.toml", tmp_path / "b.toml"
+    config_a.write_text('[default]\non_conflict = "suffix"\n', encoding='utf-8')
+    config_b.write_text('[default]\non_conflict = "overwrite"\n', encoding='utf-8')
+    for path in (config_a, config_b):
+        config_manager.ConfigManager(config_path_override=path, interactive_fallback=False, quiet_mode=True)
+    assert len(list(isolated_validated_config_cache.glob("*.json"))) == 2
+
+    validate = mocker.patch.object(config_manager.RootConfigModel, 'model_validate')
+    manager_a = config_manager.ConfigManager(config_path_override=config_a, interactive_fallback=False, quiet_mode=True)
+    manager_b = config_manager.ConfigManager(config_path_override=config_b, interactive_fallback=False, quiet_mode=True)
+    validate.assert_not_called()  # Alternating between the two files hits both entries
+    assert manager_a.get_value('on_conflict', 'default', None, None) == 'suffix'
+    assert manager_b.get_value('on_conflict', 'default', None, None) == 'overwrite'
+
+# --- END OF FILE test_config_manager.py ---
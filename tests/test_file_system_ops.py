@@ -179,9 +179,9 @@ def test_perform_file_actions_live_trash(tmp_path, mock_cfg_helper, mock_undo_ma
     # Assert
     assert result['success'] is True, f"Action failed: {result.get('message')}"
     assert result['actions_taken'] == 1, f"Action count mismatch: {result['actions_taken']}"
-    mock_send2trash.assert_called_once_with(str(orig_path))
-    mock_undo_manager.log_action.assert_called_once_with(batch_id=plan.batch_id, original_path=orig_path, new_path=intended_new_path, item_type='file', status='trashed')
-    mock_undo_manager.update_action_status.assert_not_called()
+    mock_send2trash.assert_called_once_with([str(orig_path)])
+    mock_undo_manager.log_actions.assert_called_once_with(plan.batch_id, [(orig_path, intended_new_path)], 'file', 'trashed')
+    mock_undo_manager.update_action_statuses.assert_not_called()
 
 def test_perform_file_actions_live_backup(tmp_path, mock_cfg_helper, mock_undo_manager, mocker):
     """Test live run with backup action."""
@@ -189,7 +189,7 @@ def test_perform_file_actions_live_backup(tmp_path, mock_cfg_helper, mock_undo_m
     mock_copy2 = mocker.patch('shutil.copy2') # Mock copy only
     # Let move/rename run
     mock_cfg_helper.args.dry_run = False; backup_dir = tmp_path / "backups"; mock_cfg_helper.args.backup_dir = backup_dir; mock_cfg_helper.args.stage_dir = None; mock_cfg_helper.args.use_trash = False
-    mock_cfg_helper.manager._mock_values = {'on_conflict': 'skip', 'create_folders': False, 'enable_undo': True}
+    mock_cfg_helper.manager._mock_values = {'on_conflict': 'skip', 'create_folders': False, 'enable_undo': True, 'backup_strategy': 'copy'}
     plan = create_test_plan(tmp_path, actions=[("backup_me.mkv", "new_backup.mkv", 'file', 'rename')])
     orig_path = plan.actions[0].original_path; final_path = plan.actions[0].new_path; expected_backup_path = backup_dir / orig_path.name; orig_path.write_text("content")
     # Act
@@ -291,4 +291,103 @@ def test_perform_file_actions_conflict_suffix(tmp_path, mock_cfg_helper, mock_un
     mock_undo_manager.log_action.assert_called_once_with(batch_id=plan.batch_id, original_path=orig_path, new_path=expected_final_path, item_type='file', status='pending_final')
     mock_undo_manager.update_action_status.assert_called_once_with(batch_id=plan.batch_id, original_path=str(orig_path), new_status='renamed')
 
-# TODO: Add tests for transactional rollback scenarios (Phase 1 failure, Phase 2 failure)
\ No newline at end of file
+# TODO: Add tests for transactional rollback scenarios (Phase 1 failure, Phase 2 failure)
+
+def _live_rename_args(mock_cfg_helper, mock_undo_manager):
+    mock_undo_manager.is_enabled = True
+    mock_cfg_helper.args.live = True; mock_cfg_helper.args.backup_dir = None; mock_cfg_helper.args.stage_dir = None; mock_cfg_helper.args.trash = False
+    mock_cfg_helper.manager._mock_values = {'on_conflict': 'skip', 'create_folders': False, 'enable_undo': True}
+    return mock_cfg_helper.args
+
+@pytest.mark.skipif(not file_system_ops._get_renameat2() and os.name != 'nt', reason="no-clobber rename not supported here")
+def test_rename_noreplace_never_clobbers(tmp_path):
+    src = tmp_path / "a.mkv"; src.write_text("a")
+    dst = tmp_path / "b.mkv"; dst.write_text("b")
+    assert file_system_ops._rename_noreplace(src, dst) is False
+    assert src.read_text() == "a" and dst.read_text() == "b"
+    dst.unlink()
+    assert file_system_ops._rename_noreplace(src, dst) is True
+    assert not src.exists() and dst.read_text() == "a"
+
+@pytest.mark.skipif(not file_system_ops._get_renameat2() and os.name != 'nt', reason="no-clobber rename not supported here")
+def test_live_rename_goes_straight_to_final_name(tmp_path, mock_cfg_helper, mock_undo_manager, mocker):
+    args = _live_rename_args(mock_cfg_helper, mock_undo_manager)
+    move_spy = mocker.spy(file_system_ops.shutil, 'move')
+    plan = create_test_plan(tmp_path, actions=[("vid.mkv", "new_vid.mkv", 'file', 'rename'), ("vid.srt", "new_vid.srt", 'file', 'rename')])
+    for action in plan.actions: action.original_path.write_text(action.original_path.name)
+
+    result = file_system_ops.perform_file_actions(plan, args, mock_cfg_helper, mock_undo_manager, run_batch_id="run1")
+
+    assert result['success'] is True and result['actions_taken'] == 2, result['message']
+    move_spy.assert_not_called()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new_vid.mkv", "new_vid.srt"]
+    assert mock_undo_manager.log_action.call_count == 2
+    mock_undo_manager.update_action_status.assert_any_call("run1", str(plan.actions[0].original_path), 'renamed')
+
+def test_swapped_names_and_unsupported_fast_path_use_temp_files(tmp_path, mock_cfg_helper, mock_undo_manager, mocker):
+    args = _live_rename_args(mock_cfg_helper, mock_undo_manager)
+    noreplace = mocker.patch.object(file_system_ops, '_rename_noreplace', return_value=False)
+    a = tmp_path / "a.mkv"; a.write_text("a")
+    b = tmp_path / "b.mkv"; b.write_text("b")
+    swap = RenamePlan(batch_id="swap", video_file=a, status='success',
+                      actions=[RenameAction(a, b, 'rename'), RenameAction(b, a, 'rename')])
+    mock_cfg_helper.manager._mock_values['on_conflict'] = 'overwrite'
+
+    result = file_system_ops.perform_file_actions(swap, args, mock_cfg_helper, mock_undo_manager, run_batch_id="run1")
+    assert result['success'] is True, result['message']
+    assert a.read_text() == "b" and b.read_text() == "a"
+    noreplace.assert_not_called()
+
+    plan = create_test_plan(tmp_path, actions=[("c.mkv", "d.mkv", 'file', 'rename')])
+    plan.actions[0].original_path.write_text("c")
+    result = file_system_ops.perform_file_actions(plan, args, mock_cfg_helper, mock_undo_manager, run_batch_id="run2")
+    assert result['success'] is True, result['message']
+    noreplace.assert_called_once()
+    assert (tmp_path / "d.mkv").read_text() == "c"
+
+@pytest.mark.parametrize("strategy, expected", [('auto', 'copy'), ('hardlink', 'hardlink'), ('reflink', 'copy'), ('copy', 'copy')])
+def test_backup_strategy_is_used_and_logged(tmp_path, mock_cfg_helper, mock_undo_manager, mocker, strategy, expected):
+    args = _live_rename_args(mock_cfg_helper, mock_undo_manager)
+    mocker.patch.object(file_system_ops, '_reflink_file', side_effect=OSError(95, "Operation not supported"))
+    args.backup_dir = tmp_path / "backups"
+    mock_cfg_helper.manager._mock_values['backup_strategy'] = strategy
+    plan = create_test_plan(tmp_path, actions=[("vid.mkv", "new_vid.mkv", 'file', 'rename')])
+    orig_path = plan.actions[0].original_path; orig_path.write_text("content")
+    original_inode = orig_path.stat().st_ino
+
+    result = file_system_ops.perform_file_actions(plan, args, mock_cfg_helper, mock_undo_manager, run_batch_id="run1")
+
+    backup = args.backup_dir / "vid.mkv"
+    assert result['success'] is True, result['message']
+    assert backup.read_text() == "content"
+    assert (backup.stat().st_ino == original_inode) == (expected == 'hardlink')
+    log_kwargs = mock_undo_manager.log_action.call_args.kwargs
+    assert log_kwargs['backup_path'] == backup and log_kwargs['backup_strategy'] == expected
+
+
+def test_trash_sends_files_in_batches_per_device_and_logs_once(tmp_path, mock_cfg_helper, mock_undo_manager, mocker):
+    if not SEND2TRASH_AVAILABLE: pytest.skip("send2trash not installed")
+    args = _live_rename_args(mock_cfg_helper, mock_undo_manager)
+    args.trash = True
+    mock_cfg_helper.manager._mock_values['trash_batch_size'] = 2
+    names = ["a.mkv", "a.srt", "b.mkv", "c.mkv"]
+    plan = create_test_plan(tmp_path, actions=[(name, f"new_{name}", 'file', 'rename') for name in names])
+    originals = [action.original_path for action in plan.actions]
+    for path in originals: path.write_text("x")
+    other_device = originals[3]
+    real_stat = os.stat
+    mocker.patch.object(file_system_ops.os, 'stat', side_effect=lambda p, *a, **kw: os.stat_result((0,) * 2 + (999,) + (0,) * 7) if Path(p) == other_device else real_stat(p, *a, **kw))
+
+    def fake_trash(paths):
+        for path in paths:
+            if path.endswith("b.mkv"): raise OSError(13, "Permission denied")
+            Path(path).unlink()
+    mock_send2trash = mocker.patch('send2trash.send2trash', side_effect=fake_trash)
+
+    result = file_system_ops.perform_file_actions(plan, args, mock_cfg_helper, mock_undo_manager, run_batch_id="run1")
+
+    assert [call.args[0] for call in mock_send2trash.call_args_list] == [[str(p) for p in originals[:2]], [str(originals[2])], [str(originals[3])]]
+    assert result['actions_taken'] == 3
+    mock_undo_manager.log_actions.assert_called_once_with("run1", [(a.original_path, a.new_path) for a in plan.actions], 'file', 'trashed')
+    mock_undo_manager.log_action.assert_not_called()
+    mock_undo_manager.update_action_statuses.assert_called_once_with("run1", [str(originals[2])], 'failed_pending')
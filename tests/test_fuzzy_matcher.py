@@ -0,0 +1,31 @@
+# tests/test_fuzzy_matcher.py
+import pytest
+
+from rename_app import fuzzy_matcher
+from rename_app.fuzzy_matcher import TitleMatcher, fuzzy_ratio, preprocess_for_scoring
+from rename_app.metadata_fetcher import find_best_match
+
+pytestmark = pytest.mark.skipif(not fuzzy_matcher.FUZZY_AVAILABLE, reason="no fuzzy matching library installed")
+
+CANDIDATES = ["The Office (US)", "Office Space", "The Offer", "Parks and Recreation"]
+
+
+def test_preprocess_matches_thefuzz_full_process():
+    assert preprocess_for_scoring("  Marvel's Agents of S.H.I.E.L.D.! ") == "marvel s agents of s h i e l d"
+
+
+def test_extract_orders_by_score_and_applies_cutoff():
+    matcher = TitleMatcher(CANDIDATES)
+    matches = matcher.extract("the office us", limit=None, score_cutoff=60)
+    assert matches[0][0] == 0
+    assert [score for _, score in matches] == sorted((score for _, score in matches), reverse=True)
+    assert all(score >= 60 for _, score in matches)
+    assert matcher.best("zzzz", score_cutoff=80) is None
+
+
+def test_find_best_match_returns_original_dict():
+    results = ({'id': 1, 'title': 'Heat'}, {'id': 2, 'title': 'Heathers'}, {'id': 3}, 'junk')
+    match, score = find_best_match('Heathers', results, score_cutoff=70)
+    assert match == {'id': 2, 'title': 'Heathers'} and score == pytest.approx(100.0)
+    assert find_best_match('Completely Different', results, score_cutoff=95) == (results[0], None)
+    assert fuzzy_ratio('HEAT', 'heat') == pytest.approx(100.0)
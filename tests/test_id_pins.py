@@ -0,0 +1,41 @@
+# tests/test_id_pins.py
+from rename_app.id_pins import IdPin, IdPinStore
+
+
+def test_pins_persist_and_match_title_spellings(tmp_path):
+    db = tmp_path / "pins.sqlite3"
+    store = IdPinStore(db)
+    store.pin('series', tmp_path / "Show", "Marvel's Agents of S.H.I.E.L.D.", None, 'tvdb', 263365)
+    store.pin('movie', tmp_path / "Movies", "Dune", 2021, 'tmdb', 438631)
+    store.close()
+
+    store = IdPinStore(db)
+    assert store.lookup('series', None, "Marvels.Agents.of.S.H.I.E.L.D") == IdPin('tvdb', 263365)
+    assert store.lookup('series', tmp_path / "Show", "S01E01") == IdPin('tvdb', 263365) # Directory pin
+    assert store.lookup('movie', None, "Dune", 2021) == IdPin('tmdb', 438631)
+    assert store.lookup('movie', None, "Dune", 1984) is None
+    assert store.lookup('movie', tmp_path / "Movies", "Arrival", 2016) is None # Movie directories are never pinned
+    store.close()
+
+
+def test_directory_with_two_shows_becomes_ambiguous(tmp_path):
+    store = IdPinStore(tmp_path / "pins.sqlite3")
+    flat_dir = tmp_path / "TV"
+    store.pin('series', flat_dir, "Show A", None, 'tmdb', 1)
+    store.pin('series', flat_dir, "Show B", None, 'tmdb', 2)
+    assert store.lookup('series', flat_dir, "Show C") is None
+    assert store.lookup('series', flat_dir, "Show B") == IdPin('tmdb', 2)
+    assert len(store) == 2
+    store.close()
+
+
+def test_unpin_by_directory_or_title(tmp_path):
+    store = IdPinStore(tmp_path / "pins.sqlite3")
+    show_dir = (tmp_path / "Show").resolve()
+    store.pin('series', show_dir, "The Show", None, 'tmdb', 7)
+    store.pin('movie', None, "The Show", 2020, 'tmdb', 8)
+    assert store.unpin(str(show_dir)) == 1
+    assert store.lookup('series', show_dir, "Other") is None
+    assert store.unpin("show") == 2 # Both kinds' title pins, any year
+    assert len(store) == 0
+    store.close()
@@ -0,0 +1,68 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time of rename_main (microseconds, as reported by -X importtime).
+# The pre-lazy-import baseline was ~600 ms.
+IMPORT_BUDGET_US = 150_000
+
+# Wall clock for a whole 'undo --list' process (interpreter startup included), best of a few runs.
+UNDO_LIST_BUDGET_S = 0.2
+
+# Modules only the rename pipeline (or 'config validate') needs; none of them may be
+# pulled in just by starting the CLI (e.g. for 'undo --list' or 'config show').
+HEAVY_MODULES = (
+    'asyncio', 'pydantic', 'guessit', 'pymediainfo', 'langcodes', 'chardet',
+    'tmdbv3api', 'tvdb_v4_official', 'diskcache', 'thefuzz', 'rapidfuzz', 'tenacity',
+    'rename_app.main_processor', 'rename_app.metadata_fetcher', 'rename_app.config_schema',
+)
+
+
+def _run_importtime(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+    )
+
+
+def test_cli_startup_does_not_import_heavy_modules():
+    result = _run_importtime("import sys, rename_main; print(','.join(sorted(sys.modules)))")
+    assert result.returncode == 0, result.stderr
+    loaded = set(result.stdout.strip().splitlines()[-1].split(','))
+    offenders = [m for m in HEAVY_MODULES if m in loaded]
+    assert not offenders, f"Importing rename_main loaded: {offenders}"
+
+
+def test_cli_import_time_budget():
+    result = _run_importtime("import rename_main")
+    assert result.returncode == 0, result.stderr
+    match = re.search(r'import time:\s+\d+ \|\s+(\d+) \| rename_main\s*$', result.stderr, re.MULTILINE)
+    if not match:
+        pytest.skip("Could not parse -X importtime output.")
+    cumulative_us = int(match.group(1))
+    assert cumulative_us < IMPORT_BUDGET_US, f"rename_main import took {cumulative_us / 1000:.1f} ms (budget {IMPORT_BUDGET_US / 1000:.0f} ms)"
+
+
+def test_undo_list_wall_clock_budget(tmp_path):
+    config_path = tmp_path / "config.toml"
+    config_path.write_text(f'[default]\nundo_db_path = "{(tmp_path / "undo.db").as_posix()}"\n', encoding='utf-8')
+    env = dict(os.environ, HOME=str(tmp_path), XDG_CACHE_HOME=str(tmp_path / ".cache"))
+    command = [sys.executable, str(PROJECT_ROOT / 'rename_main.py'), '--config', str(config_path), 'undo', '--list']
+
+    def timed_run() -> float:
+        started = time.perf_counter()
+        result = subprocess.run(command, cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+        elapsed = time.perf_counter() - started
+        assert result.returncode == 0, result.stderr
+        return elapsed
+
+    timed_run()  # First run validates the config and creates the undo DB
+    best = min(timed_run() for _ in range(3))
+    assert best < UNDO_LIST_BUDGET_S, f"'undo --list' took {best * 1000:.0f} ms (budget {UNDO_LIST_BUDGET_S * 1000:.0f} ms)"
@@ -3,7 +3,7 @@
 import pytest
 import logging
 from pathlib import Path
-from unittest.mock import MagicMock, patch, call, ANY
+from unittest.mock import AsyncMock, MagicMock, patch, call, ANY
 import argparse
 import sys
 
@@ -379,4 +379,193 @@ def test_run_processing_dry_run_success(
 # - Interactive mode: 'y', 'n', 's', 'q', EOF
 # - Errors during planning/fetching in main loop
 # - Unhandled exceptions
-# - Check tqdm calls (set_postfix_str)
\ No newline at end of file
+# - Check tqdm calls (set_postfix_str)
+
+@pytest.mark.asyncio
+async def test_fetch_uses_pinned_id_instead_of_searching(tmp_path):
+    from types import SimpleNamespace
+    from rename_app.id_pins import IdPinStore
+    from rename_app.main_processor import _fetch_metadata_for_batch
+
+    show_dir = tmp_path / "The Show" / "Season 1"
+    video = show_dir / "The.Show.S01E02.mkv"
+    renamer = MagicMock()
+    renamer.parse_filename.return_value = {'title': 'The Show', 'season': 1, 'episode': 2}
+    renamer._determine_file_type.return_value = 'series'
+    fetcher = MagicMock()
+    fetcher.fetch_series_metadata = AsyncMock(return_value=None)
+    pins = IdPinStore(tmp_path / "pins.sqlite3")
+    pins.pin('series', show_dir, 'Some Other Spelling', None, 'tvdb', 4242)
+    processor_stub = SimpleNamespace(args=argparse.Namespace(use_metadata=True, tmdb_id=None, tvdb_id=None),
+                                     renamer=renamer, metadata_fetcher=fetcher, id_pins=pins)
+    try:
+        await _fetch_metadata_for_batch(processor_stub, video.stem, {'video': video, 'associated': []})
+    finally:
+        pins.close()
+
+    kwargs = fetcher.fetch_series_metadata.await_args.kwargs
+    assert kwargs['force_tvdb_id'] == 4242 and kwargs['force_tmdb_id'] is None
+
+
+@pytest.mark.asyncio
+async def test_episode_files_of_one_season_share_a_single_fetch(tmp_path):
+    from rename_app.models import MediaMetadata
+
+    def parse(path):
+        if path.stem.startswith("Movie"): return {'title': 'Movie', 'year': 2020}
+        return {'title': 'The Show', 'season': 1, 'episode': int(path.stem[-2:])}
+
+    args = argparse.Namespace(use_metadata=False, quiet=True, interactive=False, live=False, tmdb_id=None, tvdb_id=None)
+    processor = MainProcessor(args, MagicMock(return_value=None), MagicMock())
+    processor.args.use_metadata = True
+    processor.renamer = MagicMock()
+    processor.renamer.parse_filename.side_effect = parse
+    processor.renamer._determine_file_type.side_effect = lambda guess: 'series' if 'season' in guess else 'movie'
+    season_meta = MediaMetadata(source_api='tmdb', ids={'tmdb_id': 1}, is_series=True, show_title='The Show', season=1,
+                                episode_list=[1, 2, 3], episode_titles={1: 'One', 2: 'Two', 3: 'Three'})
+    processor.metadata_fetcher = MagicMock()
+    processor.metadata_fetcher.fetch_series_metadata = AsyncMock(return_value=season_meta)
+    processor.metadata_fetcher.fetch_movie_metadata = AsyncMock(return_value=None)
+
+    file_batches = {stem: {'video': tmp_path / f"{stem}.mkv", 'associated': []}
+                    for stem in ("The.Show.S01E01", "the show S01E02", "The.Show.S01E03", "Movie.2020")}
+    parsed = processor._perform_initial_parsing(file_batches, len(file_batches))
+    results = await processor._fetch_all_metadata(file_batches, parsed)
+
+    processor.metadata_fetcher.fetch_series_metadata.assert_awaited_once()
+    kwargs = processor.metadata_fetcher.fetch_series_metadata.await_args.kwargs
+    assert kwargs['episode_num_list'] == (1, 2, 3)
+    assert sorted(kwargs['cache_episode_sets']) == [(1,), (2,), (3,)]
+    assert results["the show S01E02"].metadata.episode_list == [2]
+    assert results["the show S01E02"].metadata.episode_titles == {2: 'Two'}
+    assert results["The.Show.S01E03"].metadata.episode_titles == {3: 'Three'}
+    processor.metadata_fetcher.fetch_movie_metadata.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_live_actions_run_concurrently_across_directories_only(tmp_path, mocker):
+    import asyncio
+    import threading
+    import time
+    from rename_app.async_file_ops import AsyncFileOps
+
+    active = {'total': 0}
+    peaks = {'total': 0}
+    counter_lock = threading.Lock()
+
+    def fake_actions(plan, **kwargs):
+        folder = plan.actions[0].new_path.parent
+        with counter_lock:
+            for key in ('total', folder):
+                active[key] = active.get(key, 0) + 1
+                peaks[key] = max(peaks.get(key, 0), active[key])
+        time.sleep(0.05)
+        with counter_lock:
+            active['total'] -= 1
+            active[folder] -= 1
+        return {'success': True, 'message': 'ok', 'actions_taken': len(plan.actions)}
+
+    mocker.patch('rename_app.main_processor.perform_file_actions', side_effect=fake_actions)
+    args = argparse.Namespace(use_metadata=False, quiet=True, interactive=False, live=True, backup_dir=None, stage_dir=None)
+    processor = MainProcessor(args, MagicMock(return_value=None), MagicMock())
+    plans = []
+    for folder in ("Show A", "Show A", "Show B", "Show B"):
+        video = tmp_path / folder / f"{len(plans)}.mkv"
+        plans.append(RenamePlan(batch_id=str(len(plans)), video_file=video, status='success',
+                                actions=[RenameAction(video, video.with_name(f"renamed {len(plans)}.mkv"), 'rename')]))
+
+    processor.file_ops = AsyncFileOps(max_workers=4)
+    try:
+        results = await asyncio.gather(*(processor._run_file_actions(plan, MagicMock(), "run-1") for plan in plans))
+    finally:
+        processor.file_ops.shutdown()
+
+    assert all(r['success'] for r in results)
+    assert peaks['total'] == 2
+    assert peaks[tmp_path / "Show A"] == 1 and peaks[tmp_path / "Show B"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pipelined_live_run_fetches_next_batch_while_earlier_one_moves(tmp_path, mocker):
+    import threading
+    from rename_app.models import MediaInfo
+
+    stems = ["A", "B", "C", "D"]
+    file_batches = {stem: {'video': tmp_path / f"{stem}.mkv", 'associated': []} for stem in stems}
+    fetch_started = []
+    second_fetch_started = threading.Event()
+
+    async def fake_fetch(processor, stem, batch_data, progress=None, task_id=None, episode_sets=()):
+        fetch_started.append(stem)
+        if stem == "B": second_fetch_started.set()
+        return stem, MediaInfo(original_path=batch_data['video'], file_type='movie', guess_info={'title': stem})
+
+    fetched_while_first_moved = []
+    async def fake_process(stem, batch_data, media_info, run_batch_id, is_live):
+        if stem == "A": # Its file actions block on the pool until the next lookup has begun
+            assert await processor.file_ops.run(second_fetch_started.wait, 5)
+            fetched_while_first_moved.extend(fetch_started)
+        return {'success': True, 'message': f"done {stem}", 'actions_taken': 1}, False, False
+
+    mocker.patch('rename_app.main_processor._fetch_metadata_for_batch', new=fake_fetch)
+    settings = {'live_parallel_batches': 1}
+    args = argparse.Namespace(use_metadata=False, quiet=True, interactive=False, live=True, tmdb_id=None, tvdb_id=None)
+    processor = MainProcessor(args, lambda key, default=None, arg_value=None: settings.get(key, default), MagicMock())
+    processor.args.use_metadata = True
+    processor.metadata_fetcher = MagicMock()
+    mocker.patch.object(processor, '_process_single_batch', new=fake_process)
+    assert processor._pipelines_metadata(is_live_run=True, unattended=False)
+    media_infos = {stem: MediaInfo(original_path=data['video'], file_type='movie', guess_info={'title': stem}) for stem, data in file_batches.items()}
+
+    try:
+        outcomes = await processor._fetch_and_execute_pipelined(file_batches, media_infos, "run-1", 1, MagicMock(), 0)
+    finally:
+        processor.file_ops.shutdown()
+
+    assert sorted(outcomes) == stems and all(outcome[0]['success'] for outcome in outcomes.values())
+    assert fetched_while_first_moved[:2] == ["A", "B"]
+    assert "D" not in fetched_while_first_moved # The bounded queue holds lookups back until batches are taken
+    processor.args.quiet = False
+    assert not processor._pipelines_metadata(is_live_run=True, unattended=False) # Confirmations need every lookup first
+
+
+@pytest.mark.asyncio
+async def test_resume_processes_only_unhandled_batches_under_the_same_run_id(tmp_path, mocker):
+    done, todo = tmp_path / "Done.S01E01.mkv", tmp_path / "Todo.S01E02.mkv"
+    batches = {"Done.S01E01": {'video': done, 'associated': [tmp_path / "Done.S01E01.srt"]},
+               "Todo.S01E02": {'video': todo, 'associated': []}}
+    mocker.patch('rename_app.main_processor.scan_media_files', return_value=list(batches.items()))
+    undo_manager = MagicMock()
+    undo_manager.recover_run.return_value = {'finished': 1, 'discarded': 0, 'unresolved': 0,
+                                             'done_paths': {str((tmp_path / "Done.S01E01.srt").resolve())}}
+    args = argparse.Namespace(directory=tmp_path, use_metadata=False, quiet=True, interactive=False, live=True, resume="run-1")
+    processor = MainProcessor(args, MagicMock(return_value=None), undo_manager)
+    process = mocker.patch.object(processor, 'process_file_batches', new=AsyncMock(return_value={}))
+
+    await processor.run_processing()
+
+    undo_manager.recover_run.assert_called_once_with("run-1")
+    process.assert_awaited_once_with({"Todo.S01E02": batches["Todo.S01E02"]}, unattended=False, run_batch_id="run-1")
+
+
+@pytest.mark.asyncio
+async def test_move_to_unknown_runs_file_operations_off_the_event_loop(tmp_path, mocker):
+    import threading
+    video = tmp_path / "mystery.mkv"
+    video.write_text("v")
+    (tmp_path / "_unknown_files_").mkdir()
+    (tmp_path / "_unknown_files_" / "mystery.mkv").write_text("older")
+    moving_threads = []
+    real_move = __import__('shutil').move
+    mocker.patch('rename_app.async_file_ops.shutil.move', side_effect=lambda src, dst: (moving_threads.append(threading.current_thread().name), real_move(src, dst)))
+    args = argparse.Namespace(directory=tmp_path, live=True, quiet=True, unknown_files_dir=None)
+    settings = {'unknown_files_dir': '_unknown_files_', 'on_conflict': 'suffix'}
+    undo_manager = MagicMock(is_enabled=False)
+    processor = MainProcessor(args, lambda key, default=None, arg_value=None: settings.get(key, default), undo_manager)
+
+    result = await processor._handle_move_to_unknown("mystery", {'video': video, 'associated': []}, "run-1")
+    processor.file_ops.shutdown()
+
+    assert result['move_success'] and result['actions_taken'] == 1
+    assert (tmp_path / "_unknown_files_" / "mystery_1.mkv").read_text() == "v"
+    assert moving_threads and moving_threads[0].startswith("rename-fileops") and moving_threads[0] != threading.current_thread().name
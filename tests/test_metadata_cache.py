@@ -0,0 +1,186 @@
+# tests/test_metadata_cache.py
+import asyncio
+import pytest
+from types import SimpleNamespace
+
+from rename_app import metadata_fetcher as mf_module
+from rename_app.exceptions import MetadataError, MetadataNotFoundError
+from rename_app.metadata_cache import (
+    MemoryLRUCache, compact_movie_result, compact_series_result, encode_cache_record, decode_cache_record, CACHE_SCHEMA_VERSION
+)
+from rename_app.metadata_fetcher import MetadataFetcher
+
+
+def test_lru_evicts_least_recently_used_by_count():
+    cache = MemoryLRUCache(max_items=2, max_bytes=1_000_000)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' becomes most recent
+    cache.set('c', 3)
+    assert 'b' not in cache
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_lru_evicts_by_size_and_rejects_oversized_values():
+    cache = MemoryLRUCache(max_items=100, max_bytes=250)
+    cache.set('a', 'x', size=100)
+    cache.set('b', 'y', size=100)
+    cache.set('c', 'z', size=100)
+    assert 'a' not in cache and len(cache) == 2
+    assert cache.total_bytes == 200
+    assert cache.set('huge', 'w', size=1000) is False
+    assert 'huge' not in cache
+
+
+def test_lru_expiry_and_disabled(mocker):
+    cache = MemoryLRUCache(max_items=10, max_bytes=1000)
+    mocker.patch('rename_app.metadata_cache.time.monotonic', return_value=100.0)
+    cache.set('k', 'v', expire=5)
+    mocker.patch('rename_app.metadata_cache.time.monotonic', return_value=106.0)
+    assert cache.get('k') is None
+    assert cache.total_bytes == 0
+
+    disabled = MemoryLRUCache(max_items=0, max_bytes=1000)
+    assert disabled.set('k', 'v') is False
+    assert disabled.get('k', 'default') == 'default'
+
+
+@pytest.fixture
+def fetcher(mock_cfg_helper, tmp_path):
+    if not mf_module.DISKCACHE_AVAILABLE:
+        pytest.skip("diskcache not installed")
+    mock_cfg_helper.manager._mock_values.update({'cache_directory': str(tmp_path / 'cache'), 'cache_enabled': True, 'api_rate_limit_delay': 0})
+    mock_cfg_helper.args.quiet = True
+    fetcher = MetadataFetcher(mock_cfg_helper)
+    yield fetcher
+    fetcher.cache.close()
+
+
+@pytest.mark.asyncio
+async def test_fetcher_write_through_and_tier_counters(fetcher):
+    value = ({'title': 'Movie', 'release_date': '2020-01-01'}, {'tmdb_id': 1}, 90.0)
+    await fetcher._set_cache('movie::en::k', value)
+    assert decode_cache_record(fetcher.cache.get('movie::en::k')) == value  # written through to disk
+
+    assert await fetcher._get_cache('movie::en::k') == value
+    assert fetcher.cache_stats['memory_hits'] == 1
+
+    fetcher.memory_cache.clear()  # e.g. a new run: only the disk tier has it
+    assert await fetcher._get_cache('movie::en::k') == value
+    assert fetcher.cache_stats['disk_hits'] == 1
+    assert 'movie::en::k' in fetcher.memory_cache  # promoted to L1
+
+    assert await fetcher._get_cache('missing') is None
+    assert fetcher.cache_stats['misses'] == 1
+
+
+def test_compact_records_keep_only_needed_fields_and_round_trip():
+    api_movie = SimpleNamespace(title='Heat', release_date='1995-12-15', overview='long text', credits={'cast': ['...']})
+    movie = compact_movie_result(api_movie, {'tmdb_id': 949, 'collection_name': None}, 88.5)
+    assert movie[0] == {'title': 'Heat', 'release_date': '1995-12-15'}
+    assert decode_cache_record(encode_cache_record(movie)) == movie
+
+    tvdb_show = {'name': 'Show', 'firstAired': '2001-02-03', 'aliases': ['x'] * 50}
+    episodes = {1: {'episodeName': 'Pilot', 'aired': '2001-02-03', 'overview': '...'}, 2: None}
+    series = compact_series_result(tvdb_show, episodes, {'tvdb_id': 7}, 95.0)
+    assert series[0] == {'name': 'Show', 'first_air_date': '2001-02-03'}
+    assert series[1] == {1: {'name': 'Pilot', 'air_date': '2001-02-03'}}
+    assert decode_cache_record(encode_cache_record(series)) == series  # int episode keys survive JSON
+
+
+def test_decode_rejects_stale_formats():
+    legacy_pickled_tuple = (SimpleNamespace(title='Heat'), {'tmdb_id': 1}, 90.0)
+    assert decode_cache_record(legacy_pickled_tuple) is None
+    other_version = encode_cache_record(({'title': 'A'}, {}, None)).replace(f'"v":{CACHE_SCHEMA_VERSION}', '"v":0')
+    assert decode_cache_record(other_version) is None
+    assert decode_cache_record('not json') is None
+    with pytest.raises(ValueError):
+        encode_cache_record((SimpleNamespace(title='raw api object'), {}, None))
+
+
+@pytest.mark.asyncio
+async def test_fetcher_drops_legacy_entries(fetcher):
+    fetcher.cache.set('movie::en::old', (SimpleNamespace(title='Heat'), {'tmdb_id': 1}, 90.0, None))
+    assert await fetcher._get_cache('movie::en::old') is None
+    assert 'movie::en::old' not in fetcher.cache
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_skips_api_and_can_be_purged(fetcher, mocker):
+    fetcher.tmdb = object()  # pretend the client is configured
+    do_fetch = mocker.patch.object(fetcher, '_do_fetch_tmdb_movie', side_effect=MetadataNotFoundError("No TMDB match found for movie 'Sample Clip'."))
+
+    for _ in range(2):
+        with pytest.raises(MetadataError):
+            await fetcher.fetch_movie_metadata('Sample Clip', 2020)
+    assert do_fetch.call_count == 1
+    assert fetcher.cache_stats['negative_hits'] == 1
+
+    assert fetcher.purge_negative_cache('sample  CLIP') == 1
+    with pytest.raises(MetadataError):
+        await fetcher.fetch_movie_metadata('Sample Clip', 2020)
+    assert do_fetch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_not_negatively_cached(fetcher, mocker):
+    fetcher.tmdb = object()
+    do_fetch = mocker.patch.object(fetcher, '_do_fetch_tmdb_movie', side_effect=MetadataError("Failed to fetch TMDB metadata after 3 attempts."))
+    for _ in range(2):
+        with pytest.raises(MetadataError):
+            await fetcher.fetch_movie_metadata('Real Movie', 2020)
+    assert do_fetch.call_count == 2
+    assert fetcher.cache_stats['negative_hits'] == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_and_refreshed_in_background(fetcher, mocker):
+    fetcher.tmdb = object()
+    fetcher.stale_while_revalidate, fetcher.cache_expire, fetcher.cache_max_stale = True, 60, None
+    cache_key = "movie::en::Heat_1995"
+    stale = ({'title': 'Heat (old)', 'release_date': '1995-12-15'}, {'tmdb_id': 949}, 90.0)
+    fetcher.cache.set(cache_key, encode_cache_record(stale, fetched_at=mf_module.time.time() - 3600))
+    release = asyncio.Event()
+
+    async def slow_fetch(*args, **kwargs):
+        await release.wait()
+        return SimpleNamespace(title='Heat', release_date='1995-12-15'), {'tmdb_id': 949}, 95.0
+    do_fetch = mocker.patch.object(fetcher, '_do_fetch_tmdb_movie', side_effect=slow_fetch)
+
+    first = await fetcher.fetch_movie_metadata('Heat', 1995)
+    second = await fetcher.fetch_movie_metadata('Heat', 1995)  # refresh already in flight: not scheduled twice
+    assert first.movie_title == second.movie_title == 'Heat (old)'
+    assert cache_key not in fetcher.memory_cache  # stale values stay out of L1
+
+    release.set()
+    await fetcher.wait_for_background_refreshes()
+    assert do_fetch.call_count == 1
+    assert fetcher.cache_stats['stale_hits'] == 2 and fetcher.cache_stats['refreshed'] == 1
+    assert (await fetcher.fetch_movie_metadata('Heat', 1995)).movie_title == 'Heat'
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_beyond_limit_is_a_miss(fetcher):
+    fetcher.stale_while_revalidate, fetcher.cache_expire, fetcher.cache_max_stale = True, 60, 100
+    value = ({'title': 'A', 'release_date': None}, {}, None)
+    fetcher.cache.set('movie::k', encode_cache_record(value, fetched_at=mf_module.time.time() - 120))
+    assert await fetcher._get_cache_entry('movie::k') == (value, True)
+    fetcher.cache.set('movie::k', encode_cache_record(value, fetched_at=mf_module.time.time() - 1000))
+    assert await fetcher._get_cache_entry('movie::k') == (None, False)
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_breaker_falls_back_to_next_series_source(fetcher, mocker):
+    fetcher.tmdb, fetcher.tvdb = object(), object()
+    fetcher.cfg.manager._mock_values['series_metadata_preference'] = ['tvdb', 'tmdb']
+    tvdb_fetch = mocker.patch.object(fetcher, '_do_fetch_tvdb_series')
+    tmdb_fetch = mocker.patch.object(fetcher, '_do_fetch_tmdb_series', return_value=(
+        {'name': 'Show', 'first_air_date': '2020-01-01'}, {1: {'name': 'Pilot', 'air_date': '2020-01-01'}}, {'tmdb_id': 5}, 95.0))
+    for _ in range(fetcher.circuit_breaker.threshold):
+        fetcher.circuit_breaker.record_failure('tvdb')
+
+    meta = await fetcher.fetch_series_metadata('Show', 1, (1,))
+
+    tvdb_fetch.assert_not_called()
+    assert meta.source_api == 'tmdb' and meta.episode_titles == {1: 'Pilot'}
+    assert fetcher.circuit_breaker.trips == {'tvdb': 1}
@@ -0,0 +1,73 @@
+# tests/test_move_engine.py
+import errno
+import os
+
+import pytest
+
+from rename_app import move_engine
+from rename_app.exceptions import FileOperationError
+from rename_app.move_engine import MoveEngine, copy_file_data
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / "src" / "Show.S01E01.mkv"
+    src.parent.mkdir()
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 123))
+    return src
+
+
+@pytest.fixture
+def cross_device(mocker):
+    return mocker.patch.object(move_engine, 'is_cross_device', return_value=True)
+
+
+def test_copy_falls_back_when_kernel_copy_is_unsupported(source, tmp_path, mocker):
+    unsupported = OSError(errno.EXDEV, "cross-device")
+    mocker.patch.object(os, 'copy_file_range', side_effect=unsupported, create=True)
+    mocker.patch.object(os, 'sendfile', side_effect=unsupported, create=True)
+    seen = []
+    dst = tmp_path / "copy.mkv"
+
+    assert copy_file_data(source, dst, chunk_bytes=1024 * 1024, on_bytes=seen.append) == source.stat().st_size
+    assert dst.read_bytes() == source.read_bytes()
+    assert sum(seen) == source.stat().st_size and len(seen) == 4
+    assert dst.stat().st_mtime == pytest.approx(source.stat().st_mtime)
+
+
+def test_short_copy_keeps_source_and_leaves_no_partial_file(source, tmp_path, mocker, cross_device):
+    mocker.patch.object(os, 'copy_file_range', return_value=0, create=True)
+    dst = tmp_path / "stage" / "Show - S01E01.mkv"
+    dst.parent.mkdir()
+
+    with pytest.raises(FileOperationError, match="incomplete"):
+        MoveEngine().move(source, dst)
+    assert source.exists()
+    assert list(dst.parent.iterdir()) == []
+
+
+def test_cross_device_move_copies_then_unlinks(source, tmp_path, cross_device):
+    data = source.read_bytes()
+    dst = tmp_path / "stage" / "Show - S01E01.mkv"
+    dst.parent.mkdir()
+    dst.write_bytes(b"old")  # Replaced, as shutil.move would
+
+    assert MoveEngine(chunk_bytes=1024 * 1024).move(source, dst) is True
+    assert not source.exists()
+    assert dst.read_bytes() == data
+    assert [p.name for p in dst.parent.iterdir()] == [dst.name]
+
+
+def test_move_many_reports_errors_per_file(tmp_path, cross_device):
+    pairs = []
+    for name in ("a.mkv", "b.mkv", "missing.mkv"):
+        src = tmp_path / name
+        if name != "missing.mkv": src.write_bytes(name.encode())
+        pairs.append((src, tmp_path / f"moved_{name}"))
+
+    errors = MoveEngine(parallel_transfers=3).move_many(pairs)
+
+    assert errors[:2] == [None, None]
+    assert isinstance(errors[2], OSError)
+    assert (tmp_path / "moved_a.mkv").read_bytes() == b"a.mkv"
+    assert (tmp_path / "moved_b.mkv").read_bytes() == b"b.mkv"
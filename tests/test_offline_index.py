@@ -0,0 +1,72 @@
+# tests/test_offline_index.py
+import sqlite3
+import pytest
+
+from rename_app.exceptions import ConfigError, MetadataError
+from rename_app.metadata_fetcher import MetadataFetcher
+from rename_app.offline_index import OfflineMetadataIndex
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = tmp_path / "titles.sqlite"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE movies (tmdb_id INTEGER PRIMARY KEY, title TEXT NOT NULL, release_date TEXT, imdb_id TEXT, collection_id INTEGER, collection_name TEXT);
+        CREATE TABLE shows (id INTEGER PRIMARY KEY, tmdb_id INTEGER, tvdb_id INTEGER, imdb_id TEXT, name TEXT NOT NULL, first_air_date TEXT);
+        CREATE TABLE episodes (show_id INTEGER NOT NULL, season INTEGER NOT NULL, episode INTEGER NOT NULL, name TEXT, air_date TEXT, PRIMARY KEY (show_id, season, episode));
+        INSERT INTO movies VALUES (949, 'Heat', '1995-12-15', 'tt0113277', NULL, NULL);
+        INSERT INTO movies VALUES (1001, 'Heat', '1986-03-14', NULL, NULL, NULL);
+        INSERT INTO movies VALUES (194, 'Amélie', '2001-04-25', NULL, NULL, NULL);
+        INSERT INTO shows VALUES (1, 1399, 121361, 'tt0944947', 'Game of Thrones', '2011-04-17');
+        INSERT INTO episodes VALUES (1, 1, 1, 'Winter Is Coming', '2011-04-17');
+        INSERT INTO episodes VALUES (1, 1, 2, 'The Kingsroad', '2011-04-24');
+    """)
+    conn.commit(); conn.close()
+    return path
+
+
+def test_movie_lookup_by_title_year_and_id(index_path):
+    index = OfflineMetadataIndex(index_path)
+    data, ids, score = index.find_movie("heat", 1995)
+    assert data == {'title': 'Heat', 'release_date': '1995-12-15'}
+    assert ids == {'tmdb_id': 949, 'imdb_id': 'tt0113277'} and score == 100.0
+    assert index.find_movie("Heat", 1986)[1]['tmdb_id'] == 1001
+    assert index.find_movie("Heat", 2010) is None  # outside year tolerance
+    assert index.find_movie("Amelie", None)[0]['title'] == 'Amélie'
+    assert index.find_movie("anything", tmdb_id=194)[2] == 101.0
+
+
+def test_series_lookup_returns_requested_episodes(index_path):
+    index = OfflineMetadataIndex(index_path)
+    show, episodes, ids, _score = index.find_series("Game.of.Thrones", 1, (2, 9))
+    assert show['name'] == 'Game of Thrones'
+    assert episodes == {2: {'name': 'The Kingsroad', 'air_date': '2011-04-24'}}
+    assert ids == {'tmdb_id': 1399, 'tvdb_id': 121361, 'imdb_id': 'tt0944947'}
+    assert index.find_series("x", 1, (1,), tvdb_id=121361)[1][1]['name'] == 'Winter Is Coming'
+    fuzzy = index.find_series("Thrones of Game", 1, (1,))  # no exact title: batch fuzzy scoring over all index titles
+    assert fuzzy[0]['name'] == 'Game of Thrones' and fuzzy[3] == 100.0
+
+
+def test_missing_index_is_a_config_error(tmp_path):
+    with pytest.raises(ConfigError):
+        OfflineMetadataIndex(tmp_path / "missing.sqlite")
+
+
+@pytest.mark.asyncio
+async def test_fetcher_answers_from_index_without_api_clients(index_path, mock_cfg_helper, mocker):
+    mocker.patch('rename_app.metadata_fetcher.get_tmdb_client', return_value=None)
+    mocker.patch('rename_app.metadata_fetcher.get_tvdb_client', return_value=None)
+    mock_cfg_helper.manager._mock_values.update({'offline_index_path': str(index_path), 'cache_directory': str(index_path.parent / 'cache'), 'api_rate_limit_delay': 0})
+    mock_cfg_helper.args.quiet = True
+    fetcher = MetadataFetcher(mock_cfg_helper)
+    assert fetcher.offline_only and fetcher.cache is None
+
+    movie = await fetcher.fetch_movie_metadata("Heat", 1995)
+    assert movie.source_api == 'tmdb' and movie.movie_year == 1995 and movie.ids['imdb_id'] == 'tt0113277'
+
+    series = await fetcher.fetch_series_metadata("Game of Thrones", 1, (1, 2))
+    assert series.show_title == 'Game of Thrones' and series.episode_titles == {1: 'Winter Is Coming', 2: 'The Kingsroad'}
+
+    with pytest.raises(MetadataError, match="offline index"):
+        await fetcher.fetch_movie_metadata("Unknown Film", 2020)
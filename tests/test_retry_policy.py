@@ -0,0 +1,106 @@
+# tests/test_retry_policy.py
+import pytest
+
+from rename_app.retry_policy import CircuitBreaker, RetryPolicy, is_throttle_or_server_error
+
+
+class _Response:
+    def __init__(self, status_code): self.status_code = status_code
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}"); self.response = _Response(status_code)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(mocker):
+    return mocker.patch('asyncio.sleep', new=mocker.AsyncMock())
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_wait=1.0, max_wait=5.0)
+    waits = [policy.backoff(attempt) for attempt in range(1, 8) for _ in range(50)]
+    assert all(0.0 <= w <= 5.0 for w in waits)
+    assert len({round(w, 6) for w in waits}) > 100 # Not a fixed step
+    assert max(policy.backoff(1) for _ in range(200)) <= 1.0
+
+
+def test_throttle_classification():
+    assert is_throttle_or_server_error(_HTTPError(429))
+    assert is_throttle_or_server_error(_HTTPError(503))
+    assert not is_throttle_or_server_error(_HTTPError(404))
+    assert is_throttle_or_server_error(ValueError("Server responded 502 Bad Gateway"))
+    assert not is_throttle_or_server_error(ValueError("No record found"))
+
+
+@pytest.mark.asyncio
+async def test_retries_until_success_and_resets_error_streak():
+    policy = RetryPolicy(max_attempts=3, base_wait=0.0, pause_after=3)
+    outcomes = [_HTTPError(503), _HTTPError(503), "ok"]
+    async def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception): raise outcome
+        return outcome
+    assert await policy.call('tmdb', flaky) == "ok"
+    assert policy.retries_used == 2
+    assert policy.pause_remaining('tmdb') == 0.0 # The streak ended with a success before reaching the threshold
+
+
+@pytest.mark.asyncio
+async def test_repeated_throttling_pauses_the_provider_for_all_callers():
+    policy = RetryPolicy(max_attempts=2, base_wait=0.0, pause_after=2, pause_seconds=30.0)
+    async def throttled(): raise _HTTPError(429)
+    with pytest.raises(_HTTPError):
+        await policy.call('tvdb', throttled)
+    assert policy.pauses == {'tvdb': 1}
+    assert policy.pause_remaining('tvdb') == pytest.approx(30.0, abs=1.0)
+    assert policy.pause_remaining('tmdb') == 0.0
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_is_shared_and_non_retryable_errors_fail_fast():
+    policy = RetryPolicy(max_attempts=5, base_wait=0.0, pause_after=0, budget=3)
+    calls = 0
+    async def always_down():
+        nonlocal calls; calls += 1
+        raise _HTTPError(500)
+    for _ in range(2):
+        with pytest.raises(_HTTPError):
+            await policy.call('tmdb', always_down)
+    assert calls == 2 + 3 # Two first attempts, three retries in total
+    assert policy.retries_left == 0
+
+    calls = 0
+    strict_policy = RetryPolicy(max_attempts=5, base_wait=0.0, should_retry=lambda e: False)
+    with pytest.raises(_HTTPError):
+        await strict_policy.call('tmdb', always_down)
+    assert calls == 1
+
+
+def test_circuit_breaker_opens_then_half_opens_after_cooldown():
+    breaker = CircuitBreaker(threshold=2, cooldown=60.0)
+    breaker.record_failure('tvdb')
+    assert breaker.allow('tvdb')
+    breaker.record_failure('tvdb')
+    assert not breaker.allow('tvdb') and breaker.allow('tmdb')
+    assert breaker.trips == {'tvdb': 1}
+    later = __import__('time').monotonic() + 61
+    assert breaker.allow('tvdb', now=later)
+    breaker.record_failure('tvdb') # The trial request after the cool-down fails: open again at once
+    assert breaker.trips == {'tvdb': 2} and not breaker.allow('tvdb')
+
+
+@pytest.mark.asyncio
+async def test_only_exhausted_transient_failures_count_against_the_breaker():
+    breaker = CircuitBreaker(threshold=2, cooldown=60.0)
+    policy = RetryPolicy(max_attempts=2, base_wait=0.0, pause_after=0, breaker=breaker,
+                         should_retry=lambda e: isinstance(e, _HTTPError) and e.response.status_code >= 500)
+    async def not_found(): raise _HTTPError(404)
+    async def down(): raise _HTTPError(503)
+    for _ in range(3):
+        with pytest.raises(_HTTPError): await policy.call('tvdb', not_found)
+    assert breaker.allow('tvdb')
+    for _ in range(2):
+        with pytest.raises(_HTTPError): await policy.call('tvdb', down)
+    assert not breaker.allow('tvdb')
@@ -0,0 +1,98 @@
+# tests/test_title_aliases.py
+import pytest
+from types import SimpleNamespace
+
+from rename_app.exceptions import MetadataNotFoundError, MetadataError
+from rename_app.metadata_fetcher import MetadataFetcher
+from rename_app.title_aliases import TitleAliasIndex, normalize_title
+
+
+@pytest.mark.parametrize("variants, expected", [
+    (["Marvels.Agents.of.S.H.I.E.L.D", "Marvel's Agents of S.H.I.E.L.D.", "marvels agents of shield"], "marvels agents of shield"),
+    (["The Office", "Office, The", "the office"], "office"),
+    (["Amélie", "AMELIE"], "amelie"),
+    (["Amélie (2001)!", "amelie 2001"], "amelie 2001"),
+    (["Rocky II", "rocky 2"], "rocky 2"),
+    (["Law & Order", "Law and Order"], "law and order"),
+])
+def test_normalize_title_folds_variants(variants, expected):
+    assert {normalize_title(v) for v in variants} == {expected}
+
+
+def test_normalize_title_keeps_single_letter_words_and_bare_articles():
+    assert normalize_title("Malcolm X") == "malcolm x"
+    assert normalize_title("The") == "the"
+
+
+def test_alias_index_persists_and_forgets(tmp_path):
+    db_path = tmp_path / "aliases.sqlite3"
+    index = TitleAliasIndex(db_path)
+    index.record('series', "Marvel's Agents of S.H.I.E.L.D.", None, 'tmdb', 1403, 97.0)
+    index.record('series', "Marvel's Agents of S.H.I.E.L.D.", None, 'tvdb', 263365, 95.0)
+    index.close()
+
+    reopened = TitleAliasIndex(db_path)
+    assert reopened.lookup('series', "Marvels.Agents.of.S.H.I.E.L.D", None, 'tmdb').provider_id == 1403
+    assert reopened.lookup('series', "Marvels.Agents.of.S.H.I.E.L.D", 2013, 'tmdb') is None  # year is part of the key
+    assert reopened.lookup('movie', "Marvels.Agents.of.S.H.I.E.L.D", None, 'tmdb') is None
+    assert reopened.forget("marvels agents of shield") == 2
+    assert len(TitleAliasIndex(db_path)) == 0
+
+
+@pytest.fixture
+def fetcher(mock_cfg_helper, tmp_path):
+    mock_cfg_helper.manager._mock_values.update({'cache_directory': str(tmp_path / 'cache'), 'cache_enabled': True, 'api_rate_limit_delay': 0})
+    mock_cfg_helper.args.quiet = True
+    fetcher = MetadataFetcher(mock_cfg_helper)
+    fetcher.tmdb = object()
+    yield fetcher
+    if fetcher.cache is not None: fetcher.cache.close()
+
+
+def test_alias_index_requires_the_disk_cache(mock_cfg_helper, tmp_path):
+    mock_cfg_helper.manager._mock_values.update({'cache_directory': str(tmp_path / 'cache'), 'cache_enabled': False})
+    mock_cfg_helper.args.quiet = True
+    assert MetadataFetcher(mock_cfg_helper).alias_index is None
+    assert not (tmp_path / 'cache').exists()
+
+
+@pytest.mark.asyncio
+async def test_alias_hit_skips_title_search(fetcher, mocker):
+    heat = SimpleNamespace(title='Heat', release_date='1995-12-15')
+    do_fetch = mocker.patch.object(fetcher, '_do_fetch_tmdb_movie', side_effect=[
+        (heat, {'tmdb_id': 949}, 96.0),                  # title search
+        (heat, {'tmdb_id': 949}, 101.0),                 # direct ID fetch via alias
+    ])
+    await fetcher.fetch_movie_metadata('Heat', 1995)
+    meta = await fetcher.fetch_movie_metadata('heat.', 1995)
+
+    assert do_fetch.call_args_list[1].kwargs['force_tmdb_id_arg'] == 949
+    assert meta.match_confidence == 96.0  # original search score, not the direct-ID score
+    assert fetcher.cache_stats['alias_hits'] == 1
+
+    # The entry cached under the title key still answers the original spelling; no network call.
+    meta = await fetcher.fetch_movie_metadata('Heat', 1995)
+    assert do_fetch.call_count == 2
+    assert meta.match_confidence == 96.0
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_do_not_create_aliases(fetcher, mocker):
+    mocker.patch.object(fetcher, '_do_fetch_tmdb_movie', return_value=(SimpleNamespace(title='Heat', release_date='1995-12-15'), {'tmdb_id': 949}, 96.0))
+    await fetcher.fetch_movie_metadata('Heat', 1995)
+    fetcher.alias_index.forget('Heat')
+    await fetcher.fetch_movie_metadata('Heat', 1995)  # served from cache
+    assert fetcher.alias_index.lookup('movie', 'Heat', 1995, 'tmdb') is None
+
+
+@pytest.mark.asyncio
+async def test_low_scores_are_not_aliased_and_dead_ids_are_dropped(fetcher, mocker):
+    mocker.patch.object(fetcher, '_do_fetch_tmdb_movie', return_value=(SimpleNamespace(title='Heat', release_date='1995-12-15'), {'tmdb_id': 949}, 72.0))
+    await fetcher.fetch_movie_metadata('Heat', 1995)
+    assert fetcher._lookup_alias('movie', 'Heat', 1995, 'tmdb') is None
+
+    fetcher.alias_index.record('movie', 'Gone Film', None, 'tmdb', 5, 99.0)
+    mocker.patch.object(fetcher, '_do_fetch_tmdb_movie', side_effect=MetadataNotFoundError("Provided TMDB ID '5' was not found."))
+    with pytest.raises(MetadataError):
+        await fetcher.fetch_movie_metadata('Gone Film')
+    assert fetcher.alias_index.lookup('movie', 'Gone Film', None, 'tmdb') is None
@@ -6,13 +6,16 @@ import time
 import sys
 import os
 import logging
+import itertools
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, call, patch, ANY
 from datetime import datetime, timezone, timedelta
 
 # Ensure imports work correctly relative to the project structure
 # Assuming tests are run from the project root
-from rename_app.undo_manager import UndoManager, TEMP_SUFFIX_PREFIX, MTIME_TOLERANCE
+from rename_app.undo_manager import UndoManager, MTIME_TOLERANCE
+TEMP_SUFFIX_PREFIX = ".renametmp_" # Default temp_file_suffix_prefix
 from rename_app.exceptions import RenamerError
 from rename_app import config_manager
 from rename_app import log_setup
@@ -413,9 +416,10 @@ def test_init_db_creates_table_and_index(basic_undo_manager, tmp_path):
     db_path = basic_undo_manager.db_path
     assert db_path.exists(), "Database file should be created"
 
-    # Check table exists
-    tables = _query_db(db_path, "SELECT name FROM sqlite_master WHERE type='table' AND name='rename_log'")
-    assert len(tables) == 1, "Table 'rename_log' should exist"
+    # rename_log is a view over the interned schema
+    assert _query_db(db_path, "SELECT type FROM sqlite_master WHERE name='rename_log'")[0]['type'] == 'view'
+    tables = {row['name'] for row in _query_db(db_path, "SELECT name FROM sqlite_master WHERE type='table'")}
+    assert {'rename_entries', 'dirs', 'batches'} <= tables
 
     # Check essential columns exist
     cols_info = _query_db(db_path, "PRAGMA table_info(rename_log)")
@@ -423,17 +427,13 @@ def test_init_db_creates_table_and_index(basic_undo_manager, tmp_path):
     expected_cols = {'id', 'batch_id', 'timestamp', 'original_path', 'new_path', 'type', 'status', 'original_size', 'original_mtime'}
     assert expected_cols <= col_names, f"Missing columns: {expected_cols - col_names}"
 
-    # Check UNIQUE constraint on original_path (best effort check in SQL definition)
-    constraints = _query_db(db_path, "SELECT sql FROM sqlite_master WHERE name='rename_log'")
-    assert constraints, "Could not fetch table SQL definition"
-    sql_def = constraints[0]['sql'].lower()
-    # Simple check for UNIQUE keyword associated with the column
-    assert 'original_path' in sql_def
-    assert 'unique' in sql_def # Assuming 'original_path TEXT NOT NULL UNIQUE' or similar
+    # Check UNIQUE constraint on the original path (directory id + name) per batch
+    sql_def = _query_db(db_path, "SELECT sql FROM sqlite_master WHERE name='rename_entries'")[0]['sql'].lower()
+    assert 'unique(batch_id, original_dir_id, original_name)' in sql_def
 
-    # Check index exists
-    indexes = _query_db(db_path, "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_batch_id'")
-    assert len(indexes) == 1, "Index 'idx_batch_id' should exist"
+    # Lookups by batch are indexed
+    plan = _query_db(db_path, "EXPLAIN QUERY PLAN SELECT * FROM rename_log WHERE batch_id = ?", ("b",))
+    assert any("USING INDEX" in row['detail'] and "batch_id=?" in row['detail'] for row in plan)
 
 
 # --- log_action Tests ---
@@ -1919,4 +1919,168 @@ def test_undo_failed_transaction_temp_file(basic_undo_manager, tmp_path, mocker)
     log_entry = _query_db(basic_undo_manager.db_path, "SELECT status FROM rename_log WHERE batch_id = ?", ("bft",))[0]
     assert log_entry['status'] == 'reverted'
 
+def test_group_file_reverts_keeps_dependent_reverts_together():
+    rows = [
+        {'id': 4, 'original_path': '/lib/a/x.mkv', 'new_path': '/lib/a/y.mkv'},
+        {'id': 3, 'original_path': '/lib/b/p.mkv', 'new_path': '/lib/b/q.mkv'},
+        {'id': 2, 'original_path': '/lib/c/y.mkv', 'new_path': '/lib/a/x.mkv'},  # Chained through /lib/a/x.mkv
+        {'id': 1, 'original_path': '/lib/a/z.mkv', 'new_path': '/lib/d/z.mkv'},  # Same target directory as id 4
+    ]
+    groups = UndoManager._group_file_reverts(rows)
+    assert sorted([r['id'] for r in g] for g in groups) == [[3], [4, 2, 1]]
+
+
+def test_parallel_undo_reverts_all_directories_with_one_status_update(tmp_path, mocker):
+    db_path = tmp_path / "parallel_undo.db"
+    settings = {'enable_undo': True, 'undo_db_path': str(db_path), 'undo_check_integrity': True, 'undo_parallel_workers': 4}
+    manager = UndoManager(cfg_helper=lambda k, d=None: settings.get(k, d))
+    originals = []
+    for show in ("Show A", "Show B", "Show C"):
+        folder = tmp_path / show
+        folder.mkdir()
+        for episode in (1, 2):
+            src = folder / f"{show}.S01E0{episode}.mkv"
+            src.write_text(f"{show} {episode}")
+            renamed = folder / f"{show} - S01E0{episode}.mkv"
+            manager.log_action("bpar", src, renamed, 'file', 'renamed')
+            src.rename(renamed)
+            originals.append(src)
+    mocker.patch("rename_app.undo_manager.ConfirmClass.ask", return_value=True)
+    mark_spy = mocker.spy(manager, '_mark_reverted')
+
+    assert manager.perform_undo("bpar") is True
+
+    assert all(p.exists() for p in originals)
+    mark_spy.assert_called_once()
+    statuses = {row['status'] for row in _query_db(db_path, "SELECT status FROM rename_log WHERE batch_id = ?", ("bpar",))}
+    assert statuses == {'reverted'}
+
+def test_integrity_skip_is_not_an_error_and_keeps_other_reverts(tmp_path, mocker):
+    db_path = tmp_path / "skip_undo.db"
+    settings = {'enable_undo': True, 'undo_db_path': str(db_path), 'undo_check_integrity': True}
+    manager = UndoManager(cfg_helper=lambda k, d=None: settings.get(k, d))
+    pairs = []
+    for name in ("kept", "edited"):
+        src = tmp_path / f"{name}.mkv"
+        src.write_text(name)
+        renamed = tmp_path / f"{name} renamed.mkv"
+        manager.log_action("bskip", src, renamed, 'file', 'renamed')
+        src.rename(renamed)
+        pairs.append((src, renamed))
+    pairs[1][1].write_text("changed after the rename") # Size no longer matches: integrity failure
+    mocker.patch("rename_app.undo_manager.ConfirmClass.ask", return_value=True)
+
+    assert manager.perform_undo("bskip") is True
+
+    assert pairs[0][0].exists() and pairs[1][1].exists()
+    statuses = dict(_query_db(db_path, "SELECT original_path, status FROM rename_log WHERE batch_id = 'bskip'"))
+    assert statuses == {str(pairs[0][0]): 'reverted', str(pairs[1][0]): 'renamed'}
+
+def test_legacy_undo_db_is_migrated_and_batch_summary_maintained(tmp_path):
+    db_path = tmp_path / "legacy_undo.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE rename_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT NOT NULL, timestamp TEXT NOT NULL,
+            original_path TEXT NOT NULL, new_path TEXT NOT NULL, type TEXT NOT NULL, status TEXT NOT NULL,
+            original_size INTEGER, original_mtime REAL, UNIQUE(batch_id, original_path)
+        )""")
+    old = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+    conn.executemany("INSERT INTO rename_log (batch_id, timestamp, original_path, new_path, type, status) VALUES (?, ?, ?, ?, 'file', 'renamed')",
+                     [("old_batch", old, f"/a/{i}.mkv", f"/a/{i}b.mkv") for i in range(3)])
+    conn.commit(); conn.close()
+
+    settings = {'enable_undo': True, 'undo_db_path': str(db_path), 'undo_expire_days': 30}
+    manager = UndoManager(cfg_helper=lambda k, d=None: settings.get(k, d))
+    assert _query_db(db_path, "PRAGMA user_version")[0][0] == 3
+    assert [(b['batch_id'], b['action_count']) for b in manager.list_batches()] == [("old_batch", 3)]
+    assert [row['path'] for row in _query_db(db_path, "SELECT path FROM dirs")] == ["/a/"] # Interned once
+    assert [tuple(row) for row in _query_db(db_path, "SELECT original_path, new_path FROM rename_log ORDER BY id")] == \
+        [(f"/a/{i}.mkv", f"/a/{i}b.mkv") for i in range(3)]
+
+    manager.log_action("new_batch", tmp_path / "x.mkv", tmp_path / "y.mkv", 'file', 'renamed')
+    manager.log_action("new_batch", tmp_path / "z.mkv", tmp_path / "w.mkv", 'file', 'renamed')
+    assert [(b['batch_id'], b['action_count']) for b in manager.list_batches()] == [("new_batch", 2), ("old_batch", 3)]
+
+    manager.prune_old_batches()
+    assert [(b['batch_id'], b['action_count']) for b in manager.list_batches()] == [("new_batch", 2)]
+    assert _query_db(db_path, "PRAGMA auto_vacuum")[0][0] == 2 # Small legacy file switched by the prune
+    assert "/a/" not in [row['path'] for row in _query_db(db_path, "SELECT path FROM dirs")] # Orphaned directory dropped
+    plan = _query_db(db_path, "EXPLAIN QUERY PLAN SELECT * FROM rename_log WHERE timestamp < ?", (old,))
+    assert any("idx_rename_entries_timestamp" in row['detail'] for row in plan)
+
+def test_prune_deletes_in_chunks_within_time_budget_then_vacuums(tmp_path, mocker):
+    db_path = tmp_path / "chunked_prune.db"
+    settings = {'enable_undo': True, 'undo_db_path': str(db_path), 'undo_expire_days': 30, 'undo_prune_chunk_rows': 100}
+    manager = UndoManager(cfg_helper=lambda k, d=None: settings.get(k, d))
+    old = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO rename_log (batch_id, timestamp, original_path, new_path, type, status) VALUES (?, ?, ?, ?, 'file', 'renamed')",
+                     [(f"old_{i % 5}", old, f"/a/{i}" + "x" * 200, f"/b/{i}") for i in range(1000)])
+    conn.commit(); conn.close()
+    manager.log_action("recent", tmp_path / "r.mkv", tmp_path / "s.mkv", 'file', 'renamed')
+    assert _query_db(db_path, "PRAGMA auto_vacuum")[0][0] == 2 # INCREMENTAL on a new database
+
+    mocker.patch('rename_app.undo_manager.time.monotonic', side_effect=itertools.chain([0.0, 0.0, 0.5], itertools.repeat(5.0)))
+    manager.prune_old_batches(time_budget=1.0) # Budget runs out after the third chunk
+    assert _get_log_count(db_path) == 1000 - 300 + 1
+
+    mocker.stopall()
+    manager.prune_old_batches(time_budget=0)
+    assert [b['batch_id'] for b in manager.list_batches()] == ["recent"]
+    assert _query_db(db_path, "PRAGMA freelist_count")[0][0] == 0
+
+def test_background_prune_runs_off_the_calling_thread(basic_undo_manager, mocker):
+    if not basic_undo_manager.is_enabled: pytest.skip("Undo disabled")
+    seen = []
+    mocker.patch.object(basic_undo_manager, 'prune_old_batches', side_effect=lambda: seen.append(threading.current_thread().name))
+    basic_undo_manager.start_background_prune().join(timeout=5)
+    assert seen == ["undo-prune"]
+
+def test_recover_run_finishes_interrupted_renames_and_drops_stale_entries(tmp_path):
+    db_path = tmp_path / "resume_undo.db"
+    settings = {'enable_undo': True, 'undo_db_path': str(db_path)}
+    manager = UndoManager(cfg_helper=lambda k, d=None: settings.get(k, d))
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir(); dst.mkdir()
+    journal = {
+        'in_temp': (src / "a.mkv", dst / "A.mkv", 'pending_final'),
+        'at_target': (src / "b.mkv", src / "B.mkv", 'pending_final'),
+        'untouched': (src / "c.mkv", dst / "C.mkv", 'pending_final'),
+        'rolled_back': (src / "d.mkv", dst / "D.mkv", 'failed_pending'),
+        'completed': (src / "e.mkv", dst / "E.mkv", 'moved'),
+    }
+    for original, new, status in journal.values():
+        manager.log_action("run-1", original, new, 'file', status)
+    (dst / "A.renametmp_1234abcd.mkv").write_text("a")
+    (src / "B.mkv").write_text("b")
+    (src / "c.mkv").write_text("c"); (src / "d.mkv").write_text("d")
+
+    result = manager.recover_run("run-1")
+
+    assert (dst / "A.mkv").read_text() == "a" and not (dst / "A.renametmp_1234abcd.mkv").exists()
+    assert (result['finished'], result['discarded'], result['unresolved']) == (2, 2, 0)
+    rows = dict(_query_db(db_path, "SELECT original_path, status FROM rename_log WHERE batch_id = 'run-1'"))
+    assert rows == {str(src / "a.mkv"): 'moved', str(src / "b.mkv"): 'renamed', str(src / "e.mkv"): 'moved'}
+    assert str(src / "e.mkv") in result['done_paths'] and str(dst / "A.mkv") in result['done_paths']
+    with pytest.raises(RenamerError, match="nothing to resume"):
+        manager.recover_run("run-unknown")
+
+def test_log_actions_writes_all_rows_in_one_transaction(basic_undo_manager, tmp_path):
+    if not basic_undo_manager.is_enabled: pytest.skip("Undo disabled")
+    files = [tmp_path / f"t{i}.mkv" for i in range(3)]
+    for path in files: path.write_text("data")
+    pairs = [(path, path.with_name(f"new_{path.name}")) for path in files]
+
+    assert basic_undo_manager.log_actions("trash_batch", pairs, 'file', 'trashed') is True
+    rows = _query_db(basic_undo_manager.db_path, "SELECT original_path, status, original_size FROM rename_log WHERE batch_id = 'trash_batch' ORDER BY id")
+    assert [tuple(row) for row in rows] == [(str(path), 'trashed', 4) for path in files]
+
+    # A duplicate rolls back the whole batch
+    extra = tmp_path / "extra.mkv"
+    assert basic_undo_manager.log_actions("trash_batch", [(extra, extra), pairs[0]], 'file', 'trashed') is False
+    assert _get_log_count(basic_undo_manager.db_path, "trash_batch") == 3
+
+    assert basic_undo_manager.update_action_statuses("trash_batch", [str(files[1]), str(files[2])], 'failed_pending') == 2
+
 # --- END tests/test_undo_manager.py ---
\ No newline at end of file
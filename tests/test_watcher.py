@@ -0,0 +1,174 @@
+# tests/test_watcher.py
+import argparse
+import asyncio
+import os
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from rename_app import config_manager
+from rename_app.config_manager import DEFAULT_CONFIG_FILENAME
+from rename_app.watcher import WatchService, PollingWatcher, InotifyWatcher
+
+
+@pytest.fixture
+def watch_settings(tmp_path, mocker):
+    config_path = tmp_path / DEFAULT_CONFIG_FILENAME
+    config_path.write_text('[default]\nrecursive = true\nwatch_settle_seconds = 5.0\n', encoding='utf-8')
+    mocker.patch('rename_app.config_manager.find_dotenv', return_value=None)
+    mocker.patch.dict(os.environ, {}, clear=True)
+    manager = config_manager.ConfigManager(config_path_override=config_path, interactive_fallback=False, quiet_mode=True)
+    args = argparse.Namespace(profile='default')
+    return config_manager.ConfigHelper(manager, args).snapshot()
+
+
+@pytest.fixture
+def watch_dir(tmp_path):
+    target = tmp_path / "incoming"
+    target.mkdir()
+    return target
+
+
+@pytest.fixture
+def service(watch_settings, watch_dir):
+    processor = MagicMock()
+    processor.args = argparse.Namespace(unknown_files_dir=None, stage_dir=None, backup_dir=None)
+    processor.process_file_batches = AsyncMock()
+    processor.run_processing = AsyncMock()
+    return WatchService(processor, watch_settings, watch_dir)
+
+
+def test_service_reads_watch_settings(service):
+    assert service.settle_seconds == 5.0
+    assert service.poll_interval == 10.0
+    assert service.use_polling is False
+    assert service.recursive is True
+
+
+def test_is_candidate_filters(service, watch_dir):
+    assert service.is_candidate(watch_dir / "Show.S01E01.mkv")
+    assert service.is_candidate(watch_dir / "sub" / "Show.S01E01.nfo")
+    assert not service.is_candidate(watch_dir / "Show.S01E01.mkv.part")
+    assert not service.is_candidate(watch_dir / "notes.docx")
+    assert not service.is_candidate(watch_dir / ".hidden.mkv")
+    assert not service.is_candidate(watch_dir / "_unknown_files_" / "x.mkv")
+    assert not service.is_candidate(watch_dir / "Show.renametmp_ab.mkv")
+    assert not service.is_candidate(watch_dir.parent / "elsewhere.mkv")
+
+
+def test_debounce_waits_for_settle_time(service, watch_dir):
+    video = watch_dir / "Show.S01E01.mkv"
+    video.write_bytes(b"abc")
+    service.note_changed({video}, now=100.0)
+    assert service.collect_ready(now=102.0) == []
+    assert service.next_timeout(now=102.0) == pytest.approx(3.0)
+
+    # Still growing: the settle timer restarts.
+    video.write_bytes(b"abcdef")
+    os.utime(video, ns=(1, 2))
+    assert service.collect_ready(now=104.0) == []
+    assert service.collect_ready(now=108.0) == []
+    assert service.collect_ready(now=109.0) == [video]
+    assert service.next_timeout() is None
+
+
+def test_deleted_pending_file_is_dropped(service, watch_dir):
+    video = watch_dir / "Gone.S01E01.mkv"
+    video.write_bytes(b"x")
+    service.note_changed({video}, now=0.0)
+    video.unlink()
+    assert service.collect_ready(now=100.0) == []
+    assert service.next_timeout() is None
+
+
+@pytest.mark.asyncio
+async def test_process_ready_groups_by_directory_and_ignores_own_renames(service, watch_dir):
+    season = watch_dir / "Season 1"
+    season.mkdir()
+    ready = [watch_dir / "Movie.2020.mkv", season / "Show.S01E01.mkv"]
+    for p in ready:
+        p.write_bytes(b"data")
+    (season / "Show.S01E01.srt").write_bytes(b"sub")
+    (season / "Other.S01E02.mkv").write_bytes(b"not ready")
+
+    await service.process_ready(ready)
+
+    calls = service.processor.process_file_batches.await_args_list
+    assert len(calls) == 2
+    assert all(c.kwargs == {'unattended': True} for c in calls)
+    stems = sorted(stem for c in calls for stem in c.args[0])
+    assert stems == ["Movie.2020", "Show.S01E01"]
+
+    # The renamer moving the file keeps its inode/size/mtime; that event must not re-trigger a run.
+    renamed = watch_dir / "Movie (2020).mkv"
+    ready[0].rename(renamed)
+    service.note_changed({renamed}, now=0.0)
+    assert service.collect_ready(now=1000.0) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_files_are_retried_with_backoff(service, watch_dir):
+    failed_video = watch_dir / "Show.S01E01.mkv"
+    done_video = watch_dir / "Movie.2020.mkv"
+    for p in (failed_video, done_video):
+        p.write_bytes(b"data")
+    service.processor.process_file_batches.return_value = {'failed_paths': [failed_video]}
+
+    await service.process_ready([failed_video, done_video])
+
+    # The failed file is queued again instead of being remembered as handled ...
+    service.note_changed({failed_video, done_video})
+    assert list(service._pending) == [failed_video]
+    assert service.next_timeout() == pytest.approx(10.0, abs=0.5)  # settle_seconds * 2
+    # ... and a run that raises leaves its files pending too, with a longer delay.
+    service.processor.process_file_batches.side_effect = RuntimeError("API down")
+    await service.process_ready(service.collect_ready(now=time.monotonic() + 11))
+    assert list(service._pending) == [failed_video]
+    assert service.next_timeout() == pytest.approx(20.0, abs=0.5)
+
+
+@pytest.mark.asyncio
+async def test_polling_watcher_reports_new_and_modified_files(watch_dir):
+    existing = watch_dir / "a.mkv"
+    existing.write_bytes(b"1")
+    watcher = PollingWatcher(watch_dir, True, set(), ['.*'], interval=0.01)
+    await watcher.start()
+    assert await watcher.wait(0) == set()
+
+    new_file = watch_dir / "b.mkv"
+    new_file.write_bytes(b"2")
+    existing.write_bytes(b"11")
+    assert await watcher.wait(0) == {existing, new_file}
+    watcher.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not InotifyWatcher.is_supported(), reason="inotify not available")
+async def test_inotify_watcher_sees_files_in_new_subdirectories(watch_dir):
+    watcher = InotifyWatcher(watch_dir, True, set(), ['.*'])
+    await watcher.start()
+    try:
+        top = watch_dir / "top.mkv"
+        top.write_bytes(b"x")
+        assert top in await watcher.wait(2.0)
+
+        sub = watch_dir / "new_show"
+        sub.mkdir()
+        await watcher.wait(0.2)
+        nested = sub / "Show.S01E01.mkv"
+        nested.write_bytes(b"y")
+        assert nested in await watcher.wait(2.0)
+    finally:
+        watcher.close()
+
+
+@pytest.mark.asyncio
+async def test_run_stops_and_does_initial_scan(service):
+    service.use_polling = True
+    service.poll_interval = 0.01
+    task = asyncio.create_task(service.run(initial_scan=True))
+    await asyncio.sleep(0.1)
+    service.stop()
+    await asyncio.wait_for(task, timeout=2.0)
+    service.processor.run_processing.assert_awaited_once_with(unattended=True)